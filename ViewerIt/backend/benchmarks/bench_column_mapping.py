@@ -0,0 +1,100 @@
+"""
+Benchmark: column mapping suggestions across many wide files.
+
+Each file is a copy of the same wide table with a share of its columns
+renamed (the way productions rename fields between volumes). Mapping time
+should stay well under a second and grow with the number of renamed
+columns, not with the square of all columns.
+
+Usage:
+    python benchmarks/bench_column_mapping.py [--files 10] [--columns 300] [--renamed 0.2] [--json]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.schema_analyzer import SchemaAnalyzer
+
+
+def make_renamed_files(files: int, columns: int, rows: int, renamed: float,
+                       seed: int = 42) -> dict[str, pd.DataFrame]:
+    """Copies of one wide table, each renaming a random share of its columns."""
+    rng = np.random.default_rng(seed)
+    base = {}
+    for c in range(columns):
+        kind = c % 3
+        if kind == 0:
+            base[f"amount_{c}"] = rng.normal(100, 25, rows).round(2)
+        elif kind == 1:
+            base[f"control_number_{c}"] = np.char.add("CTRL", rng.integers(0, 10**7, rows).astype(str)).astype(object)
+        else:
+            base[f"custodian_{c}"] = rng.choice(["Smith", "Jones", "Lee", "Patel"], rows)
+
+    dataframes = {}
+    for i in range(files):
+        chosen = set(rng.choice(columns, int(columns * renamed), replace=False)) if i else set()
+        data = {
+            (f"{name.upper().replace('_', ' ')} V{i}" if c in chosen else name): values
+            for c, (name, values) in enumerate(base.items())
+        }
+        dataframes[f"volume_{i + 1}.csv"] = pd.DataFrame(data, columns=list(data))
+    return dataframes
+
+
+def run(files: int, columns: int, rows: int, renamed: float, repeat: int) -> dict:
+    dataframes = make_renamed_files(files, columns, rows, renamed)
+    analyzer = SchemaAnalyzer(dataframes)
+    schemas = {name: analyzer._extract_schema(df) for name, df in dataframes.items()}
+
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = analyzer._suggest_column_mappings(schemas)
+        best = min(best, time.perf_counter() - start)
+
+    return {
+        "files": files,
+        "columns": columns,
+        "rows": rows,
+        "renamed_share": renamed,
+        "seconds": round(best, 4),
+        "total_suggestions": result["total_suggestions"],
+        "top_suggestion": result["suggestions"][0] if result["suggestions"] else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--columns", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--renamed", type=float, default=0.2, help="Share of columns renamed per file")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.files, args.columns, args.rows, args.renamed, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+        return
+
+    print(f"Column mapping: {args.files} files x {args.columns} columns x {args.rows} rows, "
+          f"{args.renamed:.0%} renamed per file")
+    print(f"  {results['seconds']:.4f}s  {results['total_suggestions']} suggestions")
+    if results["top_suggestion"]:
+        top = results["top_suggestion"]
+        print(f"  top: {top['column1']} -> {top['column2']} ({top['similarity_score']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark: cross-column consistency checks on a wide numeric file.
+
+Compares the previous checks (Series.corr for every pair of numeric columns,
+each date column parsed once to detect it and again for every ordered pair)
+with the vectorized correlation matrix and cached date parsing used by
+QualityChecker._check_consistency. The file is read from CSV first, as an
+upload would be.
+
+Usage:
+    python benchmarks/bench_consistency.py [--rows 100000] [--columns 200] [--skip-legacy] [--json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import timed
+from services.quality_checker import QualityChecker
+
+
+def write_wide_file(path: Path, rows: int, columns: int, seed: int = 42):
+    """Numeric columns (some nearly collinear, some sparse) plus date ranges."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for c in range(columns):
+        if c % 10 == 1:
+            # Derived column, e.g. a total from its subtotal
+            values = data[f"amount_{c - 1}"] * 1.08 + rng.normal(0, 0.5, rows)
+        else:
+            values = rng.normal(100, 25, rows)
+        if c % 7 == 3:
+            values[rng.random(rows) < 0.2] = np.nan
+        data[f"amount_{c}"] = values.round(2)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1500, rows), unit="D")
+    data["start_date"] = start.strftime("%m/%d/%Y")
+    data["end_date"] = (start + pd.to_timedelta(rng.integers(-5, 90, rows), unit="D")).strftime("%m/%d/%Y")
+    data["from_date"] = data["start_date"]
+    data["to_date"] = data["end_date"]
+    pd.DataFrame(data).to_csv(path, index=False)
+
+
+def legacy_consistency(df: pd.DataFrame) -> list:
+    """The previous checks: a Series.corr call per pair and repeated date parsing."""
+    issues = []
+    numeric_cols = df.select_dtypes(include=['number']).columns
+    for i, col1 in enumerate(numeric_cols):
+        for col2 in numeric_cols[i+1:]:
+            correlation = df[col1].corr(df[col2])
+            if abs(correlation) > 0.95:
+                issues.append(("high_correlation", col1, col2, round(correlation, 3)))
+
+    date_cols = []
+    for col in df.columns:
+        if 'date' in col.lower() or 'time' in col.lower():
+            try:
+                pd.to_datetime(df[col], errors='raise')
+                date_cols.append(col)
+            except (ValueError, TypeError, pd.errors.ParserError):
+                pass
+    for i, col1 in enumerate(date_cols):
+        for col2 in date_cols[i+1:]:
+            if ('start' in col1.lower() and 'end' in col2.lower()) or \
+               ('from' in col1.lower() and 'to' in col2.lower()):
+                invalid = int((pd.to_datetime(df[col1]) > pd.to_datetime(df[col2])).sum())
+                if invalid > 0:
+                    issues.append(("date_order_violation", col1, col2, invalid))
+    return issues
+
+
+def vectorized_consistency(df: pd.DataFrame) -> tuple[float, list]:
+    """Time QualityChecker._check_consistency; issues in the legacy tuple form."""
+    checker = QualityChecker(df, "bench")
+    checker.profiles  # Shared with the rest of the quality check; timed separately
+    start = time.perf_counter()
+    result = checker._check_consistency()
+    seconds = time.perf_counter() - start
+    issues = [
+        (issue["type"], *issue["columns"], issue.get("correlation", issue.get("violation_count")))
+        for issue in result["issues"]
+    ]
+    return seconds, issues
+
+
+def run(rows: int, columns: int, skip_legacy: bool) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "wide.csv"
+        write_wide_file(path, rows, columns)
+        df = pd.read_csv(path, low_memory=False)
+
+    vectorized_seconds, vectorized = vectorized_consistency(df)
+    results = {
+        "rows": rows,
+        "numeric_columns": columns,
+        "vectorized_seconds": round(vectorized_seconds, 3),
+        "issues": len(vectorized),
+    }
+
+    if not skip_legacy:
+        legacy_seconds, legacy = timed(lambda: legacy_consistency(df))
+        results["legacy_seconds"] = round(legacy_seconds, 3)
+        results["speedup"] = round(legacy_seconds / vectorized_seconds, 1)
+        results["issues_match"] = legacy == vectorized
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the vectorized checks")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.columns, args.skip_legacy)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Consistency checks: {args.rows} rows x {args.columns} numeric columns + 4 date columns")
+    print(f"  vectorized + cached dates: {results['vectorized_seconds']:>8.3f}s  ({results['issues']} issues)")
+    if "legacy_seconds" in results:
+        print(f"  legacy pairwise loop:      {results['legacy_seconds']:>8.3f}s")
+        print(f"  speedup: {results['speedup']}x  (identical issues: {results['issues_match']})")
+
+
+if __name__ == "__main__":
+    main()
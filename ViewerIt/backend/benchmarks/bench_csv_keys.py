@@ -0,0 +1,114 @@
+"""
+Benchmark: composite key extraction for a multi-file overlap analysis.
+
+Writes --files synthetic load files sharing most control numbers and times
+compare_multiple_files_chunked on a two-column key three ways: the former
+per-row '|'.join over every column parsed with inferred dtypes, the Python
+fallback (key columns only, as text, joined with vectorized string
+concatenation), and viewerit_core's native reader when the built extension
+supports it (files parsed in parallel in Rust, no DataFrames).
+
+Usage:
+    python benchmarks/bench_csv_keys.py [--rows 500000] [--files 10] [--json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import timed
+from services.chunked_processor import ChunkedProcessor, NATIVE_CSV_KEYS
+from services.worker_pool import WorkerPool
+
+KEY_COLUMNS = ["control_number", "custodian"]
+
+
+def write_files(directory: Path, rows: int, files: int) -> list[Path]:
+    """Load files of rows each; each drops and adds a few percent of keys."""
+    rng = np.random.default_rng(42)
+    paths = []
+    for i in range(files):
+        ids = np.arange(rows)
+        ids[rng.random(rows) < 0.03] += rows * (i + 1)
+        path = directory / f"volume{i}.csv"
+        pd.DataFrame({
+            "control_number": np.char.add("CTRL", ids.astype(str)),
+            "custodian": rng.choice(["Smith, J", "Jones, K", "Lee, M"], rows),
+            "subject": np.char.add("Re: matter ", rng.integers(0, 10_000, rows).astype(str)),
+            "amount": rng.normal(100, 25, rows).round(2),
+            "pages": rng.integers(1, 500, rows),
+        }).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def legacy_keys(processor: ChunkedProcessor, path: Path) -> set:
+    """Keys as extracted before: every column parsed, rows joined one by one."""
+    keys = set()
+    for chunk in processor.read_csv_chunked(path):
+        keys.update(chunk[KEY_COLUMNS].astype(str).agg('|'.join, axis=1).tolist())
+    return keys
+
+
+def run(rows: int, files: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(Path(directory), rows, files)
+        processor = ChunkedProcessor(pool=WorkerPool(max_workers=1))
+        processor._native_keys = False
+
+        results = {
+            "rows_per_file": rows,
+            "files": files,
+            "total_mb": round(sum(path.stat().st_size for path in paths) / 1024 ** 2, 1),
+        }
+        results["legacy_seconds"], legacy = timed(
+            lambda: processor._compare_multiple_python({path.name: legacy_keys(processor, path) for path in paths}), digits=2)
+        results["fallback_seconds"], fallback = timed(
+            lambda: processor.compare_multiple_files_chunked(paths, KEY_COLUMNS), digits=2)
+        results["same_result"] = legacy == fallback
+        results["keys_in_all_files"] = fallback["keys_in_all_files"]
+
+        if NATIVE_CSV_KEYS:
+            processor._native_keys = True
+            results["native_seconds"], native = timed(
+                lambda: processor.compare_multiple_files_chunked(paths, KEY_COLUMNS), digits=2)
+            results["native_same_result"] = native["keys_in_all_files"] == fallback["keys_in_all_files"]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.files)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Overlap of {args.files} files x {args.rows} rows ({results['total_mb']} MB CSV), "
+          f"key {'+'.join(KEY_COLUMNS)}")
+    print(f"  per-row join   {results['legacy_seconds']:>8.2f}s")
+    print(f"  text concat    {results['fallback_seconds']:>8.2f}s  "
+          f"({results['legacy_seconds'] / results['fallback_seconds']:.1f}x)  same result: {results['same_result']}")
+    if "native_seconds" in results:
+        print(f"  viewerit_core  {results['native_seconds']:>8.2f}s  "
+              f"({results['legacy_seconds'] / results['native_seconds']:.1f}x)  "
+              f"same result: {results['native_same_result']}")
+    else:
+        print("  viewerit_core  not built with native CSV key extraction")
+    print(f"  keys in all files: {results['keys_in_all_files']}")
+
+
+if __name__ == "__main__":
+    main()
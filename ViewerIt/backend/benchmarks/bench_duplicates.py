@@ -0,0 +1,157 @@
+"""
+Benchmark: exact and near-duplicate rows across files, in memory vs fingerprinted in chunks.
+
+Writes two load files sharing exact copies and lightly edited rows, then runs
+each method in its own subprocess, reporting wall time and peak resident
+memory. pandas loads and concatenates both files to find exact duplicates;
+DuplicateFinder reads them in chunks, keeping one 64-bit fingerprint per row
+(plus sketches and LSH bucket keys for near-duplicates) within its budget.
+Near-duplicate recall is measured on the planted edits; the candidate pairs
+are compared with the all-pairs count a direct comparison would need.
+
+Usage:
+    python benchmarks/bench_duplicates.py [--rows 1000000] [--chunk-size 50000] [--budget-mb 64] [--json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import control_numbers, peak_rss_mb, run_in_subprocess
+
+_EDITED = 1000  # Rows re-appearing with one word of the subject changed
+_COPIED = 2000  # Rows re-appearing unchanged in the second file
+
+
+def load_file_rows(start: int, n: int, rng) -> pd.DataFrame:
+    words = np.array([f"term{i}" for i in range(50_000)])
+    subjects = rng.choice(words, (n, 12))
+    return pd.DataFrame({
+        "control_number": control_numbers(start, n),
+        "custodian": rng.choice(["Smith, J", "Jones, K", "Lee, M"], n),
+        "subject": [" ".join(row) for row in subjects],
+        "pages": rng.integers(1, 500, n),
+    })
+
+
+def write_files(directory: Path, rows: int, batch: int = 250_000) -> list[Path]:
+    """Two files of rows/2 each; the second repeats some rows of the first."""
+    rng = np.random.default_rng(42)
+    first, second = directory / "volume1.csv", directory / "volume2.csv"
+    half = rows // 2
+    head = None
+    for start in range(0, half, batch):
+        df = load_file_rows(start, min(batch, half - start), rng)
+        head = df if head is None else head
+        df.to_csv(first, mode="a" if start else "w", header=not start, index=False)
+    for start in range(0, half - _EDITED - _COPIED, batch):
+        df = load_file_rows(half + start, min(batch, half - _EDITED - _COPIED - start), rng)
+        df.to_csv(second, mode="a" if start else "w", header=not start, index=False)
+
+    edited = head.iloc[:_EDITED].copy()
+    edited["subject"] = edited["subject"].str.replace(r"^\w+", "edited", regex=True)
+    pd.concat([edited, head.iloc[_EDITED:_EDITED + _COPIED]]).to_csv(second, mode="a", header=False, index=False)
+    return [first, second]
+
+
+def run_worker(mode: str, paths: list[Path], chunk_size: int, budget_mb: float) -> dict:
+    """Run one method in this process and report time and peak RSS."""
+    from services.chunked_processor import ChunkedProcessor
+    from services.row_fingerprints import DuplicateFinder
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    result = {}
+    if mode == "pandas":
+        df = pd.concat([pd.read_csv(path, dtype=str) for path in paths], ignore_index=True)
+        result["duplicate_rows"] = int(df.duplicated().sum())
+    else:
+        processor = ChunkedProcessor(chunk_size)
+        near_method = None if mode == "exact" else mode
+        with DuplicateFinder(near_method=near_method, memory_budget_mb=budget_mb) as finder:
+            for path in paths:
+                for chunk in processor.read_csv_chunked(path, dtype=str):
+                    finder.add(path.name, chunk)
+            found = finder.result()
+        result["duplicate_rows"] = found["exact"]["duplicate_rows"]
+        result["spilled"] = found["spilled"]
+        if near_method:
+            near = found["near"]
+            result.update({
+                "candidate_pairs": near["candidate_pairs"],
+                "clusters": near["clusters"],
+                "recall": round(min(near["clusters"], _EDITED) / _EDITED, 3),
+            })
+    result.update({
+        "seconds": round(time.perf_counter() - start, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "imports_rss_mb": round(baseline, 1),
+    })
+    return result
+
+
+def measure(mode: str, paths: list[Path], chunk_size: int, budget_mb: float) -> dict:
+    """Run one method in a worker subprocess (see run_worker)."""
+    return run_in_subprocess(__file__, "--worker", mode, "--chunk-size", chunk_size,
+                             "--budget-mb", budget_mb, "--csv", *paths)
+
+
+def run(rows: int, chunk_size: int, budget_mb: float) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(Path(directory), rows)
+        results = {
+            "rows": rows,
+            "file_mb": round(sum(path.stat().st_size for path in paths) / 1024 ** 2, 1),
+            "chunk_size": chunk_size,
+            "budget_mb": budget_mb,
+            "all_pairs": rows * (rows - 1) // 2,
+        }
+        for mode in ("pandas", "exact", "minhash", "simhash"):
+            results[mode] = measure(mode, paths, chunk_size, budget_mb)
+    results["same_duplicates"] = len({results[mode]["duplicate_rows"]
+                                      for mode in ("pandas", "exact", "minhash", "simhash")}) == 1
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--budget-mb", type=float, default=64)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--worker", choices=["pandas", "exact", "minhash", "simhash"], help=argparse.SUPPRESS)
+    parser.add_argument("--csv", type=Path, nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.csv, args.chunk_size, args.budget_mb)))
+        return
+
+    results = run(args.rows, args.chunk_size, args.budget_mb)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Duplicate rows across 2 files: {args.rows} rows ({results['file_mb']} MB CSV)")
+    for mode in ("pandas", "exact", "minhash", "simhash"):
+        entry = results[mode]
+        line = (f"  {mode:<8} {entry['seconds']:>8.2f}s  peak RSS {entry['peak_rss_mb']:>8.1f} MB  "
+                f"duplicates {entry['duplicate_rows']}")
+        if "clusters" in entry:
+            line += (f"  near clusters {entry['clusters']} (recall {entry['recall']})  "
+                     f"candidate pairs {entry['candidate_pairs']:,} of {results['all_pairs']:,}")
+        print(line)
+    print(f"  identical duplicate counts: {results['same_duplicates']}")
+
+
+if __name__ == "__main__":
+    main()
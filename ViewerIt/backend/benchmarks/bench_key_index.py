@@ -0,0 +1,158 @@
+"""
+Benchmark: follow-up key queries, re-hashing the uploads vs reopening a persistent key index.
+
+Writes --files overlapping CSV volumes and builds their key index once
+(ChunkedProcessor.build_key_index). Each follow-up flow then runs in its own
+subprocess, reporting wall time and peak resident memory: the former flow
+re-extracts and re-hashes every file's keys to answer "keys in the first
+and last files but not the second" plus a batch of per-key membership
+lookups; the index flow memory-maps the index (KeyIndex) and answers the
+same questions from the sorted keys and presence bitmasks. Answers must be
+identical.
+
+Usage:
+    python benchmarks/bench_key_index.py [--files 4] [--keys 1000000] [--lookups 1000] [--json]
+"""
+import argparse
+import hashlib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import control_numbers, peak_rss_mb, run_in_subprocess
+
+KEY_COLUMNS = ["control_number"]
+
+
+def write_volumes(directory: Path, files: int, keys: int, seed: int = 42) -> list[Path]:
+    """Volumes drawn from one universe of control numbers (each file holds 60-90% of them)."""
+    rng = np.random.default_rng(seed)
+    universe = control_numbers(0, keys)
+    paths = []
+    for idx in range(files):
+        held = universe[rng.random(keys) < rng.uniform(0.6, 0.9)]
+        path = directory / f"volume_{idx:02d}.csv"
+        pd.DataFrame({"control_number": held, "pages": rng.integers(1, 500, len(held))}).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def lookup_keys(keys: int, lookups: int) -> list[str]:
+    """Keys to look up, a tenth of them absent from every file."""
+    rng = np.random.default_rng(7)
+    return [f"CTRL{value}" for value in rng.integers(0, int(keys * 1.1), lookups)]
+
+
+def run_worker(mode: str, paths: list[Path], index_path: Path, keys: int, lookups: int) -> dict:
+    """Answer the follow-up questions in this process and report time and peak RSS."""
+    from services.chunked_processor import ChunkedProcessor
+    from services.key_index import KeyIndex
+    from services.overlap import membership_masks, mask_files
+
+    names = [path.name for path in paths]
+    include, exclude = [names[0], names[-1]], [names[1]]
+    wanted = lookup_keys(keys, lookups)
+
+    start = time.perf_counter()
+    if mode == "rehash":
+        processor = ChunkedProcessor()
+        key_arrays = [list(processor.find_unique_keys_chunked(path, KEY_COLUMNS)) for path in paths]
+        all_keys, masks = membership_masks(key_arrays, sort=True)
+        include_bits = np.uint64(sum(1 << names.index(name) for name in include))
+        exclude_bits = np.uint64(sum(1 << names.index(name) for name in exclude))
+        selected = all_keys[((masks & include_bits) == include_bits) & ((masks & exclude_bits) == 0)]
+        position = {key: idx for idx, key in enumerate(all_keys)}
+        found = [mask_files(int(masks[position[key]]), names) if key in position else [] for key in wanted]
+        open_seconds = None
+    else:
+        index = KeyIndex(index_path)
+        open_seconds = time.perf_counter() - start
+        selected = index.query(include, exclude, limit=keys)["keys"]
+        found = [result["files"] for result in index.lookup(wanted)]
+    seconds = time.perf_counter() - start
+
+    return {
+        "seconds": round(seconds, 3),
+        "open_seconds": round(open_seconds, 4) if open_seconds is not None else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "selected": len(selected),
+        "answers": hashlib.blake2b(json.dumps([list(selected), found]).encode()).hexdigest(),
+    }
+
+
+def measure(mode: str, paths: list[Path], index_path: Path, keys: int, lookups: int) -> dict:
+    """Run one follow-up flow in a worker subprocess (see run_worker)."""
+    return run_in_subprocess(__file__, "--worker", mode, "--index", index_path,
+                             "--keys", keys, "--lookups", lookups, "--paths", *paths)
+
+
+def run(files: int, keys: int, lookups: int) -> dict:
+    from services.chunked_processor import ChunkedProcessor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        paths = write_volumes(directory, files, keys)
+        index_path = directory / "index.arrow"
+
+        start = time.perf_counter()
+        indexed = ChunkedProcessor().build_key_index(paths, KEY_COLUMNS, index_path)
+        build_seconds = time.perf_counter() - start
+
+        results = {
+            "files": files,
+            "keys": keys,
+            "lookups": lookups,
+            "file_mb": round(sum(path.stat().st_size for path in paths) / 1024 ** 2, 1),
+            "index_mb": round(index_path.stat().st_size / 1024 ** 2, 1),
+            "indexed_keys": indexed,
+            "build_seconds": round(build_seconds, 2),
+        }
+        for mode in ("rehash", "index"):
+            results[mode] = measure(mode, paths, index_path, keys, lookups)
+    results["same_answers"] = results["rehash"].pop("answers") == results["index"].pop("answers")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--keys", type=int, default=1_000_000, help="Distinct keys across the files")
+    parser.add_argument("--lookups", type=int, default=1000, help="Per-key membership lookups")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--worker", choices=["rehash", "index"], help=argparse.SUPPRESS)
+    parser.add_argument("--index", help=argparse.SUPPRESS)
+    parser.add_argument("--paths", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        paths = [Path(path) for path in args.paths]
+        print(json.dumps(run_worker(args.worker, paths, Path(args.index), args.keys, args.lookups)))
+        return
+
+    results = run(args.files, args.keys, args.lookups)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Key index of {args.files} files over {args.keys} keys ({results['file_mb']} MB CSV): "
+          f"{results['indexed_keys']} keys, {results['index_mb']} MB, built in {results['build_seconds']:.2f}s")
+    print(f"Follow-up: 'in first and last, not second' + {args.lookups} lookups")
+    for mode, label in (("rehash", "re-hash uploads"), ("index", "reopen key index")):
+        entry = results[mode]
+        opened = entry["open_seconds"]
+        print(f"  {label:<17} {entry['seconds']:>7.3f}s  peak RSS {entry['peak_rss_mb']:>8.1f} MB"
+              + (f"  (open {opened * 1000:.1f} ms)" if opened is not None else ""))
+    print(f"  same answers: {results['same_answers']}")
+
+
+if __name__ == "__main__":
+    main()
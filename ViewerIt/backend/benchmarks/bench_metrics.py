@@ -0,0 +1,141 @@
+"""
+Benchmark: overhead of per-stage timing and memory metrics, enabled vs disabled.
+
+Measures the cost of one stage (enter + exit) inside a recorded operation,
+with metrics enabled (clocks, peak RSS reset and read) and disabled (the
+shared no-op), and the end-to-end time of a pairwise comparison flow -
+parse two CSV uploads, compare them, build the report and serialize it -
+recorded the way a /compare/sync request is, with metrics on and off.
+
+Usage:
+    python benchmarks/bench_metrics.py [--rows 100000] [--stages 20000] [--repeat 5] [--json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import response_layer
+import services.file_handler as file_handler
+import services.metrics as metrics
+from services.comparator import DataComparator
+from services.file_handler import FileHandler
+from services.metrics import MetricsRegistry, record, stage
+
+
+def write_uploads(directory: Path, rows: int, seed: int = 42) -> list[str]:
+    """Two overlapping CSV uploads with a few percent of changed values."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows)
+    df = pd.DataFrame({
+        "id": ids,
+        "amount": rng.normal(1000, 250, rows).round(2),
+        "custodian": rng.choice(["Smith", "Jones", "Lee", "Garcia"], rows),
+        "pages": rng.integers(1, 500, rows),
+    })
+    changed = df.sample(frac=0.97, random_state=seed).sort_values("id").copy()
+    edited = rng.random(len(changed)) < 0.03
+    changed.loc[edited, "amount"] += 1
+
+    names = ["base.csv", "changed.csv"]
+    df.to_csv(directory / names[0], index=False)
+    changed.to_csv(directory / names[1], index=False)
+    return names
+
+
+def stage_cost(enabled: bool, stages: int) -> float:
+    """Seconds per stage (enter + exit) within one recorded operation."""
+    metrics.METRICS_ENABLED = enabled
+    with record("bench", MetricsRegistry()):
+        start = time.perf_counter()
+        for _ in range(stages):
+            with stage("parse") as parsed:
+                parsed.add(rows=1)
+        return (time.perf_counter() - start) / stages
+
+
+def compare_flow(session_id: str, names: list[str]) -> int:
+    """The work of a /compare/sync request; returns the response size."""
+    df1 = FileHandler.load_dataframe(session_id, names[0])
+    df2 = FileHandler.load_dataframe(session_id, names[1])
+    result = DataComparator(df1, df2, names[0], names[1]).compare(join_columns=["id"])
+    return len(response_layer.FastJSONResponse(result).body)
+
+
+def flow_times(session_id: str, names: list[str], repeat: int) -> tuple[dict, dict]:
+    """
+    Fastest of repeat recorded runs of the flow with metrics off and on
+    (alternating, so drift affects both), and the summary of an enabled run.
+    """
+    best, summary = {False: float("inf"), True: float("inf")}, None
+    for _ in range(repeat):
+        for enabled in (False, True):
+            metrics.METRICS_ENABLED = enabled
+            start = time.perf_counter()
+            with record("POST /compare/sync", MetricsRegistry()) as recorder:
+                compare_flow(session_id, names)
+            best[enabled] = min(best[enabled], time.perf_counter() - start)
+            if enabled:
+                summary = recorder.summary()
+    return best, summary
+
+
+def run(rows: int, stages: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        file_handler.UPLOADS_DIR = Path(tmp)
+        session_dir = Path(tmp) / "bench"
+        session_dir.mkdir()
+        names = write_uploads(session_dir, rows)
+
+        # Warm imports and caches before timing
+        compare_flow("bench", names)
+
+        results = {
+            "rows": rows,
+            "stage_us_enabled": round(stage_cost(True, stages) * 1e6, 2),
+            "stage_us_disabled": round(stage_cost(False, stages) * 1e6, 3),
+        }
+        best, summary = flow_times("bench", names, repeat)
+        disabled, enabled = best[False], best[True]
+
+    results["flow_seconds_disabled"] = round(disabled, 3)
+    results["flow_seconds_enabled"] = round(enabled, 3)
+    results["flow_overhead_pct"] = round((enabled - disabled) / disabled * 100, 2)
+    results["stages"] = summary["stages"]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per upload")
+    parser.add_argument("--stages", type=int, default=20_000, help="Stages timed for the per-stage cost")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of the comparison flow per setting (fastest kept)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.stages, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Per stage: {results['stage_us_enabled']:.2f} us enabled, "
+          f"{results['stage_us_disabled']:.3f} us disabled")
+    print(f"Comparison flow ({args.rows} rows per upload, best of {args.repeat}): "
+          f"{results['flow_seconds_disabled']:.3f}s disabled, {results['flow_seconds_enabled']:.3f}s enabled "
+          f"({results['flow_overhead_pct']:+.2f}%)")
+    for entry in results["stages"]:
+        print(f"  {entry['stage']:<20} {entry['wall_seconds']:>8.4f}s wall  {entry['cpu_seconds']:>8.4f}s CPU"
+              f"  peak {entry['peak_rss_mb']:>7.1f} MB  rows {entry['rows']:>8}  bytes {entry['bytes']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: N-way key overlap (Venn / UpSet data), per-key file sets vs membership bitmasks.
+
+Draws --files overlapping volumes from a universe of keys (each key lands in
+each file with its own probability) and runs each method in its own
+subprocess, reporting wall time and peak resident memory. The former path
+builds a set of file names per key and counts sorted name tuples in a Python
+loop; the bitmask path factorizes the keys once, ORs one bit per file into a
+uint64 mask per key, and counts masks with np.unique. The aggregation step
+alone (mask -> count table plus the top-K UpSet rows) is then timed over
+--aggregate-keys masks. Intersection counts must be identical.
+
+Usage:
+    python benchmarks/bench_overlap.py [--files 20] [--keys 1000000] [--aggregate-keys 10000000] [--json]
+"""
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import control_numbers, peak_rss_mb, run_in_subprocess
+
+
+def random_masks(keys: int, files: int, seed: int = 42, batch: int = 1_000_000) -> np.ndarray:
+    """Membership mask per key; file i holds a key with probability 0.3-0.95."""
+    rng = np.random.default_rng(seed)
+    presence = rng.uniform(0.3, 0.95, files)
+    weights = np.uint64(1) << np.arange(files, dtype=np.uint64)
+    masks = np.empty(keys, dtype=np.uint64)
+    for start in range(0, keys, batch):
+        bits = rng.random((min(batch, keys - start), files)) < presence
+        masks[start:start + len(bits)] = (bits * weights).sum(axis=1, dtype=np.uint64)
+    return masks
+
+
+def key_lists(keys: int, files: int) -> list[np.ndarray]:
+    """Each file's keys (control numbers as text), from random_masks."""
+    masks = random_masks(keys, files)
+    universe = control_numbers(0, keys).astype(object)
+    return [universe[(masks >> np.uint64(idx)) & np.uint64(1) == 1] for idx in range(files)]
+
+
+def legacy_counts(file_keys: dict[str, np.ndarray]) -> dict[tuple, int]:
+    """The former path: a set of file names per key, then a loop over the keys."""
+    key_to_files = defaultdict(set)
+    for name, keys in file_keys.items():
+        for key in keys:
+            key_to_files[key].add(name)
+    combination_counts = defaultdict(int)
+    for files in key_to_files.values():
+        combination_counts[tuple(sorted(files))] += 1
+    return combination_counts
+
+
+def run_worker(mode: str, files: int, keys: int) -> dict:
+    """Run one method in this process and report time, peak RSS and counts."""
+    from services.overlap import membership_masks, count_masks, upset_data
+
+    names = [f"volume{idx:02d}.csv" for idx in range(files)]
+    if mode == "aggregate":
+        masks = random_masks(keys, files)
+        baseline = peak_rss_mb()
+        start = time.perf_counter()
+        upset = upset_data(count_masks(masks), names)
+        seconds = time.perf_counter() - start
+        return {"seconds": round(seconds, 3), "peak_rss_mb": round(peak_rss_mb(), 1),
+                "input_rss_mb": round(baseline, 1), "intersection_count": upset["intersection_count"]}
+
+    file_keys = dict(zip(names, key_lists(keys, files)))
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "legacy":
+        counts = {sum(1 << names.index(name) for name in combo): count
+                  for combo, count in legacy_counts(file_keys).items()}
+    else:
+        _, masks = membership_masks(list(file_keys.values()))
+        counts = count_masks(masks)
+        upset_data(counts, names)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": round(seconds, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "input_rss_mb": round(baseline, 1),
+        "counts": {str(mask): count for mask, count in counts.items()},
+    }
+
+
+def measure(mode: str, files: int, keys: int) -> dict:
+    """Run one method in a worker subprocess (see run_worker)."""
+    return run_in_subprocess(__file__, "--worker", mode, "--files", files, "--keys", keys)
+
+
+def run(files: int, keys: int, aggregate_keys: int) -> dict:
+    results = {"files": files, "keys": keys, "aggregate_keys": aggregate_keys}
+    for mode in ("legacy", "bitmask"):
+        results[mode] = measure(mode, files, keys)
+    results["same_counts"] = results["legacy"].pop("counts") == results["bitmask"].pop("counts")
+    results["aggregate"] = measure("aggregate", files, aggregate_keys)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--keys", type=int, default=1_000_000, help="Distinct keys across the files")
+    parser.add_argument("--aggregate-keys", type=int, default=10_000_000, help="Masks counted in the aggregation step")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--worker", choices=["legacy", "bitmask", "aggregate"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.files, args.keys)))
+        return
+
+    results = run(args.files, args.keys, args.aggregate_keys)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Key overlap of {args.files} files over {args.keys} distinct keys")
+    for mode, label in (("legacy", "per-key file sets"), ("bitmask", "membership masks")):
+        entry = results[mode]
+        print(f"  {label:<18} {entry['seconds']:>8.2f}s  peak RSS {entry['peak_rss_mb']:>8.1f} MB  "
+              f"(keys loaded {entry['input_rss_mb']:.1f} MB)")
+    print(f"  same intersection counts: {results['same_counts']}")
+    entry = results["aggregate"]
+    print(f"Aggregating {args.aggregate_keys} masks: {entry['seconds']:.3f}s  "
+          f"peak RSS {entry['peak_rss_mb']:.1f} MB (masks {entry['input_rss_mb']:.1f} MB)  "
+          f"intersections: {entry['intersection_count']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: chunked statistics and key extraction, serial vs byte ranges in the worker pool.
+
+Writes a synthetic load file (with quoted multi-line fields), splits it at
+record boundaries and compares one serial chunked pass with byte ranges
+parsed and processed in a pool of --workers processes. Splitting reads the
+file once to count quotes, which is also timed. Speedup should approach the
+worker count on a machine with that many cores; on fewer cores it cannot.
+
+Usage:
+    python benchmarks/bench_parallel_chunks.py [--rows 2000000] [--workers 8] [--range-mb 16] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import control_numbers, timed, write_load_file
+from services.chunked_processor import ChunkedProcessor
+from services.csv_ranges import split_csv_ranges
+from services.worker_pool import WorkerPool
+
+
+def load_file_batch(rng: np.random.Generator, start: int, n: int) -> pd.DataFrame:
+    """Rows start .. start + n - 1 of the synthetic load file."""
+    return pd.DataFrame({
+        "control_number": control_numbers(start, n),
+        "custodian": rng.choice(["Smith, J", "Jones, K", "Lee, M", None], n),
+        "email": np.char.add(np.char.add("user", rng.integers(0, 50_000, n).astype(str)), "@example.com"),
+        "note": rng.choice(["", "Privileged", "Line one\nline two", 'He said "no"'], n),
+        "amount": rng.normal(100, 25, n).round(2),
+        "pages": rng.integers(1, 500, n),
+    })
+
+
+def run(rows: int, workers: int, range_mb: float) -> dict:
+    range_bytes = int(range_mb * 1024 * 1024)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "load_file.csv"
+        write_load_file(path, rows, load_file_batch)
+
+        pool = WorkerPool(max_workers=workers, memory_budget_mb=1 << 20)
+        try:
+            # Start the workers outside the timing; the shared pool stays up between requests
+            warm = ChunkedProcessor(range_bytes=path.stat().st_size // (workers + 1) + 1, pool=pool)
+            warm.map_ranges(path, list)
+
+            serial = ChunkedProcessor(pool=WorkerPool(max_workers=1))
+            parallel = ChunkedProcessor(range_bytes=range_bytes, pool=pool)
+            split_seconds, (_, ranges) = timed(lambda: split_csv_ranges(path, range_bytes))
+
+            results = {
+                "rows": rows,
+                "file_mb": round(path.stat().st_size / 1024 ** 2, 1),
+                "workers": workers,
+                "cpu_count": os.cpu_count(),
+                "ranges": len(ranges),
+                "split_seconds": round(split_seconds, 3),
+            }
+            for name, task in (
+                ("statistics", lambda processor: processor.get_chunked_statistics(path)),
+                ("unique_keys", lambda processor: processor.find_unique_keys_chunked(path, ["control_number"])),
+            ):
+                serial_seconds, expected = timed(lambda: task(serial))
+                parallel_seconds, actual = timed(lambda: task(parallel))
+                results[name] = {
+                    "serial_seconds": round(serial_seconds, 2),
+                    "parallel_seconds": round(parallel_seconds, 2),
+                    "speedup": round(serial_seconds / parallel_seconds, 2),
+                    "identical": expected == actual,
+                }
+        finally:
+            pool.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--range-mb", type=float, default=16)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.workers, args.range_mb)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Chunked processing: {args.rows} rows ({results['file_mb']} MB CSV), "
+          f"{results['ranges']} byte ranges, {args.workers} workers on {results['cpu_count']} CPUs")
+    print(f"  split at record boundaries {results['split_seconds']:.3f}s")
+    for name in ("statistics", "unique_keys"):
+        entry = results[name]
+        print(f"  {name:<12} serial {entry['serial_seconds']:>7.2f}s  parallel {entry['parallel_seconds']:>7.2f}s  "
+              f"speedup {entry['speedup']:.2f}x  identical: {entry['identical']}")
+
+
+if __name__ == "__main__":
+    main()
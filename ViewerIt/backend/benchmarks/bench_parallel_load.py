@@ -0,0 +1,118 @@
+"""
+Benchmark: loading several uploads serially, in threads, and in worker processes.
+
+Writes --files upload files and loads them four ways: one after another,
+in a thread pool (the previous ParallelProcessor), in worker processes
+returning pickled frames, and in worker processes handing frames back as
+Arrow IPC files in shared memory (ParallelProcessor.load_session_files).
+Workers are started before timing, as the shared pool stays up between
+requests. Process pools need as many cores as workers to pay off.
+
+Usage:
+    python benchmarks/bench_parallel_load.py [--files 4] [--rows 500000] [--workers 4] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import timed
+from services.chunked_processor import ParallelProcessor
+from services.file_handler import FileHandler, UPLOADS_DIR
+from services.worker_pool import WorkerPool, PoolJob
+
+
+def write_upload(path: Path, rows: int, seed: int):
+    """A load-file-like CSV with text, numeric and date columns."""
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "control_number": np.char.add("CTRL", np.arange(rows).astype(str)),
+        "custodian": rng.choice(["Smith, J", "Jones, K", "Lee, M", None], rows),
+        "email": np.char.add(np.char.add("user", rng.integers(0, 50_000, rows).astype(str)), "@example.com"),
+        "amount": rng.normal(100, 25, rows).round(2),
+        "pages": rng.integers(1, 500, rows),
+        "start_date": rng.choice(["2024-01-01", "2024-02-15", "2023-12-31"], rows),
+    }).to_csv(path, index=False)
+
+
+def run(files: int, rows: int, workers: int) -> dict:
+    session_id = f"bench-{uuid.uuid4()}"
+    session_dir = UPLOADS_DIR / session_id
+    session_dir.mkdir(parents=True)
+    pool = WorkerPool(max_workers=workers, memory_budget_mb=1 << 20)
+    try:
+        names = [f"volume_{i:02d}.csv" for i in range(files)]
+        for i, name in enumerate(names):
+            write_upload(session_dir / name, rows, seed=i)
+        # Start the workers outside the timing
+        list(pool.run({f"warmup{i}": PoolJob(os.getpid) for i in range(workers)}))
+        processor = ParallelProcessor(pool)
+
+        def serial():
+            return {name: FileHandler.load_dataframe(session_id, name) for name in names}
+
+        def threads():
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return dict(zip(names, executor.map(lambda name: FileHandler.load_dataframe(session_id, name), names)))
+
+        def pickled():
+            jobs = {name: PoolJob(FileHandler.load_dataframe, (session_id, name)) for name in names}
+            return dict(pool.run(jobs))
+
+        def arrow():
+            return processor.load_session_files(session_id, names)
+
+        results = {
+            "files": files,
+            "rows_per_file": rows,
+            "file_mb": round(sum((session_dir / name).stat().st_size for name in names) / 1024 ** 2, 1),
+            "workers": workers,
+            "cpu_count": os.cpu_count(),
+        }
+        expected = None
+        for mode, fn in (("serial", serial), ("threads", threads), ("process_pickle", pickled),
+                         ("process_arrow", arrow)):
+            seconds, frames = timed(fn)
+            expected = expected or frames
+            results[mode] = {
+                "seconds": round(seconds, 2),
+                "identical": all(frames[name].equals(expected[name]) for name in names),
+            }
+    finally:
+        pool.shutdown()
+        FileHandler.cleanup_session(session_id)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.files, args.rows, args.workers)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Loading {args.files} files x {args.rows} rows ({results['file_mb']} MB CSV), "
+          f"{args.workers} workers on {results['cpu_count']} CPUs")
+    for mode in ("serial", "threads", "process_pickle", "process_arrow"):
+        entry = results[mode]
+        print(f"  {mode:<15} {entry['seconds']:>7.2f}s  identical: {entry['identical']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: multi-dataset quality checks, sequential vs the shared worker pool.
+
+Writes several upload files of different sizes and compares the previous
+flow (load every file, then check each in turn, all in one process) with
+MultiDatasetQualityChecker running one load-and-check job per file in the
+worker pool. With enough cores the pool should finish in about the time of
+the largest file alone, which is also reported.
+
+Usage:
+    python benchmarks/bench_parallel_quality.py [--files 10] [--rows 200000] [--workers 4] [--json]
+"""
+import argparse
+import json
+import sys
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import timed
+from services.file_handler import FileHandler, UPLOADS_DIR
+from services.quality_checker import MultiDatasetQualityChecker
+from services.quality_jobs import check_file_quality, quality_job
+from services.worker_pool import WorkerPool
+
+
+def write_upload(path: Path, rows: int, seed: int):
+    """A load-file-like CSV with text, numeric and date columns."""
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "control_number": np.char.add("CTRL", np.arange(rows).astype(str)),
+        "custodian": rng.choice(["Smith, J", "Jones, K", "Lee, M", None], rows),
+        "email": np.char.add(np.char.add("user", rng.integers(0, 50_000, rows).astype(str)), "@example.com"),
+        "amount": rng.normal(100, 25, rows).round(2),
+        "tax": rng.normal(10, 2, rows).round(2),
+        "pages": rng.integers(1, 500, rows),
+        "start_date": rng.choice(["2024-01-01", "2024-02-15", "2023-12-31"], rows),
+        "end_date": rng.choice(["2024-03-01", "2024-01-15"], rows),
+    }).to_csv(path, index=False)
+
+
+def run(files: int, rows: int, workers: int) -> dict:
+    session_id = f"bench-{uuid.uuid4()}"
+    session_dir = UPLOADS_DIR / session_id
+    session_dir.mkdir(parents=True)
+    try:
+        # One file at full size, the rest smaller (as in a typical production set)
+        sizes = [rows] + [max(1000, rows // (i + 2)) for i in range(files - 1)]
+        names = []
+        for i, size in enumerate(sizes):
+            name = f"volume_{i:02d}.csv"
+            write_upload(session_dir / name, size, seed=i)
+            names.append(name)
+
+        def sequential():
+            frames = {name: FileHandler.load_dataframe(session_id, name) for name in names}
+            return MultiDatasetQualityChecker(dataframes=frames).check_all()
+
+        pool = WorkerPool(max_workers=workers)
+        # Start the workers outside the timing; the shared pool stays up between requests
+        list(pool.run({f"warmup{i}": quality_job(session_id, names[-1]) for i in range(workers)}))
+
+        def pooled():
+            jobs = {name: quality_job(session_id, name) for name in names}
+            return MultiDatasetQualityChecker(jobs=jobs, pool=pool).check_all()
+
+        sequential_seconds, sequential_result = timed(sequential)
+        pooled_seconds, pooled_result = timed(pooled)
+        largest_seconds, _ = timed(lambda: check_file_quality(session_id, names[0]))
+        pool.shutdown()
+    finally:
+        FileHandler.cleanup_session(session_id)
+
+    return {
+        "files": files,
+        "rows": sum(sizes),
+        "largest_file_rows": rows,
+        "workers": workers,
+        "sequential_seconds": round(sequential_seconds, 2),
+        "pool_seconds": round(pooled_seconds, 2),
+        "largest_file_seconds": round(largest_seconds, 2),
+        "speedup": round(sequential_seconds / pooled_seconds, 2),
+        "same_scores": sequential_result["comparison"]["scores"] == pooled_result["comparison"]["scores"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows in the largest file")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.files, args.rows, args.workers)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Multi-dataset quality check: {args.files} files, {results['rows']} rows, {args.workers} workers")
+    print(f"  sequential load + check:  {results['sequential_seconds']:>8.2f}s")
+    print(f"  worker pool:              {results['pool_seconds']:>8.2f}s  (speedup {results['speedup']}x)")
+    print(f"  largest file alone:       {results['largest_file_seconds']:>8.2f}s")
+    print(f"  identical scores: {results['same_scores']}")
+
+
+if __name__ == "__main__":
+    main()
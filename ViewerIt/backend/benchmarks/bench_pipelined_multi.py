@@ -0,0 +1,145 @@
+"""
+Benchmark: multi-file comparison, load-everything-then-compare vs pipelined per-file registration.
+
+Writes --files upload files carrying a wide extracted-text column that the
+comparison ignores, then runs each flow in its own subprocess, reporting wall
+time and peak resident memory. The former flow loads every full frame
+(ParallelProcessor.load_session_files) and only then compares. The pipelined
+flow loads each file in a worker reduced to its composite key and compared
+columns (load_keyed_frame) and registers its keys and records as soon as it
+arrives (MultiFileComparator.compare_stream), while other files still load.
+Summaries must be identical.
+
+Usage:
+    python benchmarks/bench_pipelined_multi.py [--files 6] [--rows 40000] [--workers 2] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import peak_rss_mb, run_in_subprocess
+from services.file_handler import FileHandler, UPLOADS_DIR
+
+JOIN_COLUMNS = ["control_number"]
+IGNORE_COLUMNS = ["extracted_text"]
+
+
+def write_upload(path: Path, rows: int, seed: int):
+    """A production volume: overlapping control numbers, metadata and long text."""
+    rng = np.random.default_rng(seed)
+    ids = np.sort(rng.choice(int(rows * 1.5), rows, replace=False))
+    words = np.array([f"term{i}" for i in range(5000)])
+    pd.DataFrame({
+        "control_number": np.char.add("CTRL", ids.astype(str)),
+        "custodian": rng.choice(["Smith, J", "Jones, K", "Lee, M"], rows),
+        "amount": rng.normal(100, 25, rows).round(2),
+        "pages": rng.integers(1, 500, rows),
+        "extracted_text": [" ".join(row) for row in rng.choice(words, (rows, 150))],
+    }).to_csv(path, index=False)
+
+
+def run_worker(mode: str, session_id: str, names: list[str], workers: int) -> dict:
+    """Run one flow in this process and report time and peak RSS."""
+    from services.chunked_processor import ParallelProcessor
+    from services.multi_comparator import MultiFileComparator, load_keyed_frame
+    from services.worker_pool import WorkerPool, PoolJob
+
+    pool = WorkerPool(max_workers=workers, memory_budget_mb=1 << 20)
+    try:
+        # Start the workers outside the timing
+        list(pool.run({f"warmup{i}": PoolJob(os.getpid) for i in range(workers)}))
+        processor = ParallelProcessor(pool)
+        first_registered = []
+        start = time.perf_counter()
+        if mode == "load_all":
+            frames = processor.load_session_files(session_id, names)
+            result = MultiFileComparator(frames).compare(JOIN_COLUMNS, IGNORE_COLUMNS)
+        else:
+            frames = processor.iter_session_files(session_id, names, load_keyed_frame, JOIN_COLUMNS, IGNORE_COLUMNS)
+            _, result = MultiFileComparator.compare_stream(
+                names, frames, JOIN_COLUMNS, IGNORE_COLUMNS,
+                on_file=lambda name, rows: first_registered.append(time.perf_counter() - start),
+            )
+        seconds = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+    return {
+        "seconds": round(seconds, 2),
+        "first_file_registered_seconds": round(first_registered[0], 2) if first_registered else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "summary": {k: v for k, v in result["summary"].items() if k != "rust_accelerated"},
+    }
+
+
+def measure(mode: str, session_id: str, names: list[str], workers: int) -> dict:
+    """Run one flow in a worker subprocess (see run_worker)."""
+    return run_in_subprocess(__file__, "--worker", mode, "--session", session_id,
+                             "--names", *names, "--workers", workers)
+
+
+def run(files: int, rows: int, workers: int) -> dict:
+    session_id = f"bench-{uuid.uuid4()}"
+    session_dir = UPLOADS_DIR / session_id
+    session_dir.mkdir(parents=True)
+    try:
+        names = [f"volume_{i:02d}.csv" for i in range(files)]
+        for i, name in enumerate(names):
+            write_upload(session_dir / name, rows, seed=i)
+        results = {
+            "files": files,
+            "rows_per_file": rows,
+            "file_mb": round(sum((session_dir / name).stat().st_size for name in names) / 1024 ** 2, 1),
+            "workers": workers,
+            "cpu_count": os.cpu_count(),
+        }
+        for mode in ("load_all", "pipelined"):
+            results[mode] = measure(mode, session_id, names, workers)
+    finally:
+        FileHandler.cleanup_session(session_id)
+    results["same_summary"] = results["load_all"].pop("summary") == results["pipelined"].pop("summary")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=6)
+    parser.add_argument("--rows", type=int, default=40_000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--worker", choices=["load_all", "pipelined"], help=argparse.SUPPRESS)
+    parser.add_argument("--session", help=argparse.SUPPRESS)
+    parser.add_argument("--names", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.session, args.names, args.workers)))
+        return
+
+    results = run(args.files, args.rows, args.workers)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Multi-file comparison of {args.files} files x {args.rows} rows ({results['file_mb']} MB CSV), "
+          f"{args.workers} workers on {results['cpu_count']} CPUs")
+    for mode, label in (("load_all", "load all, then compare"), ("pipelined", "pipelined")):
+        entry = results[mode]
+        first = entry["first_file_registered_seconds"]
+        print(f"  {label:<23} {entry['seconds']:>7.2f}s  peak RSS {entry['peak_rss_mb']:>8.1f} MB"
+              + (f"  first file registered after {first:.2f}s" if first is not None else ""))
+    print(f"  same summary: {results['same_summary']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: tail and random sampling of a large CSV, former chunked passes vs seek/skip-based.
+
+Writes a synthetic load file and times the previous implementations (tail:
+count every chunk, then re-read skipping rows; random: iterrows with a
+random index per row) against tail_sample (blocks read backwards from the
+end, header re-attached) and reservoir_sample (quote-aware record scan,
+Algorithm L skips, only the sampled records parsed).
+
+Usage:
+    python benchmarks/bench_sampling.py [--rows 1000000] [--sample-size 1000] [--json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import control_numbers, timed, write_load_file
+from services.chunked_processor import ChunkedProcessor
+
+
+def load_file_batch(rng: np.random.Generator, start: int, n: int) -> pd.DataFrame:
+    """Rows start .. start + n - 1 of the synthetic load file."""
+    return pd.DataFrame({
+        "control_number": control_numbers(start, n),
+        "custodian": rng.choice(["Smith, J", "Jones, K", "Lee, M"], n),
+        "note": rng.choice(["", "Privileged", "Line one\nline two", 'He said "no"'], n),
+        "amount": rng.normal(100, 25, n).round(2),
+    })
+
+
+def legacy_tail(processor: ChunkedProcessor, path: Path, sample_size: int) -> pd.DataFrame:
+    """The former tail: count rows chunk by chunk, then re-read skipping rows."""
+    row_count = sum(len(chunk) for chunk in processor.read_csv_chunked(path))
+    return pd.read_csv(path, skiprows=range(1, row_count - sample_size + 1))
+
+
+def legacy_random(processor: ChunkedProcessor, path: Path, sample_size: int) -> pd.DataFrame:
+    """The former random sample: per-row reservoir updates through iterrows."""
+    sample, total_seen = [], 0
+    for chunk in processor.read_csv_chunked(path):
+        if total_seen == 0:
+            sample = chunk.head(sample_size).to_dict('records')
+        else:
+            for _, row in chunk.iterrows():
+                total_seen += 1
+                j = np.random.randint(0, total_seen)
+                if j < sample_size:
+                    sample[j] = row.to_dict()
+        total_seen += len(chunk)
+    return pd.DataFrame(sample)
+
+
+def run(rows: int, sample_size: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "load_file.csv"
+        write_load_file(path, rows, load_file_batch)
+        processor = ChunkedProcessor()
+
+        results = {"rows": rows, "file_mb": round(path.stat().st_size / 1024 ** 2, 1), "sample_size": sample_size}
+        results["legacy_tail_seconds"], expected = timed(lambda: legacy_tail(processor, path, sample_size), digits=2)
+        results["tail_seconds"], tail = timed(lambda: processor.tail_sample(path, sample_size), digits=2)
+        results["same_tail"] = tail.equals(expected)
+        results["legacy_random_seconds"], _ = timed(lambda: legacy_random(processor, path, sample_size), digits=2)
+        results["random_seconds"], (sample, total) = timed(
+            lambda: processor.reservoir_sample(path, sample_size, seed=1), digits=2)
+        results["random_rows_counted"] = total
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sample-size", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.sample_size)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Sampling {args.sample_size} of {args.rows} rows ({results['file_mb']} MB CSV)")
+    print(f"  tail    chunked pass {results['legacy_tail_seconds']:>8.2f}s  "
+          f"seek from end {results['tail_seconds']:>8.2f}s  same rows: {results['same_tail']}")
+    print(f"  random  iterrows     {results['legacy_random_seconds']:>8.2f}s  "
+          f"Algorithm L   {results['random_seconds']:>8.2f}s  rows counted: {results['random_rows_counted']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: /schema/analyze scaling on wide synthetic load files.
+
+Schema analysis should grow linearly with column count: each file's schema
+is extracted once and reused by the type, format, mapping and issue
+analyses. The report shows time per column for each width; a roughly flat
+per-column time means linear scaling.
+
+Usage:
+    python benchmarks/bench_schema.py [--widths 100 250 500 1000] [--rows 2000] [--json]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.profiler import profile_cache
+from services.schema_analyzer import SchemaAnalyzer
+
+
+def make_wide_dataframes(columns: int, rows: int, files: int = 2,
+                         seed: int = 42) -> dict[str, pd.DataFrame]:
+    """Wide load files mixing numeric, text, code and date columns."""
+    rng = np.random.default_rng(seed)
+    dataframes = {}
+    for i in range(files):
+        data = {}
+        for c in range(columns):
+            kind = c % 4
+            if kind == 0:
+                data[f"amount_{c}"] = rng.normal(100, 25, rows).round(2)
+            elif kind == 1:
+                data[f"custodian_{c}"] = rng.choice(["Smith", "Jones", "Lee", None], rows)
+            elif kind == 2:
+                data[f"code_{c}"] = np.char.add("DOC", rng.integers(0, 10**6, rows).astype(str).astype(object))
+            else:
+                data[f"date_{c}"] = rng.choice(["2024-01-01", "2024-02-15", "2023-12-31"], rows)
+        dataframes[f"volume_{i + 1}.csv"] = pd.DataFrame(data)
+    return dataframes
+
+
+def time_analyze(dataframes: dict[str, pd.DataFrame], repeat: int) -> float:
+    """Best wall time of SchemaAnalyzer.analyze, profiling from scratch each run."""
+    best = float("inf")
+    for _ in range(repeat):
+        profile_cache.clear()
+        start = time.perf_counter()
+        SchemaAnalyzer(dataframes).analyze()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(widths: list[int], rows: int, repeat: int) -> dict:
+    results = []
+    for width in widths:
+        seconds = time_analyze(make_wide_dataframes(width, rows), repeat)
+        results.append({
+            "columns": width,
+            "seconds": round(seconds, 4),
+            "ms_per_column": round(seconds / width * 1000, 3),
+        })
+
+    # Ratio of per-column cost at the widest vs narrowest width (~1 = linear)
+    scaling = results[-1]["ms_per_column"] / results[0]["ms_per_column"] if results else None
+    return {
+        "rows": rows,
+        "files": 2,
+        "widths": results,
+        "per_column_cost_ratio": round(scaling, 2) if scaling else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--widths", type=int, nargs="+", default=[100, 250, 500, 1000])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(sorted(args.widths), args.rows, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"SchemaAnalyzer.analyze: 2 files x {args.rows} rows")
+    for entry in results["widths"]:
+        print(f"  {entry['columns']:>6} columns  {entry['seconds']:>8.4f}s  "
+              f"{entry['ms_per_column']:>7.3f} ms/column")
+    print(f"  per-column cost ratio (widest/narrowest): {results['per_column_cost_ratio']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: JSON encode time and bytes-on-wire for /compare/multi/sync payloads.
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) with the
+orjson-based response layer, and reports gzip/zstd compressed sizes.
+
+Usage:
+    python benchmarks/bench_serialization.py [--rows 20000] [--files 3] [--json]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import response_layer
+from services.multi_comparator import MultiFileComparator
+
+
+def make_dataframes(rows: int, files: int, seed: int = 42) -> dict[str, pd.DataFrame]:
+    """Overlapping synthetic load files with numeric, text, date and null values."""
+    rng = np.random.default_rng(seed)
+    dataframes = {}
+    for i in range(files):
+        ids = rng.choice(int(rows * 1.3), size=rows, replace=False)
+        amounts = rng.normal(1000, 250, rows).round(2)
+        amounts[rng.random(rows) < 0.05] = np.nan
+        dataframes[f"volume_{i + 1}.csv"] = pd.DataFrame({
+            "control_number": ids,
+            "custodian": rng.choice(["Smith", "Jones", "Lee", "Garcia", None], rows),
+            "amount": amounts,
+            "page_count": rng.integers(1, 500, rows),
+            "date_sent": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1500, rows), unit="D"),
+            "doc_type": rng.choice(["Email", "Attachment", "Loose File"], rows),
+        })
+    return dataframes
+
+
+def build_payload(dataframes: dict[str, pd.DataFrame]) -> dict:
+    """Produce the same payload as /compare/multi/sync."""
+    comparator = MultiFileComparator(dataframes)
+    result = comparator.compare(join_columns=["control_number"])
+    result["reconciliation_report"] = comparator.get_reconciliation_report()
+    return result
+
+
+def best_of(fn, repeat: int) -> tuple[float, bytes]:
+    """Run fn repeat times and return the fastest duration and its output."""
+    best, output = float("inf"), b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def encode_default(payload: dict) -> bytes:
+    # FastAPI default path. allow_nan=True so the baseline completes; the
+    # stock JSONResponse uses allow_nan=False and rejects NaN outright.
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=True, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def run(rows: int, files: int, repeat: int) -> dict:
+    payload = build_payload(make_dataframes(rows, files))
+
+    default_time, default_body = best_of(lambda: encode_default(payload), repeat)
+    fast_time, fast_body = best_of(lambda: response_layer.dumps(payload), repeat)
+
+    results = {
+        "rows_per_file": rows,
+        "files": files,
+        "orjson": response_layer.ORJSON_AVAILABLE,
+        "default": {"encode_seconds": round(default_time, 4), "bytes": len(default_body)},
+        "fast": {"encode_seconds": round(fast_time, 4), "bytes": len(fast_body)},
+        "encode_speedup": round(default_time / fast_time, 1) if fast_time > 0 else None,
+        "gzip_bytes": len(response_layer.compress(fast_body, "gzip")),
+    }
+    if response_layer.ZSTD_AVAILABLE:
+        start = time.perf_counter()
+        results["zstd_bytes"] = len(response_layer.compress(fast_body, "zstd"))
+        results["zstd_seconds"] = round(time.perf_counter() - start, 4)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--files", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.files, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"/compare/multi/sync payload: {args.files} files x {args.rows} rows")
+    print(f"  default  encode {results['default']['encode_seconds']:>8.4f}s  "
+          f"{results['default']['bytes']:>12,} bytes")
+    print(f"  orjson   encode {results['fast']['encode_seconds']:>8.4f}s  "
+          f"{results['fast']['bytes']:>12,} bytes  ({results['encode_speedup']}x faster)")
+    print(f"  gzip     {results['gzip_bytes']:>30,} bytes on wire")
+    if "zstd_bytes" in results:
+        print(f"  zstd     {results['zstd_bytes']:>30,} bytes on wire")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: chunked column profiles, exact value counts vs mergeable sketches.
+
+Writes a synthetic load file with high-cardinality columns and profiles it in
+chunks in its own subprocess per mode, reporting wall time and peak resident
+memory. The exact profiler keeps every distinct value of every column; the
+sketched profiler switches columns past --max-tracked distinct values to
+HyperLogLog, KLL and Misra-Gries sketches of fixed size. Sketch estimates are
+checked against the exact profile: distinct-count relative error, quantile
+rank error, and top-value count error, next to their documented bounds.
+
+Usage:
+    python benchmarks/bench_sketches.py [--rows 2000000] [--chunk-size 50000] [--max-tracked 10000] [--json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import control_numbers, peak_rss_mb, run_in_subprocess, write_load_file
+
+_COLUMNS = ("control_number", "email", "amount", "pages")
+
+
+def load_file_batch(rng: np.random.Generator, start: int, n: int) -> pd.DataFrame:
+    """Rows of the load file: unique control numbers, Zipf-skewed emails."""
+    return pd.DataFrame({
+        "control_number": control_numbers(start, n),
+        "email": np.char.add(np.char.add("user", rng.zipf(1.3, n).astype(str)), "@example.com"),
+        "amount": rng.lognormal(4, 1, n).round(2),
+        "pages": rng.integers(1, 500, n),
+    })
+
+
+def run_worker(mode: str, path: Path, chunk_size: int, max_tracked: int) -> dict:
+    """Profile the file in this process and report time, peak RSS and profiles."""
+    from services.chunked_processor import ChunkedProcessor
+    from services.profiler import ChunkedProfiler
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    profiler = ChunkedProfiler(max_tracked_values=max_tracked if mode == "sketch" else 10 ** 12)
+    for chunk in ChunkedProcessor(chunk_size).read_csv_chunked(path):
+        profiler.update(chunk)
+    profiles = profiler.result()
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": round(seconds, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "imports_rss_mb": round(baseline, 1),
+        "profiles": {col: {key: profiles[col].get(key) for key in (
+            "unique_count", "unique_count_exact", "unique_count_error", "q1", "median", "q3",
+            "quantile_rank_error", "top_values_max_error")} | {
+            "top_values": {str(k): v for k, v in profiles[col]["top_values"].items()}}
+            for col in _COLUMNS},
+    }
+
+
+def sketch_errors(path: Path, exact: dict, sketch: dict) -> dict:
+    """Observed sketch errors per column, next to the reported bounds."""
+    errors = {}
+    for col in _COLUMNS:
+        approx, truth = sketch[col], exact[col]
+        if approx["unique_count_exact"]:
+            continue
+        entry = {
+            "unique_relative_error": round(abs(approx["unique_count"] / truth["unique_count"] - 1), 4),
+            "unique_error_bound": approx["unique_count_error"],
+            "top_count_error": max((truth["top_values"][value] - count
+                                    for value, count in approx["top_values"].items()
+                                    if value in truth["top_values"]), default=0),
+            "top_count_error_bound": approx["top_values_max_error"],
+        }
+        if approx["quantile_rank_error"] is not None:
+            values = np.sort(pd.read_csv(path, usecols=[col])[col].to_numpy())
+            entry["quantile_rank_error"] = round(max(
+                abs(np.searchsorted(values, approx[field]) / len(values) - q)
+                for field, q in (("q1", 0.25), ("median", 0.5), ("q3", 0.75))), 4)
+            entry["quantile_rank_error_bound"] = approx["quantile_rank_error"]
+        errors[col] = entry
+    return errors
+
+
+def run(rows: int, chunk_size: int, max_tracked: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "load_file.csv"
+        write_load_file(path, rows, load_file_batch)
+        results = {
+            "rows": rows,
+            "file_mb": round(path.stat().st_size / 1024 ** 2, 1),
+            "chunk_size": chunk_size,
+            "max_tracked": max_tracked,
+        }
+        for mode in ("exact", "sketch"):
+            results[mode] = run_in_subprocess(__file__, "--worker", mode, "--csv", path,
+                                              "--chunk-size", chunk_size, "--max-tracked", max_tracked)
+        results["errors"] = sketch_errors(path, results["exact"]["profiles"], results["sketch"]["profiles"])
+    for mode in ("exact", "sketch"):
+        del results[mode]["profiles"]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--max-tracked", type=int, default=10_000, help="Distinct values tracked exactly per column")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--worker", choices=["exact", "sketch"], help=argparse.SUPPRESS)
+    parser.add_argument("--csv", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.csv, args.chunk_size, args.max_tracked)))
+        return
+
+    results = run(args.rows, args.chunk_size, args.max_tracked)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Chunked column profiles: {args.rows} rows ({results['file_mb']} MB CSV)")
+    for mode in ("exact", "sketch"):
+        entry = results[mode]
+        print(f"  {mode:<7} {entry['seconds']:>8.2f}s  peak RSS {entry['peak_rss_mb']:>8.1f} MB  "
+              f"(after imports {entry['imports_rss_mb']:.1f} MB)")
+    for col, entry in results["errors"].items():
+        line = (f"  {col:<15} distinct error {entry['unique_relative_error']:.2%} "
+                f"(bound {entry['unique_error_bound']:.2%})  top count error {entry['top_count_error']} "
+                f"(bound {entry['top_count_error_bound']})")
+        if "quantile_rank_error" in entry:
+            line += (f"  quantile rank error {entry['quantile_rank_error']:.2%} "
+                     f"(bound {entry['quantile_rank_error_bound']:.2%})")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
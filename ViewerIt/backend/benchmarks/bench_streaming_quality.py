@@ -0,0 +1,120 @@
+"""
+Benchmark: exact quality checks, in memory vs streamed in chunks.
+
+Writes a synthetic load file and runs each checker in its own subprocess,
+reporting wall time and peak resident memory. The in-memory checker needs
+the whole frame plus its working copies; the streaming checker should stay
+near one chunk plus its spill budget however large the file grows.
+
+Usage:
+    python benchmarks/bench_streaming_quality.py [--rows 2000000] [--chunk-size 50000] [--budget-mb 64] [--json]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import control_numbers, peak_rss_mb, run_in_subprocess, write_load_file
+
+
+def load_file_batch(rng: np.random.Generator, start: int, n: int) -> pd.DataFrame:
+    """Rows of the load file: text, numeric and date columns with nulls."""
+    return pd.DataFrame({
+        "control_number": control_numbers(start, n),
+        "custodian": rng.choice(["Smith, J", "Jones, K", "Lee, M", None], n),
+        "email": np.char.add(np.char.add("user", rng.integers(0, 50_000, n).astype(str)), "@example.com"),
+        "amount": rng.normal(100, 25, n).round(2),
+        "tax": rng.normal(10, 2, n).round(2),
+        "pages": rng.integers(1, 500, n),
+        "start_date": rng.choice(["2024-01-01", "2024-02-15", "2023-12-31"], n),
+        "end_date": rng.choice(["2024-03-01", "2024-01-15"], n),
+    })
+
+
+def run_worker(mode: str, path: Path, chunk_size: int, budget_mb: float) -> dict:
+    """Run one checker in this process and report time and peak RSS."""
+    from services.quality_checker import QualityChecker
+    from services.chunked_processor import ChunkedProcessor
+    from services.streaming_quality import StreamingQualityChecker
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "in_memory":
+        report = QualityChecker(pd.read_csv(path, low_memory=False), path.name).check_all()
+    else:
+        report = StreamingQualityChecker(path, path.name, ChunkedProcessor(chunk_size),
+                                         memory_budget_mb=budget_mb).check_all()
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": round(seconds, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "imports_rss_mb": round(baseline, 1),
+        "quality_score": report["quality_score"]["total"],
+        "duplicate_rows": report["uniqueness"]["duplicate_row_count"],
+    }
+
+
+def measure(mode: str, path: Path, chunk_size: int, budget_mb: float) -> dict:
+    """Run one checker in a worker subprocess (see run_worker)."""
+    return run_in_subprocess(__file__, "--worker", mode, "--csv", path,
+                             "--chunk-size", chunk_size, "--budget-mb", budget_mb)
+
+
+def run(rows: int, chunk_size: int, budget_mb: float, skip_in_memory: bool) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "load_file.csv"
+        write_load_file(path, rows, load_file_batch)
+        results = {
+            "rows": rows,
+            "file_mb": round(path.stat().st_size / 1024 ** 2, 1),
+            "chunk_size": chunk_size,
+            "budget_mb": budget_mb,
+            "streaming": measure("streaming", path, chunk_size, budget_mb),
+        }
+        if not skip_in_memory:
+            results["in_memory"] = measure("in_memory", path, chunk_size, budget_mb)
+            results["same_score"] = results["in_memory"]["quality_score"] == results["streaming"]["quality_score"]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--budget-mb", type=float, default=64)
+    parser.add_argument("--skip-in-memory", action="store_true", help="Only run the streaming checker")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--worker", choices=["in_memory", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--csv", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.csv, args.chunk_size, args.budget_mb)))
+        return
+
+    results = run(args.rows, args.chunk_size, args.budget_mb, args.skip_in_memory)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Exact quality check: {args.rows} rows ({results['file_mb']} MB CSV)")
+    for mode in ("in_memory", "streaming"):
+        if mode in results:
+            entry = results[mode]
+            print(f"  {mode:<10} {entry['seconds']:>8.2f}s  peak RSS {entry['peak_rss_mb']:>8.1f} MB  "
+                  f"(after imports {entry['imports_rss_mb']:.1f} MB)  score {entry['quality_score']}")
+    if "same_score" in results:
+        print(f"  identical score: {results['same_score']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark: text-column validity checks (case, whitespace, format patterns).
+
+Compares the previous per-column approach (one str.match scan per format
+pattern, Python loops for case classes, separate whitespace scans) with the
+single-pass Arrow string profiler used by QualityChecker._check_validity.
+
+Usage:
+    python benchmarks/bench_string_checks.py [--rows 1000000] [--columns 50] [--skip-legacy] [--json]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import timed
+from config import QUALITY_FORMAT_PATTERNS
+from services.string_profiler import profile_strings
+from services.profiler import get_profiles
+
+
+def make_text_frame(rows: int, columns: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Text columns of mixed cardinality, drawn from shared value pools so a
+    1M x 50 frame fits in memory.
+    """
+    rng = np.random.default_rng(seed)
+    pools = {
+        "status": np.array(["OPEN", "closed", "Pending", "open ", None], dtype=object),
+        "custodian": np.array([f"Custodian {i}" for i in range(5000)] + [None], dtype=object),
+        "email": np.array([f"user{i}@example.com" for i in range(50000)] + ["n/a"], dtype=object),
+        "comment": np.array([f" note  {i} " if i % 7 == 0 else f"note {i}" for i in range(20000)], dtype=object),
+        "control_number": np.array([f"CTRL{i:09d}" for i in range(rows)], dtype=object),
+    }
+    kinds = list(pools)
+    data = {}
+    for c in range(columns):
+        kind = kinds[c % len(kinds)]
+        pool = pools[kind]
+        if kind == "control_number":
+            data[f"{kind}_{c}"] = pool  # unique per row; shared between columns to save memory
+        else:
+            data[f"{kind}_{c}"] = pool[rng.integers(0, len(pool), rows)]
+    return pd.DataFrame(data)
+
+
+def legacy_string_checks(series: pd.Series) -> dict:
+    """The previous per-column checks: one scan per pattern plus Python loops."""
+    sample_str = series.dropna().astype(str)
+    formats = {}
+    for name, pattern in QUALITY_FORMAT_PATTERNS.items():
+        matches = sample_str.str.match(pattern, na=False)
+        match_count = int(matches.sum())
+        if match_count > len(sample_str) * 0.5:
+            formats[name] = match_count
+    case = {
+        "upper": sum(1 for s in sample_str if str(s).isupper()),
+        "lower": sum(1 for s in sample_str if str(s).islower()),
+        "title": sum(1 for s in sample_str if str(s).istitle()),
+    }
+    whitespace = {
+        "leading": int(sample_str.str.match(r'^\s+', na=False).sum()),
+        "trailing": int(sample_str.str.contains(r'\s$', na=False).sum()),
+        "multiple": int(sample_str.str.contains(r'\s{2,}', na=False).sum()),
+    }
+    return {"formats": formats, "case": case, "whitespace": whitespace}
+
+
+def profiled_string_checks(df: pd.DataFrame) -> dict:
+    """The single-pass profiler, as QualityChecker._check_validity calls it."""
+    profiles = get_profiles(df)
+    return {
+        col: profile_strings(df[col], distinct_count=profiles[col]["unique_count"])
+        for col in df.columns
+    }
+
+
+def run(rows: int, columns: int, skip_legacy: bool) -> dict:
+    df = make_text_frame(rows, columns)
+
+    # Profiles are shared with the rest of the quality check; time them separately
+    profile_seconds, _ = timed(lambda: get_profiles(df))
+    profiler_seconds, profiled = timed(lambda: profiled_string_checks(df))
+
+    results = {
+        "rows": rows,
+        "columns": columns,
+        "column_profiles_seconds": round(profile_seconds, 3),
+        "string_profiler_seconds": round(profiler_seconds, 3),
+    }
+
+    if not skip_legacy:
+        legacy_seconds, legacy = timed(lambda: {col: legacy_string_checks(df[col]) for col in df.columns})
+        results["legacy_seconds"] = round(legacy_seconds, 3)
+        results["speedup"] = round(legacy_seconds / profiler_seconds, 1)
+        results["counts_match"] = all(
+            legacy[col]["case"] == profiled[col]["case"]
+            and legacy[col]["whitespace"] == profiled[col]["whitespace"]
+            and legacy[col]["formats"] == {k: v["match_count"] for k, v in profiled[col]["patterns"].items()}
+            for col in df.columns
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the string profiler")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.columns, args.skip_legacy)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Text validity checks: {args.rows} rows x {args.columns} text columns")
+    print(f"  column profiles (shared):  {results['column_profiles_seconds']:>8.3f}s")
+    print(f"  string profiler:           {results['string_profiler_seconds']:>8.3f}s")
+    if "legacy_seconds" in results:
+        print(f"  legacy per-pattern scans:  {results['legacy_seconds']:>8.3f}s")
+        print(f"  speedup: {results['speedup']}x  (identical counts: {results['counts_match']})")
+
+
+if __name__ == "__main__":
+    main()
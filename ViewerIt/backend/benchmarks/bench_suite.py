@@ -0,0 +1,397 @@
+"""
+Benchmark suite: throughput and peak memory of the core services on synthetic data.
+
+Generates a deterministic synthetic file set (see synthetic.py: rows, value
+columns, key cardinality, overlap, mismatch and null rates, dtypes) and runs
+each benchmark in its own subprocess, so peak memory is isolated:
+
+    file_handler               FileHandler.load_dataframe of the first file
+    comparator                 DataComparator.compare of the first two files
+    multi_comparator[python]   MultiFileComparator.compare of every file
+    multi_comparator[rust]       ... with viewerit_core's intersector
+    chunked_processor[python]  compare_multiple_files_chunked of every CSV
+    chunked_processor[rust]      ... with viewerit_core's CSV key reader
+    schema_analyzer            SchemaAnalyzer.analyze of every file
+    quality_checker            QualityChecker.check_all of the first file
+
+Inputs are loaded before timing. Each result reports wall and CPU seconds,
+rows and CSV megabytes per second, peak RSS during the run and the RSS it
+started from, plus the run's stage breakdown (services.metrics). Rust
+benchmarks are reported as skipped when viewerit_core is not built.
+
+The results table is printed as JSON with --json; --output appends it as
+one line to a JSON Lines history file, and --baseline compares against an
+earlier results file (or the last line of a history file), exiting with
+status 1 when a benchmark is slower or uses more memory than --tolerance
+allows.
+
+Usage:
+    python benchmarks/bench_suite.py [--rows 100000] [--columns 8] [--files 3] [--keys N]
+        [--overlap 0.9] [--mismatch-rate 0.01] [--null-rate 0.02] [--dtypes int,float,str,...]
+        [--key-dtype str] [--seed 42] [--only comparator,quality] [--repeat 1]
+        [--data-dir DIR] [--output history.jsonl] [--baseline results.json] [--tolerance 0.2] [--json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import peak_rss_mb, reset_peak_rss, rss_mb
+from synthetic import DTYPES, KEY_COLUMN, DatasetSpec, write_csv_files
+
+BENCHMARKS = (
+    "file_handler",
+    "comparator",
+    "multi_comparator[python]",
+    "multi_comparator[rust]",
+    "chunked_processor[python]",
+    "chunked_processor[rust]",
+    "schema_analyzer",
+    "quality_checker",
+)
+
+SUITE_VERSION = 1
+
+
+# ============== Worker: one benchmark in this process ==============
+
+class SkipBenchmark(Exception):
+    """The benchmark cannot run with this build or dataset."""
+
+
+def prepare(benchmark: str, spec: DatasetSpec, session_id: str):
+    """
+    Load the benchmark's inputs (untimed).
+
+    Returns:
+        (fn, rows, input_bytes) - fn runs the benchmarked work
+
+    Raises:
+        SkipBenchmark: If it cannot run here
+    """
+    from services.chunked_processor import ChunkedProcessor, NATIVE_CSV_KEYS
+    from services.comparator import DataComparator
+    from services.file_handler import FileHandler, UPLOADS_DIR
+    from services.multi_comparator import MultiFileComparator, NATIVE_OVERLAP
+    from services.quality_checker import QualityChecker
+    from services.schema_analyzer import SchemaAnalyzer
+
+    names = spec.file_names()
+    paths = [UPLOADS_DIR / session_id / name for name in names]
+    sizes = [path.stat().st_size for path in paths]
+    # One-time setup a running server has already paid (chardet's models)
+    FileHandler.detect_encoding(paths[0])
+
+    def load(count: int) -> dict:
+        return {name: FileHandler.load_dataframe(session_id, name) for name in names[:count]}
+
+    if benchmark == "file_handler":
+        return (lambda: len(FileHandler.load_dataframe(session_id, names[0]))), spec.rows, sizes[0]
+
+    if benchmark == "comparator":
+        if spec.files < 2:
+            raise SkipBenchmark("needs at least 2 files")
+        df1, df2 = load(2).values()
+        return (lambda: DataComparator(df1, df2, names[0], names[1]).compare([KEY_COLUMN])), \
+            2 * spec.rows, sum(sizes[:2])
+
+    if benchmark.startswith("multi_comparator"):
+        native = benchmark.endswith("[rust]")
+        if spec.files < 2:
+            raise SkipBenchmark("needs at least 2 files")
+        if native and not NATIVE_OVERLAP:
+            raise SkipBenchmark("viewerit_core not built")
+        frames = load(spec.files)
+
+        def compare():
+            comparator = MultiFileComparator(frames)
+            comparator._use_rust = native
+            return comparator.compare([KEY_COLUMN])
+        return compare, spec.files * spec.rows, sum(sizes)
+
+    if benchmark.startswith("chunked_processor"):
+        native = benchmark.endswith("[rust]")
+        if native and not NATIVE_CSV_KEYS:
+            raise SkipBenchmark("viewerit_core not built")
+        processor = ChunkedProcessor()
+        if not native:
+            processor._use_rust = processor._native_keys = processor._native_overlap = False
+        return (lambda: processor.compare_multiple_files_chunked(paths, [KEY_COLUMN])), \
+            spec.files * spec.rows, sum(sizes)
+
+    if benchmark == "schema_analyzer":
+        frames = load(spec.files)
+        return (lambda: SchemaAnalyzer(frames).analyze()), spec.files * spec.rows, sum(sizes)
+
+    if benchmark == "quality_checker":
+        (df,) = load(1).values()
+        return (lambda: QualityChecker(df, names[0]).check_all()), spec.rows, sizes[0]
+
+    raise ValueError(f"Unknown benchmark: {benchmark}")
+
+
+def run_worker(benchmark: str, spec: DatasetSpec, data_dir: Path) -> dict:
+    """Run one benchmark in this process and measure it."""
+    import services.file_handler as file_handler
+    from services.metrics import MetricsRegistry, record
+
+    # The data directory is the benchmark's upload session
+    file_handler.UPLOADS_DIR = data_dir.parent
+    try:
+        fn, rows, input_bytes = prepare(benchmark, spec, data_dir.name)
+    except SkipBenchmark as e:
+        return {"benchmark": benchmark, "status": "skipped", "reason": str(e)}
+
+    baseline = rss_mb()
+    reset_peak_rss()
+    start, cpu_start = time.perf_counter(), time.process_time()
+    with record(f"bench:{benchmark}", MetricsRegistry()) as recorder:
+        fn()
+    seconds = time.perf_counter() - start
+    cpu_seconds = time.process_time() - cpu_start
+    summary = recorder.summary()
+
+    return {
+        "benchmark": benchmark,
+        "status": "ok",
+        "seconds": round(seconds, 4),
+        "cpu_seconds": round(cpu_seconds, 4),
+        "rows": rows,
+        "rows_per_second": round(rows / seconds),
+        "mb_per_second": round(input_bytes / 1024 ** 2 / seconds, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "baseline_rss_mb": round(baseline, 1),
+        "stages": summary["stages"] if summary else [],
+    }
+
+
+# ============== Driver ==============
+
+def measure(benchmark: str, spec: DatasetSpec, data_dir: Path, timeout: float) -> dict:
+    """Run one benchmark in a worker subprocess, reporting a timeout or crash as its result."""
+    try:
+        completed = subprocess.run(
+            [sys.executable, __file__, "--worker", benchmark, "--spec", json.dumps(spec.to_dict()),
+             "--data-dir", str(data_dir)],
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"benchmark": benchmark, "status": "timeout", "reason": f"exceeded {timeout:.0f}s"}
+
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return {"benchmark": benchmark, "status": "error", "reason": lines[-1] if lines else "worker failed"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def best_run(runs: list[dict]) -> dict:
+    """The fastest of repeated runs, with the highest peak memory seen."""
+    ok = [entry for entry in runs if entry["status"] == "ok"]
+    if not ok:
+        return runs[-1]
+    best = dict(min(ok, key=lambda entry: entry["seconds"]))
+    best["peak_rss_mb"] = max(entry["peak_rss_mb"] for entry in ok)
+    best["runs"] = len(ok)
+    return best
+
+
+def ensure_data(spec: DatasetSpec, data_dir: Path) -> float:
+    """
+    Write the spec's CSV files to data_dir unless an identical set is there.
+
+    Returns:
+        Seconds spent generating (0 when reused)
+    """
+    marker = data_dir / "spec.json"
+    if marker.exists() and json.loads(marker.read_text()) == spec.to_dict():
+        return 0.0
+    start = time.perf_counter()
+    write_csv_files(spec, data_dir)
+    marker.write_text(json.dumps(spec.to_dict()))
+    return time.perf_counter() - start
+
+
+def environment() -> dict:
+    """Where the results were measured."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import viewerit_core  # noqa: F401
+        native = True
+    except ImportError:
+        native = False
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "viewerit_core": native,
+    }
+
+
+def select(only: str | None) -> list[str]:
+    """Benchmarks whose names start with any of the comma-separated prefixes."""
+    if not only:
+        return list(BENCHMARKS)
+    prefixes = [prefix.strip() for prefix in only.split(",") if prefix.strip()]
+    selected = [name for name in BENCHMARKS if any(name.startswith(prefix) for prefix in prefixes)]
+    if not selected:
+        raise SystemExit(f"No benchmark matches --only {only} (choose from {', '.join(BENCHMARKS)})")
+    return selected
+
+
+def run(spec: DatasetSpec, benchmarks: list[str], repeat: int = 1, timeout: float = 3600,
+        data_dir: Path | None = None) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(data_dir) if data_dir else Path(tmp) / "bench"
+        directory.mkdir(parents=True, exist_ok=True)
+        generate_seconds = ensure_data(spec, directory)
+        data_mb = sum(path.stat().st_size for path in directory.glob("*.csv")) / 1024 ** 2
+
+        results = [best_run([measure(name, spec, directory, timeout) for _ in range(repeat)])
+                   for name in benchmarks]
+
+    return {
+        "suite_version": SUITE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "spec": spec.to_dict(),
+        "data_mb": round(data_mb, 1),
+        "generate_seconds": round(generate_seconds, 2),
+        "results": results,
+    }
+
+
+def load_results(path: Path) -> dict:
+    """A results table, or the last one of a JSON Lines history file."""
+    text = Path(path).read_text().strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return json.loads(text.splitlines()[-1])
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """
+    Time and peak memory of each benchmark relative to a baseline run.
+
+    Returns:
+        One dict per benchmark measured in both, with 'time_ratio',
+        'memory_ratio' and 'regression' (either ratio above 1 + tolerance)
+    """
+    before = {entry["benchmark"]: entry for entry in baseline["results"] if entry["status"] == "ok"}
+    changes = []
+    for entry in results["results"]:
+        base = before.get(entry["benchmark"])
+        if entry["status"] != "ok" or base is None:
+            continue
+        time_ratio = entry["seconds"] / base["seconds"] if base["seconds"] else 1.0
+        memory_ratio = entry["peak_rss_mb"] / base["peak_rss_mb"] if base["peak_rss_mb"] else 1.0
+        changes.append({
+            "benchmark": entry["benchmark"],
+            "time_ratio": round(time_ratio, 3),
+            "memory_ratio": round(memory_ratio, 3),
+            "regression": time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance,
+        })
+    return changes
+
+
+def print_table(results: dict):
+    spec = results["spec"]
+    env = results["environment"]
+    print(f"{spec['files']} files x {spec['rows']} rows x {spec['columns']} columns "
+          f"({spec['keys']} keys, overlap {spec['overlap']}, mismatches {spec['mismatch_rate']}, "
+          f"nulls {spec['null_rate']}): {results['data_mb']} MB CSV")
+    print(f"commit {env['git_commit']}, Python {env['python']}, {env['cpus']} CPUs, "
+          f"viewerit_core {'built' if env['viewerit_core'] else 'not built'}")
+    print(f"  {'benchmark':<27} {'seconds':>9} {'rows/s':>12} {'MB/s':>8} {'peak MB':>9} {'start MB':>9}")
+    for entry in results["results"]:
+        if entry["status"] != "ok":
+            print(f"  {entry['benchmark']:<27} {entry['status']}: {entry['reason']}")
+            continue
+        print(f"  {entry['benchmark']:<27} {entry['seconds']:>9.3f} {entry['rows_per_second']:>12,} "
+              f"{entry['mb_per_second']:>8.1f} {entry['peak_rss_mb']:>9.1f} {entry['baseline_rss_mb']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per file (10K-10M)")
+    parser.add_argument("--columns", type=int, default=8, help="Value columns per file")
+    parser.add_argument("--files", type=int, default=3)
+    parser.add_argument("--keys", type=int, help="Distinct keys per file (default: rows)")
+    parser.add_argument("--overlap", type=float, default=0.9, help="Fraction of keys shared with the first file")
+    parser.add_argument("--mismatch-rate", type=float, default=0.01, help="Fraction of keys with a changed value")
+    parser.add_argument("--null-rate", type=float, default=0.02)
+    parser.add_argument("--dtypes", default=",".join(DTYPES), help="Value column types, assigned in turn")
+    parser.add_argument("--key-dtype", choices=["str", "int"], default="str")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", help="Comma-separated benchmark name prefixes")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per benchmark (fastest kept)")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds allowed per run")
+    parser.add_argument("--data-dir", help="Keep the generated files here and reuse them for the same spec")
+    parser.add_argument("--output", help="Append the results as one line to this JSON Lines file")
+    parser.add_argument("--baseline", help="Results (or history) file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown / memory growth vs baseline")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--worker", choices=BENCHMARKS, help=argparse.SUPPRESS)
+    parser.add_argument("--spec", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        spec = DatasetSpec(**json.loads(args.spec))
+        print(json.dumps(run_worker(args.worker, spec, Path(args.data_dir))))
+        return
+
+    try:
+        spec = DatasetSpec(
+            rows=args.rows, columns=args.columns, files=args.files, keys=args.keys,
+            overlap=args.overlap, mismatch_rate=args.mismatch_rate, null_rate=args.null_rate,
+            dtypes=[dtype.strip() for dtype in args.dtypes.split(",") if dtype.strip()],
+            key_dtype=args.key_dtype, seed=args.seed,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = run(spec, select(args.only), args.repeat, args.timeout, args.data_dir)
+
+    regressions = []
+    if args.baseline:
+        baseline = load_results(Path(args.baseline))
+        if baseline["spec"] != results["spec"]:
+            print("warning: baseline was measured on a different dataset spec", file=sys.stderr)
+        results["baseline"] = compare_to_baseline(results, baseline, args.tolerance)
+        regressions = [change for change in results["baseline"] if change["regression"]]
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(results) + "\n")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+        for change in results.get("baseline", []):
+            flag = "  REGRESSION" if change["regression"] else ""
+            print(f"  vs baseline {change['benchmark']:<27} time x{change['time_ratio']:.2f}  "
+                  f"memory x{change['memory_ratio']:.2f}{flag}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
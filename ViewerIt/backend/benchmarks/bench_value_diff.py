@@ -0,0 +1,95 @@
+"""
+Benchmark: value-level diff of two wide frames, datacompy vs the value_diff kernel.
+
+Builds two versions of a --rows x --columns frame (half numeric columns with
+drift, half text columns with case/whitespace edits) and times a datacompy
+Compare against DataComparator, whose value comparison batches every column
+through value_diff (viewerit_core's Rust kernel when built, else NumPy) and
+adds the match columns in one concat instead of one per column. Mismatch
+counts per column must be identical.
+
+Usage:
+    python benchmarks/bench_value_diff.py [--rows 200000] [--columns 40] [--json]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import timed
+from datacompy.core import Compare
+from services.comparator import DataComparator
+from services.value_diff import NATIVE_DIFF_AVAILABLE
+
+
+def make_frames(rows: int, columns: int, seed: int = 42) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    words = np.array(["Smith, J", "Jones, K", "Lee, M", "Garcia, R", "Chen, L"], dtype=object)
+    data = {"id": np.arange(rows)}
+    for i in range(columns):
+        if i % 2:
+            data[f"text_{i}"] = rng.choice(words, rows)
+        else:
+            data[f"amount_{i}"] = rng.normal(100, 25, rows).round(4)
+    df1 = pd.DataFrame(data)
+    df2 = df1.copy()
+    for column in df2.columns[1:]:
+        changed = rng.random(rows) < 0.02
+        if column.startswith("text"):
+            df2.loc[changed, column] = df2.loc[changed, column].str.upper() + " "
+        else:
+            df2.loc[changed, column] += rng.choice([0.00005, 1.0], changed.sum())
+    return df1, df2
+
+
+def run(rows: int, columns: int) -> dict:
+    df1, df2 = make_frames(rows, columns)
+    results = {"rows": rows, "columns": columns, "native": NATIVE_DIFF_AVAILABLE}
+    for name, kwargs in [("exact", {}), ("ignore_case_spaces", {"ignore_spaces": True, "ignore_case": True})]:
+        datacompy_seconds, reference = timed(
+            lambda: Compare(df1, df2, join_columns=["id"], abs_tol=0.0001, **kwargs), digits=2)
+        kernel_seconds, comparator = timed(
+            lambda: DataComparator(df1, df2).compare(["id"], abs_tol=0.0001, **kwargs), digits=2)
+        expected = {stat["column"]: int(stat["unequal_cnt"]) for stat in reference.column_stats
+                    if stat["column"] != "id"}
+        results[name] = {
+            "datacompy_seconds": datacompy_seconds,
+            "kernel_seconds": kernel_seconds,
+            "speedup": round(datacompy_seconds / kernel_seconds, 2),
+            "mismatches": sum(expected.values()),
+            "same_counts": expected == {stat["column"]: stat["mismatch_count"]
+                                        for stat in comparator["column_stats"]},
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.columns)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    kernel = "viewerit_core" if results["native"] else "NumPy fallback"
+    print(f"Value diff of {args.rows} rows x {args.columns} columns (kernel: {kernel})")
+    for name in ("exact", "ignore_case_spaces"):
+        entry = results[name]
+        print(f"  {name:<20} datacompy {entry['datacompy_seconds']:>7.2f}s  "
+              f"kernel {entry['kernel_seconds']:>7.2f}s  ({entry['speedup']}x)  "
+              f"mismatches {entry['mismatches']}  same counts: {entry['same_counts']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Shared benchmark helpers: timing, peak memory, worker subprocesses and
+synthetic load files written in batches.
+
+Benchmark scripts import this as a sibling module (running
+`python benchmarks/bench_x.py` puts this directory first on sys.path).
+"""
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def timed(fn, digits: Optional[int] = None) -> tuple[float, object]:
+    """(seconds, result) of calling fn, seconds rounded to digits when given."""
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    return (seconds if digits is None else round(seconds, digits)), result
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB."""
+    try:
+        # VmHWM resets on exec (and on clear_refs); ru_maxrss can carry the forking parent's peak
+        status = Path("/proc/self/status").read_text()
+        return int(status.split("VmHWM:")[1].split()[0]) / 1024
+    except (OSError, IndexError):
+        # ru_maxrss is in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def rss_mb() -> float:
+    """Current resident memory of this process in MB (0 where /proc is unavailable)."""
+    try:
+        status = Path("/proc/self/status").read_text()
+        return int(status.split("VmRSS:")[1].split()[0]) / 1024
+    except (OSError, IndexError):
+        return 0.0
+
+
+def reset_peak_rss():
+    """Reset the kernel's high-water mark to the current RSS, where supported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def run_in_subprocess(script: str, *args) -> dict:
+    """
+    Run a benchmark script's worker mode in a subprocess, so peak memory is
+    measured in isolation, and return the JSON line it prints last.
+    """
+    output = subprocess.run(
+        [sys.executable, script, *map(str, args)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def write_load_file(path: Path, rows: int,
+                    make_batch: Callable[[np.random.Generator, int, int], pd.DataFrame],
+                    seed: int = 42, batch: int = 500_000):
+    """
+    Synthetic load file written in batches (never held whole in memory).
+
+    Args:
+        path: CSV file to write
+        rows: Total rows
+        make_batch: make_batch(rng, start, n) -> the n rows from row start on
+        seed: Seed of the generator shared by every batch
+        batch: Rows per batch
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, batch):
+        n = min(batch, rows - start)
+        make_batch(rng, start, n).to_csv(path, mode="a" if start else "w", header=not start, index=False)
+
+
+def control_numbers(start: int, n: int) -> np.ndarray:
+    """Control numbers CTRL<start> .. CTRL<start + n - 1>."""
+    return np.char.add("CTRL", np.arange(start, start + n).astype(str))
@@ -0,0 +1,214 @@
+"""
+Synthetic load files for benchmarks: deterministic, configurable datasets.
+
+A DatasetSpec describes a set of files keyed by an `id` column. Every value
+is a pure function of (seed, key, column) - hashed with SplitMix64 rather
+than drawn from a sequential RNG - so the same spec yields byte-identical
+files on every machine, any file or row range can be generated on its own,
+and a key shared by two files carries the same values in both unless it
+was picked as a mismatch.
+
+    spec = DatasetSpec(rows=1_000_000, files=3, overlap=0.9, mismatch_rate=0.02)
+    paths = write_csv_files(spec, directory)
+
+File 0 holds keys 0..keys-1. Every other file keeps an `overlap` fraction
+of them and replaces the rest with keys of its own, and changes one value
+in the rows of a `mismatch_rate` fraction of its keys. With fewer keys than rows, keys
+repeat (duplicate rows per key).
+"""
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+DTYPES = ("int", "float", "str", "category", "date", "bool")
+
+KEY_COLUMN = "id"
+
+_CATEGORIES = np.array(["Smith, J", "Jones, K", "Lee, M", "Garcia, R", "Chen, L", "Patel, A", "Kim, S", "Brown, T"])
+_EPOCH = np.datetime64("2015-01-01")
+
+# Salts separating the hash streams of values, nulls, mismatches and key choice
+_VALUE, _NULL, _MISMATCH, _KEYS = 1, 2, 3, 4
+
+
+@dataclass
+class DatasetSpec:
+    """
+    Shape of a synthetic file set.
+
+    Attributes:
+        rows: Rows per file
+        columns: Value columns per file (besides the key)
+        files: Number of files
+        keys: Distinct keys per file (default: rows, i.e. unique keys)
+        overlap: Fraction of file 0's keys each other file also holds
+        mismatch_rate: Fraction of each other file's keys with one changed value
+        null_rate: Fraction of null values per column (the same cells in every file)
+        dtypes: Value column types, assigned to the columns in turn
+        key_dtype: 'str' (control numbers like CTRL000123) or 'int'
+        seed: Seed of every hash stream
+    """
+    rows: int = 100_000
+    columns: int = 8
+    files: int = 2
+    keys: int | None = None
+    overlap: float = 0.9
+    mismatch_rate: float = 0.01
+    null_rate: float = 0.02
+    dtypes: tuple[str, ...] = DTYPES
+    key_dtype: str = "str"
+    seed: int = 42
+
+    def __post_init__(self):
+        self.dtypes = tuple(self.dtypes)
+        if self.keys is None:
+            self.keys = self.rows
+        if not 0 < self.keys <= self.rows:
+            raise ValueError(f"keys must be between 1 and rows ({self.rows}), got {self.keys}")
+        if self.files < 1 or self.columns < 0:
+            raise ValueError("files must be at least 1 and columns non-negative")
+        for name in ("overlap", "mismatch_rate", "null_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+        unknown = set(self.dtypes) - set(DTYPES)
+        if unknown or not self.dtypes:
+            raise ValueError(f"dtypes must be among {', '.join(DTYPES)}, got {', '.join(sorted(unknown)) or 'none'}")
+        if self.key_dtype not in ("str", "int"):
+            raise ValueError(f"key_dtype must be 'str' or 'int', got {self.key_dtype}")
+
+    def column_names(self) -> list[str]:
+        """Value column names, e.g. ['int_0', 'float_1', ...]."""
+        return [f"{self.dtypes[idx % len(self.dtypes)]}_{idx}" for idx in range(self.columns)]
+
+    def file_names(self) -> list[str]:
+        return [f"volume_{idx:02d}.csv" for idx in range(self.files)]
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "dtypes": list(self.dtypes)}
+
+
+def mix(values: np.ndarray, salt: int) -> np.ndarray:
+    """SplitMix64 finalizer of values ^ salt (uint64, wraps on overflow)."""
+    z = values.astype(np.uint64) ^ np.uint64(salt * 0x9E3779B97F4A7C15 % 2 ** 64)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _unit(hashed: np.ndarray) -> np.ndarray:
+    """Hashes as floats in [0, 1)."""
+    return (hashed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _salt(spec: DatasetSpec, stream: int, *parts: int) -> int:
+    salt = spec.seed * 1_000_003 + stream
+    for part in parts:
+        salt = salt * 1_000_003 + part
+    return salt % 2 ** 64
+
+
+def file_key_ids(spec: DatasetSpec, file_idx: int) -> np.ndarray:
+    """
+    Key ids of each row of a file, in row order.
+
+    File 0 holds ids 0..keys-1; file i keeps the ids whose hash falls under
+    the overlap fraction and replaces the others with ids of its own range
+    (keys * i onwards). Rows beyond the number of keys repeat ids.
+    """
+    ids = np.arange(spec.keys, dtype=np.int64)
+    if file_idx > 0:
+        kept = _unit(mix(ids, _salt(spec, _KEYS, file_idx))) < spec.overlap
+        ids = np.where(kept, ids, ids + spec.keys * file_idx)
+
+    if spec.rows > spec.keys:
+        extra = np.arange(spec.keys, spec.rows, dtype=np.int64)
+        repeats = ids[(mix(extra, _salt(spec, _KEYS, file_idx, 1)) % np.uint64(spec.keys)).astype(np.int64)]
+        ids = np.concatenate([ids, repeats])
+
+    # Deterministic row order
+    order = np.argsort(mix(np.arange(spec.rows, dtype=np.int64), _salt(spec, _KEYS, file_idx, 2)), kind="stable")
+    return ids[order]
+
+
+def _column_values(dtype: str, hashed: np.ndarray, changed: np.ndarray):
+    """Column of a dtype from per-row hashes, with changed rows (bool mask) given a different value."""
+    if dtype == "int":
+        return (hashed % np.uint64(1_000_000)).astype(np.int64) + changed
+    if dtype == "float":
+        return (hashed % np.uint64(10_000_000)).astype(np.float64) / 100 + changed
+    if dtype == "str":
+        values = np.char.add("doc-", (hashed % np.uint64(1_000_000)).astype(np.int64).astype(str)).astype(object)
+        values[changed] = values[changed] + "-rev"
+        return values
+    if dtype == "category":
+        return _CATEGORIES[((hashed % np.uint64(len(_CATEGORIES))).astype(np.int64) + changed) % len(_CATEGORIES)]
+    if dtype == "date":
+        days = (hashed % np.uint64(3650)).astype(np.int64) + changed
+        return _EPOCH + days.astype("timedelta64[D]")
+    return (hashed & np.uint64(1)).astype(bool) ^ changed
+
+
+def make_frame(spec: DatasetSpec, file_idx: int) -> pd.DataFrame:
+    """One file of the set as a DataFrame (nullable dtypes where values are null)."""
+    ids = file_key_ids(spec, file_idx)
+    columns = spec.column_names()
+
+    # One changed column per mismatched key (never in file 0)
+    changed_column = np.full(len(ids), -1, dtype=np.int64)
+    if file_idx > 0 and columns:
+        hashed = mix(ids, _salt(spec, _MISMATCH, file_idx))
+        mismatched = _unit(hashed) < spec.mismatch_rate
+        changed_column = np.where(mismatched, (hashed % np.uint64(len(columns))).astype(np.int64), -1)
+
+    key = np.char.add("CTRL", np.char.zfill(ids.astype(str), 9)) if spec.key_dtype == "str" else ids
+    data = {KEY_COLUMN: key}
+    for col_idx, name in enumerate(columns):
+        dtype = spec.dtypes[col_idx % len(spec.dtypes)]
+        hashed = mix(ids, _salt(spec, _VALUE, col_idx))
+        values = _column_values(dtype, hashed, changed_column == col_idx)
+        nulls = _unit(mix(ids, _salt(spec, _NULL, col_idx))) < spec.null_rate
+        if nulls.any():
+            nullable = {"int": "Int64", "bool": "boolean", "float": "Float64"}.get(dtype)
+            series = pd.Series(values, dtype=nullable) if nullable else pd.Series(values)
+            values = series.mask(nulls)
+        data[name] = values
+    return pd.DataFrame(data)
+
+
+def make_frames(spec: DatasetSpec) -> dict[str, pd.DataFrame]:
+    """Every file of the set, by file name."""
+    return {name: make_frame(spec, idx) for idx, name in enumerate(spec.file_names())}
+
+
+def write_csv_files(spec: DatasetSpec, directory: Path) -> list[Path]:
+    """
+    Write the file set as CSV (one file in memory at a time).
+
+    Returns:
+        File paths in file order
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for idx, name in enumerate(spec.file_names()):
+        path = directory / name
+        table = pa.Table.from_pandas(make_frame(spec, idx), preserve_index=False)
+        pa_csv.write_csv(table, path, pa_csv.WriteOptions(quoting_style="needed"))
+        paths.append(path)
+    return paths
+
+
+def expected_counts(spec: DatasetSpec) -> dict:
+    """Distinct keys of file 0 and each other file's shared / mismatched key counts, for checks."""
+    base = set(file_key_ids(spec, 0).tolist())
+    counts = {"keys": len(base), "files": []}
+    for idx in range(1, spec.files):
+        ids = np.unique(file_key_ids(spec, idx))
+        shared = ids[ids < spec.keys]
+        mismatched = _unit(mix(shared, _salt(spec, _MISMATCH, idx))) < spec.mismatch_rate if spec.columns else []
+        counts["files"].append({"shared_keys": len(shared), "mismatched_keys": int(np.sum(mismatched))})
+    return counts
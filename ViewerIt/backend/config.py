@@ -4,6 +4,7 @@ Centralized settings for the application.
 All configurations are local-only - no external services or telemetry.
 """
 import os
+import tempfile
 from pathlib import Path
 
 # =============================================================================
@@ -29,6 +30,9 @@ DANGEROUS_FILENAME_PATTERNS = [
 # Common delimiters for auto-detection
 FILE_DELIMITERS = [",", "\t", "|", ";", "\x14"]
 
+# Upload content digests remembered, least recently used dropped first
+CONTENT_HASH_CACHE_MAX_FILES = int(os.getenv("CONTENT_HASH_CACHE_MAX_FILES", 4096))
+
 # =============================================================================
 # COMPARISON SETTINGS
 # =============================================================================
@@ -40,6 +44,55 @@ COMPARISON_TIMEOUT = int(os.getenv("COMPARISON_TIMEOUT", 300))  # 5 minutes
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 50000))  # Rows per chunk
 LARGE_FILE_THRESHOLD = int(os.getenv("LARGE_FILE_THRESHOLD", 100000))  # Rows
 
+# =============================================================================
+# DIFF EXPORT SETTINGS
+# =============================================================================
+# Full difference sets are written under <session dir>/exports
+EXPORTS_DIRNAME = "exports"
+EXPORT_FORMATS = {"parquet": ".parquet", "csv": ".csv"}
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", 100000))  # Rows per write batch
+EXPORT_DOWNLOAD_CHUNK = 1024 * 1024  # Bytes per streamed download chunk
+
+# =============================================================================
+# KEY INDEXES
+# =============================================================================
+# Key membership of a file set (sorted keys + presence bitmasks) is written
+# once under <session dir>/key_indexes as a memory-mappable Arrow IPC file
+KEY_INDEX_DIRNAME = "key_indexes"
+KEY_INDEX_PAGE_SIZE = int(os.getenv("KEY_INDEX_PAGE_SIZE", 1000))  # Keys per query page
+
+# =============================================================================
+# COMPARISON RESULT CACHE (IN-MEMORY)
+# =============================================================================
+# Completed comparisons are reused by drill-down endpoints while they fit
+COMPARISON_CACHE_MAX_MB = int(os.getenv("COMPARISON_CACHE_MAX_MB", 512))
+COMPARISON_CACHE_MAX_BYTES = COMPARISON_CACHE_MAX_MB * 1024 * 1024
+
+# =============================================================================
+# MULTI-FILE OVERLAP (UPSET / VENN)
+# =============================================================================
+# Key membership is a 64-bit mask per key, so up to 64 files are supported;
+# responses list this many of the largest exclusive intersections
+OVERLAP_TOP_K = int(os.getenv("OVERLAP_TOP_K", 50))
+
+# =============================================================================
+# COLUMN PROFILING
+# =============================================================================
+# Column profiles are shared by schema, quality and comparison services
+PROFILE_CACHE_MAX_FILES = int(os.getenv("PROFILE_CACHE_MAX_FILES", 64))  # Files kept in profile cache
+PROFILE_TOP_VALUES = 5  # Most frequent values kept per column
+PROFILE_MAX_TRACKED_VALUES = int(os.getenv("PROFILE_MAX_TRACKED_VALUES", 1000000))  # Per column, chunked mode
+# Columns with more distinct values switch to mergeable sketches (chunked mode)
+PROFILE_HLL_PRECISION = int(os.getenv("PROFILE_HLL_PRECISION", 14))  # 2^14 registers: ~0.8% distinct-count error
+PROFILE_KLL_K = int(os.getenv("PROFILE_KLL_K", 200))  # Quantile sketch size: ~1.3% rank error
+PROFILE_HEAVY_HITTERS = int(os.getenv("PROFILE_HEAVY_HITTERS", 1000))  # Misra-Gries counters for top values
+
+# =============================================================================
+# COLUMN MAPPING SUGGESTIONS
+# =============================================================================
+# Non-null rows sampled per unmatched column for its value signature
+COLUMN_MAPPING_SAMPLE_ROWS = int(os.getenv("COLUMN_MAPPING_SAMPLE_ROWS", 1000))
+
 # =============================================================================
 # AI / OLLAMA SETTINGS (LOCAL ONLY)
 # =============================================================================
@@ -89,6 +142,55 @@ QUALITY_FORMAT_PATTERNS = {
     'ipv4': r'^(?:(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}(?:25[0-5]|2[0-4]\d|[01]?\d\d?)$',
 }
 
+# Numeric columns correlated pairwise (the first ones, in file order)
+QUALITY_CORRELATION_MAX_COLUMNS = int(os.getenv("QUALITY_CORRELATION_MAX_COLUMNS", 200))
+
+# =============================================================================
+# SAMPLED QUALITY CHECKS
+# =============================================================================
+# mode="sampled" checks a uniform row sample and reports confidence intervals
+QUALITY_SAMPLE_ROWS = int(os.getenv("QUALITY_SAMPLE_ROWS", 100000))
+QUALITY_SAMPLE_CONFIDENCE = float(os.getenv("QUALITY_SAMPLE_CONFIDENCE", 0.95))
+
+# =============================================================================
+# STREAMING QUALITY CHECKS
+# =============================================================================
+# Exact checks on large CSV files stream chunks instead of loading the file.
+# Row fingerprints, distinct-value hashes and numeric values are buffered up
+# to this budget and spilled to partitioned temp files beyond it
+QUALITY_STREAMING_MEMORY_MB = int(os.getenv("QUALITY_STREAMING_MEMORY_MB", 256))
+QUALITY_SPILL_PARTITIONS = 64
+
+# =============================================================================
+# DUPLICATE & NEAR-DUPLICATE ROWS
+# =============================================================================
+# Near-duplicates: "minhash" (token Jaccard >= threshold) or "simhash"
+# (at most max_hamming of 64 sketch bits differ); found via LSH buckets
+NEAR_DUPLICATE_METHOD = os.getenv("NEAR_DUPLICATE_METHOD", "minhash")
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.8))
+NEAR_DUPLICATE_MAX_HAMMING = int(os.getenv("NEAR_DUPLICATE_MAX_HAMMING", 3))
+NEAR_DUPLICATE_NUM_PERM = 64  # MinHash signature length (power of two)
+NEAR_DUPLICATE_MAX_BUCKET = 200  # Larger LSH buckets are paired star-wise
+# Fingerprints, bucket keys and sketches spill to temp files beyond this
+DUPLICATE_MEMORY_MB = int(os.getenv("DUPLICATE_MEMORY_MB", 256))
+DUPLICATE_SAMPLE_GROUPS = 20  # Duplicate groups / clusters listed per result
+
+# =============================================================================
+# WORKER POOL (LOCAL PROCESSES)
+# =============================================================================
+# Shared process pool for per-file work (e.g. multi-dataset quality checks).
+# Jobs start while their estimated memory fits the budget; one always runs
+WORKER_POOL_MAX_WORKERS = int(os.getenv("WORKER_POOL_MAX_WORKERS", os.cpu_count() or 1))
+WORKER_POOL_MEMORY_MB = int(os.getenv("WORKER_POOL_MEMORY_MB", 4096))
+WORKER_BASE_MEMORY_MB = 256  # Interpreter, libraries and one chunk per worker
+WORKER_FRAME_EXPANSION = 6  # In-memory frame size / file size on disk (text files)
+# Frames loaded in workers come back as Arrow IPC files here (shared memory if available)
+WORKER_TRANSFER_DIR = os.getenv(
+    "WORKER_TRANSFER_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+)
+# Large CSV files are split into byte ranges of whole records, parsed in the pool
+CSV_RANGE_MB = int(os.getenv("CSV_RANGE_MB", 64))  # Target bytes per range
+
 # =============================================================================
 # CORS SETTINGS (LOCAL DEVELOPMENT)
 # =============================================================================
@@ -104,6 +206,14 @@ CORS_ORIGINS = [
 # =============================================================================
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
+# =============================================================================
+# RESPONSE SERIALIZATION & COMPRESSION
+# =============================================================================
+# Bodies smaller than this are sent uncompressed
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", 32 * 1024))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", 6))
+RESPONSE_ZSTD_LEVEL = int(os.getenv("RESPONSE_ZSTD_LEVEL", 3))
+
 # =============================================================================
 # RATE LIMITING
 # =============================================================================
@@ -116,6 +226,13 @@ RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", 60))  # seconds
 TASK_RESULT_TTL = int(os.getenv("TASK_RESULT_TTL", 3600))  # seconds to keep results
 TASK_CLEANUP_INTERVAL = int(os.getenv("TASK_CLEANUP_INTERVAL", 300))  # cleanup every 5 min
 
+# =============================================================================
+# STAGE METRICS
+# =============================================================================
+# Per-stage wall/CPU time, peak RSS and rows/bytes of every task and request,
+# served locally at /metrics (Prometheus text format) and on task status
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
 # =============================================================================
 # SUPPORTED FILE FORMATS
 # =============================================================================
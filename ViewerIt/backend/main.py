@@ -7,12 +7,14 @@ Enhanced with multi-file comparison, schema analysis, and quality checking.
 """
 import time
 import asyncio
+import functools
 import json
+import re
 from collections import defaultdict
 from pathlib import Path
 from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 import uvicorn
@@ -26,16 +28,31 @@ from services import (
     SchemaAnalyzer,
     QualityChecker,
     MultiDatasetQualityChecker,
+    DiffExporter,
+    comparison_cache,
     task_store,
     TaskStatus,
+    worker_pool,
 )
-from services.chunked_processor import ChunkedProcessor, LARGE_FILE_THRESHOLD
+from services.chunked_processor import ChunkedProcessor, ParallelProcessor, LARGE_FILE_THRESHOLD
+from services.multi_comparator import load_keyed_frame
+from services.key_index import KeyIndex, make_index_id, get_key_index_path
+from services.quality_jobs import build_quality_checker, quality_job, find_file_duplicates
+from services.metrics import metrics_registry, record, rss_bytes, stage
+from response_layer import FastJSONResponse, FastJSONRoute, CompressionMiddleware
 from config import (
     CORS_ORIGINS, 
     SUPPORTED_FORMATS, 
     LOG_LEVEL,
     RATE_LIMIT_REQUESTS,
     RATE_LIMIT_WINDOW,
+    EXPORT_DOWNLOAD_CHUNK,
+    QUALITY_SAMPLE_ROWS,
+    NEAR_DUPLICATE_METHOD,
+    NEAR_DUPLICATE_THRESHOLD,
+    NEAR_DUPLICATE_MAX_HAMMING,
+    KEY_INDEX_PAGE_SIZE,
+    METRICS_ENABLED,
 )
 
 # Configure logging
@@ -99,8 +116,12 @@ app = FastAPI(
     title="ViewerIt API",
     description="eDiscovery Data Comparison & AI Analysis Backend - Enhanced",
     version="2.0.0",
+    default_response_class=FastJSONResponse,
 )
 
+# Serialize endpoint results with orjson instead of jsonable_encoder
+app.router.route_class = FastJSONRoute
+
 # CORS Configuration for React frontend
 app.add_middleware(
     CORSMiddleware,
@@ -110,6 +131,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiated zstd/gzip compression for large response bodies.
+# Registered before the rate limiter so it sees the raw endpoint responses.
+app.add_middleware(CompressionMiddleware)
+
 
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
@@ -153,8 +178,38 @@ async def rate_limit_middleware(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    """
+    Record each request's stages (parsing, comparison, serialization...)
+    under its route for /metrics, and report them in a Server-Timing header.
+    """
+    if not METRICS_ENABLED or request.url.path in ["/", "/health", "/metrics"]:
+        return await call_next(request)
+    
+    with record("request") as recorder:
+        response = await call_next(request)
+        # The router stores the matched route in the scope
+        route = request.scope.get("route")
+        recorder.operation = f"{request.method} {route.path if route else 'unmatched'}"
+        if response.status_code >= 400:
+            recorder.fail()
+        response.headers["Server-Timing"] = recorder.server_timing()
+    
+    return response
+
+
 # ============== Pydantic Models ==============
 
+class FuzzyKeyOptions(BaseModel):
+    """Key normalization and similarity settings for fuzzy key matching."""
+    case_insensitive: bool = True
+    strip_whitespace: bool = True
+    remove_separators: bool = True
+    strip_leading_zeros: bool = True
+    strip_prefixes: list[str] = Field(default_factory=list)
+    threshold: float = Field(default=0.85, gt=0.0, le=1.0, description="Minimum similarity for a fuzzy key match")
+
 class CompareRequest(BaseModel):
     session_id: str
     files: list[str]
@@ -162,6 +217,7 @@ class CompareRequest(BaseModel):
     ignore_columns: Optional[list[str]] = None
     abs_tol: float = Field(default=0.0001, ge=0.0, le=1.0, description="Absolute tolerance for numeric comparison")
     rel_tol: float = Field(default=0.0, ge=0.0, le=1.0, description="Relative tolerance for numeric comparison")
+    fuzzy_keys: Optional[FuzzyKeyOptions] = None  # Enable fuzzy key matching
 
     @field_validator('abs_tol', 'rel_tol')
     @classmethod
@@ -177,8 +233,67 @@ class MultiCompareRequest(BaseModel):
     files: list[str]
     join_columns: list[str]
     ignore_columns: Optional[list[str]] = None
+    fuzzy_keys: Optional[FuzzyKeyOptions] = None  # Enable fuzzy key matching
     use_chunked: bool = False  # Enable chunked processing for large files
 
+class ExportRequest(BaseModel):
+    session_id: str
+    files: list[str]
+    join_columns: list[str]
+    ignore_columns: Optional[list[str]] = None
+    abs_tol: float = Field(default=0.0001, ge=0.0, le=1.0, description="Absolute tolerance for numeric comparison")
+    rel_tol: float = Field(default=0.0, ge=0.0, le=1.0, description="Relative tolerance for numeric comparison")
+    fuzzy_keys: Optional[FuzzyKeyOptions] = None  # Enable fuzzy key matching
+    format: str = Field(default="parquet", pattern="^(parquet|csv)$", description="Export file format")
+
+class KeyIndexRequest(BaseModel):
+    session_id: str
+    files: list[str]
+    join_columns: list[str]
+
+class KeySetRequest(BaseModel):
+    session_id: str
+    index_id: str
+    include: list[str] = Field(default_factory=list, description="Files every selected key is in")
+    exclude: list[str] = Field(default_factory=list, description="Files no selected key is in")
+    limit: int = Field(default=KEY_INDEX_PAGE_SIZE, ge=0, le=100000, description="Keys per page")
+    offset: int = Field(default=0, ge=0)
+
+class KeyLookupRequest(BaseModel):
+    session_id: str
+    index_id: str
+    keys: list[str] = Field(max_length=10000, description="Composite keys ('val1|val2')")
+
+class KeyExportRequest(BaseModel):
+    session_id: str
+    index_id: str
+    include: list[str] = Field(default_factory=list, description="Files every exported key is in")
+    exclude: list[str] = Field(default_factory=list, description="Files no exported key is in")
+    format: str = Field(default="parquet", pattern="^(parquet|csv)$", description="Export file format")
+
+class RowDiffRequest(BaseModel):
+    session_id: str
+    file1: str
+    file2: str
+    join_columns: list[str]
+    key: dict[str, str | int | float]
+    ignore_columns: Optional[list[str]] = None
+    abs_tol: float = Field(default=0.0001, ge=0.0, le=1.0, description="Absolute tolerance for numeric comparison")
+    rel_tol: float = Field(default=0.0, ge=0.0, le=1.0, description="Relative tolerance for numeric comparison")
+
+class ColumnDiffBatchRequest(BaseModel):
+    session_id: str
+    file1: str
+    file2: str
+    join_columns: list[str]
+    columns: Optional[list[str]] = None  # Default: every compared column
+    limit: int = Field(default=100, ge=0, le=1000, description="Maximum differences per column")
+    offset: int = Field(default=0, ge=0, description="Differences to skip per column")
+    ignore_columns: Optional[list[str]] = None
+    abs_tol: float = Field(default=0.0001, ge=0.0, le=1.0, description="Absolute tolerance for numeric comparison")
+    rel_tol: float = Field(default=0.0, ge=0.0, le=1.0, description="Relative tolerance for numeric comparison")
+    fuzzy_keys: Optional[FuzzyKeyOptions] = None  # Must match the comparison being drilled into
+
 class SchemaAnalysisRequest(BaseModel):
     session_id: str
     files: list[str]
@@ -186,6 +301,18 @@ class SchemaAnalysisRequest(BaseModel):
 class QualityCheckRequest(BaseModel):
     session_id: str
     files: list[str]
+    mode: str = Field(default="exact", pattern="^(exact|sampled)$", description="'sampled' checks a random row sample with confidence intervals")
+    sample_size: int = Field(default=QUALITY_SAMPLE_ROWS, ge=100, description="Rows sampled per file in sampled mode")
+    refine: bool = False  # Sampled mode: also run an exact check in the background
+
+class DuplicateCheckRequest(BaseModel):
+    session_id: str
+    files: list[str]
+    columns: Optional[list[str]] = None  # Default: columns common to all files
+    normalize: bool = False  # Ignore text case and whitespace differences
+    near_method: Optional[str] = Field(default=NEAR_DUPLICATE_METHOD, pattern="^(minhash|simhash)$", description="Near-duplicate method; null for exact duplicates only")
+    threshold: float = Field(default=NEAR_DUPLICATE_THRESHOLD, gt=0, le=1, description="MinHash similarity threshold")
+    max_hamming: int = Field(default=NEAR_DUPLICATE_MAX_HAMMING, ge=0, le=63, description="SimHash maximum differing bits")
 
 class AIAnalyzeRequest(BaseModel):
     model: str
@@ -208,8 +335,140 @@ class AIStreamRequest(BaseModel):
     comparison_summary: dict
 
 
+# ============== Comparison Cache Helpers ==============
+
+def _fuzzy_options(options: Optional[FuzzyKeyOptions]) -> dict | None:
+    """Convert request fuzzy-key options to the service keyword arguments."""
+    return options.model_dump() if options is not None else None
+
+
+def _fuzzy_cache_token(fuzzy_keys: dict | None) -> str | None:
+    """Hashable form of fuzzy-key options for cache keys."""
+    return json.dumps(fuzzy_keys, sort_keys=True) if fuzzy_keys is not None else None
+
+
+def _get_pairwise_comparison(
+    session_id: str,
+    file1: str,
+    file2: str,
+    join_columns: list[str],
+    ignore_columns: list[str] | None,
+    abs_tol: float,
+    rel_tol: float,
+    fuzzy_keys: dict | None = None,
+    loaded: dict | None = None,
+    preload: list[str] | None = None,
+) -> tuple[DataComparator, dict]:
+    """
+    Get a completed pairwise comparison, reusing a cached one when the file
+    contents and parameters match.
+    
+    Args:
+        loaded: Optional dict of already-loaded dataframes by filename,
+                shared across calls within one request
+        preload: Other files to load in parallel with these two on a cache
+                 miss (e.g. the rest of a batch), added to loaded
+    
+    Returns:
+        (comparator, result) - the result is a shallow copy, safe to extend
+    """
+    key = comparison_cache.make_key(
+        "pairwise",
+        [FileHandler.get_content_hash(session_id, f) for f in (file1, file2)],
+        join_columns, ignore_columns, abs_tol, rel_tol,
+        names=(file1, file2),
+        fuzzy=_fuzzy_cache_token(fuzzy_keys),
+    )
+    cached = comparison_cache.get(key)
+    if cached is None:
+        loaded = loaded if loaded is not None else {}
+        missing = [f for f in dict.fromkeys([file1, file2, *(preload or [])]) if f not in loaded]
+        loaded.update(parallel_processor.load_session_files(session_id, missing))
+        
+        comparator = DataComparator(loaded[file1], loaded[file2], file1, file2)
+        result = comparator.compare(
+            join_columns=join_columns,
+            ignore_columns=ignore_columns,
+            abs_tol=abs_tol,
+            rel_tol=rel_tol,
+            fuzzy_keys=fuzzy_keys,
+        )
+        cached = (comparator, result)
+        comparison_cache.put(key, cached)
+    
+    comparator, result = cached
+    return comparator, dict(result)
+
+
+def _get_multi_comparison(
+    session_id: str,
+    files: list[str],
+    join_columns: list[str],
+    ignore_columns: list[str] | None,
+    fuzzy_keys: dict | None = None,
+    on_load=None,
+) -> tuple[MultiFileComparator, dict]:
+    """
+    Get a completed multi-file comparison, reusing a cached one when the file
+    contents and parameters match.
+    
+    Files load in parallel in the worker pool, each reduced there to its
+    composite key and compared columns; each is registered with the
+    comparison as soon as it arrives, while the others are still loading.
+    
+    Args:
+        on_load: Optional callback(index, filename, rows) as each file is
+                 loaded and registered
+    
+    Returns:
+        (comparator, result) - the result is a shallow copy, safe to extend
+    """
+    key = comparison_cache.make_key(
+        "multi",
+        [FileHandler.get_content_hash(session_id, f) for f in files],
+        join_columns, ignore_columns,
+        names=tuple(files),
+        fuzzy=_fuzzy_cache_token(fuzzy_keys),
+    )
+    cached = comparison_cache.get(key)
+    if cached is None:
+        done = []
+        
+        def file_registered(filename: str, rows: int):
+            done.append(filename)
+            if on_load:
+                on_load(len(done), filename, rows)
+        
+        frames = parallel_processor.iter_session_files(
+            session_id, files, load_keyed_frame, join_columns, ignore_columns
+        )
+        cached = MultiFileComparator.compare_stream(
+            files, frames, join_columns, ignore_columns,
+            fuzzy_keys=fuzzy_keys, on_file=file_registered,
+        )
+        comparison_cache.put(key, cached)
+    
+    comparator, result = cached
+    return comparator, dict(result)
+
+
 # ============== Background Task Functions ==============
 
+def _recorded(task_type: str):
+    """
+    Record a background task's stages under 'task:<task_type>' in /metrics.
+    The task store attaches them to the task when it completes or fails.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with record(f"task:{task_type}"):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@_recorded("comparison")
 def run_comparison_task(
     task_id: str,
     session_id: str,
@@ -218,13 +477,14 @@ def run_comparison_task(
     ignore_columns: list[str] | None,
     abs_tol: float,
     rel_tol: float,
+    fuzzy_keys: dict | None = None,
 ):
     """Background task for pairwise file comparison."""
     try:
-        task_store.update_progress(task_id, 10, "Loading base file...")
+        task_store.update_progress(task_id, 10, "Loading files...")
         
         base_file = files[0]
-        df_base = FileHandler.load_dataframe(session_id, base_file)
+        loaded = {}
         
         comparisons = []
         total_comparisons = len(files) - 1
@@ -235,14 +495,10 @@ def run_comparison_task(
                 task_id, progress, f"Comparing {base_file} vs {other_file}..."
             )
             
-            df_other = FileHandler.load_dataframe(session_id, other_file)
-            
-            comparator = DataComparator(df_base, df_other, base_file, other_file)
-            result = comparator.compare(
-                join_columns=join_columns,
-                ignore_columns=ignore_columns,
-                abs_tol=abs_tol,
-                rel_tol=rel_tol,
+            comparator, result = _get_pairwise_comparison(
+                session_id, base_file, other_file,
+                join_columns, ignore_columns, abs_tol, rel_tol,
+                fuzzy_keys=fuzzy_keys, loaded=loaded, preload=files[2:],
             )
             
             result["statistics"] = comparator.get_statistics()
@@ -258,30 +514,29 @@ def run_comparison_task(
         task_store.fail_task(task_id, str(e))
 
 
+@_recorded("multi_comparison")
 def run_multi_comparison_task(
     task_id: str,
     session_id: str,
     files: list[str],
     join_columns: list[str],
     ignore_columns: list[str] | None,
+    fuzzy_keys: dict | None = None,
 ):
     """Background task for multi-file comparison."""
     try:
         task_store.update_progress(task_id, 10, "Loading dataframes...")
         
-        dataframes = {}
-        for idx, filename in enumerate(files):
-            progress = 10 + int((idx / len(files)) * 30)
-            task_store.update_progress(task_id, progress, f"Loading {filename}...")
-            df = FileHandler.load_dataframe(session_id, filename)
-            dataframes[filename] = df
-        
-        task_store.update_progress(task_id, 50, "Performing multi-file comparison...")
+        def on_load(idx: int, filename: str, rows: int):
+            progress = 10 + int((idx / len(files)) * 70)
+            task_store.update_progress(
+                task_id, progress, f"Loaded and registered {filename} ({idx}/{len(files)})",
+                partial={filename: {"rows": rows}},
+            )
         
-        comparator = MultiFileComparator(dataframes)
-        result = comparator.compare(
-            join_columns=join_columns,
-            ignore_columns=ignore_columns,
+        comparator, result = _get_multi_comparison(
+            session_id, files, join_columns, ignore_columns,
+            fuzzy_keys=fuzzy_keys, on_load=on_load,
         )
         
         task_store.update_progress(task_id, 90, "Generating reconciliation report...")
@@ -294,38 +549,148 @@ def run_multi_comparison_task(
         task_store.fail_task(task_id, str(e))
 
 
+@_recorded("export")
+def run_export_task(
+    task_id: str,
+    session_id: str,
+    files: list[str],
+    join_columns: list[str],
+    ignore_columns: list[str] | None,
+    abs_tol: float,
+    rel_tol: float,
+    export_format: str,
+    fuzzy_keys: dict | None = None,
+):
+    """Background task for exporting full difference sets."""
+    try:
+        exporter = DiffExporter(session_id, format=export_format)
+        
+        if len(files) == 2:
+            task_store.update_progress(task_id, 10, f"Comparing {files[0]} vs {files[1]}...")
+            comparator, _ = _get_pairwise_comparison(
+                session_id, files[0], files[1],
+                join_columns, ignore_columns, abs_tol, rel_tol,
+                fuzzy_keys=fuzzy_keys,
+            )
+            
+            task_store.update_progress(task_id, 70, "Writing difference files...")
+            result = exporter.export_pairwise(comparator)
+        else:
+            def on_load(idx: int, filename: str, rows: int):
+                progress = 10 + int((idx / len(files)) * 60)
+                task_store.update_progress(task_id, progress, f"Loaded {filename} ({idx}/{len(files)})")
+            
+            comparator, _ = _get_multi_comparison(
+                session_id, files, join_columns, ignore_columns,
+                fuzzy_keys=fuzzy_keys, on_load=on_load,
+            )
+            
+            task_store.update_progress(task_id, 70, "Writing difference files...")
+            result = exporter.export_multi(comparator)
+        
+        task_store.complete_task(task_id, result)
+        
+    except Exception as e:
+        logger.error(f"Export task {task_id} failed: {str(e)}")
+        task_store.fail_task(task_id, str(e))
+
+
+def _run_quality_check(session_id: str, files: list[str], mode: str = "exact",
+                       sample_size: int = QUALITY_SAMPLE_ROWS,
+                       on_chunk=None, on_result=None) -> dict:
+    """
+    Run single-file or multi-dataset quality checks.
+    
+    A single file is checked in this process; multiple files are loaded and
+    checked concurrently in the shared worker pool.
+    
+    Args:
+        on_chunk: Optional callback(filename, rows_read) while a single large file streams
+        on_result: Optional callback(filename, result) as each file's check completes
+    """
+    if len(files) == 1:
+        file_on_chunk = (lambda rows: on_chunk(files[0], rows)) if on_chunk else None
+        checker = build_quality_checker(
+            session_id, files[0], mode, sample_size, chunked_processor, file_on_chunk
+        )
+        return checker.check_all()
+    
+    jobs = {filename: quality_job(session_id, filename, mode, sample_size) for filename in files}
+    return MultiDatasetQualityChecker(jobs=jobs, pool=worker_pool).check_all(on_result=on_result)
+
+
+@_recorded("quality_check")
 def run_quality_check_task(
     task_id: str,
     session_id: str,
     files: list[str],
+    mode: str = "exact",
+    sample_size: int = QUALITY_SAMPLE_ROWS,
+    refine_task_id: Optional[str] = None,
 ):
     """Background task for quality checking."""
     try:
+        action = "Sampling" if mode == "sampled" else "Loading"
         if len(files) == 1:
-            task_store.update_progress(task_id, 20, f"Loading {files[0]}...")
-            filename = files[0]
-            df = FileHandler.load_dataframe(session_id, filename)
-            
-            task_store.update_progress(task_id, 50, "Running quality checks...")
-            checker = QualityChecker(df, filename)
-            result = checker.check_all()
+            task_store.update_progress(task_id, 10, f"{action} {files[0]}...")
         else:
-            dataframes = {}
-            for idx, filename in enumerate(files):
-                progress = 10 + int((idx / len(files)) * 40)
-                task_store.update_progress(task_id, progress, f"Loading {filename}...")
-                df = FileHandler.load_dataframe(session_id, filename)
-                dataframes[filename] = df
-            
-            task_store.update_progress(task_id, 60, "Running multi-dataset quality checks...")
-            checker = MultiDatasetQualityChecker(dataframes)
-            result = checker.check_all()
+            task_store.update_progress(task_id, 10, f"{action} and checking {len(files)} files in parallel...")
+        
+        def on_chunk(filename: str, rows: int):
+            task_store.update_progress(task_id, 50, f"Streaming {filename}: {rows:,} rows checked...")
+        
+        checked = []
+        
+        def on_result(filename: str, result: dict):
+            checked.append(filename)
+            progress = 10 + int((len(checked) / len(files)) * 80)
+            summary = {
+                "quality_score": result["quality_score"]["total"],
+                "grade": result["quality_score"]["grade"],
+                "row_count": result["row_count"],
+            }
+            task_store.update_progress(
+                task_id, progress, f"Checked {filename} ({len(checked)}/{len(files)})",
+                partial={filename: summary},
+            )
+        
+        result = _run_quality_check(session_id, files, mode, sample_size, on_chunk, on_result)
+        if refine_task_id:
+            result["refinement_task_id"] = refine_task_id
         
         task_store.complete_task(task_id, result)
         
     except Exception as e:
         logger.error(f"Quality check task {task_id} failed: {str(e)}")
         task_store.fail_task(task_id, str(e))
+        if refine_task_id:
+            task_store.fail_task(refine_task_id, f"Sampled check failed: {str(e)}")
+        return
+    
+    # Exact follow-up for a sampled check
+    if refine_task_id:
+        run_quality_check_task(refine_task_id, session_id, files)
+
+
+@_recorded("duplicate_check")
+def run_duplicate_check_task(task_id: str, request: DuplicateCheckRequest):
+    """Background task for duplicate and near-duplicate detection."""
+    try:
+        task_store.update_progress(task_id, 10, f"Fingerprinting {len(request.files)} file(s)...")
+        
+        def on_chunk(filename: str, rows: int):
+            task_store.update_progress(task_id, 50, f"Fingerprinting {filename}: {rows:,} rows...")
+        
+        result = find_file_duplicates(
+            request.session_id, request.files, request.columns, request.normalize,
+            request.near_method, request.threshold, request.max_hamming,
+            processor=chunked_processor, on_chunk=on_chunk,
+        )
+        task_store.complete_task(task_id, result)
+        
+    except Exception as e:
+        logger.error(f"Duplicate check task {task_id} failed: {str(e)}")
+        task_store.fail_task(task_id, str(e))
 
 
 # ============== Health & Info ==============
@@ -349,6 +714,8 @@ async def root():
             "/compare/multi",
             "/schema/analyze",
             "/quality/check",
+            "/quality/duplicates",
+            "/export/diff",
             "/ai/models", 
             "/ai/analyze",
         ],
@@ -358,6 +725,18 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Per-operation and per-stage timing and memory metrics in the Prometheus
+    text exposition format.
+    """
+    body = metrics_registry.render(extra_gauges={
+        "process_resident_memory_bytes": ("Resident memory of the API process", rss_bytes()),
+        "viewerit_tasks_active": ("Background tasks pending or running", task_store.get_active_task_count()),
+    })
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
 @app.get("/formats")
 async def get_supported_formats():
     """Get list of supported file formats."""
@@ -377,11 +756,13 @@ async def upload_files(files: list[UploadFile] = File(...)):
     
     for file in files:
         try:
-            content = await file.read()
-            if session_id is None:
-                session_id = FileHandler.save_uploaded_file(content, file.filename)
-            else:
-                FileHandler.save_uploaded_file(content, file.filename, session_id)
+            with stage("upload") as upload:
+                content = await file.read()
+                upload.add(bytes=len(content))
+                if session_id is None:
+                    session_id = FileHandler.save_uploaded_file(content, file.filename)
+                else:
+                    FileHandler.save_uploaded_file(content, file.filename, session_id)
             
             uploaded.append(file.filename)
         except ValueError as e:
@@ -481,6 +862,7 @@ async def compare_files(request: CompareRequest, background_tasks: BackgroundTas
             request.ignore_columns,
             request.abs_tol,
             request.rel_tol,
+            _fuzzy_options(request.fuzzy_keys),
         )
         
         return {
@@ -510,19 +892,16 @@ async def compare_files_sync(request: CompareRequest):
             raise HTTPException(status_code=400, detail="At least two files are required for comparison")
 
         base_file = request.files[0]
-        df_base = FileHandler.load_dataframe(request.session_id, base_file)
+        loaded = {}
         
         comparisons = []
         
         for other_file in request.files[1:]:
-            df_other = FileHandler.load_dataframe(request.session_id, other_file)
-            
-            comparator = DataComparator(df_base, df_other, base_file, other_file)
-            result = comparator.compare(
-                join_columns=request.join_columns,
-                ignore_columns=request.ignore_columns,
-                abs_tol=request.abs_tol,
-                rel_tol=request.rel_tol,
+            comparator, result = _get_pairwise_comparison(
+                request.session_id, base_file, other_file,
+                request.join_columns, request.ignore_columns,
+                request.abs_tol, request.rel_tol,
+                fuzzy_keys=_fuzzy_options(request.fuzzy_keys), loaded=loaded,
             )
             
             # Add statistics
@@ -546,27 +925,74 @@ async def get_column_differences(
     file2: str,
     join_columns: list[str],
     diff_column: str,
-    limit: int = Query(default=100, le=1000)
+    limit: int = Query(default=100, le=1000),
+    offset: int = Query(default=0, ge=0),
+    ignore_columns: Optional[list[str]] = Query(default=None),
+    abs_tol: float = Query(default=0.0001, ge=0.0, le=1.0),
+    rel_tol: float = Query(default=0.0, ge=0.0, le=1.0),
 ):
-    """Get detailed differences for a specific column."""
+    """
+    Get detailed differences for a specific column.
+    Reuses the cached comparison when the same files and parameters were compared.
+    """
     try:
-        df1 = FileHandler.load_dataframe(session_id, file1)
-        df2 = FileHandler.load_dataframe(session_id, file2)
-        
-        comparator = DataComparator(df1, df2, file1, file2)
-        comparator.compare(join_columns=join_columns)
+        comparator, _ = _get_pairwise_comparison(
+            session_id, file1, file2, join_columns, ignore_columns, abs_tol, rel_tol,
+        )
         
-        diffs = comparator.get_detailed_diff(diff_column, limit)
+        diffs = comparator.get_detailed_diff(diff_column, limit, offset=offset)
         return {"column": diff_column, "differences": diffs, "count": len(diffs)}
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+
+@app.post("/compare/column-diff/batch")
+async def get_column_differences_batch(request: ColumnDiffBatchRequest):
+    """
+    Get one page of differences for many (default: all) columns at once,
+    in columnar form, so every column's first page can be prefetched.
+    """
+    try:
+        comparator, _ = _get_pairwise_comparison(
+            request.session_id, request.file1, request.file2,
+            request.join_columns, request.ignore_columns,
+            request.abs_tol, request.rel_tol,
+            fuzzy_keys=_fuzzy_options(request.fuzzy_keys),
+        )
+        return comparator.get_detailed_diffs(
+            request.columns, limit=request.limit, offset=request.offset,
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/compare/row-diff")
+async def get_row_differences(request: RowDiffRequest):
+    """
+    Get both versions of a single row (identified by its join key values)
+    and the columns that differ. Reuses the cached comparison when available.
+    """
+    try:
+        comparator, _ = _get_pairwise_comparison(
+            request.session_id, request.file1, request.file2,
+            request.join_columns, request.ignore_columns,
+            request.abs_tol, request.rel_tol,
+        )
+        return comparator.get_row_diff(request.key)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ============== Multi-File Comparison Operations ==============
 
-# Initialize chunked processor
+# Initialize chunked processor and multi-file loader (both use the shared worker pool)
 chunked_processor = ChunkedProcessor()
+parallel_processor = ParallelProcessor()
 
 
 def _get_file_path(session_id: str, filename: str) -> Path:
@@ -631,6 +1057,7 @@ async def compare_multiple_files(request: MultiCompareRequest, background_tasks:
             request.files,
             request.join_columns,
             request.ignore_columns,
+            _fuzzy_options(request.fuzzy_keys),
         )
         
         response = {
@@ -661,11 +1088,29 @@ async def compare_multiple_files_sync(request: MultiCompareRequest):
     """
     Synchronous multi-file comparison (immediate result, no task polling).
     Use for small files or when immediate response is needed.
+    
+    With use_chunked=True, CSV files are compared by key only, without
+    loading them: key membership counts and the largest intersections.
     """
     try:
         if len(request.files) < 2:
             raise HTTPException(status_code=400, detail="At least 2 files required")
         
+        if request.use_chunked:
+            file_paths = [_get_file_path(request.session_id, filename) for filename in request.files]
+            for path in file_paths:
+                if not path.exists():
+                    raise HTTPException(status_code=404, detail=f"File not found: {path.name}")
+                if path.suffix.lower() != '.csv':
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Chunked comparison only supports CSV files. {path.name} is not CSV."
+                    )
+            result = chunked_processor.compare_multiple_files_chunked(file_paths, request.join_columns)
+            result["method"] = "chunked"
+            result["memory_efficient"] = True
+            return result
+        
         # Check if any files are large
         large_files = []
         for filename in request.files:
@@ -683,17 +1128,11 @@ async def compare_multiple_files_sync(request: MultiCompareRequest):
                 "suggestion": "Set use_chunked=True in the request for memory-efficient processing."
             })
         
-        # Load all dataframes
-        dataframes = {}
-        for filename in request.files:
-            df = FileHandler.load_dataframe(request.session_id, filename)
-            dataframes[filename] = df
-        
-        # Perform multi-file comparison
-        comparator = MultiFileComparator(dataframes)
-        result = comparator.compare(
-            join_columns=request.join_columns,
-            ignore_columns=request.ignore_columns,
+        # Perform multi-file comparison (cached by content and parameters)
+        comparator, result = _get_multi_comparison(
+            request.session_id, request.files,
+            request.join_columns, request.ignore_columns,
+            fuzzy_keys=_fuzzy_options(request.fuzzy_keys),
         )
         
         # Add reconciliation report
@@ -706,6 +1145,8 @@ async def compare_multiple_files_sync(request: MultiCompareRequest):
         return result
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -777,7 +1218,9 @@ async def get_chunked_file_stats(session_id: str, filename: str):
                 detail="Chunked statistics only available for CSV files"
             )
         
-        stats = chunked_processor.get_chunked_statistics(file_path)
+        stats = chunked_processor.get_chunked_statistics(
+            file_path, content_hash=FileHandler.get_content_hash(session_id, filename)
+        )
         stats["filename"] = filename
         stats["method"] = "chunked"
         
@@ -787,6 +1230,233 @@ async def get_chunked_file_stats(session_id: str, filename: str):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# ============== Key Index Operations ==============
+
+def _open_key_index(session_id: str, index_id: str) -> KeyIndex:
+    """Open a session's key index, as an HTTP error when it is missing or invalid."""
+    try:
+        return KeyIndex.open(session_id, index_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Key index not found: {index_id}. Build it with /keys/index")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/keys/index")
+async def build_key_index(request: KeyIndexRequest):
+    """
+    Build (or reopen) the key index of a set of CSV files: every composite
+    key with its file-membership bitmask, stored on disk next to the uploads.
+    The index is named after the files' contents, so repeated requests for
+    the same uploads reuse it without reading the files again.
+    Returns the index_id for /keys/query, /keys/lookup and /keys/export,
+    with the overlap statistics of the files.
+    """
+    try:
+        if not request.files:
+            raise HTTPException(status_code=400, detail="At least 1 file required")
+        if len(set(request.files)) != len(request.files):
+            raise HTTPException(status_code=400, detail="Files must be distinct")
+        
+        file_paths = [_get_file_path(request.session_id, filename) for filename in request.files]
+        for path in file_paths:
+            if not path.is_file():
+                raise HTTPException(status_code=404, detail=f"File not found: {path.name}")
+            if path.suffix.lower() != '.csv':
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Key indexes only support CSV files. {path.name} is not CSV."
+                )
+        
+        index_id = make_index_id(
+            [FileHandler.get_content_hash(request.session_id, f) for f in request.files],
+            request.files, request.join_columns,
+        )
+        index_path = get_key_index_path(request.session_id, index_id)
+        reused = index_path.exists()
+        if not reused:
+            chunked_processor.build_key_index(file_paths, request.join_columns, index_path)
+        
+        index = KeyIndex(index_path)
+        return {"index_id": index_id, "reused": reused, **index.summary()}
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Key index error: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/keys/query")
+async def query_key_index(request: KeySetRequest):
+    """
+    Page through the keys held by every file in include and by none in
+    exclude (e.g. keys in A and C but not B), from a built key index.
+    """
+    index = _open_key_index(request.session_id, request.index_id)
+    try:
+        return {
+            "index_id": request.index_id,
+            **index.query(request.include, request.exclude, request.limit, request.offset),
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/keys/lookup")
+async def lookup_keys(request: KeyLookupRequest):
+    """Which files hold each of the given composite keys, from a built key index."""
+    index = _open_key_index(request.session_id, request.index_id)
+    return {"index_id": request.index_id, "results": index.lookup(request.keys)}
+
+
+@app.post("/keys/export")
+async def export_keys(request: KeyExportRequest):
+    """
+    Export the keys selected by include / exclude, with their membership, to
+    Parquet or CSV from a built key index. Returns the export manifest;
+    download the file from /exports/{session_id}/{filename}.
+    """
+    index = _open_key_index(request.session_id, request.index_id)
+    try:
+        exporter = DiffExporter(request.session_id, format=request.format)
+        return exporter.export_keys(index, request.include, request.exclude)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Key export error: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ============== Difference Export Operations ==============
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _file_download_response(path: Path, range_header: Optional[str]):
+    """
+    Serve a file, honouring a single HTTP byte range when requested.
+    Returns 206 with Content-Range for ranges, 416 if unsatisfiable.
+    """
+    file_size = path.stat().st_size
+    start, end = 0, file_size - 1
+    status_code = 200
+    
+    if range_header:
+        match = _RANGE_PATTERN.match(range_header.strip())
+        if not match or not (match.group(1) or match.group(2)):
+            raise HTTPException(
+                status_code=416,
+                detail="Invalid or unsupported Range header",
+                headers={"Content-Range": f"bytes */{file_size}"},
+            )
+        
+        if match.group(1):
+            start = int(match.group(1))
+            if match.group(2):
+                end = min(int(match.group(2)), file_size - 1)
+        else:
+            # Suffix range: the last N bytes
+            start = max(0, file_size - int(match.group(2)))
+        
+        if start >= file_size or start > end:
+            raise HTTPException(
+                status_code=416,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{file_size}"},
+            )
+        status_code = 206
+    
+    def iter_file():
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                data = f.read(min(EXPORT_DOWNLOAD_CHUNK, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+    
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(max(0, end - start + 1)),
+        "Content-Disposition": f'attachment; filename="{path.name}"',
+    }
+    if status_code == 206:
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+    
+    media_type = "text/csv" if path.suffix == ".csv" else "application/octet-stream"
+    return StreamingResponse(iter_file(), status_code=status_code,
+                             media_type=media_type, headers=headers)
+
+
+@app.post("/export/diff")
+async def export_differences(request: ExportRequest, background_tasks: BackgroundTasks):
+    """
+    Export complete difference sets (not samples) to Parquet or CSV.
+    Two files produce pairwise exports; 3+ files produce presence bitmasks
+    and cross-file value mismatches.
+    Returns task_id for async processing - poll /tasks/{task_id} for the manifest.
+    """
+    try:
+        if len(request.files) < 2:
+            raise HTTPException(status_code=400, detail="At least 2 files required")
+        
+        # Validate files exist before starting task
+        session_files = FileHandler.get_session_files(request.session_id)
+        for filename in request.files:
+            if filename not in session_files:
+                raise HTTPException(status_code=404, detail=f"File not found: {filename}")
+        
+        task = task_store.create_task("diff_export")
+        
+        background_tasks.add_task(
+            run_export_task,
+            task.id,
+            request.session_id,
+            request.files,
+            request.join_columns,
+            request.ignore_columns,
+            request.abs_tol,
+            request.rel_tol,
+            request.format,
+            _fuzzy_options(request.fuzzy_keys),
+        )
+        
+        return {
+            "task_id": task.id,
+            "status": "pending",
+            "message": f"Difference export started for {len(request.files)} files",
+            "poll_url": f"/tasks/{task.id}",
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Export error: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/exports/{session_id}")
+async def list_exports(session_id: str):
+    """List exported difference files for a session."""
+    return {"session_id": session_id, "exports": DiffExporter.list_exports(session_id)}
+
+
+@app.get("/exports/{session_id}/{filename}")
+async def download_export(session_id: str, filename: str, request: Request):
+    """Download an exported difference file. Supports HTTP Range requests."""
+    try:
+        path = DiffExporter.get_export_path(session_id, filename)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return _file_download_response(path, request.headers.get("range"))
+
 # ============== Schema Analysis Operations ==============
 
 @app.post("/schema/analyze")
@@ -836,20 +1506,30 @@ async def check_data_quality(request: QualityCheckRequest, background_tasks: Bac
         
         # Create task and start background processing
         task = task_store.create_task("quality_check")
+        refine_task = None
+        if request.mode == "sampled" and request.refine:
+            refine_task = task_store.create_task("quality_check")
         
         background_tasks.add_task(
             run_quality_check_task,
             task.id,
             request.session_id,
             request.files,
+            request.mode,
+            request.sample_size,
+            refine_task.id if refine_task else None,
         )
         
-        return {
+        response = {
             "task_id": task.id,
             "status": "pending",
             "message": f"Quality check started for {len(request.files)} file(s)",
             "poll_url": f"/tasks/{task.id}",
         }
+        if refine_task:
+            response["refinement_task_id"] = refine_task.id
+            response["refinement_poll_url"] = f"/tasks/{refine_task.id}"
+        return response
         
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -861,38 +1541,71 @@ async def check_data_quality(request: QualityCheckRequest, background_tasks: Bac
 
 
 @app.post("/quality/check/sync")
-async def check_data_quality_sync(request: QualityCheckRequest):
+async def check_data_quality_sync(request: QualityCheckRequest, background_tasks: BackgroundTasks):
     """
     Synchronous quality check (immediate result, no task polling).
     Use for small files or when immediate response is needed.
+    With mode="sampled" and refine=true, an exact check is started in the
+    background; poll refinement_task_id for it.
     """
     try:
         if len(request.files) < 1:
             raise HTTPException(status_code=400, detail="At least 1 file required")
         
-        if len(request.files) == 1:
-            # Single file quality check
-            filename = request.files[0]
-            df = FileHandler.load_dataframe(request.session_id, filename)
-            checker = QualityChecker(df, filename)
-            result = checker.check_all()
-        else:
-            # Multi-dataset quality comparison
-            dataframes = {}
-            for filename in request.files:
-                df = FileHandler.load_dataframe(request.session_id, filename)
-                dataframes[filename] = df
-            
-            checker = MultiDatasetQualityChecker(dataframes)
-            result = checker.check_all()
+        result = _run_quality_check(
+            request.session_id, request.files, request.mode, request.sample_size
+        )
+        
+        if request.mode == "sampled" and request.refine:
+            refine_task = task_store.create_task("quality_check")
+            background_tasks.add_task(
+                run_quality_check_task, refine_task.id, request.session_id, request.files
+            )
+            result["refinement_task_id"] = refine_task.id
         
         return result
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Quality check error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/quality/duplicates")
+async def check_duplicates(request: DuplicateCheckRequest, background_tasks: BackgroundTasks):
+    """
+    Find exact and near-duplicate rows within and across files.
+    Files are fingerprinted chunk by chunk, so they need not fit in memory.
+    Returns task_id for async processing - poll /tasks/{task_id} for results.
+    """
+    try:
+        if len(request.files) < 1:
+            raise HTTPException(status_code=400, detail="At least 1 file required")
+        
+        files = FileHandler.get_session_files(request.session_id)
+        for filename in request.files:
+            if filename not in files:
+                raise HTTPException(status_code=404, detail=f"File not found: {filename}")
+        
+        task = task_store.create_task("duplicate_check")
+        background_tasks.add_task(run_duplicate_check_task, task.id, request)
+        
+        return {
+            "task_id": task.id,
+            "status": "pending",
+            "message": f"Duplicate check started for {len(request.files)} file(s)",
+            "poll_url": f"/tasks/{task.id}",
+        }
+        
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Duplicate check error: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/quality/{session_id}/{filename}")
 async def get_single_file_quality(session_id: str, filename: str):
     """Get quality metrics for a single file."""
@@ -0,0 +1,265 @@
+"""
+ViewerIt Response Layer - Fast JSON serialization and response compression.
+
+Comparison payloads are nested dicts full of numpy/pandas scalars. FastAPI's
+default path walks them with jsonable_encoder before json.dumps; this layer
+serializes them directly with orjson and compresses large bodies with
+zstd or gzip, negotiated from the client's Accept-Encoding header.
+"""
+import datetime
+import decimal
+import enum
+import functools
+import gzip
+import inspect
+import json
+import math
+from pathlib import Path
+from typing import Any, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+
+from config import (
+    RESPONSE_COMPRESSION_MIN_BYTES,
+    RESPONSE_GZIP_LEVEL,
+    RESPONSE_ZSTD_LEVEL,
+)
+from services.metrics import stage
+
+logger = logging.getLogger(__name__)
+
+# Optional fast JSON encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson not available - using stdlib json for responses (slower)")
+
+# Optional zstd compression
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    logger.debug("zstandard not available - responses will use gzip only")
+
+
+def _default(obj: Any) -> Any:
+    """Convert values the encoder does not handle natively."""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (pd.Timestamp, datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, pd.Timedelta):
+        return str(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _to_builtin(obj: Any) -> Any:
+    """
+    Recursively convert a payload to plain Python types.
+    Slow path, used only when the fast encoder rejects the payload
+    (e.g. numpy dict keys) or when orjson is not installed.
+    """
+    if isinstance(obj, dict):
+        return {
+            (_to_builtin(k) if not isinstance(k, str) else k): _to_builtin(v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_to_builtin(v) for v in obj]
+    if isinstance(obj, float):
+        return None if math.isnan(obj) or math.isinf(obj) else obj
+    if obj is None or isinstance(obj, (str, int, bool)):
+        return obj
+    if isinstance(obj, np.floating):
+        return None if not np.isfinite(obj) else obj.item()
+    if isinstance(obj, (np.ndarray, pd.Series, pd.Index, set, frozenset, tuple)):
+        return [_to_builtin(v) for v in obj]
+    return _to_builtin(_default(obj))
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize a payload to JSON bytes.
+    NaN/inf become null, numpy scalars and arrays are encoded natively and
+    pandas timestamps are written as ISO-8601 strings.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            return orjson.dumps(_to_builtin(content), option=_ORJSON_OPTIONS)
+
+    return json.dumps(
+        _to_builtin(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with the fast serializer."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with stage("serialize") as serialize:
+            body = dumps(content)
+            serialize.add(bytes=len(body))
+        return body
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route that renders plain endpoint return values with FastJSONResponse.
+
+    FastAPI runs jsonable_encoder over any non-Response return value when no
+    response_model is set; wrapping the endpoint so it returns a Response
+    skips that walk entirely.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            original = endpoint
+
+            @functools.wraps(original)
+            async def endpoint(*args, **kw):
+                result = await original(*args, **kw)
+                if isinstance(result, Response):
+                    return result
+                return FastJSONResponse(result)
+
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q-value}."""
+    codings = {}
+    for part in header.split(","):
+        pieces = part.strip().split(";")
+        coding = pieces[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in pieces[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported content coding for a request, preferring zstd."""
+    codings = _parse_accept_encoding(accept_encoding)
+    wildcard = codings.get("*", 0.0)
+
+    candidates = (["zstd"] if ZSTD_AVAILABLE else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with the given content coding."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=RESPONSE_ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-body responses above a size threshold.
+
+    Streaming responses (SSE, file downloads) and responses that already carry
+    a Content-Encoding or Content-Range pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = RESPONSE_COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+
+        encoding = choose_encoding(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or "content-range" in headers
+                or headers.get("content-type", "").startswith("text/event-stream")
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            with stage("compress", bytes=len(body)):
+                compressed = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,125 @@
+//! Value-level diff kernel: mismatching rows of key-aligned column pairs.
+//!
+//! Columns arrive as Arrow arrays (float64 for numeric columns, large_utf8
+//! for text) and are compared with datacompy's rules: two nulls match, a null
+//! and a value do not, numbers match within `abs_tol + rel_tol * |right|`
+//! (np.isclose), and text matches after optional whitespace stripping and
+//! upper-casing. Columns are compared in parallel, and the rows of each
+//! column are split across the rayon pool.
+
+use arrow::array::{make_array, Array, ArrayData, ArrayRef, Float64Array, LargeStringArray, UInt64Array};
+use arrow::pyarrow::PyArrowType;
+use pyo3::exceptions::PyTypeError;
+use pyo3::prelude::*;
+use rayon::prelude::*;
+use std::borrow::Cow;
+
+/// Comparison settings shared by every column of a call.
+struct Tolerance {
+    abs_tol: f64,
+    rel_tol: f64,
+    ignore_spaces: bool,
+    ignore_case: bool,
+}
+
+impl Tolerance {
+    fn numbers_match(&self, left: f64, right: f64) -> bool {
+        left == right
+            || (left.is_nan() && right.is_nan())
+            || (left - right).abs() <= self.abs_tol + self.rel_tol * right.abs()
+    }
+
+    /// Text as compared: stripped like Python's str.strip (which also strips
+    /// the \x1c-\x1f separators) and upper-cased like str.upper.
+    fn normalize<'a>(&self, text: &'a str) -> Cow<'a, str> {
+        let text = if self.ignore_spaces {
+            text.trim_matches(|c: char| c.is_whitespace() || ('\x1c'..='\x1f').contains(&c))
+        } else {
+            text
+        };
+        if self.ignore_case {
+            Cow::Owned(text.to_uppercase())
+        } else {
+            Cow::Borrowed(text)
+        }
+    }
+
+    fn texts_match(&self, left: &str, right: &str) -> bool {
+        left == right || ((self.ignore_spaces || self.ignore_case) && self.normalize(left) == self.normalize(right))
+    }
+}
+
+/// Null-aware match of row i: both null match, one null does not.
+fn row_matches<A: Array>(left: &A, right: &A, i: usize, values_match: impl Fn(usize) -> bool) -> bool {
+    match (left.is_null(i), right.is_null(i)) {
+        (true, true) => true,
+        (false, false) => values_match(i),
+        _ => false,
+    }
+}
+
+/// Positions of the rows where a column pair differs.
+fn column_mismatches(left: &ArrayRef, right: &ArrayRef, tolerance: &Tolerance) -> Result<Vec<u64>, String> {
+    if left.len() != right.len() {
+        return Err(format!("column lengths differ: {} and {}", left.len(), right.len()));
+    }
+    let rows = 0..left.len();
+    if let (Some(l), Some(r)) = (
+        left.as_any().downcast_ref::<Float64Array>(),
+        right.as_any().downcast_ref::<Float64Array>(),
+    ) {
+        return Ok(rows
+            .into_par_iter()
+            .filter(|&i| !row_matches(l, r, i, |i| tolerance.numbers_match(l.value(i), r.value(i))))
+            .map(|i| i as u64)
+            .collect());
+    }
+    if let (Some(l), Some(r)) = (
+        left.as_any().downcast_ref::<LargeStringArray>(),
+        right.as_any().downcast_ref::<LargeStringArray>(),
+    ) {
+        return Ok(rows
+            .into_par_iter()
+            .filter(|&i| !row_matches(l, r, i, |i| tolerance.texts_match(l.value(i), r.value(i))))
+            .map(|i| i as u64)
+            .collect());
+    }
+    Err(format!(
+        "unsupported column types {} and {} (expected float64 or large_utf8 pairs)",
+        left.data_type(),
+        right.data_type()
+    ))
+}
+
+/// Mismatching row positions of each (left[i], right[i]) column pair, as
+/// uint64 Arrow arrays (the mismatch count is each array's length).
+#[pyfunction]
+#[pyo3(signature = (left, right, abs_tol = 0.0, rel_tol = 0.0, ignore_spaces = false, ignore_case = false))]
+pub fn diff_columns(
+    py: Python<'_>,
+    left: Vec<PyArrowType<ArrayData>>,
+    right: Vec<PyArrowType<ArrayData>>,
+    abs_tol: f64,
+    rel_tol: f64,
+    ignore_spaces: bool,
+    ignore_case: bool,
+) -> PyResult<Vec<PyArrowType<ArrayData>>> {
+    if left.len() != right.len() {
+        return Err(PyTypeError::new_err("left and right must hold the same number of columns"));
+    }
+    let left: Vec<ArrayRef> = left.into_iter().map(|array| make_array(array.0)).collect();
+    let right: Vec<ArrayRef> = right.into_iter().map(|array| make_array(array.0)).collect();
+    let tolerance = Tolerance { abs_tol, rel_tol, ignore_spaces, ignore_case };
+
+    let mismatches: Result<Vec<Vec<u64>>, String> = py.allow_threads(|| {
+        left.par_iter()
+            .zip(right.par_iter())
+            .map(|(l, r)| column_mismatches(l, r, &tolerance))
+            .collect()
+    });
+    Ok(mismatches
+        .map_err(PyTypeError::new_err)?
+        .into_iter()
+        .map(|positions| PyArrowType(UInt64Array::from(positions).into_data()))
+        .collect())
+}
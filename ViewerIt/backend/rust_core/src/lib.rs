@@ -1,8 +1,91 @@
 use pyo3::prelude::*;
+use pyo3::exceptions::{PyIOError, PyValueError};
+use std::borrow::Cow;
 use std::collections::{HashMap, HashSet};
+use std::fs::File;
+use std::io::{BufReader, BufWriter};
+use std::sync::Arc;
 use ahash::RandomState;
+use arrow::array::{LargeStringArray, UInt64Array};
+use arrow::datatypes::{DataType, Field, Schema};
+use arrow::ipc::writer::FileWriter;
+use arrow::record_batch::RecordBatch;
+use encoding_rs::{Encoding, UTF_8, WINDOWS_1252};
 use rayon::prelude::*;
 
+mod diff;
+
+/// Exclusive keys listed per file in an IntersectionResult
+const EXCLUSIVE_SAMPLE_SIZE: usize = 10;
+
+/// Text of one CSV field in the file's encoding.
+/// Invalid UTF-8 is read as Windows-1252 (a Latin-1 superset), as the
+/// Python reader falls back to Latin-1.
+fn decode_field<'a>(bytes: &'a [u8], encoding: &'static Encoding) -> Cow<'a, str> {
+    if encoding == UTF_8 {
+        if let Ok(text) = std::str::from_utf8(bytes) {
+            return Cow::Borrowed(text);
+        }
+        return WINDOWS_1252.decode_without_bom_handling(bytes).0;
+    }
+    encoding.decode_without_bom_handling(bytes).0
+}
+
+/// Validate the delimiter (one byte) and encoding (ASCII-compatible label).
+fn parse_options(delimiter: &str, encoding: &str) -> PyResult<(u8, &'static Encoding)> {
+    let delimiter = match delimiter.as_bytes() {
+        [byte] => *byte,
+        _ => return Err(PyValueError::new_err("delimiter must be a single byte")),
+    };
+    let encoding = Encoding::for_label(encoding.as_bytes())
+        .filter(|encoding| encoding.is_ascii_compatible())
+        .ok_or_else(|| PyValueError::new_err(format!("unsupported CSV encoding: {}", encoding)))?;
+    Ok((delimiter, encoding))
+}
+
+/// Unique composite keys ("val1|val2", the key fields' text) of a CSV file.
+/// A file without every key column has no keys.
+fn read_csv_keys(
+    path: &str,
+    key_columns: &[String],
+    delimiter: u8,
+    encoding: &'static Encoding,
+) -> Result<HashSet<String, RandomState>, String> {
+    let file = File::open(path).map_err(|e| format!("{}: {}", path, e))?;
+    let mut reader = csv::ReaderBuilder::new()
+        .delimiter(delimiter)
+        .flexible(true)
+        .from_reader(BufReader::with_capacity(1 << 20, file));
+
+    let headers: Vec<String> = reader
+        .byte_headers()
+        .map_err(|e| format!("{}: {}", path, e))?
+        .iter()
+        .map(|field| decode_field(field, encoding).trim_start_matches('\u{feff}').to_owned())
+        .collect();
+    let mut indices = Vec::with_capacity(key_columns.len());
+    for column in key_columns {
+        match headers.iter().position(|header| header == column) {
+            Some(index) => indices.push(index),
+            None => return Ok(HashSet::default()),
+        }
+    }
+
+    let mut keys: HashSet<String, RandomState> = HashSet::default();
+    let mut record = csv::ByteRecord::new();
+    while reader.read_byte_record(&mut record).map_err(|e| format!("{}: {}", path, e))? {
+        let mut key = String::new();
+        for (n, &index) in indices.iter().enumerate() {
+            if n > 0 {
+                key.push('|');
+            }
+            key.push_str(&decode_field(record.get(index).unwrap_or(b""), encoding));
+        }
+        keys.insert(key);
+    }
+    Ok(keys)
+}
+
 /// Result structure for multi-file intersection
 #[pyclass]
 #[derive(Clone)]
@@ -14,6 +97,8 @@ pub struct IntersectionResult {
     #[pyo3(get)]
     pub file_exclusive_counts: HashMap<String, usize>,
     #[pyo3(get)]
+    pub exclusive_samples: HashMap<String, Vec<String>>,
+    #[pyo3(get)]
     pub overlap_count: usize,
     #[pyo3(get)]
     pub total_unique_keys: usize,
@@ -41,6 +126,36 @@ impl FastIntersector {
         self.file_map.insert(filename, set);
     }
 
+    /// Add CSV files' composite keys, read natively and in parallel across
+    /// files (the GIL is released), without building DataFrames.
+    /// `files` are (filename, path) pairs; returns unique keys per file.
+    #[pyo3(signature = (files, key_columns, delimiter = ",", encoding = "utf-8"))]
+    pub fn add_csv_files(
+        &mut self,
+        py: Python<'_>,
+        files: Vec<(String, String)>,
+        key_columns: Vec<String>,
+        delimiter: &str,
+        encoding: &str,
+    ) -> PyResult<HashMap<String, usize>> {
+        let (delimiter, encoding) = parse_options(delimiter, encoding)?;
+        let parsed: Result<Vec<(String, HashSet<String, RandomState>)>, String> = py.allow_threads(|| {
+            files
+                .par_iter()
+                .map(|(name, path)| {
+                    read_csv_keys(path, &key_columns, delimiter, encoding).map(|keys| (name.clone(), keys))
+                })
+                .collect()
+        });
+
+        let mut counts = HashMap::new();
+        for (name, keys) in parsed.map_err(PyIOError::new_err)? {
+            counts.insert(name.clone(), keys.len());
+            self.file_map.insert(name, keys);
+        }
+        Ok(counts)
+    }
+
     /// Compute the intersection matrix and statistics.
     pub fn compute(&self) -> IntersectionResult {
         // 1. Collect all unique keys across all files (Union)
@@ -67,13 +182,15 @@ impl FastIntersector {
 
         // 3. Calculate Statistics
         let mut file_exclusive_counts: HashMap<String, usize> = HashMap::new();
+        let mut exclusive_samples: HashMap<String, Vec<String>> = HashMap::new();
         for fname in &filenames {
             file_exclusive_counts.insert(fname.clone(), 0);
+            exclusive_samples.insert(fname.clone(), Vec::new());
         }
 
         let mut overlap_count = 0;
 
-        for row in &presence_matrix {
+        for (key_idx, row) in presence_matrix.iter().enumerate() {
             let present_in_count = row.iter().filter(|&&present| present).count();
             
             if present_in_count == filenames.len() {
@@ -84,6 +201,10 @@ impl FastIntersector {
                     if present {
                         let fname = &filenames[idx];
                         *file_exclusive_counts.get_mut(fname).unwrap() += 1;
+                        let samples = exclusive_samples.get_mut(fname).unwrap();
+                        if samples.len() < EXCLUSIVE_SAMPLE_SIZE {
+                            samples.push(sorted_keys[key_idx].clone());
+                        }
                         break;
                     }
                 }
@@ -94,11 +215,126 @@ impl FastIntersector {
             presence_matrix,
             keys: sorted_keys,
             file_exclusive_counts,
+            exclusive_samples,
             overlap_count,
             total_unique_keys,
         }
     }
-    
+
+    /// Key membership aggregated as bitmask counts: bit i of a key's mask is
+    /// set when filenames[i] holds it; returns mask -> number of keys.
+    /// Nothing per key is materialized (no union, no presence matrix): each
+    /// key is counted by the first file in bit order that holds it, with the
+    /// keys of every file scanned in parallel (the GIL is released).
+    pub fn overlap_counts(&self, py: Python<'_>, filenames: Vec<String>) -> PyResult<HashMap<u64, usize>> {
+        if filenames.len() > 64 {
+            return Err(PyValueError::new_err(format!(
+                "Overlap bitmasks support at most 64 files, got {}", filenames.len()
+            )));
+        }
+        let sets = filenames
+            .iter()
+            .map(|name| {
+                self.file_map
+                    .get(name)
+                    .ok_or_else(|| PyValueError::new_err(format!("Unknown file: {}", name)))
+            })
+            .collect::<PyResult<Vec<_>>>()?;
+
+        let merge = |mut total: HashMap<u64, usize>, part: HashMap<u64, usize>| {
+            for (mask, count) in part {
+                *total.entry(mask).or_insert(0) += count;
+            }
+            total
+        };
+        Ok(py.allow_threads(|| {
+            sets.iter()
+                .enumerate()
+                .map(|(idx, set)| {
+                    set.par_iter()
+                        .fold(HashMap::new, |mut counts: HashMap<u64, usize>, key| {
+                            if sets[..idx].iter().any(|earlier| earlier.contains(key)) {
+                                return counts;
+                            }
+                            let mut mask = 1u64 << idx;
+                            for (other, later) in sets.iter().enumerate().skip(idx + 1) {
+                                if later.contains(key) {
+                                    mask |= 1u64 << other;
+                                }
+                            }
+                            *counts.entry(mask).or_insert(0) += 1;
+                            counts
+                        })
+                        .reduce(HashMap::new, merge)
+                })
+                .fold(HashMap::new(), merge)
+        }))
+    }
+
+    /// Write a key index: every key once, sorted, with its presence bitmask
+    /// (bit i set when filenames[i] holds it), as a single-batch Arrow IPC
+    /// file ("key": large_utf8, "presence_mask": uint64) carrying `metadata`
+    /// in its schema. services.key_index memory-maps it for follow-up
+    /// queries. Returns the number of keys written (the GIL is released).
+    #[pyo3(signature = (path, filenames, metadata = None))]
+    pub fn write_index(
+        &self,
+        py: Python<'_>,
+        path: String,
+        filenames: Vec<String>,
+        metadata: Option<HashMap<String, String>>,
+    ) -> PyResult<usize> {
+        if filenames.len() > 64 {
+            return Err(PyValueError::new_err(format!(
+                "Overlap bitmasks support at most 64 files, got {}", filenames.len()
+            )));
+        }
+        let sets = filenames
+            .iter()
+            .map(|name| {
+                self.file_map
+                    .get(name)
+                    .ok_or_else(|| PyValueError::new_err(format!("Unknown file: {}", name)))
+            })
+            .collect::<PyResult<Vec<_>>>()?;
+
+        py.allow_threads(|| -> Result<usize, String> {
+            let mut masks: HashMap<&str, u64, RandomState> = HashMap::default();
+            for (idx, set) in sets.iter().enumerate() {
+                for key in set.iter() {
+                    *masks.entry(key.as_str()).or_insert(0) |= 1u64 << idx;
+                }
+            }
+            let mut entries: Vec<(&str, u64)> = masks.into_iter().collect();
+            // Byte order of UTF-8 is code point order, the order Python sorts in
+            entries.par_sort_unstable_by(|a, b| a.0.cmp(b.0));
+
+            let schema = Arc::new(Schema::new_with_metadata(
+                vec![
+                    Field::new("key", DataType::LargeUtf8, false),
+                    Field::new("presence_mask", DataType::UInt64, false),
+                ],
+                metadata.unwrap_or_default(),
+            ));
+            let batch = RecordBatch::try_new(
+                schema.clone(),
+                vec![
+                    Arc::new(LargeStringArray::from_iter_values(entries.iter().map(|(key, _)| *key))),
+                    Arc::new(UInt64Array::from_iter_values(entries.iter().map(|(_, mask)| *mask))),
+                ],
+            )
+            .map_err(|e| e.to_string())?;
+
+            let file = File::create(&path).map_err(|e| format!("{}: {}", path, e))?;
+            let mut writer = FileWriter::try_new(BufWriter::with_capacity(1 << 20, file), &schema)
+                .map_err(|e| e.to_string())?;
+            writer.write(&batch).map_err(|e| e.to_string())?;
+            writer.finish().map_err(|e| e.to_string())?;
+            Ok(entries.len())
+        })
+        .map_err(PyIOError::new_err)
+    }
+
     /// Get the list of files currently tracked
     pub fn get_filenames(&self) -> Vec<String> {
         self.file_map.keys().cloned().collect()
@@ -115,10 +351,30 @@ impl FastIntersector {
     }
 }
 
+/// Unique composite keys ("val1|val2") of a CSV file's key columns, read
+/// natively without building a DataFrame (the GIL is released).
+#[pyfunction]
+#[pyo3(signature = (path, key_columns, delimiter = ",", encoding = "utf-8"))]
+pub fn extract_csv_keys(
+    py: Python<'_>,
+    path: String,
+    key_columns: Vec<String>,
+    delimiter: &str,
+    encoding: &str,
+) -> PyResult<Vec<String>> {
+    let (delimiter, encoding) = parse_options(delimiter, encoding)?;
+    let keys = py
+        .allow_threads(|| read_csv_keys(&path, &key_columns, delimiter, encoding))
+        .map_err(PyIOError::new_err)?;
+    Ok(keys.into_iter().collect())
+}
+
 /// A Python module implemented in Rust.
 #[pymodule]
 fn viewerit_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<FastIntersector>()?;
     m.add_class::<IntersectionResult>()?;
+    m.add_function(wrap_pyfunction!(extract_csv_keys, m)?)?;
+    m.add_function(wrap_pyfunction!(diff::diff_columns, m)?)?;
     Ok(())
 }
@@ -4,9 +4,14 @@ from .comparator import DataComparator
 from .ai_service import AIService
 from .multi_comparator import MultiFileComparator
 from .schema_analyzer import SchemaAnalyzer
-from .quality_checker import QualityChecker, MultiDatasetQualityChecker
+from .quality_checker import QualityChecker, SampledQualityChecker, MultiDatasetQualityChecker
 from .chunked_processor import ChunkedProcessor, ParallelProcessor
+from .streaming_quality import StreamingQualityChecker
+from .row_fingerprints import DuplicateFinder, fingerprint_rows, find_duplicates
+from .worker_pool import WorkerPool, PoolJob, worker_pool
 from .task_store import TaskStore, Task, TaskStatus, task_store
+from .diff_exporter import DiffExporter
+from .result_cache import ComparisonCache, comparison_cache
 
 __all__ = [
     "FileHandler", 
@@ -15,12 +20,23 @@ __all__ = [
     "MultiFileComparator",
     "SchemaAnalyzer",
     "QualityChecker",
+    "SampledQualityChecker",
     "MultiDatasetQualityChecker",
+    "StreamingQualityChecker",
+    "DuplicateFinder",
+    "fingerprint_rows",
+    "find_duplicates",
+    "WorkerPool",
+    "PoolJob",
+    "worker_pool",
     "ChunkedProcessor",
     "ParallelProcessor",
     "TaskStore",
     "Task",
     "TaskStatus",
     "task_store",
+    "DiffExporter",
+    "ComparisonCache",
+    "comparison_cache",
 ]
 
@@ -7,16 +7,38 @@ Performance optimized with optional Rust acceleration for set operations.
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Optional, Generator, Callable
+from typing import Optional, Generator, Callable, Iterator
+import functools
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
+import pickle
+import shutil
+import tempfile
+
+from config import CSV_RANGE_MB, WORKER_BASE_MEMORY_MB, WORKER_FRAME_EXPANSION, WORKER_TRANSFER_DIR
+from .csv_ranges import (
+    split_csv_ranges, read_csv_range, header_length, iter_record_blocks, tail_record_start, read_csv_spans,
+)
+from .file_handler import FileHandler, UPLOADS_DIR
+from .frame_transfer import export_frame, import_frame
+from .key_index import index_metadata, replacing, write_key_index
+from .metrics import stage
+from .overlap import (
+    MAX_OVERLAP_FILES,
+    membership_masks,
+    membership_statistics,
+    count_masks,
+    overlap_statistics,
+    upset_data,
+)
+from .profiler import ChunkedProfiler, profile_cache
+from .worker_pool import WorkerPool, PoolJob, worker_pool
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 CHUNK_SIZE = 50000  # Rows per chunk
 LARGE_FILE_THRESHOLD = 100000  # Rows to trigger chunked processing
-MAX_WORKERS = 4  # Parallel workers
 
 # Try to import Rust acceleration module
 try:
@@ -27,18 +49,90 @@ except ImportError:
     RUST_AVAILABLE = False
     logger.debug("viewerit_core not available for chunked processing - using Python fallback")
 
+# Native CSV key extraction (builds of viewerit_core before it only take key lists)
+NATIVE_CSV_KEYS = RUST_AVAILABLE and hasattr(FastIntersector, "add_csv_files")
+if NATIVE_CSV_KEYS:
+    from viewerit_core import extract_csv_keys
+# Native mask -> count aggregation of key membership
+NATIVE_OVERLAP = RUST_AVAILABLE and hasattr(FastIntersector, "overlap_counts")
+# Native key index files (sorted keys + presence bitmasks as Arrow IPC)
+NATIVE_KEY_INDEX = RUST_AVAILABLE and hasattr(FastIntersector, "write_index")
+
+# Key columns are read as their CSV text, the text viewerit_core's reader keys on
+KEY_READ_KWARGS = {"dtype": str, "keep_default_na": False}
+
+
+def _apply_chunks(processor: Callable[[pd.DataFrame], dict], chunks: Iterator[pd.DataFrame]) -> list:
+    """Partial result of each chunk, in order."""
+    return [processor(chunk) for chunk in chunks]
+
+
+def _profile_chunks(chunks: Iterator[pd.DataFrame]) -> ChunkedProfiler:
+    """Column profiles of a run of chunks."""
+    profiler = ChunkedProfiler()
+    for chunk in chunks:
+        profiler.update(chunk)
+    return profiler
+
+
+def _key_chunks(key_columns: list[str], chunks: Iterator[pd.DataFrame]) -> set:
+    """
+    Composite keys of a run of chunks ("|"-joined key column values).
+    Chunks are read with KEY_READ_KWARGS, so values are strings and the
+    columns are joined with vectorized string concatenation.
+    """
+    all_keys = set()
+    for chunk in chunks:
+        if not all(col in chunk.columns for col in key_columns):
+            continue
+        # Short rows leave NaN in their missing fields; they key as empty text
+        keys = chunk[key_columns[0]].fillna("")
+        for col in key_columns[1:]:
+            keys = keys + "|" + chunk[col].fillna("")
+        all_keys.update(keys.tolist())
+    return all_keys
+
+
+def _range_job(file_path: Path, header_end: int, byte_range: tuple[int, int],
+               chunk_size: int, consume: Callable[[Iterator[pd.DataFrame]], object],
+               **read_kwargs):
+    """Worker: consume(chunks) over one byte range, retried as Latin-1 like read_csv_chunked."""
+    try:
+        return consume(read_csv_range(file_path, header_end, *byte_range, chunk_size, **read_kwargs))
+    except UnicodeDecodeError:
+        return consume(read_csv_range(file_path, header_end, *byte_range, chunk_size,
+                                      encoding='latin-1', **read_kwargs))
+
 
 class ChunkedProcessor:
     """
     Processes large files in chunks to avoid memory issues.
     Supports chunked reading, parallel processing, and streaming aggregation.
     
-    Uses Rust acceleration when available for set operations.
+    CSV files larger than two byte ranges are split at record boundaries and
+    the ranges are parsed and processed in the shared worker pool; results
+    are reduced in file order, so they match a serial pass.
+    
+    Uses Rust acceleration when available for set operations, and reads
+    key columns natively (without DataFrames) when viewerit_core supports it.
     """
     
-    def __init__(self, chunk_size: int = CHUNK_SIZE):
+    def __init__(self, chunk_size: int = CHUNK_SIZE,
+                 range_bytes: int = CSV_RANGE_MB * 1024 * 1024,
+                 pool: Optional[WorkerPool] = None):
+        """
+        Args:
+            chunk_size: Rows per chunk
+            range_bytes: Target bytes per byte range parsed in one worker
+            pool: Worker pool for byte ranges (default: the shared pool)
+        """
         self.chunk_size = chunk_size
+        self.range_bytes = range_bytes
+        self.pool = pool if pool is not None else worker_pool
         self._use_rust = RUST_AVAILABLE
+        self._native_keys = NATIVE_CSV_KEYS
+        self._native_overlap = NATIVE_OVERLAP
+        self._native_index = NATIVE_KEY_INDEX
     
     def is_large_file(self, file_path: Path, threshold: int = LARGE_FILE_THRESHOLD) -> bool:
         """
@@ -86,88 +180,161 @@ class ChunkedProcessor:
             for chunk in reader:
                 yield chunk
     
+    def map_ranges(self, file_path: Path,
+                   consume: Callable[[Iterator[pd.DataFrame]], object],
+                   **read_kwargs) -> Optional[list]:
+        """
+        Run consume(chunks) on each byte range of a CSV file in the worker pool.
+        
+        Args:
+            file_path: Path to CSV file
+            consume: Picklable function of an iterator of chunks
+            **read_kwargs: Additional arguments for pd.read_csv
+            
+        Returns:
+            One result per range in file order, or None when the file should
+            be read serially (one worker, a small file, an unpicklable
+            consume, or ranges the parser rejects)
+        """
+        if self.pool.max_workers < 2 or file_path.stat().st_size < 2 * self.range_bytes:
+            return None
+        try:
+            pickle.dumps(consume)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            logger.debug("Chunk processor is not picklable; reading serially")
+            return None
+        
+        header_end, ranges = split_csv_ranges(file_path, self.range_bytes)
+        if len(ranges) < 2:
+            return None
+        
+        jobs = {
+            str(i): PoolJob(_range_job, (file_path, header_end, byte_range, self.chunk_size, consume),
+                            memory_bytes=WORKER_BASE_MEMORY_MB * 1024 * 1024 + 2 * (byte_range[1] - byte_range[0]),
+                            kwargs=read_kwargs)
+            for i, byte_range in enumerate(ranges)
+        }
+        try:
+            results = dict(self.pool.run(jobs))
+        except pd.errors.ParserError as e:
+            # e.g. a stray quote inside an unquoted field misplaced a boundary
+            logger.warning(f"Parallel parse of {file_path.name} failed ({e}); reading serially")
+            return None
+        logger.debug(f"Parsed {file_path.name} as {len(ranges)} byte ranges in the worker pool")
+        return [results[str(i)] for i in range(len(ranges))]
+    
     def process_chunked(self, file_path: Path,
                         processor: Callable[[pd.DataFrame], dict],
                         aggregator: Callable[[list[dict]], dict]) -> dict:
         """
         Process a large file in chunks with custom processor and aggregator.
+        Chunks are processed in the worker pool when the file splits into
+        byte ranges and processor is picklable (a module-level function).
         
         Args:
             file_path: Path to file
             processor: Function to process each chunk, returns partial result
-            aggregator: Function to combine partial results
+            aggregator: Function to combine partial results (in file order)
             
         Returns:
             Aggregated result
         """
-        partial_results = []
-        
-        for chunk in self.read_csv_chunked(file_path):
-            result = processor(chunk)
-            partial_results.append(result)
-        
-        return aggregator(partial_results)
+        consume = functools.partial(_apply_chunks, processor)
+        ranges = self.map_ranges(file_path, consume)
+        if ranges is None:
+            return aggregator(consume(self.read_csv_chunked(file_path)))
+        return aggregator([result for partials in ranges for result in partials])
     
-    def get_chunked_statistics(self, file_path: Path) -> dict:
+    def get_chunked_statistics(self, file_path: Path,
+                               content_hash: Optional[str] = None) -> dict:
         """
         Get statistics for a large file using chunked processing.
-        """
-        def process_chunk(chunk: pd.DataFrame) -> dict:
-            return {
-                'row_count': len(chunk),
-                'null_counts': chunk.isnull().sum().to_dict(),
-                'numeric_stats': chunk.select_dtypes(include=['number']).describe().to_dict() 
-                                 if len(chunk.select_dtypes(include=['number']).columns) > 0 else {},
-                'columns': list(chunk.columns),
-                'dtypes': {col: str(dtype) for col, dtype in chunk.dtypes.items()},
-            }
+        Each chunk is folded into shared column profiles in a single pass;
+        columns past PROFILE_MAX_TRACKED_VALUES distinct values are profiled
+        from mergeable sketches and listed in approximate_columns.
         
-        def aggregate_stats(results: list[dict]) -> dict:
-            if not results:
-                return {}
-            
-            total_rows = sum(r['row_count'] for r in results)
-            
-            # Aggregate null counts
-            all_null_counts = {}
-            for r in results:
-                for col, count in r['null_counts'].items():
-                    all_null_counts[col] = all_null_counts.get(col, 0) + count
-            
-            # Use first result for columns and dtypes
-            first = results[0]
-            
-            return {
-                'total_rows': total_rows,
-                'total_chunks': len(results),
-                'columns': first['columns'],
-                'column_count': len(first['columns']),
-                'dtypes': first['dtypes'],
-                'null_counts': all_null_counts,
-                'null_percentages': {
-                    col: round(count / total_rows * 100, 2) if total_rows > 0 else 0
-                    for col, count in all_null_counts.items()
-                },
-            }
+        Args:
+            file_path: Path to CSV file
+            content_hash: File content hash; when given, profiles are cached
+                          and reused for the same content
+        """
+        cache_key = (content_hash, "chunked") if content_hash else None
+        profiles = profile_cache.get_columns(cache_key) if cache_key else {}
+        
+        if not profiles:
+            ranges = self.map_ranges(file_path, _profile_chunks)
+            if ranges is None:
+                profiler = _profile_chunks(self.read_csv_chunked(file_path))
+            else:
+                profiler = ranges[0]
+                for other in ranges[1:]:
+                    profiler.merge(other)
+            profiles = profiler.result()
+            if cache_key and profiles:
+                profile_cache.update_columns(cache_key, profiles)
+        
+        if not profiles:
+            return {}
+        
+        total_rows = next(iter(profiles.values()))["row_count"]
+        null_counts = {col: p["null_count"] for col, p in profiles.items()}
         
-        return self.process_chunked(file_path, process_chunk, aggregate_stats)
+        return {
+            'total_rows': total_rows,
+            'total_chunks': -(-total_rows // self.chunk_size),
+            'columns': list(profiles),
+            'column_count': len(profiles),
+            'dtypes': {col: p["dtype"] for col, p in profiles.items()},
+            'null_counts': null_counts,
+            'null_percentages': {col: p["null_percentage"] for col, p in profiles.items()},
+            'column_profiles': profiles,
+            'approximate_columns': [col for col, p in profiles.items() if not p["unique_count_exact"]],
+        }
     
     def find_unique_keys_chunked(self, file_path: Path, 
                                   key_columns: list[str]) -> set:
         """
         Find all unique key combinations in a large file.
+        
+        Keys are the key columns' CSV text joined with "|" (empty fields key
+        as empty text). A file missing any key column has no keys.
         """
-        all_keys = set()
+        key_columns = list(key_columns)
+        with stage("keys", bytes=file_path.stat().st_size):
+            return self._find_unique_keys(file_path, key_columns)
+    
+    def _find_unique_keys(self, file_path: Path, key_columns: list[str]) -> set:
+        if self._native_keys:
+            return set(extract_csv_keys(str(file_path), key_columns))
         
-        for chunk in self.read_csv_chunked(file_path):
-            if not all(col in chunk.columns for col in key_columns):
-                continue
-            
-            # Create composite keys
-            keys = chunk[key_columns].astype(str).agg('|'.join, axis=1)
-            all_keys.update(keys.tolist())
+        try:
+            header = pd.read_csv(file_path, nrows=0).columns
+        except UnicodeDecodeError:
+            header = pd.read_csv(file_path, nrows=0, encoding='latin-1').columns
+        if not all(col in header for col in key_columns):
+            return set()
+        
+        read_kwargs = {"usecols": key_columns, **KEY_READ_KWARGS}
+        consume = functools.partial(_key_chunks, key_columns)
+        ranges = self.map_ranges(file_path, consume, **read_kwargs)
+        if ranges is None:
+            return consume(self.read_csv_chunked(file_path, **read_kwargs))
+        return set().union(*ranges)
+    
+    def _add_csv_keys(self, file_paths: list[Path], key_columns: list[str]):
+        """
+        Read the files' keys natively into a FastIntersector, in parallel
+        across files.
         
-        return all_keys
+        Returns:
+            Tuple of ({filename: unique key count}, FastIntersector)
+        """
+        logger.debug(f"Extracting keys natively from {len(file_paths)} files")
+        intersector = FastIntersector()
+        with stage("keys", bytes=sum(path.stat().st_size for path in file_paths)):
+            key_counts = intersector.add_csv_files([(path.name, str(path)) for path in file_paths],
+                                                   list(key_columns))
+        return key_counts, intersector
     
     def compare_large_files_chunked(self, 
                                     file1_path: Path,
@@ -181,6 +348,25 @@ class ChunkedProcessor:
         """
         logger.info(f"Starting chunked comparison of {file1_path.name} and {file2_path.name}")
         
+        if self._native_keys:
+            key_counts, intersector = self._add_csv_keys([file1_path, file2_path], key_columns)
+            rust_result = intersector.compute()
+            samples = rust_result.exclusive_samples
+            exclusive = rust_result.file_exclusive_counts
+            total_unique = rust_result.total_unique_keys
+            return {
+                'file1_keys': key_counts[file1_path.name],
+                'file2_keys': key_counts[file2_path.name],
+                'common_keys': rust_result.overlap_count,
+                'only_in_file1': exclusive[file1_path.name],
+                'only_in_file2': exclusive[file2_path.name],
+                'only_in_file1_sample': list(samples[file1_path.name]),
+                'only_in_file2_sample': list(samples[file2_path.name]),
+                'overlap_percentage': round(rust_result.overlap_count / total_unique * 100, 2)
+                                      if total_unique > 0 else 0,
+                'rust_accelerated': True,
+            }
+        
         # Get unique keys from both files
         keys1 = self.find_unique_keys_chunked(file1_path, key_columns)
         keys2 = self.find_unique_keys_chunked(file2_path, key_columns)
@@ -267,15 +453,25 @@ class ChunkedProcessor:
         Compare multiple large files using chunked processing and Rust acceleration.
         
         This is ideal for comparing 3+ large files without loading them into memory.
+        Key membership is aggregated as bitmask counts, so memory does not
+        grow with the number of files. Beyond 64 files the masks do not fit:
+        totals are counted from the keys and 'overlaps' is None.
         
         Args:
             file_paths: List of paths to CSV files
             key_columns: Columns to use for key generation
             
         Returns:
-            Comprehensive comparison results
+            Comprehensive comparison results, with the largest exclusive
+            intersections under 'overlaps' (UpSet / Venn data)
         """
         logger.info(f"Starting multi-file chunked comparison of {len(file_paths)} files")
+        too_many = len(file_paths) > MAX_OVERLAP_FILES
+        
+        if self._native_keys and self._native_overlap and not too_many:
+            _, intersector = self._add_csv_keys(file_paths, key_columns)
+            file_names = [path.name for path in file_paths]
+            return self._overlap_result(file_names, dict(intersector.overlap_counts(file_names)), True)
         
         # Extract keys from all files
         file_keys = {}
@@ -284,11 +480,68 @@ class ChunkedProcessor:
             file_keys[path.name] = keys
             logger.debug(f"Extracted {len(keys)} keys from {path.name}")
         
-        if self._use_rust:
+        if too_many:
+            file_names = list(file_keys.keys())
+            stats = membership_statistics([list(keys) for keys in file_keys.values()], file_names)
+            return self._statistics_result(file_names, stats, None, False)
+        if self._use_rust and self._native_overlap:
             return self._compare_multiple_rust(file_keys)
         else:
             return self._compare_multiple_python(file_keys)
     
+    def build_key_index(self, file_paths: list[Path], key_columns: list[str], path: Path) -> int:
+        """
+        Write the files' key index (sorted keys and presence bitmasks, see
+        services.key_index) without loading the files.
+        
+        Keys are the chunked comparison's keys, so queries on the index agree
+        with compare_multiple_files_chunked. The file is written to a
+        temporary path and moved into place once complete.
+        
+        Args:
+            file_paths: CSV files, in bit order
+            key_columns: Columns to use for key generation
+            path: Index file to write
+            
+        Returns:
+            Number of unique keys indexed
+        """
+        if len(file_paths) > MAX_OVERLAP_FILES:
+            raise ValueError(f"At most {MAX_OVERLAP_FILES} files can be indexed at once")
+        file_names = [path.name for path in file_paths]
+        
+        with replacing(path) as temp_path:
+            if self._native_keys and self._native_index:
+                _, intersector = self._add_csv_keys(file_paths, key_columns)
+                with stage("index_write"):
+                    return intersector.write_index(str(temp_path), file_names,
+                                                   index_metadata(file_names, key_columns))
+            
+            key_arrays = [list(self.find_unique_keys_chunked(file_path, key_columns))
+                          for file_path in file_paths]
+            with stage("index_write"):
+                return write_key_index(temp_path, file_names, key_arrays, key_columns)
+    
+    def _overlap_result(self, file_names: list[str], mask_counts: dict[int, int],
+                        rust_accelerated: bool) -> dict:
+        """Multi-file comparison result from a key membership mask -> count table."""
+        return self._statistics_result(file_names, overlap_statistics(mask_counts, file_names),
+                                       upset_data(mask_counts, file_names), rust_accelerated)
+    
+    def _statistics_result(self, file_names: list[str], stats: dict, overlaps: Optional[dict],
+                           rust_accelerated: bool) -> dict:
+        """Multi-file comparison result from overlap statistics and UpSet data."""
+        return {
+            'file_count': len(file_names),
+            'file_names': file_names,
+            'total_unique_keys': stats['total_unique_keys'],
+            'keys_in_all_files': stats['keys_in_all_files'],
+            'file_exclusive_counts': stats['file_exclusive_counts'],
+            'keys_by_file_count': stats['by_file_count'],
+            'overlaps': overlaps,
+            'rust_accelerated': rust_accelerated,
+        }
+    
     def _compare_multiple_rust(self, file_keys: dict[str, set]) -> dict:
         """
         Use Rust FastIntersector for multi-file comparison.
@@ -300,50 +553,146 @@ class ChunkedProcessor:
         for filename, keys in file_keys.items():
             intersector.add_file(filename, list(keys))
         
-        rust_result = intersector.compute()
-        
-        return {
-            'file_count': len(file_keys),
-            'file_names': list(file_keys.keys()),
-            'total_unique_keys': rust_result.total_unique_keys,
-            'keys_in_all_files': rust_result.overlap_count,
-            'file_exclusive_counts': dict(rust_result.file_exclusive_counts),
-            'rust_accelerated': True,
-        }
+        file_names = list(file_keys.keys())
+        return self._overlap_result(file_names, dict(intersector.overlap_counts(file_names)), True)
     
     def _compare_multiple_python(self, file_keys: dict[str, set]) -> dict:
         """
-        Pure Python fallback for multi-file comparison.
+        Pure Python fallback for multi-file comparison (NumPy bitmasks).
         """
         logger.debug("Using Python fallback for multi-file comparison")
         
-        all_keys = set()
-        for keys in file_keys.values():
-            all_keys.update(keys)
+        _, masks = membership_masks([list(keys) for keys in file_keys.values()])
+        return self._overlap_result(list(file_keys.keys()), count_masks(masks), False)
+    
+    def reservoir_sample(self, file_path: Path,
+                         sample_size: int,
+                         seed: Optional[int] = None) -> tuple[pd.DataFrame, int]:
+        """
+        Uniform random sample of rows from a large file.
+        
+        Records are numbered from a vectorized, quote-aware scan of the
+        file's bytes, Algorithm L picks the sample (skipping straight to the
+        next record that enters the reservoir), and only the sampled records
+        are parsed. Files whose quotes do not balance are sampled from a
+        chunked pass instead, with the same skips over parsed chunks.
         
-        # Find keys in all files
-        keys_in_all = all_keys.copy()
-        for keys in file_keys.values():
-            keys_in_all &= keys
+        Args:
+            file_path: Path to CSV file
+            sample_size: Number of rows to sample
+            seed: Random seed for a reproducible sample
+            
+        Returns:
+            Tuple of (sample in file order, indexed by row number; total rows)
+        """
+        if sample_size < 1:
+            raise ValueError("sample_size must be positive")
+        sampled = self._sample_records(file_path, sample_size, np.random.default_rng(seed))
+        if sampled is None:
+            sampled = self._sample_chunks(file_path, sample_size, np.random.default_rng(seed))
+        return sampled
+    
+    def _read_spans(self, file_path: Path, header_end: int,
+                    spans: list[tuple[int, int]]) -> pd.DataFrame:
+        """Parse records by byte span, retried as Latin-1 like read_csv_chunked."""
+        try:
+            return read_csv_spans(file_path, header_end, spans)
+        except UnicodeDecodeError:
+            return read_csv_spans(file_path, header_end, spans, encoding='latin-1')
+    
+    def _sample_records(self, file_path: Path, sample_size: int,
+                        rng: np.random.Generator) -> Optional[tuple[pd.DataFrame, int]]:
+        """Reservoir sample over byte spans; None when the spans cannot be trusted."""
+        header_end = header_length(file_path)
+        reservoir = _SkipReservoir(sample_size, rng)
+        items = np.full(sample_size, -1, dtype=np.int64)
+        spans = np.zeros((sample_size, 2), dtype=np.int64)
+        total_rows = 0
+        try:
+            for block in iter_record_blocks(file_path, header_end):
+                accepted = reservoir.accept(total_rows, total_rows + block.count)
+                if accepted:
+                    block_items, slots = np.array(accepted).T
+                    # A slot taken twice in one block keeps its last item
+                    _, last = np.unique(slots[::-1], return_index=True)
+                    block_items, slots = block_items[::-1][last], slots[::-1][last]
+                    starts, ends = block.spans(block_items - total_rows)
+                    items[slots] = block_items
+                    spans[slots, 0], spans[slots, 1] = starts, ends
+                total_rows += block.count
+        except ValueError as e:
+            logger.warning(f"{e}; sampling {file_path.name} from parsed chunks")
+            return None
+        if not total_rows:
+            return pd.DataFrame(), 0
+        
+        filled = min(total_rows, sample_size)
+        order = np.argsort(items[:filled])
+        try:
+            sample = self._read_spans(file_path, header_end, spans[:filled][order].tolist())
+        except pd.errors.ParserError:
+            sample = None
+        if sample is None or len(sample) != filled:
+            logger.warning(f"Sampled records of {file_path.name} did not parse as scanned; "
+                           f"sampling from parsed chunks")
+            return None
+        sample.index = pd.Index(items[:filled][order])
+        return sample, total_rows
+    
+    def _sample_chunks(self, file_path: Path, sample_size: int,
+                       rng: np.random.Generator) -> tuple[pd.DataFrame, int]:
+        """Reservoir sample over parsed chunks (rows of skipped chunks are never copied)."""
+        reservoir = _SkipReservoir(sample_size, rng)
+        items = np.full(sample_size, -1, dtype=np.int64)
+        sample = None
+        total_rows = 0
         
-        # Count file-exclusive keys
-        file_exclusive_counts = {}
-        for filename, keys in file_keys.items():
-            other_keys = set()
-            for other_name, other in file_keys.items():
-                if other_name != filename:
-                    other_keys.update(other)
-            exclusive = keys - other_keys
-            file_exclusive_counts[filename] = len(exclusive)
+        for chunk in self.read_csv_chunked(file_path):
+            chunk.index = pd.RangeIndex(total_rows, total_rows + len(chunk))
+            accepted = reservoir.accept(total_rows, total_rows + len(chunk))
+            total_rows += len(chunk)
+            if sample is not None and not accepted:
+                continue
+            for item, slot in accepted:
+                items[slot] = item
+            entering = chunk.loc[np.sort(items[items >= chunk.index.start])]
+            sample = entering if sample is None else pd.concat([sample[sample.index.isin(items)], entering])
+        
+        if sample is None:
+            return pd.DataFrame(), 0
+        return sample, total_rows
+    
+    def tail_sample(self, file_path: Path, sample_size: int) -> pd.DataFrame:
+        """
+        Last rows of a large file, read from the end.
         
-        return {
-            'file_count': len(file_keys),
-            'file_names': list(file_keys.keys()),
-            'total_unique_keys': len(all_keys),
-            'keys_in_all_files': len(keys_in_all),
-            'file_exclusive_counts': file_exclusive_counts,
-            'rust_accelerated': False,
-        }
+        The records are found by reading blocks backwards from the end of
+        the file and parsed with the header line re-attached. A file whose
+        tail does not parse as scanned (unbalanced quotes) is read in chunks.
+        
+        Args:
+            file_path: Path to CSV file
+            sample_size: Number of rows
+            
+        Returns:
+            The last sample_size rows (all rows of a shorter file)
+        """
+        if sample_size < 1:
+            raise ValueError("sample_size must be positive")
+        header_end = header_length(file_path)
+        start = tail_record_start(file_path, header_end, sample_size)
+        try:
+            tail = self._read_spans(file_path, header_end, [(start, file_path.stat().st_size)])
+            if len(tail) == sample_size or (start == header_end and len(tail) < sample_size):
+                return tail
+        except (pd.errors.ParserError, pd.errors.EmptyDataError):
+            pass
+        
+        logger.warning(f"Tail of {file_path.name} did not parse as scanned; reading it in chunks")
+        tail = None
+        for chunk in self.read_csv_chunked(file_path):
+            tail = chunk.iloc[-sample_size:] if tail is None else pd.concat([tail, chunk]).iloc[-sample_size:]
+        return tail.reset_index(drop=True) if tail is not None else pd.DataFrame()
     
     def sample_large_file(self, file_path: Path, 
                           sample_size: int = 1000,
@@ -354,7 +703,7 @@ class ChunkedProcessor:
         Args:
             file_path: Path to file
             sample_size: Number of rows to sample
-            method: 'random', 'head', 'tail', or 'stratified'
+            method: 'random' (indexed by row number), 'head' or 'tail'
             
         Returns:
             Sampled DataFrame
@@ -363,54 +712,102 @@ class ChunkedProcessor:
             return pd.read_csv(file_path, nrows=sample_size)
         
         elif method == 'tail':
-            # Need to count rows first
-            row_count = sum(1 for _ in self.read_csv_chunked(file_path))
-            if row_count <= sample_size:
-                return pd.read_csv(file_path)
-            
-            skip_rows = row_count - sample_size
-            return pd.read_csv(file_path, skiprows=range(1, skip_rows + 1))
+            return self.tail_sample(file_path, sample_size)
         
         elif method == 'random':
-            # Reservoir sampling across chunks
-            sample = []
-            total_seen = 0
-            
-            for chunk in self.read_csv_chunked(file_path):
-                chunk_size = len(chunk)
-                
-                if total_seen == 0:
-                    # First chunk - take up to sample_size
-                    sample = chunk.head(sample_size).to_dict('records')
-                else:
-                    # Reservoir sampling
-                    for i, row in chunk.iterrows():
-                        total_seen_before = total_seen
-                        total_seen += 1
-                        
-                        if len(sample) < sample_size:
-                            sample.append(row.to_dict())
-                        else:
-                            # Replace with decreasing probability
-                            j = np.random.randint(0, total_seen)
-                            if j < sample_size:
-                                sample[j] = row.to_dict()
-                
-                total_seen += chunk_size
-            
-            return pd.DataFrame(sample)
+            return self.reservoir_sample(file_path, sample_size)[0]
         
         else:
             raise ValueError(f"Unknown sampling method: {method}")
 
 
+class _SkipReservoir:
+    """
+    Algorithm L (Li, 1994) over items numbered 0, 1, 2...
+    
+    The first `size` items fill the reservoir; after that the gap to the
+    next item entering it is drawn directly, so random numbers are spent
+    only on the roughly size * ln(n / size) items that enter, not on every
+    item.
+    """
+    
+    def __init__(self, size: int, rng: np.random.Generator):
+        self.size = size
+        self.rng = rng
+        self._w = math.exp(math.log(self._uniform()) / size)
+        self._next = size + self._gap()
+    
+    def _uniform(self) -> float:
+        """Uniform in (0, 1]."""
+        return 1.0 - self.rng.random()
+    
+    def _gap(self) -> int:
+        if self._w >= 1.0:
+            return 0
+        return int(math.log(self._uniform()) / math.log1p(-self._w))
+    
+    def accept(self, start: int, stop: int) -> list[tuple[int, int]]:
+        """(item, reservoir slot) for each item in [start, stop) entering the reservoir, in order."""
+        accepted = [(item, item) for item in range(start, min(stop, self.size))]
+        while self._next < stop:
+            accepted.append((self._next, int(self.rng.integers(self.size))))
+            self._w *= math.exp(math.log(self._uniform()) / self.size)
+            self._next += self._gap() + 1
+        return accepted
+
+
+def _picklable(obj) -> bool:
+    try:
+        pickle.dumps(obj)
+        return True
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+
+
+def _capture(fn: Callable, *args) -> tuple[bool, object]:
+    """Worker: (True, fn(*args)), or (False, message) if it raised."""
+    try:
+        return True, fn(*args)
+    except Exception as e:
+        return False, str(e)
+
+
+def _load_job(loader: Callable[..., pd.DataFrame], directory: str, *args):
+    """Worker: load a frame and hand it back through an Arrow IPC file in directory."""
+    return export_frame(loader(*args), directory)
+
+
+def _load_memory(file_path: Path) -> int:
+    """Rough peak memory, in bytes, of loading one file in a worker."""
+    size = file_path.stat().st_size if file_path.exists() else 0
+    return WORKER_BASE_MEMORY_MB * 1024 * 1024 + size * WORKER_FRAME_EXPANSION
+
+
 class ParallelProcessor:
     """
     Parallel processing utilities for multiple files.
+    
+    Files are processed and loaded in the worker pool (processes sized from
+    the CPU count and memory budget), so CPU-bound pandas work is not
+    serialized by the GIL. Loaded frames come back as Arrow IPC files in
+    shared memory (WORKER_TRANSFER_DIR) rather than pickled through the
+    pool's pipe. With one worker, one file, or a function that cannot be
+    pickled, files are handled in this process.
     """
     
-    def __init__(self, max_workers: int = MAX_WORKERS):
-        self.max_workers = max_workers
+    def __init__(self, pool: Optional[WorkerPool] = None):
+        """
+        Args:
+            pool: Worker pool (default: the shared pool)
+        """
+        self.pool = pool if pool is not None else worker_pool
+    
+    @property
+    def max_workers(self) -> int:
+        return self.pool.max_workers
+    
+    def _in_pool(self, count: int, fn: Callable) -> bool:
+        return self.pool.max_workers > 1 and count > 1 and _picklable(fn)
     
     def process_files_parallel(self, 
                                file_paths: list[Path],
@@ -420,28 +817,24 @@ class ParallelProcessor:
         
         Args:
             file_paths: List of file paths
-            processor: Function to process each file
+            processor: Function to process each file (picklable to run in workers)
             
         Returns:
-            Dict mapping filename to result
+            Dict mapping filename to result ({"error": message} if it failed)
         """
-        results = {}
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_file = {
-                executor.submit(processor, path): path 
-                for path in file_paths
-            }
-            
-            for future in as_completed(future_to_file):
-                file_path = future_to_file[future]
-                try:
-                    result = future.result()
-                    results[file_path.name] = result
-                except Exception as e:
-                    logger.error(f"Error processing {file_path.name}: {str(e)}")
-                    results[file_path.name] = {"error": str(e)}
+        if self._in_pool(len(file_paths), processor):
+            jobs = {path.name: PoolJob(_capture, (processor, path), memory_bytes=_load_memory(path))
+                    for path in file_paths}
+            outcomes = self.pool.run(jobs)
+        else:
+            outcomes = ((path.name, _capture(processor, path)) for path in file_paths)
         
+        results = {}
+        for name, (ok, value) in outcomes:
+            if not ok:
+                logger.error(f"Error processing {name}: {value}")
+                value = {"error": value}
+            results[name] = value
         return results
     
     def load_dataframes_parallel(self, 
@@ -449,21 +842,85 @@ class ParallelProcessor:
                                  loader: Callable[[Path], pd.DataFrame]) -> dict[str, pd.DataFrame]:
         """
         Load multiple dataframes in parallel.
+        Files that fail to load are logged and left out.
         """
+        loads = {path.name: ((path,), _load_memory(path)) for path in file_paths}
         results = {}
+        for name, (ok, value) in self._run_loads(loads, loader, capture_errors=True):
+            if ok:
+                results[name] = import_frame(value)
+            else:
+                logger.error(f"Error loading {name}: {value}")
+        return results
+    
+    def load_session_files(self, session_id: str, filenames: list[str],
+                           on_load: Optional[Callable[[str], None]] = None) -> dict[str, pd.DataFrame]:
+        """
+        Load uploaded files in parallel (FileHandler.load_dataframe in workers).
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_file = {
-                executor.submit(loader, path): path 
-                for path in file_paths
-            }
+        Args:
+            session_id: Session ID
+            filenames: Files to load
+            on_load: Optional callback(filename) as each file finishes loading
+            
+        Returns:
+            Dict mapping filename to DataFrame, in the order of filenames
+            
+        Raises:
+            Exception: The first load error (e.g. FileNotFoundError)
+        """
+        names = list(dict.fromkeys(filenames))
+        loaded = {}
+        for name, df in self.iter_session_files(session_id, names):
+            loaded[name] = df
+            if on_load:
+                on_load(name)
+        return {name: loaded[name] for name in names}
+    
+    def iter_session_files(self, session_id: str, filenames: list[str],
+                           loader: Callable[..., pd.DataFrame] = FileHandler.load_dataframe,
+                           *loader_args) -> Iterator[tuple[str, pd.DataFrame]]:
+        """
+        Yield (filename, frame) for uploaded files as each finishes loading,
+        so a caller can work on one file while the others are still loading.
+        
+        Args:
+            session_id: Session ID
+            filenames: Files to load
+            loader: loader(session_id, filename, *loader_args) -> DataFrame,
+                    run in the workers (picklable); it may reduce the frame
+                    so that only what the caller needs is handed back
             
-            for future in as_completed(future_to_file):
-                file_path = future_to_file[future]
-                try:
-                    df = future.result()
-                    results[file_path.name] = df
-                except Exception as e:
-                    logger.error(f"Error loading {file_path.name}: {str(e)}")
+        Raises:
+            Exception: The first load error (e.g. FileNotFoundError)
+        """
+        loads = {name: ((session_id, name, *loader_args), _load_memory(UPLOADS_DIR / session_id / name))
+                 for name in dict.fromkeys(filenames)}
+        for name, result in self._run_loads(loads, loader):
+            yield name, import_frame(result)
+    
+    def _run_loads(self, loads: dict[str, tuple[tuple, int]], loader: Callable[..., pd.DataFrame],
+                   capture_errors: bool = False) -> Iterator[tuple[str, object]]:
+        """
+        Yield (name, frame) per load of {name: (loader args, memory bytes)}.
         
-        return results
+        Frames loaded in workers are yielded as exported frames (for
+        import_frame) in a directory of this call, which is removed at the
+        end with any frames a caller stopped before importing. With
+        capture_errors each result is an (ok, frame or message) pair.
+        """
+        if not self._in_pool(len(loads), loader):
+            load = functools.partial(_capture, loader) if capture_errors else loader
+            for name, (args, _) in loads.items():
+                yield name, load(*args)
+            return
+        
+        directory = tempfile.mkdtemp(prefix="viewerit-frames-", dir=WORKER_TRANSFER_DIR)
+        load = functools.partial(_load_job, loader, directory)
+        if capture_errors:
+            load = functools.partial(_capture, load)
+        try:
+            yield from self.pool.run({name: PoolJob(load, args, memory_bytes=memory)
+                                      for name, (args, memory) in loads.items()})
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
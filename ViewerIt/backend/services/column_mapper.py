@@ -0,0 +1,269 @@
+"""
+Column Mapper Service - Candidate column mappings across files without all-pairs scans.
+Renamed columns are found two ways: by similar names (character n-grams of the
+normalized name) and by similar contents (MinHash signatures of sampled
+values). Both use bucketed indexes - an n-gram inverted index and LSH bands
+over the signatures - so the number of pairs to score grows with the number
+of similar columns, not with the square of all columns.
+
+Value signatures use one-permutation MinHash: each distinct value hash falls
+into one of num_perm bins and the bin minimum is kept, so a column costs a
+single hash pass over its sample. Empty bins are filled from the next
+non-empty bin (rotation densification) so small value sets still compare.
+"""
+import re
+from collections import defaultdict
+from typing import Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import COLUMN_MAPPING_SAMPLE_ROWS
+from .row_fingerprints import mix64
+
+logger = logging.getLogger(__name__)
+
+_NAME_SEPARATORS = re.compile(r"[\s\-_./\\:;,#]+")
+_EMPTY_BIN = np.uint64(np.iinfo(np.uint64).max)
+# Odd 64-bit constant separating borrowed bins (rotation densification)
+_ROTATION = np.uint64(0x9E3779B97F4A7C15)
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a column name and drop separators ('Doc_ID' -> 'docid')."""
+    return _NAME_SEPARATORS.sub("", str(name).lower())
+
+
+def name_ngrams(name: str, n: int = 3) -> set[str]:
+    """Character n-grams of a normalized, boundary-padded column name."""
+    padded = f"^{normalize_name(name)}$"
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class ColumnMapper:
+    """
+    Finds candidate column pairs across files by name and by value similarity.
+
+    Usage:
+        mapper = ColumnMapper()
+        for name, df in dataframes.items():
+            mapper.add_file(name, df, columns_to_match[name])
+        pairs = mapper.candidate_pairs()
+    """
+
+    def __init__(self,
+                 num_perm: int = 64,
+                 bands: int = 16,
+                 sample_rows: int = COLUMN_MAPPING_SAMPLE_ROWS,
+                 min_distinct: int = 10,
+                 ngram_size: int = 3,
+                 name_threshold: float = 0.25,
+                 max_bucket_size: int = 100,
+                 max_candidates: int = 3,
+                 seed: int = 1):
+        """
+        Args:
+            num_perm: MinHash signature length (power of two)
+            bands: LSH bands; num_perm / bands rows per band. 16 bands of 4
+                   rows catch most pairs from a value Jaccard of about 0.5
+            sample_rows: Rows sampled per column for its signature
+            min_distinct: Columns with fewer distinct sampled values get no
+                          value signature (flags and codes match everything)
+            ngram_size: Character n-gram length for name blocking
+            name_threshold: Minimum n-gram Jaccard for a name candidate
+            max_bucket_size: Buckets (n-grams or LSH bands) shared by more
+                             columns than this are too common to discriminate
+                             and are skipped
+            max_candidates: Partners kept per column for each other file
+        """
+        if num_perm <= 0 or num_perm & (num_perm - 1):
+            raise ValueError("num_perm must be a power of two")
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.sample_rows = sample_rows
+        self.min_distinct = min_distinct
+        self.ngram_size = ngram_size
+        self.name_threshold = name_threshold
+        self.max_bucket_size = max_bucket_size
+        self.max_candidates = max_candidates
+
+        self._seed = np.uint64(seed)
+        self._shift = np.uint64(64 - (num_perm.bit_length() - 1))
+        self._file_names: list[str] = []
+        self._file_columns: list[set] = []
+        self._columns: list[tuple[int, str]] = []  # (file index, column)
+        self._names: list[set[str]] = []
+        self._signatures: dict[int, np.ndarray] = {}
+
+    def value_hashes(self, series: pd.Series) -> np.ndarray:
+        """
+        Distinct value hashes for an evenly spaced row sample of a column.
+
+        Numeric columns hash as float64 so 5 and 5.0 agree; everything else
+        hashes its string form.
+        """
+        positions = None
+        if len(series) > self.sample_rows:
+            positions = np.linspace(0, len(series) - 1, self.sample_rows).astype(np.intp)
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            array = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            array = array if positions is None else array[positions]
+            array = array[~np.isnan(array)]
+        else:
+            array = series.to_numpy(dtype=object)
+            array = array if positions is None else array[positions]
+            # hash_array hashes strings directly, or falls back to str(value)
+            array = array[~pd.isna(array)]
+        return np.unique(pd.util.hash_array(array, categorize=False))
+
+    def signature(self, hashes: np.ndarray) -> Optional[np.ndarray]:
+        """One-permutation MinHash signature of distinct value hashes."""
+        if len(hashes) < self.min_distinct:
+            return None
+
+        mixed = np.sort(mix64(hashes, self._seed))
+        bins = (mixed >> self._shift).astype(np.intp)
+        occupied, first = np.unique(bins, return_index=True)
+
+        signature = np.full(self.num_perm, _EMPTY_BIN, dtype=np.uint64)
+        signature[occupied] = mixed[first]
+
+        if len(occupied) < self.num_perm:
+            # Borrow each empty bin from the next occupied bin (circularly)
+            empty = np.flatnonzero(signature == _EMPTY_BIN)
+            source = occupied[np.searchsorted(occupied, empty) % len(occupied)]
+            distance = ((source - empty) % self.num_perm).astype(np.uint64)
+            with np.errstate(over="ignore"):
+                signature[empty] = signature[source] + distance * _ROTATION
+        return signature
+
+    def add_file(self, file_name: str, df: pd.DataFrame, columns: Optional[list] = None):
+        """
+        Index a file's columns by name n-grams and value signature.
+
+        Args:
+            file_name: File the columns belong to
+            df: The file's dataframe
+            columns: Columns to index (default: all). Columns present in
+                     every file need no mapping and can be left out.
+        """
+        file_index = len(self._file_names)
+        self._file_names.append(file_name)
+        self._file_columns.append(set(df.columns))
+
+        for col in (df.columns if columns is None else columns):
+            ref = len(self._columns)
+            self._columns.append((file_index, col))
+            self._names.append(name_ngrams(col, self.ngram_size))
+            signature = self.signature(self.value_hashes(df[col]))
+            if signature is not None:
+                self._signatures[ref] = signature
+
+    def _can_map(self, ref1: int, ref2: int) -> bool:
+        """Whether two columns are in different files and each is missing from the other's file."""
+        file1, col1 = self._columns[ref1]
+        file2, col2 = self._columns[ref2]
+        return (file1 != file2 and col1 not in self._file_columns[file2]
+                and col2 not in self._file_columns[file1])
+
+    def _name_candidates(self) -> dict[tuple[int, int], float]:
+        """Mappable column pairs whose name n-gram Jaccard clears name_threshold."""
+        index = defaultdict(list)
+        for ref, grams in enumerate(self._names):
+            for gram in grams:
+                index[gram].append(ref)
+
+        # Block on n-grams rare enough to discriminate, then score exactly
+        pairs = {}
+        for ref, grams in enumerate(self._names):
+            others = set()
+            for gram in grams:
+                bucket = index[gram]
+                if len(bucket) <= self.max_bucket_size:
+                    others.update(other for other in bucket if other > ref)
+            for other in others:
+                if not self._can_map(ref, other):
+                    continue
+                other_grams = self._names[other]
+                shared = len(grams & other_grams)
+                jaccard = shared / (len(grams) + len(other_grams) - shared)
+                if jaccard >= self.name_threshold:
+                    pairs[(ref, other)] = jaccard
+        return pairs
+
+    def _value_candidates(self) -> set[tuple[int, int]]:
+        """Mappable column pairs sharing at least one LSH band of their signatures."""
+        buckets = defaultdict(list)
+        r = self.rows_per_band
+        for ref, signature in self._signatures.items():
+            for band in range(self.bands):
+                buckets[(band, signature[band * r:(band + 1) * r].tobytes())].append(ref)
+
+        pairs = set()
+        for refs in buckets.values():
+            if 1 < len(refs) <= self.max_bucket_size:
+                for i, ref in enumerate(refs):
+                    pairs.update((ref, other) for other in refs[i + 1:])
+        # Near-identical columns share many bands; check each pair once
+        return {pair for pair in pairs if self._can_map(*pair)}
+
+    def _value_similarities(self, pairs: list[tuple[int, int]]) -> np.ndarray:
+        """Estimated value Jaccard per pair (NaN where a column has no signature)."""
+        result = np.full(len(pairs), np.nan)
+        signed = [i for i, (a, b) in enumerate(pairs) if a in self._signatures and b in self._signatures]
+        if signed:
+            left = np.stack([self._signatures[pairs[i][0]] for i in signed])
+            right = np.stack([self._signatures[pairs[i][1]] for i in signed])
+            result[signed] = (left == right).mean(axis=1)
+        return result
+
+    def candidate_pairs(self) -> list[dict]:
+        """
+        Candidate column pairs from different files, where each column is
+        missing from the other file.
+
+        Each column keeps at most max_candidates partners per other file,
+        ranked by name n-gram Jaccard plus estimated value Jaccard.
+
+        Returns:
+            List of dicts with file1, column1, file2, column2 (file1 indexed
+            before file2) and value_similarity (estimated Jaccard of sampled
+            values, None when either column has no signature)
+        """
+        name_scores = self._name_candidates()
+        pairs = sorted(name_scores.keys() | self._value_candidates())
+        value_scores = self._value_similarities(pairs)
+
+        # Rank partners per (column, other file) and keep the best few
+        ranked = defaultdict(list)
+        for i, (ref1, ref2) in enumerate(pairs):
+            value = 0.0 if np.isnan(value_scores[i]) else value_scores[i]
+            combined = name_scores.get((ref1, ref2), 0.0) + value
+            ranked[(ref1, self._columns[ref2][0])].append((combined, i))
+            ranked[(ref2, self._columns[ref1][0])].append((combined, i))
+        keep = set()
+        for partners in ranked.values():
+            partners.sort(reverse=True)
+            keep.update(i for _, i in partners[:self.max_candidates])
+
+        result = []
+        for i in sorted(keep):
+            ref1, ref2 = pairs[i]
+            (file1, col1), (file2, col2) = self._columns[ref1], self._columns[ref2]
+            if file1 > file2:
+                (file1, col1), (file2, col2) = (file2, col2), (file1, col1)
+            result.append({
+                "file1": self._file_names[file1],
+                "column1": col1,
+                "file2": self._file_names[file2],
+                "column2": col2,
+                "value_similarity": None if np.isnan(value_scores[i]) else float(value_scores[i]),
+            })
+        return result
@@ -2,10 +2,70 @@
 Data Comparator Service - Core comparison logic using datacompy.
 """
 import pandas as pd
-from datacompy.core import Compare
-from typing import Optional
+import numpy as np
+from datacompy.core import Compare, calculate_max_diff
+from typing import Optional, Iterator
 import json
 
+from .metrics import stage
+from .profiler import get_profiles
+from .fuzzy_keys import FuzzyKeyMatcher, MATCH_KEY_COLUMN, composite_key, summarize_matches
+from .value_diff import diff_columns
+
+
+class _DiffKernelCompare(Compare):
+    """
+    datacompy Compare whose value comparison runs through value_diff.
+    
+    Every compared column is diffed in one batched call (in viewerit_core
+    when available) and the match columns are added to intersect_rows in a
+    single concat, instead of one full-frame concat per column. Match
+    columns and column_stats are the ones datacompy produces.
+    """
+    
+    def _intersect_compare(self, ignore_spaces: bool, ignore_case: bool) -> None:
+        rows = self.intersect_rows
+        row_cnt = len(rows)
+        value_columns = [c for c in self.intersect_columns() if c not in self.join_columns]
+        pairs = [(rows[f"{c}_{self.df1_name}"], rows[f"{c}_{self.df2_name}"]) for c in value_columns]
+        mismatches = diff_columns(pairs, abs_tol=self.abs_tol, rel_tol=self.rel_tol,
+                                  ignore_spaces=ignore_spaces, ignore_case=ignore_case)
+        
+        matches = {}
+        for column, positions in zip(value_columns, mismatches):
+            match = np.ones(row_cnt, dtype=bool)
+            match[positions] = False
+            matches[f"{column}_match"] = match
+        self.intersect_rows = pd.concat([rows, pd.DataFrame(matches, index=rows.index)], axis=1)
+        
+        unequal = dict(zip(value_columns, map(len, mismatches)))
+        for column in self.intersect_columns():
+            if column in self.join_columns:
+                match_cnt = row_cnt
+                stat_rows = row_cnt
+                if self.only_join_columns():
+                    stat_rows += len(self.df1_unq_rows) + len(self.df2_unq_rows)
+                max_diff, null_diff = 0.0, 0
+            else:
+                match_cnt = row_cnt - unequal[column]
+                stat_rows = row_cnt
+                col_1, col_2 = pairs[value_columns.index(column)]
+                max_diff = calculate_max_diff(col_1, col_2)
+                null_diff = int((col_1.isnull() ^ col_2.isnull()).sum())
+            
+            dtype1, dtype2 = self.df1[column].dtype, self.df2[column].dtype
+            self.column_stats.append({
+                "column": column,
+                "match_column": f"{column}_match",
+                "match_cnt": match_cnt,
+                "unequal_cnt": stat_rows - match_cnt,
+                "dtype1": repr(dtype1) if str(dtype1) == "string" else str(dtype1),
+                "dtype2": repr(dtype2) if str(dtype2) == "string" else str(dtype2),
+                "all_match": dtype1 == dtype2 and stat_rows == match_cnt,
+                "max_diff": max_diff,
+                "null_diff": null_diff,
+            })
+
 
 class DataComparator:
     """Compares two dataframes and generates comprehensive reports."""
@@ -17,11 +77,15 @@ class DataComparator:
         self.df1_name = df1_name
         self.df2_name = df2_name
         self._comparison: Optional[Compare] = None
+        self._statistics: Optional[dict] = None
     
     def compare(self, join_columns: list[str], 
                 ignore_columns: Optional[list[str]] = None,
                 abs_tol: float = 0.0001,
-                rel_tol: float = 0.0) -> dict:
+                rel_tol: float = 0.0,
+                fuzzy_keys: Optional[dict] = None,
+                ignore_spaces: bool = False,
+                ignore_case: bool = False) -> dict:
         """
         Perform the comparison and return results.
         
@@ -30,6 +94,11 @@ class DataComparator:
             ignore_columns: Columns to exclude from comparison
             abs_tol: Absolute tolerance for numeric comparisons
             rel_tol: Relative tolerance for numeric comparisons
+            fuzzy_keys: Optional FuzzyKeyMatcher options. When given, keys that
+                        differ only by formatting are matched and rows are
+                        joined on a synthetic '_match_key' column instead.
+            ignore_spaces: Strip leading/trailing whitespace from text values
+            ignore_case: Compare text values case-insensitively
         """
         df1_compare = self.df1.copy()
         df2_compare = self.df2.copy()
@@ -39,17 +108,58 @@ class DataComparator:
             df1_compare = df1_compare.drop(columns=[c for c in ignore_columns if c in df1_compare.columns], errors='ignore')
             df2_compare = df2_compare.drop(columns=[c for c in ignore_columns if c in df2_compare.columns], errors='ignore')
         
-        self._comparison = Compare(
-            df1_compare,
-            df2_compare,
-            join_columns=join_columns,
-            df1_name=self.df1_name,
-            df2_name=self.df2_name,
-            abs_tol=abs_tol,
-            rel_tol=rel_tol,
-        )
+        fuzzy_report = None
+        if fuzzy_keys is not None:
+            with stage("keys", rows=len(df1_compare) + len(df2_compare)):
+                df1_compare, df2_compare, fuzzy_report = self._apply_fuzzy_keys(
+                    df1_compare, df2_compare, join_columns, fuzzy_keys
+                )
+            join_columns = [MATCH_KEY_COLUMN]
+        
+        with stage("datacompy", rows=len(df1_compare) + len(df2_compare)):
+            self._comparison = _DiffKernelCompare(
+                df1_compare,
+                df2_compare,
+                join_columns=join_columns,
+                df1_name=self.df1_name,
+                df2_name=self.df2_name,
+                abs_tol=abs_tol,
+                rel_tol=rel_tol,
+                ignore_spaces=ignore_spaces,
+                ignore_case=ignore_case,
+            )
         
-        return self._get_comparison_results()
+        with stage("report"):
+            results = self._get_comparison_results()
+        if fuzzy_report is not None:
+            results["fuzzy_matching"] = fuzzy_report
+        return results
+    
+    def _apply_fuzzy_keys(self, df1: pd.DataFrame, df2: pd.DataFrame,
+                          join_columns: list[str],
+                          options: dict) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+        """
+        Add a shared match key to both frames, mapping df2 keys onto the
+        df1 keys they were matched to.
+        """
+        for name, df in ((self.df1_name, df1), (self.df2_name, df2)):
+            missing = [col for col in join_columns if col not in df.columns]
+            if missing:
+                raise ValueError(f"File '{name}' missing join columns: {missing}")
+        
+        matcher = FuzzyKeyMatcher(**options)
+        keys1 = composite_key(df1, join_columns)
+        keys2 = composite_key(df2, join_columns)
+        matches = matcher.match(keys1, keys2)
+        
+        mapping = pd.Series(matches["left_key"].to_numpy(), index=matches["right_key"].to_numpy())
+        df1 = df1.assign(**{MATCH_KEY_COLUMN: keys1})
+        df2 = df2.assign(**{MATCH_KEY_COLUMN: keys2.map(mapping).fillna(keys2)})
+        
+        report = summarize_matches(matches)
+        report["join_column"] = MATCH_KEY_COLUMN
+        report["key_columns"] = list(join_columns)
+        return df1, df2, report
     
     def _get_comparison_results(self) -> dict:
         """Extract comprehensive comparison results."""
@@ -63,9 +173,10 @@ class DataComparator:
         cols_only_in_df2 = list(comp.df2_unq_columns())
         common_columns = list(comp.intersect_columns())
         
-        # Get row differences
-        rows_only_in_df1 = comp.df1_unq_rows.to_dict(orient='records') if len(comp.df1_unq_rows) > 0 else []
-        rows_only_in_df2 = comp.df2_unq_rows.to_dict(orient='records') if len(comp.df2_unq_rows) > 0 else []
+        # Get row differences (only the sampled rows are converted to records;
+        # the full sets are available through iter_unique_row_frames)
+        rows_only_in_df1 = comp.df1_unq_rows.head(10).to_dict(orient='records')
+        rows_only_in_df2 = comp.df2_unq_rows.head(10).to_dict(orient='records')
         
         # Build column stats lookup from the new list-based format
         column_stats_lookup = {}
@@ -84,15 +195,8 @@ class DataComparator:
                     mismatch_count = int(column_stats_lookup[col].get('unequal_cnt', 0))
                 else:
                     # Fallback: Calculate mismatch from the comparison directly
-                    try:
-                        if hasattr(comp, 'intersect_rows') and comp.intersect_rows is not None:
-                            col_df1 = f"{col}_df1"
-                            col_df2 = f"{col}_df2"
-                            if col_df1 in comp.intersect_rows.columns and col_df2 in comp.intersect_rows.columns:
-                                mask = comp.intersect_rows[col_df1] != comp.intersect_rows[col_df2]
-                                mismatch_count = int(mask.sum())
-                    except Exception:
-                        mismatch_count = 0
+                    if hasattr(comp, 'intersect_rows') and comp.intersect_rows is not None:
+                        mismatch_count = int(len(self._mismatch_positions(col)))
                 
                 column_mismatches.append({
                     "column": col,
@@ -129,80 +233,263 @@ class DataComparator:
                 "mismatched": mismatched_cols_with_samples,
             },
             "rows": {
-                "only_in_df1_count": len(rows_only_in_df1),
-                "only_in_df2_count": len(rows_only_in_df2),
-                "only_in_df1_sample": rows_only_in_df1[:10],  # First 10 samples
-                "only_in_df2_sample": rows_only_in_df2[:10],
+                "only_in_df1_count": len(comp.df1_unq_rows),
+                "only_in_df2_count": len(comp.df2_unq_rows),
+                "only_in_df1_sample": rows_only_in_df1,  # First 10 samples
+                "only_in_df2_sample": rows_only_in_df2,
             },
             "column_stats": column_mismatches,
             "text_report": comp.report(),
         }
     
-    def get_detailed_diff(self, column: str, limit: int = 100) -> list[dict]:
+    def get_detailed_diff(self, column: str, limit: int = 100,
+                          offset: int = 0) -> list[dict]:
         """Get detailed row-by-row differences for a specific column."""
+        page = self.get_detailed_diffs([column], limit=limit, offset=offset)["columns"][
+            self._resolve_column(column)
+        ]
+        return [
+            {"row_index": idx, "value_in_df1": old, "value_in_df2": new}
+            for idx, old, new in zip(page["row_index"], page["value_in_df1"], page["value_in_df2"])
+        ]
+    
+    def get_detailed_diffs(self, columns: Optional[list[str]] = None,
+                           limit: int = 100, offset: int = 0) -> dict:
+        """
+        Get one page of mismatches for many columns in a single call.
+        
+        Masks come from datacompy's vectorized, tolerance-aware match columns
+        over intersect_rows; only the requested page of each column is
+        converted to Python values.
+        
+        Args:
+            columns: Columns to include (default: every compared column)
+            limit: Maximum mismatches returned per column
+            offset: Number of mismatches to skip per column
+        
+        Returns:
+            Columnar page per column: total mismatch count, join key arrays,
+            row indices and old/new value arrays.
+        """
         if not self._comparison:
             raise ValueError("Comparison not yet performed. Call compare() first.")
+        if limit < 0 or offset < 0:
+            raise ValueError("limit and offset must be non-negative")
         
         comp = self._comparison
-        diffs = []
+        intersect = comp.intersect_rows
+        join_columns = list(comp.join_columns)
+        
+        if columns is None:
+            columns = [c for c in comp.intersect_columns() if c not in join_columns]
+        else:
+            columns = [self._resolve_column(c) for c in columns]
         
-        try:
-            intersect = comp.intersect_rows
-            col_df1 = f"{column}_df1" if f"{column}_df1" in intersect.columns else column
-            col_df2 = f"{column}_df2" if f"{column}_df2" in intersect.columns else column
+        pages = {}
+        for column in columns:
+            mismatch = self._mismatch_positions(column)
+            positions = mismatch[offset:offset + limit]
+            rows = intersect.iloc[positions]
+            col_df1, col_df2 = self._intersect_value_columns(column)
             
-            if col_df1 in intersect.columns and col_df2 in intersect.columns:
-                mask = intersect[col_df1] != intersect[col_df2]
-                diff_rows = intersect[mask].head(limit)
-                
-                for idx, row in diff_rows.iterrows():
-                    diffs.append({
-                        "row_index": int(idx) if isinstance(idx, int) else str(idx),
+            pages[column] = {
+                "total": int(len(mismatch)),
+                "offset": offset,
+                "keys": {jc: rows[jc].tolist() for jc in join_columns},
+                "row_index": rows.index.tolist(),
+                "value_in_df1": rows[col_df1].astype(str).tolist(),
+                "value_in_df2": rows[col_df2].astype(str).tolist(),
+            }
+        
+        return {"join_columns": join_columns, "limit": limit, "columns": pages}
+    
+    def _resolve_column(self, column: str) -> str:
+        """Map a user-supplied column name to its compared (lowercased) name."""
+        comp = self._comparison
+        join_columns = set(comp.join_columns)
+        compared = [c for c in comp.intersect_columns() if c not in join_columns]
+        if column in compared:
+            return column
+        if str(column).lower() in compared:
+            return str(column).lower()
+        raise ValueError(f"Column '{column}' is not a compared column in both files")
+    
+    def _mismatch_positions(self, column: str) -> np.ndarray:
+        """Positional indices of intersect_rows where a column differs."""
+        match_col = f"{column}_match"
+        intersect = self._comparison.intersect_rows
+        if match_col in intersect.columns:
+            return np.flatnonzero(~intersect[match_col].to_numpy(dtype=bool))
+        
+        col_df1, col_df2 = self._intersect_value_columns(column)
+        values1, values2 = intersect[col_df1], intersect[col_df2]
+        differs = (values1 != values2) & ~(values1.isna() & values2.isna())
+        return np.flatnonzero(differs.to_numpy(dtype=bool))
+    
+    def iter_unique_row_frames(self, side: str,
+                               batch_rows: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Yield every row that exists only in one dataframe, in batches.
+        
+        Args:
+            side: 'df1' or 'df2'
+            batch_rows: Maximum rows per yielded frame
+        """
+        if not self._comparison:
+            raise ValueError("Comparison not yet performed. Call compare() first.")
+        if side not in ("df1", "df2"):
+            raise ValueError(f"Unknown side: {side}")
+        
+        unique_rows = getattr(self._comparison, f"{side}_unq_rows")
+        for start in range(0, len(unique_rows), batch_rows):
+            yield unique_rows.iloc[start:start + batch_rows]
+    
+    def iter_mismatch_frames(self, batch_rows: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Yield every value-level mismatch in long format, in batches.
+        
+        Each frame holds the join columns plus 'column', 'value_in_df1' and
+        'value_in_df2'. Masks come from datacompy's tolerance-aware match
+        columns, so no per-row Python work is done.
+        """
+        if not self._comparison:
+            raise ValueError("Comparison not yet performed. Call compare() first.")
+        
+        intersect = self._comparison.intersect_rows
+        join_columns = list(self._comparison.join_columns)
+        
+        for column in self._comparison.intersect_columns():
+            if column in join_columns:
+                continue
+            col_df1, col_df2 = self._intersect_value_columns(column)
+            if col_df1 not in intersect.columns:
+                continue
+            
+            positions = self._mismatch_positions(column)
+            for start in range(0, len(positions), batch_rows):
+                rows = intersect.iloc[positions[start:start + batch_rows]]
+                frame = rows[join_columns].reset_index(drop=True)
+                frame["column"] = column
+                frame["value_in_df1"] = rows[col_df1].astype("string").to_numpy()
+                frame["value_in_df2"] = rows[col_df2].astype("string").to_numpy()
+                yield frame
+    
+    def _intersect_value_columns(self, column: str) -> tuple[str, str]:
+        """Names of a column's two value columns in intersect_rows."""
+        # datacompy suffixes the values with the dataframe names
+        comp = self._comparison
+        return f"{column}_{comp.df1_name}", f"{column}_{comp.df2_name}"
+    
+    def get_row_diff(self, key: dict) -> dict:
+        """
+        Get both versions of a single row and the columns that differ.
+        
+        Args:
+            key: Mapping of join column to value identifying the row.
+                 Values are matched by their string form, so keys taken
+                 from JSON or query strings work for any column dtype.
+        """
+        if not self._comparison:
+            raise ValueError("Comparison not yet performed. Call compare() first.")
+        
+        comp = self._comparison
+        join_columns = list(comp.join_columns)
+        # datacompy lowercases join columns
+        key = {str(k).lower(): v for k, v in key.items()}
+        missing = [col for col in join_columns if col not in key]
+        if missing:
+            raise ValueError(f"Missing key values for join columns: {missing}")
+        
+        def _lookup(df: pd.DataFrame) -> pd.DataFrame:
+            mask = np.ones(len(df), dtype=bool)
+            for col in join_columns:
+                mask &= (df[col].astype(str) == str(key[col])).to_numpy()
+            return df[mask]
+        
+        def _record(rows: pd.DataFrame) -> Optional[dict]:
+            if rows.empty:
+                return None
+            return rows.iloc[0].to_dict()
+        
+        df1_row = _record(_lookup(comp.df1))
+        df2_row = _record(_lookup(comp.df2))
+        
+        differences = []
+        intersect_row = _lookup(comp.intersect_rows)
+        if not intersect_row.empty:
+            row = intersect_row.iloc[0]
+            for column in comp.intersect_columns():
+                match_col = f"{column}_match"
+                if column in join_columns or match_col not in intersect_row.columns:
+                    continue
+                if not bool(row[match_col]):
+                    col_df1, col_df2 = self._intersect_value_columns(column)
+                    differences.append({
+                        "column": column,
                         "value_in_df1": str(row[col_df1]),
                         "value_in_df2": str(row[col_df2]),
                     })
-        except Exception as e:
-            pass
         
-        return diffs
+        return {
+            "key": {col: key[col] for col in join_columns},
+            "in_df1": df1_row is not None,
+            "in_df2": df2_row is not None,
+            "df1_row": df1_row,
+            "df2_row": df2_row,
+            "differences": differences,
+        }
     
     def get_statistics(self) -> dict:
-        """Get comprehensive statistics for both dataframes."""
-        stats = {
-            "df1": self._get_df_stats(self.df1, self.df1_name),
-            "df2": self._get_df_stats(self.df2, self.df2_name),
-        }
-        return stats
+        """Get comprehensive statistics for both dataframes (computed once)."""
+        if self._statistics is None:
+            self._statistics = {
+                "df1": self._get_df_stats(self.df1, self.df1_name),
+                "df2": self._get_df_stats(self.df2, self.df2_name),
+            }
+        return self._statistics
     
     def _get_df_stats(self, df: pd.DataFrame, name: str) -> dict:
         """Get statistics for a single dataframe."""
         numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
         text_cols = df.select_dtypes(include=['object', 'string']).columns.tolist()
+        profiles = get_profiles(df)
         
         stats = {
             "name": name,
             "shape": {"rows": len(df), "columns": len(df.columns)},
             "memory_usage_mb": round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2),
-            "null_counts": df.isnull().sum().to_dict(),
-            "null_percentage": (df.isnull().sum() / len(df) * 100).round(2).to_dict(),
+            "null_counts": {col: p["null_count"] for col, p in profiles.items()},
+            "null_percentage": {col: p["null_percentage"] for col, p in profiles.items()},
             "duplicate_rows": int(df.duplicated().sum()),
             "numeric_columns": numeric_cols,
             "text_columns": text_cols,
         }
         
-        # Add numeric stats
+        # Add numeric stats (same layout as DataFrame.describe)
         if numeric_cols:
-            stats["numeric_summary"] = df[numeric_cols].describe().to_dict()
+            nan = float("nan")
+            stats["numeric_summary"] = {
+                col: {
+                    "count": float(profiles[col]["count"]),
+                    "mean": profiles[col].get("mean", nan),
+                    "std": profiles[col].get("std", nan),
+                    "min": profiles[col].get("min", nan),
+                    "25%": profiles[col].get("q1", nan),
+                    "50%": profiles[col].get("median", nan),
+                    "75%": profiles[col].get("q3", nan),
+                    "max": profiles[col].get("max", nan),
+                }
+                for col in numeric_cols
+            }
         
         # Add text column stats
         text_stats = {}
         for col in text_cols[:10]:  # Limit to first 10 text columns
             text_stats[col] = {
-                "unique_values": int(df[col].nunique()),
-                "most_common": df[col].value_counts().head(5).to_dict(),
-                "avg_length": round(df[col].astype(str).str.len().mean(), 2),
+                "unique_values": profiles[col]["unique_count"],
+                "most_common": profiles[col]["top_values"],
+                "avg_length": profiles[col].get("avg_length", 0.0),
             }
         stats["text_summary"] = text_stats
         
         return stats
-
@@ -0,0 +1,147 @@
+"""
+Consistency Checks - Vectorized correlations and cached date parsing.
+Cross-column consistency needs the Pearson correlation of every pair of
+numeric columns and the parsed values of every date-like column.
+
+Correlations come from four matrix products over the column block (pair
+counts, sums, sums of squares and cross products, each restricted to rows
+where both columns are present), so all pairs are computed in one BLAS pass
+with pandas' pairwise-complete semantics. The sums add across chunks, which
+lets streamed files use the same code.
+
+Dates are parsed once per column. The format is inferred from the first
+non-null string, as pd.to_datetime does for a whole column, and cached so
+later chunks of the same column parse with it directly.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from .string_profiler import DEDUPLICATE_MAX_RATIO
+
+_SUM_KEYS = ("n", "sx", "sxx", "sxy")
+_NAT_STRINGS = {"NaT", "nat", "NAT", "nan", "NaN", "NAN"}
+
+
+def correlation_sums(values: np.ndarray, shifts: np.ndarray) -> dict:
+    """
+    Pairwise-complete Pearson sums for a block of numeric columns.
+
+    Args:
+        values: Rows x columns float64 array (NaN for missing)
+        shifts: Per-column offsets subtracted first (e.g. the column means),
+                which keeps the sums numerically stable
+
+    Returns:
+        Dict of columns x columns matrices: n (rows where both are present),
+        sx (sum of the row's column where both are present), sxx (same, of
+        squares) and sxy (cross products); additive across row blocks
+    """
+    x = values - shifts
+    present = ~np.isnan(x)
+    x[~present] = 0.0
+    squares = x * x
+    rows, k = x.shape
+
+    # A column without nulls pairs with every row of the other column, so
+    # masked products are only needed against columns that have nulls
+    n = np.full((k, k), float(rows))
+    sx = np.repeat(x.sum(axis=0)[:, None], k, axis=1)
+    sxx = np.repeat(squares.sum(axis=0)[:, None], k, axis=1)
+    sparse = np.flatnonzero(~present.all(axis=0))
+    if len(sparse):
+        mask = present[:, sparse].astype(np.float64)
+        n[:, sparse] = present.T.astype(np.float64) @ mask
+        n[sparse, :] = n[:, sparse].T
+        sx[:, sparse] = x.T @ mask
+        sxx[:, sparse] = squares.T @ mask
+    return {"n": n, "sx": sx, "sxx": sxx, "sxy": x.T @ x}
+
+
+def correlation_matrix(sums: dict) -> np.ndarray:
+    """Pearson correlation matrix from correlation_sums (NaN where undefined)."""
+    n, sx, sxx, sxy = (sums[key] for key in _SUM_KEYS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sx.T / n
+        var = sxx - sx * sx / n
+        # var[a, b] is column a's variance over the rows shared with b
+        correlation = cov / np.sqrt(var * var.T)
+    correlation[(n < 2) | (var <= 0) | (var.T <= 0)] = np.nan
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def pairwise_correlation(df: pd.DataFrame) -> np.ndarray:
+    """Pearson correlation of every pair of (numeric) columns, as Series.corr computes it."""
+    values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        shifts = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(values.shape[1])
+    return correlation_matrix(correlation_sums(values, shifts))
+
+
+def correlated_pairs(columns: list, matrix: np.ndarray, threshold: float) -> list[tuple]:
+    """(col1, col2, correlation) for pairs above the threshold, in column-pair order."""
+    upper = np.triu(np.abs(np.nan_to_num(matrix)) > threshold, k=1)
+    return [(columns[i], columns[j], float(matrix[i, j])) for i, j in np.argwhere(upper)]
+
+
+def _first_date_value(series: pd.Series):
+    """First value pd.to_datetime would infer a format from (None if there is none)."""
+    for value in series.to_numpy(dtype=object):
+        if isinstance(value, str):
+            # pandas also skips empty and NaT-like strings when inferring
+            if value and value not in _NAT_STRINGS:
+                return value
+        elif not pd.isna(value):
+            return value
+    return None
+
+
+class DateParser:
+    """
+    Parses date columns with per-column format inference, cached.
+
+    pd.to_datetime infers one format from a column's first non-null string
+    and applies it to every value; the format is kept here so each column
+    (or each chunk of it) parses without inferring again.
+    """
+
+    def __init__(self):
+        # Column -> inferred format (None: no format; per-value parsing)
+        self.formats: dict = {}
+
+    def parse(self, col, series: pd.Series, distinct_count: Optional[int] = None) -> pd.Series:
+        """
+        Parse a column as dates, as pd.to_datetime(series, errors='raise') does.
+
+        Args:
+            col: Column name (key for the cached format)
+            series: Values to parse
+            distinct_count: Distinct non-null values, if known (e.g. from
+                            the column profile); few distinct values are
+                            parsed once each and mapped back to the rows
+
+        Raises:
+            ValueError, TypeError, pd.errors.ParserError: Values do not parse
+        """
+        if col not in self.formats:
+            value = _first_date_value(series)
+            if value is None:
+                # Nothing to infer from yet
+                return pd.to_datetime(series, errors='raise')
+            self.formats[col] = guess_datetime_format(value) if isinstance(value, str) else None
+
+        if distinct_count is not None and distinct_count <= len(series) * DEDUPLICATE_MAX_RATIO:
+            # Distinct values in first-seen order, so inference sees the same first value
+            codes, uniques = pd.factorize(series)
+            parsed = self._to_datetime(col, pd.Series(uniques, dtype=series.dtype))
+            return pd.Series(parsed.array.take(codes, allow_fill=True),
+                             index=series.index, name=series.name)
+        return self._to_datetime(col, series)
+
+    def _to_datetime(self, col, series: pd.Series) -> pd.Series:
+        date_format: Optional[str] = self.formats[col]
+        if date_format is None:
+            return pd.to_datetime(series, errors='raise')
+        return pd.to_datetime(series, errors='raise', format=date_format)
@@ -0,0 +1,302 @@
+"""
+CSV Byte Ranges - Split one CSV file into ranges that parse independently.
+A range starts just after a record-ending newline, so each worker can seek
+to its range, prepend the header line and parse it alone. Newlines inside
+quoted fields are not record ends: a newline ends a record only when the
+quotes before it are balanced (RFC 4180; an escaped "" counts twice and
+keeps the balance). Quote counting uses bytes.count, so finding the
+boundaries reads the file once at memory speed, without parsing it.
+
+The same rule numbers individual records (vectorized over blocks with
+NumPy) for sampling: parsing only the sampled records' bytes is much
+cheaper than parsing the file. Read backwards it finds the last records
+without reading the rest: in a well-formed file the quotes balance at EOF,
+so a newline ends a record exactly when the quotes after it balance.
+
+Splitting on bytes assumes an ASCII-compatible encoding (UTF-8, Latin-1,
+cp1252...), the encodings ChunkedProcessor reads.
+"""
+import io
+from pathlib import Path
+from typing import Generator, Optional
+
+import numpy as np
+import pandas as pd
+
+_SCAN_BYTES = 1 << 20  # Bytes read per step while counting quotes
+_WINDOW_BYTES = 1 << 16  # Bytes read per step while looking for a record end
+_RECORD_BLOCK_BYTES = 1 << 20  # Bytes scanned per step while numbering records
+
+
+def _quote_parity(handle, start: int, end: int) -> int:
+    """Quote bytes in [start, end), mod 2."""
+    handle.seek(start)
+    count = 0
+    remaining = end - start
+    while remaining > 0:
+        block = handle.read(min(_SCAN_BYTES, remaining))
+        if not block:
+            break
+        count += block.count(b'"')
+        remaining -= len(block)
+    return count % 2
+
+
+def _record_end(handle, position: int, in_quotes: int) -> int:
+    """Offset just past the first record-ending newline at or after position (EOF if none)."""
+    handle.seek(position)
+    while True:
+        block = handle.read(_WINDOW_BYTES)
+        if not block:
+            return position
+        offset = 0
+        while True:
+            newline = block.find(b"\n", offset)
+            if newline < 0:
+                in_quotes ^= block.count(b'"', offset) & 1
+                break
+            in_quotes ^= block.count(b'"', offset, newline) & 1
+            if not in_quotes:
+                return position + newline + 1
+            offset = newline + 1
+        position += len(block)
+
+
+def header_length(file_path: Path) -> int:
+    """Length in bytes of a CSV file's header line (with its newline)."""
+    with open(file_path, "rb") as handle:
+        return _record_end(handle, 0, 0)
+
+
+def split_csv_ranges(file_path: Path, range_bytes: int) -> tuple[int, list[tuple[int, int]]]:
+    """
+    Split a CSV file into byte ranges of whole records.
+
+    Args:
+        file_path: Path to CSV file
+        range_bytes: Target bytes per range (ranges end at the next record end)
+
+    Returns:
+        Tuple of (header length in bytes, [(start, end), ...] covering the
+        records after the header, in file order)
+    """
+    if range_bytes < 1:
+        raise ValueError("range_bytes must be positive")
+    size = file_path.stat().st_size
+    with open(file_path, "rb") as handle:
+        header_end = _record_end(handle, 0, 0)
+        boundaries = [header_end]
+        while boundaries[-1] + range_bytes < size:
+            target = boundaries[-1] + range_bytes
+            # Every boundary is a record end, so quotes balance there
+            end = _record_end(handle, target, _quote_parity(handle, boundaries[-1], target))
+            if end >= size:
+                break
+            boundaries.append(end)
+    if size > header_end:
+        boundaries.append(size)
+    return header_end, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def read_csv_range(file_path: Path, header_end: int, start: int, end: int,
+                   chunk_size: int, encoding: str = "utf-8",
+                   **kwargs) -> Generator[pd.DataFrame, None, None]:
+    """
+    Parse one byte range (with the file's header line) in chunks.
+
+    Args:
+        file_path: Path to CSV file
+        header_end: Header length in bytes, from split_csv_ranges
+        start, end: Byte range of whole records, from split_csv_ranges
+        chunk_size: Rows per chunk
+        encoding: File encoding
+        **kwargs: Additional arguments for pd.read_csv
+
+    Yields:
+        DataFrame chunks
+    """
+    with open(file_path, "rb") as handle:
+        header = handle.read(header_end)
+        handle.seek(start)
+        data = handle.read(end - start)
+    yield from pd.read_csv(io.BytesIO(header + data), encoding=encoding,
+                           chunksize=chunk_size, low_memory=True, **kwargs)
+
+
+def _newlines_and_quotes(block: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """Newline and quote offsets in a block."""
+    data = np.frombuffer(block, dtype=np.uint8)
+    return np.flatnonzero(data == 10), np.flatnonzero(data == 34)
+
+
+def _is_blank(handle, start: int, end: int) -> bool:
+    """Whether the record in [start, end) is a blank line (which pandas skips)."""
+    if end - start > 2:
+        return False
+    handle.seek(start)
+    return handle.read(end - start) in (b"\n", b"\r\n")
+
+
+def _last_true(mask: np.ndarray, window: int = 1 << 12) -> int:
+    """Index of the last True in a mask (-1 if none), searched backwards in windows."""
+    for stop in range(len(mask), 0, -window):
+        found = np.flatnonzero(mask[max(0, stop - window):stop])
+        if len(found):
+            return max(0, stop - window) + int(found[-1])
+    return -1
+
+
+class RecordBlock:
+    """
+    The data records ending in one scanned block of a CSV file.
+    
+    Only the count is computed while scanning; byte spans are computed on
+    demand, so a sampler pays for positions only in the blocks it samples
+    from. A span may start with blank lines, which pandas skips.
+    """
+    
+    def __init__(self, start: int, offset: int = 0,
+                 ends_mask: Optional[np.ndarray] = None, ends: Optional[np.ndarray] = None):
+        self.start = start  # Start of the first record
+        self._offset = offset
+        self._mask = ends_mask
+        self._ends = ends
+        self.count = len(ends) if ends is not None else int(np.count_nonzero(ends_mask))
+    
+    def spans(self, index: Optional[np.ndarray] = None) -> tuple[np.ndarray, np.ndarray]:
+        """(starts, ends) int64 arrays of the block's records (or those at index)."""
+        ends = self._ends
+        if ends is None:
+            ends = np.flatnonzero(self._mask) + self._offset + 1
+        starts = np.concatenate([[self.start], ends[:-1]])
+        return (starts, ends) if index is None else (starts[index], ends[index])
+
+
+def iter_record_blocks(file_path: Path, header_end: int,
+                       block_bytes: int = _RECORD_BLOCK_BYTES) -> Generator[RecordBlock, None, None]:
+    """
+    Number the data records after the header, block by block, with
+    vectorized quote parity. Blank lines are not counted, so the n-th
+    record is the n-th row pandas reads.
+    
+    Args:
+        file_path: Path to CSV file
+        header_end: Header length in bytes, from header_length
+        block_bytes: Bytes scanned per step
+        
+    Yields:
+        RecordBlock per block holding at least one record end, in file order
+        
+    Raises:
+        ValueError: If the quotes do not balance at the end of the file
+                    (the records cannot be trusted)
+    """
+    size = file_path.stat().st_size
+    in_quotes = False
+    record_start = header_end  # Start of the next record
+    line_start = header_end  # Start of the next line (after any blank line)
+    # Record-end and carriage-return flags of the two bytes before the block;
+    # the byte before the first block is the header's newline
+    previous_ends = np.array([False, True])
+    previous_cr = np.array([False, False])
+    with open(file_path, "rb") as handle:
+        handle.seek(header_end)
+        offset = header_end
+        while offset < size:
+            block = handle.read(block_bytes)
+            if not block:
+                break
+            data = np.frombuffer(block, dtype=np.uint8)
+            ends = data == 10
+            if b'"' in block:
+                inside = np.logical_xor.accumulate(data == 34)
+                if in_quotes:
+                    np.logical_not(inside, out=inside)
+                in_quotes = bool(inside[-1])
+                ends &= ~inside
+            elif in_quotes:
+                ends[:] = False
+            
+            # A blank line ends right after a record end (or a record end and \r);
+            # the byte search skips the mask work for blocks without one
+            if b"\n\n" in block or b"\n\r\n" in block or block.startswith((b"\n", b"\r\n")):
+                all_ends = np.concatenate([previous_ends, ends])
+                cr = np.concatenate([previous_cr, data == 13])
+                records = ends & ~(all_ends[1:-1] | (cr[1:-1] & all_ends[:-2]))
+            else:
+                records = ends
+            previous_ends = np.concatenate([previous_ends, ends[-2:]])[-2:]
+            previous_cr = np.concatenate([previous_cr, data[-2:] == 13])[-2:]
+            
+            last_line = _last_true(ends)
+            if last_line >= 0:
+                line_start = offset + last_line + 1
+            last_record = _last_true(records)
+            if last_record >= 0:
+                yield RecordBlock(record_start, offset, ends_mask=records)
+                record_start = offset + last_record + 1
+            offset += len(block)
+        if in_quotes:
+            raise ValueError(f"Unbalanced quotes in {file_path.name}")
+        if line_start < size and not _is_blank(handle, line_start, size):
+            # Last record without a trailing newline
+            yield RecordBlock(record_start, ends=np.array([size]))
+
+
+def tail_record_start(file_path: Path, header_end: int, count: int,
+                      block_bytes: int = _WINDOW_BYTES) -> int:
+    """
+    Offset where the last `count` data records of a file begin, found by
+    reading blocks backwards from the end (header_end if there are fewer).
+    
+    Assumes the quotes balance at the end of the file; callers should check
+    the parsed row count.
+    """
+    size = file_path.stat().st_size
+    suffix_quotes = 0  # Quote bytes after the current block, mod 2
+    found = 0
+    record_end = size  # End of the record before the next boundary found
+    with open(file_path, "rb") as handle:
+        hi = size
+        while hi > header_end:
+            lo = max(header_end, hi - block_bytes)
+            handle.seek(lo)
+            block = handle.read(hi - lo)
+            newlines, quotes = _newlines_and_quotes(block)
+            after = len(quotes) - np.searchsorted(quotes, newlines, side="right")
+            starts = lo + newlines[((after + suffix_quotes) & 1) == 0] + 1
+            for start in starts[::-1].tolist():
+                if start >= record_end:
+                    continue  # the file's final newline
+                if not _is_blank(handle, start, record_end):
+                    found += 1
+                    if found == count:
+                        return start
+                record_end = start
+            suffix_quotes = (suffix_quotes + len(quotes)) & 1
+            hi = lo
+    return header_end
+
+
+def read_csv_spans(file_path: Path, header_end: int,
+                   spans: list[tuple[int, int]], encoding: str = "utf-8",
+                   **kwargs) -> pd.DataFrame:
+    """
+    Parse the records in the given byte spans, with the file's header line.
+    
+    Args:
+        file_path: Path to CSV file
+        header_end: Header length in bytes, from split_csv_ranges
+        spans: (start, end) byte spans of whole records, in file order
+        encoding: File encoding
+        **kwargs: Additional arguments for pd.read_csv
+    """
+    buffer = io.BytesIO()
+    with open(file_path, "rb") as handle:
+        buffer.write(handle.read(header_end))
+        for start, end in spans:
+            handle.seek(start)
+            record = handle.read(end - start)
+            buffer.write(record if record.endswith(b"\n") else record + b"\n")
+    buffer.seek(0)
+    return pd.read_csv(buffer, encoding=encoding, **kwargs)
@@ -0,0 +1,271 @@
+"""
+Diff Exporter Service - Streams complete difference sets to disk.
+Writes unique rows, value mismatches and presence bitmasks to Parquet or CSV
+files in the session's exports directory, batch by batch.
+"""
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from config import UPLOADS_DIR, EXPORTS_DIRNAME, EXPORT_FORMATS, EXPORT_BATCH_ROWS
+from .comparator import DataComparator
+from .key_index import KeyIndex
+from .metrics import stage
+from .multi_comparator import MultiFileComparator
+
+logger = logging.getLogger(__name__)
+
+
+def get_exports_dir(session_id: str) -> Path:
+    """Get the exports directory for a session."""
+    return UPLOADS_DIR / session_id / EXPORTS_DIRNAME
+
+
+class _FrameWriter:
+    """Incrementally appends DataFrame batches to a Parquet or CSV file."""
+
+    def __init__(self, path: Path, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._writer = None
+        self._schema: Optional[pa.Schema] = None
+
+    @staticmethod
+    def _to_table(frame: pd.DataFrame) -> pa.Table:
+        # Object columns hold mixed Python values; store them as strings so
+        # every batch maps to the same Arrow schema
+        object_cols = frame.select_dtypes(include=['object']).columns
+        if len(object_cols) > 0:
+            frame = frame.astype({col: "string" for col in object_cols})
+        return pa.Table.from_pandas(frame, preserve_index=False)
+
+    def write(self, frame: pd.DataFrame):
+        table = self._to_table(frame)
+
+        if self._writer is None:
+            self._schema = table.schema
+            if self.fmt == "parquet":
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = pa_csv.CSVWriter(self.path, self._schema)
+        elif not table.schema.equals(self._schema):
+            table = table.cast(self._schema)
+
+        self._writer.write_table(table)
+        self.rows += len(frame)
+
+    def close(self, empty_frame: pd.DataFrame):
+        """Close the file, writing just the header if no batch arrived."""
+        if self._writer is None:
+            self.write(empty_frame)
+        self._writer.close()
+
+
+class DiffExporter:
+    """
+    Writes full comparison outputs for production QC.
+
+    Unlike the API responses, which only carry samples, every unique row,
+    every mismatched value and every key's presence bitmask is exported.
+    Frames come straight from the comparison engines in batches, so no
+    per-record Python structures are built.
+    """
+
+    def __init__(self, session_id: str, format: str = "parquet",
+                 batch_rows: int = EXPORT_BATCH_ROWS):
+        if format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unsupported export format: {format}. Use one of {list(EXPORT_FORMATS)}"
+            )
+
+        self.session_id = session_id
+        self.format = format
+        self.batch_rows = batch_rows
+        self.export_id = uuid.uuid4().hex[:12]
+        self.exports_dir = get_exports_dir(session_id)
+
+    def _write(self, kind: str, frames: Iterable[pd.DataFrame],
+               empty_frame: pd.DataFrame, description: str) -> dict:
+        """Stream frames into a single export file and describe it."""
+        self.exports_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"{self.export_id}_{kind}{EXPORT_FORMATS[self.format]}"
+        path = self.exports_dir / filename
+
+        with stage("export_write") as write:
+            writer = _FrameWriter(path, self.format)
+            try:
+                for frame in frames:
+                    if len(frame) > 0:
+                        writer.write(frame)
+            finally:
+                writer.close(empty_frame)
+            write.add(rows=writer.rows, bytes=path.stat().st_size)
+
+        logger.info(f"Exported {writer.rows} rows to {filename}")
+        return {
+            "kind": kind,
+            "filename": filename,
+            "description": description,
+            "rows": writer.rows,
+            "size_bytes": path.stat().st_size,
+            "download_url": f"/exports/{self.session_id}/{filename}",
+        }
+
+    def export_pairwise(self, comparator: DataComparator) -> dict:
+        """
+        Export the full differences of a completed pairwise comparison.
+
+        Args:
+            comparator: DataComparator on which compare() has been called
+
+        Returns:
+            Export manifest listing the written files
+        """
+        comp = comparator._comparison
+        if comp is None:
+            raise ValueError("Comparison not yet performed. Call compare() first.")
+
+        join_columns = list(comp.join_columns)
+        files = [
+            self._write(
+                "only_in_df1",
+                comparator.iter_unique_row_frames("df1", self.batch_rows),
+                comp.df1_unq_rows.head(0),
+                f"Rows only in {comparator.df1_name}",
+            ),
+            self._write(
+                "only_in_df2",
+                comparator.iter_unique_row_frames("df2", self.batch_rows),
+                comp.df2_unq_rows.head(0),
+                f"Rows only in {comparator.df2_name}",
+            ),
+            self._write(
+                "mismatches",
+                comparator.iter_mismatch_frames(self.batch_rows),
+                pd.DataFrame(columns=join_columns + ["column", "value_in_df1", "value_in_df2"]),
+                f"Value mismatches between {comparator.df1_name} and {comparator.df2_name}",
+            ),
+        ]
+
+        return {
+            "export_id": self.export_id,
+            "format": self.format,
+            "type": "pairwise",
+            "df1_name": comparator.df1_name,
+            "df2_name": comparator.df2_name,
+            "files": files,
+        }
+
+    def export_multi(self, comparator: MultiFileComparator) -> dict:
+        """
+        Export presence bitmasks and value mismatches of a multi-file comparison.
+
+        Args:
+            comparator: MultiFileComparator on which compare() has been called
+
+        Returns:
+            Export manifest listing the written files
+        """
+        presence = comparator.get_presence_frame()
+
+        def presence_batches():
+            for start in range(0, len(presence), self.batch_rows):
+                yield presence.iloc[start:start + self.batch_rows]
+
+        files = [
+            self._write(
+                "presence",
+                presence_batches(),
+                presence.head(0),
+                "Every key with its file-membership bitmask",
+            ),
+            self._write(
+                "value_mismatches",
+                comparator.iter_value_mismatch_frames(self.batch_rows),
+                pd.DataFrame(columns=["key", "column"] + comparator.file_names),
+                "Keys whose values differ across the files holding them",
+            ),
+        ]
+
+        return {
+            "export_id": self.export_id,
+            "format": self.format,
+            "type": "multi",
+            "file_names": comparator.file_names,
+            "bit_order": {name: idx for idx, name in enumerate(comparator.file_names)},
+            "files": files,
+        }
+
+    def export_keys(self, index: KeyIndex, include: Sequence[str] = (),
+                    exclude: Sequence[str] = ()) -> dict:
+        """
+        Export the keys of a key index held by every file in include and by
+        none in exclude, straight from the memory-mapped index.
+
+        Args:
+            index: An open KeyIndex
+            include: Files every exported key is in
+            exclude: Files no exported key is in
+
+        Returns:
+            Export manifest listing the written file
+        """
+        described = [f"in {', '.join(include)}"] if include else []
+        if exclude:
+            described.append(f"not in {', '.join(exclude)}")
+
+        files = [
+            self._write(
+                "keys",
+                index.iter_frames(include, exclude, self.batch_rows),
+                index.presence_frame(np.empty(0, dtype=np.int64)),
+                f"Keys {' and '.join(described)}" if described else "Every indexed key",
+            ),
+        ]
+
+        return {
+            "export_id": self.export_id,
+            "format": self.format,
+            "type": "keys",
+            "file_names": index.file_names,
+            "bit_order": {name: idx for idx, name in enumerate(index.file_names)},
+            "include": list(include),
+            "exclude": list(exclude),
+            "files": files,
+        }
+
+    @staticmethod
+    def list_exports(session_id: str) -> list[dict]:
+        """List export files for a session."""
+        exports_dir = get_exports_dir(session_id)
+        if not exports_dir.exists():
+            return []
+
+        return [
+            {"filename": f.name, "size_bytes": f.stat().st_size}
+            for f in sorted(exports_dir.iterdir()) if f.is_file()
+        ]
+
+    @staticmethod
+    def get_export_path(session_id: str, filename: str) -> Path:
+        """
+        Resolve an export file path, rejecting anything outside the exports dir.
+
+        Raises:
+            FileNotFoundError: If the export does not exist
+        """
+        exports_dir = get_exports_dir(session_id)
+        path = (exports_dir / filename).resolve()
+
+        if path.parent != exports_dir.resolve() or not path.is_file():
+            raise FileNotFoundError(f"Export not found: {filename}")
+
+        return path
@@ -8,6 +8,9 @@ import uuid
 import shutil
 import zipfile
 import io
+import hashlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Union
 import pandas as pd
@@ -18,10 +21,13 @@ import logging
 from config import (
     UPLOADS_DIR, 
     MAX_FILE_SIZE, 
+    CONTENT_HASH_CACHE_MAX_FILES,
     DANGEROUS_FILENAME_PATTERNS,
     FILE_DELIMITERS,
     SUPPORTED_FORMATS_SIMPLE,
 )
+from .metrics import stage
+from .profiler import CONTENT_HASH_ATTR
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +88,11 @@ class FileHandler:
     # Use centralized delimiters from config
     DELIMITERS = FILE_DELIMITERS
     
+    # Content hashes keyed by (session dir, filename, size, mtime) so unchanged
+    # files are hashed once; an LRU, and a session's entries go with the session
+    _content_hashes: OrderedDict[tuple, str] = OrderedDict()
+    _content_hashes_lock = threading.Lock()
+    
     @classmethod
     def save_uploaded_file(cls, file_content: bytes, filename: str, 
                           session_id: Optional[str] = None) -> str:
@@ -182,10 +193,12 @@ class FileHandler:
         Returns:
             Detected encoding string
         """
-        with open(file_path, "rb") as f:
-            raw_data = f.read(sample_size)
+        with stage("encoding_detection") as detection:
+            with open(file_path, "rb") as f:
+                raw_data = f.read(sample_size)
+            detection.add(bytes=len(raw_data))
+            result = chardet.detect(raw_data)
         
-        result = chardet.detect(raw_data)
         encoding = result.get("encoding", "utf-8")
         confidence = result.get("confidence", 0)
         
@@ -227,6 +240,49 @@ class FileHandler:
         
         return ","  # Default
     
+    @classmethod
+    def get_content_hash(cls, session_id: str, filename: str) -> str:
+        """
+        Get a content hash of an uploaded file.
+        
+        The hash identifies the file's bytes, so cached results keyed on it
+        stay valid across requests and are invalidated by re-uploads.
+        
+        Args:
+            session_id: Session ID
+            filename: Filename
+            
+        Returns:
+            Hex digest (BLAKE2b, 128-bit)
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        file_path = UPLOADS_DIR / session_id / filename
+        
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {filename}")
+        
+        stat = file_path.stat()
+        cache_key = (str(file_path.parent), filename, stat.st_size, stat.st_mtime_ns)
+        with cls._content_hashes_lock:
+            cached = cls._content_hashes.get(cache_key)
+            if cached:
+                cls._content_hashes.move_to_end(cache_key)
+                return cached
+        
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        
+        content_hash = digest.hexdigest()
+        with cls._content_hashes_lock:
+            cls._content_hashes[cache_key] = content_hash
+            while len(cls._content_hashes) > CONTENT_HASH_CACHE_MAX_FILES:
+                cls._content_hashes.popitem(last=False)
+        return content_hash
+    
     @classmethod
     def load_dataframe(cls, session_id: str, filename: str, 
                       sheet_name: Optional[Union[str, int]] = 0,
@@ -255,29 +311,41 @@ class FileHandler:
         ext = Path(filename).suffix.lower()
         
         try:
-            if ext == ".csv":
-                return cls._load_csv(file_path, encoding)
-            elif ext == ".tsv":
-                return cls._load_csv(file_path, encoding, delimiter="\t")
-            elif ext in (".xlsx", ".xls"):
-                return cls._load_excel(file_path, sheet_name)
-            elif ext == ".parquet":
-                return pd.read_parquet(file_path)
-            elif ext == ".feather":
-                return pd.read_feather(file_path)
-            elif ext == ".json":
-                return cls._load_json(file_path)
-            elif ext == ".jsonl":
-                return pd.read_json(file_path, lines=True)
-            elif ext in (".dat", ".txt"):
-                return cls._load_delimited(file_path, encoding)
-            elif ext == ".xml":
-                return cls._load_xml(file_path)
-            else:
-                raise ValueError(f"Unsupported file format: {ext}")
+            with stage("parse", bytes=file_path.stat().st_size) as parse:
+                if ext == ".csv":
+                    df = cls._load_csv(file_path, encoding)
+                elif ext == ".tsv":
+                    df = cls._load_csv(file_path, encoding, delimiter="\t")
+                elif ext in (".xlsx", ".xls"):
+                    df = cls._load_excel(file_path, sheet_name)
+                elif ext == ".parquet":
+                    df = pd.read_parquet(file_path)
+                elif ext == ".feather":
+                    df = pd.read_feather(file_path)
+                elif ext == ".json":
+                    df = cls._load_json(file_path)
+                elif ext == ".jsonl":
+                    df = pd.read_json(file_path, lines=True)
+                elif ext in (".dat", ".txt"):
+                    df = cls._load_delimited(file_path, encoding)
+                elif ext == ".xml":
+                    df = cls._load_xml(file_path)
+                else:
+                    raise ValueError(f"Unsupported file format: {ext}")
+                parse.add(rows=len(df))
         except Exception as e:
             logger.error(f"Error loading {filename}: {str(e)}")
             raise ValueError(f"Error loading file: {str(e)}")
+        
+        # Tag the frame with its source content so column profiles can be
+        # cached across services (forced encodings may parse differently)
+        if encoding is None:
+            content_hash = cls.get_content_hash(session_id, filename)
+            if ext in (".xlsx", ".xls"):
+                content_hash = f"{content_hash}:{sheet_name}"
+            df.attrs[CONTENT_HASH_ATTR] = content_hash
+        
+        return df
     
     @classmethod
     def _load_csv(cls, file_path: Path, encoding: Optional[str] = None,
@@ -446,6 +514,9 @@ class FileHandler:
     def cleanup_session(cls, session_id: str) -> bool:
         """Remove all files for a session."""
         session_dir = UPLOADS_DIR / session_id
+        with cls._content_hashes_lock:
+            for key in [key for key in cls._content_hashes if key[0] == str(session_dir)]:
+                del cls._content_hashes[key]
         if session_dir.exists():
             shutil.rmtree(session_dir)
             return True
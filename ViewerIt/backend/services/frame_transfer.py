@@ -0,0 +1,81 @@
+"""
+Frame Transfer - Hand DataFrames from worker processes back as Arrow IPC files.
+A frame returned from a process-pool job is pickled through the pool's pipe,
+which serializes and copies it twice. Instead a worker writes the frame as
+an uncompressed Arrow IPC file in WORKER_TRANSFER_DIR (shared memory,
+/dev/shm, where available) and returns only its path; the parent
+memory-maps the file, converts it to pandas and deletes it.
+
+Frames Arrow cannot represent (e.g. object columns mixing numbers and text)
+are returned as they are and pickled as before.
+"""
+import os
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Union
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from config import WORKER_TRANSFER_DIR
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArrowFrame:
+    """A DataFrame written to an Arrow IPC file by a worker."""
+    path: str
+    attrs: dict = field(default_factory=dict)
+
+
+def export_frame(df: pd.DataFrame,
+                 directory: Union[str, Path] = WORKER_TRANSFER_DIR) -> Union[ArrowFrame, pd.DataFrame]:
+    """
+    Worker side: write a frame for the parent to map.
+
+    Returns:
+        ArrowFrame pointing at the file, or the frame itself when Arrow
+        cannot represent it
+    """
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        logger.debug(f"Returning frame by pickle: {e}")
+        return df
+
+    path = Path(directory) / f"viewerit-frame-{uuid.uuid4().hex}.arrow"
+    try:
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return ArrowFrame(str(path), dict(df.attrs))
+
+
+def import_frame(result: Union[ArrowFrame, pd.DataFrame]) -> pd.DataFrame:
+    """Parent side: the frame of an export_frame result (its file is deleted)."""
+    if isinstance(result, pd.DataFrame):
+        return result
+    try:
+        with pa.memory_map(result.path) as source:
+            table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas(deduplicate_objects=False)
+    finally:
+        os.unlink(result.path)
+
+    # Arrow nulls come back as None in object columns; pandas readers use NaN.
+    # The frame's columns come first in the table (a stored index follows).
+    for i, column in enumerate(table.columns[:len(df.columns)]):
+        if column.null_count and df.dtypes.iloc[i] == object:
+            values = df.iloc[:, i].to_numpy(copy=True)
+            values[pc.is_null(column).to_numpy(zero_copy_only=False)] = np.nan
+            df.isetitem(i, values)
+    df.attrs.update(result.attrs)
+    return df
+
@@ -0,0 +1,263 @@
+"""
+Fuzzy Key Matching Service - Reconcile join keys that differ only by formatting.
+Bates numbers, control numbers and custodian names often differ between
+productions by case, separators, leading zeros or prefixes. Keys are matched
+in three passes: exact, normalized (rule-based) and fuzzy (similarity scored).
+
+The fuzzy pass only runs on keys left over by the first two passes and never
+compares all pairs: candidates come from an n-gram blocking index plus a
+sorted-neighborhood window, so work grows with the residual, not its square.
+"""
+import re
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Optional fast string similarity
+try:
+    from rapidfuzz import fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    logger.debug("rapidfuzz not available - using difflib for key similarity")
+
+# Join column added to both sides when fuzzy matching is enabled
+MATCH_KEY_COLUMN = "_match_key"
+
+_SEPARATORS = re.compile(r"[\s\-_./\\:;,#]+")
+_LEADING_ZEROS = re.compile(r"(?<![0-9])0+(?=[0-9])")
+
+
+def composite_key(df: pd.DataFrame, join_columns: list[str]) -> pd.Series:
+    """Build a string composite key ('a|b|c') from join columns, vectorized."""
+    first = df[join_columns[0]].astype(str)
+    if len(join_columns) == 1:
+        return first
+    return first.str.cat([df[col].astype(str) for col in join_columns[1:]], sep="|")
+
+
+def similarity(a: str, b: str) -> float:
+    """String similarity in [0, 1] (normalized Indel ratio)."""
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+class FuzzyKeyMatcher:
+    """
+    Matches two sets of keys exactly, after normalization, then by similarity.
+
+    Normalization rules (each optional):
+    - case_insensitive: 'abc-001' == 'ABC-001'
+    - strip_whitespace: ' ABC001 ' == 'ABC001'
+    - remove_separators: 'ABC-001' == 'ABC 001' == 'ABC001'
+    - strip_leading_zeros: 'ABC0001' == 'ABC1' (zeros at the start of any digit run)
+    - strip_prefixes: e.g. ['PROD', 'CTRL'] makes 'PROD000123' == '000123'
+    """
+
+    def __init__(self,
+                 case_insensitive: bool = True,
+                 strip_whitespace: bool = True,
+                 remove_separators: bool = True,
+                 strip_leading_zeros: bool = True,
+                 strip_prefixes: Optional[list[str]] = None,
+                 threshold: float = 0.85,
+                 ngram_size: int = 3,
+                 max_candidates: int = 10,
+                 window: int = 5,
+                 max_block_size: int = 1000):
+        """
+        Args:
+            threshold: Minimum similarity (0-1) for a fuzzy match
+            ngram_size: Character n-gram length for the blocking index
+            max_candidates: Candidates scored per key from the n-gram index
+            window: Sorted-neighborhood window on each side of a key
+            max_block_size: N-grams shared by more keys than this are too
+                            common to discriminate and are skipped
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+
+        self.case_insensitive = case_insensitive
+        self.strip_whitespace = strip_whitespace
+        self.remove_separators = remove_separators
+        self.strip_leading_zeros = strip_leading_zeros
+        self.strip_prefixes = list(strip_prefixes or [])
+        self.threshold = threshold
+        self.ngram_size = ngram_size
+        self.max_candidates = max_candidates
+        self.window = window
+        self.max_block_size = max_block_size
+
+    def normalize(self, keys: pd.Series) -> pd.Series:
+        """Apply the normalization rules to a series of keys (vectorized)."""
+        result = keys.astype(str)
+        if self.strip_whitespace:
+            result = result.str.strip()
+        if self.case_insensitive:
+            result = result.str.upper()
+        if self.strip_prefixes:
+            prefixes = [p.upper() if self.case_insensitive else p for p in self.strip_prefixes]
+            # Longest first so 'PRODX' wins over 'PROD'
+            prefixes.sort(key=len, reverse=True)
+            pattern = "^(?:" + "|".join(re.escape(p) for p in prefixes) + ")"
+            result = result.str.replace(pattern, "", regex=True)
+        if self.remove_separators:
+            result = result.str.replace(_SEPARATORS, "", regex=True)
+        if self.strip_leading_zeros:
+            result = result.str.replace(_LEADING_ZEROS, "", regex=True)
+        return result
+
+    def match(self, left: pd.Series, right: pd.Series) -> pd.DataFrame:
+        """
+        Match right keys onto left keys, one-to-one.
+
+        Args:
+            left: Reference keys
+            right: Keys to reconcile against the reference
+
+        Returns:
+            DataFrame with left_key, right_key, confidence (0-1) and
+            method ('exact', 'normalized' or 'fuzzy'), one row per matched
+            unique key pair.
+        """
+        left_keys = pd.Index(left.astype(str).unique())
+        right_keys = pd.Index(right.astype(str).unique())
+
+        # Pass 1: exact
+        exact = left_keys.intersection(right_keys)
+        matches = [pd.DataFrame({
+            "left_key": exact, "right_key": exact,
+            "confidence": 1.0, "method": "exact",
+        })]
+
+        left_rest = left_keys.difference(exact, sort=False)
+        right_rest = right_keys.difference(exact, sort=False)
+        if len(left_rest) == 0 or len(right_rest) == 0:
+            return pd.concat(matches, ignore_index=True)
+
+        # Pass 2: normalized forms equal (first key wins on collisions)
+        left_norm = pd.DataFrame({"left_key": left_rest,
+                                  "norm": self.normalize(left_rest.to_series()).to_numpy()})
+        right_norm = pd.DataFrame({"right_key": right_rest,
+                                   "norm": self.normalize(right_rest.to_series()).to_numpy()})
+        normalized = left_norm.drop_duplicates("norm").merge(
+            right_norm.drop_duplicates("norm"), on="norm"
+        )
+        matches.append(normalized[["left_key", "right_key"]].assign(
+            confidence=1.0, method="normalized"
+        ))
+
+        # Pass 3: similarity over blocked candidates
+        left_rest = left_norm[~left_norm["left_key"].isin(normalized["left_key"])]
+        right_rest = right_norm[~right_norm["right_key"].isin(normalized["right_key"])]
+        if len(left_rest) and len(right_rest):
+            matches.append(self._fuzzy_match(left_rest, right_rest))
+
+        return pd.concat(matches, ignore_index=True)
+
+    def _fuzzy_match(self, left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+        """Score blocked candidate pairs and assign greedily by confidence."""
+        left_norm = left["norm"].tolist()
+        right_norm = right["norm"].tolist()
+
+        candidates = self._ngram_candidates(left_norm, right_norm)
+        candidates |= self._neighborhood_candidates(left_norm, right_norm)
+
+        scored = []
+        for i, j in candidates:
+            score = similarity(left_norm[i], right_norm[j])
+            if score >= self.threshold:
+                scored.append((score, i, j))
+
+        # Greedy one-to-one assignment, best scores first
+        scored.sort(key=lambda item: (-item[0], item[1], item[2]))
+        used_left, used_right = set(), set()
+        rows = []
+        left_raw = left["left_key"].tolist()
+        right_raw = right["right_key"].tolist()
+        for score, i, j in scored:
+            if i in used_left or j in used_right:
+                continue
+            used_left.add(i)
+            used_right.add(j)
+            rows.append((left_raw[i], right_raw[j], round(score, 4)))
+
+        logger.debug(f"Fuzzy keys: {len(candidates)} candidates scored, {len(rows)} matched")
+        return pd.DataFrame(rows, columns=["left_key", "right_key", "confidence"]).assign(
+            method="fuzzy"
+        )
+
+    def _ngrams(self, value: str) -> set[str]:
+        """Character n-grams of a key, padded so short keys still block."""
+        padded = f"^{value}$"
+        n = self.ngram_size
+        if len(padded) <= n:
+            return {padded}
+        return {padded[k:k + n] for k in range(len(padded) - n + 1)}
+
+    def _ngram_candidates(self, left: list[str], right: list[str]) -> set[tuple[int, int]]:
+        """Candidate pairs sharing the most discriminating n-grams."""
+        index = defaultdict(list)
+        for j, value in enumerate(right):
+            for gram in self._ngrams(value):
+                index[gram].append(j)
+
+        candidates = set()
+        for i, value in enumerate(left):
+            shared = Counter()
+            for gram in self._ngrams(value):
+                postings = index.get(gram)
+                if postings and len(postings) <= self.max_block_size:
+                    shared.update(postings)
+            for j, _ in shared.most_common(self.max_candidates):
+                candidates.add((i, j))
+        return candidates
+
+    def _neighborhood_candidates(self, left: list[str], right: list[str]) -> set[tuple[int, int]]:
+        """
+        Sorted-neighborhood candidates: left/right keys close in sort order.
+        Sorting reversed strings as well catches keys differing in their prefix.
+        """
+        candidates = set()
+        n_left = len(left)
+        values = left + right
+
+        for keyed in (values, [v[::-1] for v in values]):
+            order = np.argsort(np.asarray(keyed, dtype=object), kind="stable")
+            for pos, idx in enumerate(order):
+                if idx >= n_left:
+                    continue
+                lo, hi = max(0, pos - self.window), min(len(order), pos + self.window + 1)
+                for other in order[lo:hi]:
+                    if other >= n_left:
+                        candidates.add((int(idx), int(other - n_left)))
+        return candidates
+
+
+def summarize_matches(matches: pd.DataFrame, sample_size: int = 20) -> dict:
+    """
+    Summarize a match table for API results.
+    Samples are the lowest-confidence non-exact matches, for review.
+    """
+    counts = matches["method"].value_counts()
+    inexact = matches[matches["method"] != "exact"].sort_values("confidence")
+    fuzzy = matches[matches["method"] == "fuzzy"]
+
+    return {
+        "matched_by": {
+            method: int(counts.get(method, 0))
+            for method in ("exact", "normalized", "fuzzy")
+        },
+        "fuzzy_confidence": {
+            "min": float(fuzzy["confidence"].min()) if len(fuzzy) else None,
+            "mean": round(float(fuzzy["confidence"].mean()), 4) if len(fuzzy) else None,
+        },
+        "samples": inexact.head(sample_size).to_dict(orient="records"),
+    }
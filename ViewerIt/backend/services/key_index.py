@@ -0,0 +1,295 @@
+"""
+Key Index - Persistent key membership of a set of uploaded files.
+An index is one Arrow IPC file holding every unique key of the file set in
+sorted order next to its uint64 presence bitmask (bit i set when file i holds
+the key, as in services.overlap), with the file names and key columns in the
+schema metadata. It is written once per file set, from FastIntersector's key
+sets natively (write_index) or from the chunked key extraction, and named
+after the files' content hashes, so re-uploads get a new index.
+
+Follow-up queries memory-map the file: opening reads only the footer, the
+keys and masks are zero-copy views of the mapped pages, set queries ("in A
+and C but not B") are one vectorized predicate over the masks, and key
+lookups binary-search the sorted keys. Nothing is re-read or re-hashed.
+"""
+import bisect
+import hashlib
+import json
+import os
+import re
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from config import UPLOADS_DIR, KEY_INDEX_DIRNAME, KEY_INDEX_PAGE_SIZE
+from .overlap import membership_masks, count_masks, mask_files, overlap_statistics, presence_frame, upset_data
+
+INDEX_FORMAT = "1"
+INDEX_SUFFIX = ".arrow"
+_INDEX_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def get_key_index_dir(session_id: str) -> Path:
+    """Get the key index directory for a session."""
+    return UPLOADS_DIR / session_id / KEY_INDEX_DIRNAME
+
+
+def make_index_id(content_hashes: Sequence[str], file_names: Sequence[str],
+                  key_columns: Sequence[str]) -> str:
+    """
+    Identify the index of a file set.
+
+    Args:
+        content_hashes: Content hash of each file, in bit order
+        file_names: File names in bit order
+        key_columns: Key columns (order matters for composite keys)
+
+    Returns:
+        Hex digest (BLAKE2b, 128-bit)
+    """
+    token = json.dumps([list(content_hashes), list(file_names), list(key_columns)])
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def get_key_index_path(session_id: str, index_id: str) -> Path:
+    """
+    Path of a session's key index.
+
+    Raises:
+        ValueError: If index_id is not an index id
+    """
+    if not _INDEX_ID.fullmatch(index_id):
+        raise ValueError(f"Invalid key index id: {index_id}")
+    return get_key_index_dir(session_id) / f"{index_id}{INDEX_SUFFIX}"
+
+
+def index_metadata(file_names: Sequence[str], key_columns: Sequence[str]) -> dict[str, str]:
+    """Schema metadata of an index file."""
+    return {
+        "viewerit.key_index": INDEX_FORMAT,
+        "viewerit.file_names": json.dumps(list(file_names)),
+        "viewerit.key_columns": json.dumps(list(key_columns)),
+    }
+
+
+@contextmanager
+def replacing(path: Path):
+    """
+    Yield a temporary path next to path that replaces it once written, so
+    readers never map a partly written index.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def write_key_index(path: Path, file_names: Sequence[str], key_arrays: Sequence,
+                    key_columns: Sequence[str]) -> int:
+    """
+    Write an index file from each file's keys (the NumPy path; builds with
+    FastIntersector.write_index write the same file natively).
+
+    Args:
+        path: Output path
+        file_names: File names in bit order
+        key_arrays: One array-like of string keys per file, aligned with file_names
+        key_columns: Key columns the keys were built from
+
+    Returns:
+        Number of unique keys written
+    """
+    keys, masks = membership_masks(key_arrays, sort=True)
+    schema = pa.schema(
+        [("key", pa.large_string()), ("presence_mask", pa.uint64())],
+        metadata=index_metadata(file_names, key_columns),
+    )
+    batch = pa.record_batch([pa.array(keys, type=pa.large_string()), pa.array(masks)], schema=schema)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        writer.write_batch(batch)
+    return len(keys)
+
+
+def _single_array(column: pa.ChunkedArray) -> pa.Array:
+    # Indexes are written as one record batch, which maps without copying
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+class _Utf8Keys:
+    """
+    Sorted large_string keys as a sequence of UTF-8 bytes, for bisect.
+    UTF-8 byte order is code point order, the order indexes are written in.
+    """
+
+    def __init__(self, array: pa.Array):
+        _, offsets, data = array.buffers()
+        self._length = len(array)
+        self._offsets = (np.frombuffer(offsets, dtype=np.int64)[array.offset:array.offset + self._length + 1]
+                         if self._length else np.zeros(1, dtype=np.int64))
+        self._data = memoryview(data) if data is not None else memoryview(b"")
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, idx: int) -> bytes:
+        return self._data[self._offsets[idx]:self._offsets[idx + 1]].tobytes()
+
+
+class KeyIndex:
+    """
+    A memory-mapped key index.
+
+    Attributes:
+        file_names: Indexed files in bit order
+        key_columns: Columns the composite keys were built from
+        keys: Sorted unique keys (pyarrow large_string array)
+        masks: Presence bitmask per key (read-only uint64 array)
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open an index file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If it is not a key index this version reads
+        """
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise FileNotFoundError(f"Key index not found: {self.path.name}")
+
+        table = pa.ipc.open_file(pa.memory_map(str(self.path))).read_all()
+        metadata = table.schema.metadata or {}
+        if metadata.get(b"viewerit.key_index") != INDEX_FORMAT.encode():
+            raise ValueError(f"Not a key index of format {INDEX_FORMAT}: {self.path.name}")
+
+        self.file_names: list[str] = json.loads(metadata[b"viewerit.file_names"])
+        self.key_columns: list[str] = json.loads(metadata[b"viewerit.key_columns"])
+        self.keys = _single_array(table.column("key"))
+        self.masks = _single_array(table.column("presence_mask")).to_numpy(zero_copy_only=True)
+        self._bits = {name: idx for idx, name in enumerate(self.file_names)}
+        self._sorted_keys = _Utf8Keys(self.keys)
+
+    @classmethod
+    def open(cls, session_id: str, index_id: str) -> "KeyIndex":
+        """Open a session's index by id (see make_index_id)."""
+        return cls(get_key_index_path(session_id, index_id))
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def bits(self, file_names: Sequence[str]) -> int:
+        """
+        Mask with the bits of the given files set.
+
+        Raises:
+            ValueError: If a file is not in the index
+        """
+        mask = 0
+        for name in file_names:
+            if name not in self._bits:
+                raise ValueError(f"File not in key index: {name}")
+            mask |= 1 << self._bits[name]
+        return mask
+
+    def select(self, include: Sequence[str] = (), exclude: Sequence[str] = ()) -> np.ndarray:
+        """
+        Positions of the keys held by every file in include and by none in
+        exclude (all keys when both are empty), in key order.
+        """
+        include_bits = np.uint64(self.bits(include))
+        exclude_bits = np.uint64(self.bits(exclude))
+        if not include_bits and not exclude_bits:
+            return np.arange(len(self.masks))
+
+        selected = (self.masks & include_bits) == include_bits
+        if exclude_bits:
+            selected &= (self.masks & exclude_bits) == 0
+        return np.flatnonzero(selected)
+
+    def query(self, include: Sequence[str] = (), exclude: Sequence[str] = (),
+              limit: int = KEY_INDEX_PAGE_SIZE, offset: int = 0) -> dict:
+        """
+        One page of the keys selected by include / exclude (see select).
+
+        Returns:
+            Dict with 'include', 'exclude', 'count' (all selected keys),
+            'offset', 'limit', 'keys' and 'has_more'
+        """
+        positions = self.select(include, exclude)
+        page = positions[offset:offset + limit]
+        return {
+            "include": list(include),
+            "exclude": list(exclude),
+            "count": len(positions),
+            "offset": offset,
+            "limit": limit,
+            "keys": self.keys.take(pa.array(page, type=pa.int64())).to_pylist(),
+            "has_more": offset + len(page) < len(positions),
+        }
+
+    def find(self, key: str) -> Optional[int]:
+        """Position of a key, or None when no indexed file holds it."""
+        try:
+            target = key.encode("utf-8")
+        except UnicodeEncodeError:
+            return None
+        pos = bisect.bisect_left(self._sorted_keys, target)
+        if pos < len(self._sorted_keys) and self._sorted_keys[pos] == target:
+            return pos
+        return None
+
+    def lookup(self, keys: Sequence[str]) -> list[dict]:
+        """
+        Membership of individual keys.
+
+        Returns:
+            One dict per key with 'key', 'found', 'presence_mask' and 'files'
+        """
+        results = []
+        for key in keys:
+            pos = self.find(key)
+            mask = int(self.masks[pos]) if pos is not None else 0
+            results.append({
+                "key": key,
+                "found": pos is not None,
+                "presence_mask": mask,
+                "files": mask_files(mask, self.file_names),
+            })
+        return results
+
+    def summary(self) -> dict:
+        """
+        Overlap statistics of the file set.
+
+        Returns:
+            Dict with 'file_names', 'key_columns', the overlap_statistics
+            totals and 'overlaps' (UpSet / Venn data)
+        """
+        mask_counts = count_masks(self.masks)
+        return {
+            "file_names": self.file_names,
+            "key_columns": self.key_columns,
+            **overlap_statistics(mask_counts, self.file_names),
+            "overlaps": upset_data(mask_counts, self.file_names),
+        }
+
+    def presence_frame(self, positions: np.ndarray) -> pd.DataFrame:
+        """Keys at the given positions with their membership (see overlap.presence_frame)."""
+        keys = self.keys.take(pa.array(positions, type=pa.int64())).to_numpy(zero_copy_only=False)
+        return presence_frame(keys, self.masks[positions], self.file_names)
+
+    def iter_frames(self, include: Sequence[str] = (), exclude: Sequence[str] = (),
+                    batch_rows: int = 100000) -> Iterator[pd.DataFrame]:
+        """Yield the selected keys (see select) as presence frames of up to batch_rows rows."""
+        positions = self.select(include, exclude)
+        for start in range(0, len(positions), batch_rows):
+            yield self.presence_frame(positions[start:start + batch_rows])
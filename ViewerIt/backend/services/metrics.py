@@ -0,0 +1,493 @@
+"""
+Metrics - Per-stage timing and memory instrumentation.
+Every background task and API request runs under a recorder (record()), and
+the code along the way marks its stages:
+
+    with stage("parse", bytes=file_size) as parsed:
+        df = read(...)
+        parsed.add(rows=len(df))
+
+Each stage records wall time, CPU time, peak resident memory and the rows /
+bytes it processed. Repeated stages (one "parse" per file) are aggregated,
+and nested stages name their parent (time in a nested stage is also counted
+in its parent). A task's summary is stored with the task, a request's
+stages are sent as a Server-Timing header, and all of them are aggregated
+by operation and stage for /metrics in the Prometheus text format.
+
+CPU time is this process's (every thread, including native thread pools).
+Peak RSS is the process high-water mark while the stage ran: the kernel's
+mark is reset as stages start (/proc/self/clear_refs) after folding it into
+every open stage, and is the mark since start where it cannot be reset.
+Jobs run in the worker pool are measured in their worker and merged into
+the caller's recorder under a "worker_job" stage.
+
+With METRICS_ENABLED off no recorder is created, and stage() is a context
+variable lookup returning a shared no-op.
+"""
+import bisect
+import contextvars
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from config import METRICS_ENABLED
+
+_MB = 1024 * 1024
+
+# Wall-time buckets (seconds) of the per-operation histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_recorder: contextvars.ContextVar[Optional["Recorder"]] = contextvars.ContextVar("viewerit_recorder", default=None)
+_parent: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("viewerit_stage", default=None)
+
+
+def _status_kib(field: bytes) -> Optional[int]:
+    try:
+        with open("/proc/self/status", "rb") as f:
+            return int(f.read().split(field)[1].split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def peak_rss_bytes() -> int:
+    """High-water mark of this process's resident memory."""
+    kib = _status_kib(b"VmHWM:")
+    if kib is None:
+        # ru_maxrss is in KiB on Linux
+        kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kib * 1024
+
+
+def rss_bytes() -> int:
+    """Current resident memory of this process (0 where /proc is unavailable)."""
+    return (_status_kib(b"VmRSS:") or 0) * 1024
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's high-water mark to the current RSS (Linux 4.0+)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class _PeakTracker:
+    """
+    Peak RSS of every open stage across threads. Before the process mark is
+    reset for a starting stage, it is folded into the open stages, so each
+    stage's peak stays the process maximum over its whole run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open = set()
+        self._can_reset = True
+
+    def enter(self, measured):
+        with self._lock:
+            if self._can_reset:
+                peak = peak_rss_bytes()
+                for other in self._open:
+                    other.peak = max(other.peak, peak)
+                self._can_reset = _reset_peak_rss()
+            self._open.add(measured)
+
+    def exit(self, measured):
+        with self._lock:
+            measured.peak = max(measured.peak, peak_rss_bytes())
+            self._open.discard(measured)
+
+
+_peaks = _PeakTracker()
+
+
+class _Measure:
+    """Wall time, CPU time and peak RSS of one run of a stage (or a whole operation)."""
+
+    __slots__ = ("peak", "_wall", "_cpu")
+
+    def start(self):
+        self.peak = 0
+        _peaks.enter(self)
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def stop(self) -> tuple[float, float, int]:
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        _peaks.exit(self)
+        return wall, cpu, self.peak
+
+
+class _Stage(_Measure):
+    """Context manager measuring one run of a named stage into a recorder."""
+
+    __slots__ = ("recorder", "name", "parent", "rows", "bytes", "_token")
+
+    def __init__(self, recorder: "Recorder", name: str, rows: int, bytes: int):
+        self.recorder = recorder
+        self.name = name
+        self.rows = rows
+        self.bytes = bytes
+
+    def add(self, rows: int = 0, bytes: int = 0):
+        """Count rows / bytes processed by the stage."""
+        self.rows += rows
+        self.bytes += bytes
+
+    def __enter__(self) -> "_Stage":
+        self.parent = _parent.get()
+        self._token = _parent.set(self.name)
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        wall, cpu, peak = self.stop()
+        _parent.reset(self._token)
+        self.recorder.add_stage(self.name, self.parent, wall, cpu, peak, self.rows, self.bytes)
+        return False
+
+
+class _NullStage:
+    """Stage outside any recorder (or with metrics disabled): does nothing."""
+
+    def add(self, rows: int = 0, bytes: int = 0):
+        pass
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Recorder:
+    """
+    Stage measurements of one operation (a task or a request).
+
+    Attributes:
+        operation: Name the operation is aggregated under in /metrics
+        status: 'ok', or 'error' once the operation failed
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.status = "ok"
+        self._stages: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._measure = _Measure()
+        self._measure.start()
+        self._total: Optional[tuple[float, float, int]] = None
+
+    def add_stage(self, name: str, parent: Optional[str], wall: float, cpu: float,
+                  peak: int, rows: int = 0, bytes: int = 0, calls: int = 1):
+        """Aggregate one or more runs of a stage."""
+        with self._lock:
+            entry = self._stages.get(name)
+            if entry is None:
+                entry = self._stages[name] = {
+                    "parent": parent, "calls": 0, "wall": 0.0, "cpu": 0.0, "peak": 0, "rows": 0, "bytes": 0,
+                }
+            entry["calls"] += calls
+            entry["wall"] += wall
+            entry["cpu"] += cpu
+            entry["peak"] = max(entry["peak"], peak)
+            entry["rows"] += rows
+            entry["bytes"] += bytes
+
+    def fail(self):
+        """Count the operation as failed."""
+        self.status = "error"
+
+    def finish(self):
+        """Stop the operation's own clock (stages may not be added afterwards)."""
+        if self._total is None:
+            self._total = self._measure.stop()
+
+    def totals(self) -> tuple[float, float, int]:
+        """(wall seconds, CPU seconds, peak RSS bytes) of the operation so far."""
+        if self._total is not None:
+            return self._total
+        wall = time.perf_counter() - self._measure._wall
+        cpu = time.process_time() - self._measure._cpu
+        return wall, cpu, max(self._measure.peak, peak_rss_bytes())
+
+    def stages(self) -> dict[str, dict]:
+        """Raw stage totals by name, in first-run order."""
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._stages.items()}
+
+    def summary(self) -> dict:
+        """
+        The operation's measurements so far.
+
+        Returns:
+            Dict with 'operation', 'status', 'wall_seconds', 'cpu_seconds',
+            'peak_rss_mb' and 'stages' (each with 'stage', 'parent',
+            'calls', 'wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'rows'
+            and 'bytes')
+        """
+        wall, cpu, peak = self.totals()
+        return {
+            "operation": self.operation,
+            "status": self.status,
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(cpu, 4),
+            "peak_rss_mb": round(peak / _MB, 1),
+            "stages": [
+                {
+                    "stage": name,
+                    "parent": entry["parent"],
+                    "calls": entry["calls"],
+                    "wall_seconds": round(entry["wall"], 4),
+                    "cpu_seconds": round(entry["cpu"], 4),
+                    "peak_rss_mb": round(entry["peak"] / _MB, 1),
+                    "rows": entry["rows"],
+                    "bytes": entry["bytes"],
+                }
+                for name, entry in self.stages().items()
+            ],
+        }
+
+    def server_timing(self) -> str:
+        """Stage wall times as a Server-Timing header value (milliseconds)."""
+        wall, _, _ = self.totals()
+        timings = [f"{name};dur={entry['wall'] * 1000:.1f}" for name, entry in self.stages().items()]
+        timings.append(f"total;dur={wall * 1000:.1f}")
+        return ", ".join(timings)
+
+    def merge_worker(self, payload: tuple) -> object:
+        """
+        Merge a worker job's measurements (see measured_job) as a
+        'worker_job' stage of the current stage.
+
+        Returns:
+            The job's result
+        """
+        result, (wall, cpu, peak), stages = payload
+        self.add_stage("worker_job", _parent.get(), wall, cpu, peak)
+        for name, entry in stages.items():
+            self.add_stage(name, entry["parent"] or "worker_job", entry["wall"], entry["cpu"], entry["peak"],
+                           entry["rows"], entry["bytes"], entry["calls"])
+        return result
+
+
+class _NullRecorder:
+    """Recorder used when metrics are disabled."""
+
+    operation = None
+    status = "ok"
+
+    def fail(self):
+        pass
+
+    def summary(self) -> None:
+        return None
+
+    def server_timing(self) -> None:
+        return None
+
+
+_NULL_RECORDER = _NullRecorder()
+
+
+def stage(name: str, rows: int = 0, bytes: int = 0):
+    """
+    Measure a stage of the current operation (a no-op outside one).
+
+    Args:
+        name: Stage name, e.g. 'parse' or 'datacompy'
+        rows, bytes: Rows / bytes processed, if known up front; more can be
+                     counted with add() on the returned stage
+
+    Returns:
+        Context manager yielding the stage
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NULL_STAGE
+    return _Stage(recorder, name, rows, bytes)
+
+
+def current() -> Optional[Recorder]:
+    """The current operation's recorder, if any."""
+    return _recorder.get()
+
+
+def snapshot() -> Optional[dict]:
+    """Summary of the current operation so far (None outside one)."""
+    recorder = _recorder.get()
+    return recorder.summary() if recorder is not None else None
+
+
+@contextmanager
+def record(operation: str, registry: Optional["MetricsRegistry"] = None):
+    """
+    Measure an operation: stages run within it are recorded into a new
+    recorder, which is added to the registry when the operation ends.
+
+    Args:
+        operation: Operation name (a task type or a request route)
+        registry: Registry to aggregate into (default: the shared one)
+
+    Yields:
+        The Recorder (a no-op recorder when metrics are disabled)
+    """
+    if not METRICS_ENABLED:
+        yield _NULL_RECORDER
+        return
+
+    recorder = Recorder(operation)
+    recorder_token = _recorder.set(recorder)
+    parent_token = _parent.set(None)
+    try:
+        yield recorder
+    except BaseException:
+        recorder.fail()
+        raise
+    finally:
+        _parent.reset(parent_token)
+        _recorder.reset(recorder_token)
+        recorder.finish()
+        (registry or metrics_registry).observe(recorder)
+
+
+def measured_job(fn: Callable, *args, **kwargs) -> tuple:
+    """
+    Worker: run fn(*args, **kwargs) under its own recorder.
+
+    Returns:
+        (result, (wall, cpu, peak RSS bytes), raw stage totals) for
+        Recorder.merge_worker
+    """
+    recorder = Recorder("worker_job")
+    recorder_token = _recorder.set(recorder)
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        _recorder.reset(recorder_token)
+        recorder.finish()
+    return result, recorder.totals(), recorder.stages()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    """
+    Totals of every finished operation and its stages, by operation and
+    stage name, rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outcomes: dict[tuple[str, str], int] = {}
+        self._operations: dict[str, dict] = {}
+        self._stages: dict[tuple[str, str], dict] = {}
+
+    def observe(self, recorder: Recorder):
+        """Add a finished operation."""
+        wall, cpu, peak = recorder.totals()
+        stages = recorder.stages()
+        with self._lock:
+            outcome = (recorder.operation, recorder.status)
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+
+            operation = self._operations.setdefault(recorder.operation, {
+                "buckets": [0] * len(DURATION_BUCKETS), "count": 0, "wall": 0.0, "cpu": 0.0, "peak": 0,
+            })
+            bucket = bisect.bisect_left(DURATION_BUCKETS, wall)
+            if bucket < len(DURATION_BUCKETS):
+                operation["buckets"][bucket] += 1
+            operation["count"] += 1
+            operation["wall"] += wall
+            operation["cpu"] += cpu
+            operation["peak"] = max(operation["peak"], peak)
+
+            for name, entry in stages.items():
+                totals = self._stages.setdefault((recorder.operation, name), {
+                    "calls": 0, "wall": 0.0, "cpu": 0.0, "peak": 0, "rows": 0, "bytes": 0,
+                })
+                for field in ("calls", "wall", "cpu", "rows", "bytes"):
+                    totals[field] += entry[field]
+                totals["peak"] = max(totals["peak"], entry["peak"])
+
+    def reset(self):
+        """Forget everything observed."""
+        with self._lock:
+            self._outcomes.clear()
+            self._operations.clear()
+            self._stages.clear()
+
+    def render(self, extra_gauges: Optional[dict[str, tuple[str, float]]] = None) -> str:
+        """
+        All totals in the Prometheus text format (version 0.0.4).
+
+        Args:
+            extra_gauges: Further unlabelled gauges, {name: (help, value)}
+        """
+        lines = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            family("viewerit_operations_total", "counter", "Tasks and requests measured, by outcome.")
+            for (operation, status), count in sorted(self._outcomes.items()):
+                lines.append(f"viewerit_operations_total{_labels(operation=operation, status=status)} {count}")
+
+            family("viewerit_operation_duration_seconds", "histogram", "Wall time of tasks and requests.")
+            for operation, totals in sorted(self._operations.items()):
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, totals["buckets"]):
+                    cumulative += count
+                    lines.append(f"viewerit_operation_duration_seconds_bucket"
+                                 f"{_labels(operation=operation, le=repr(bound))} {cumulative}")
+                lines.append(f"viewerit_operation_duration_seconds_bucket"
+                             f"{_labels(operation=operation, le='+Inf')} {totals['count']}")
+                lines.append(f"viewerit_operation_duration_seconds_sum{_labels(operation=operation)} {totals['wall']}")
+                lines.append(f"viewerit_operation_duration_seconds_count{_labels(operation=operation)} {totals['count']}")
+
+            family("viewerit_operation_cpu_seconds_total", "counter", "Process CPU time of tasks and requests.")
+            for operation, totals in sorted(self._operations.items()):
+                lines.append(f"viewerit_operation_cpu_seconds_total{_labels(operation=operation)} {totals['cpu']}")
+
+            family("viewerit_operation_peak_rss_bytes", "gauge", "Largest process peak RSS during an operation.")
+            for operation, totals in sorted(self._operations.items()):
+                lines.append(f"viewerit_operation_peak_rss_bytes{_labels(operation=operation)} {totals['peak']}")
+
+            stage_families = (
+                ("viewerit_stage_calls_total", "counter", "Runs of each stage.", "calls"),
+                ("viewerit_stage_seconds_total", "counter", "Wall time spent in each stage.", "wall"),
+                ("viewerit_stage_cpu_seconds_total", "counter", "CPU time spent in each stage.", "cpu"),
+                ("viewerit_stage_rows_total", "counter", "Rows processed by each stage.", "rows"),
+                ("viewerit_stage_bytes_total", "counter", "Bytes processed by each stage.", "bytes"),
+                ("viewerit_stage_peak_rss_bytes", "gauge", "Largest peak RSS during a stage.", "peak"),
+            )
+            for name, kind, help_text, field in stage_families:
+                family(name, kind, help_text)
+                for (operation, stage_name), totals in sorted(self._stages.items()):
+                    lines.append(f"{name}{_labels(operation=operation, stage=stage_name)} {totals[field]}")
+
+        for name, (help_text, value) in (extra_gauges or {}).items():
+            family(name, "gauge", help_text)
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared instance
+metrics_registry = MetricsRegistry()
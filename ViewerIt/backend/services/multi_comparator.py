@@ -6,11 +6,23 @@ Performance optimized with optional Rust acceleration for set operations.
 """
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Optional, Iterator, Iterable, Callable
 from collections import defaultdict
-from itertools import combinations
 import logging
 
+from .file_handler import FileHandler
+from .metrics import stage
+from .fuzzy_keys import FuzzyKeyMatcher, composite_key, summarize_matches
+from .overlap import (
+    MAX_OVERLAP_FILES,
+    membership_masks,
+    membership_statistics,
+    count_masks,
+    overlap_statistics,
+    presence_frame,
+    upset_data,
+)
+
 logger = logging.getLogger(__name__)
 
 # Try to import Rust acceleration module
@@ -22,6 +34,99 @@ except ImportError:
     RUST_AVAILABLE = False
     logger.warning("viewerit_core not available - using Python fallback (slower for large datasets)")
 
+# Key membership is aggregated natively by builds with overlap_counts
+NATIVE_OVERLAP = RUST_AVAILABLE and hasattr(FastIntersector, "overlap_counts")
+
+
+def key_frame(df: pd.DataFrame, join_columns: list[str],
+              ignore_columns: Optional[list[str]] = None, name: str = "") -> pd.DataFrame:
+    """
+    Reduce a frame to the columns a comparison uses and add its composite key.
+    
+    Args:
+        df: A loaded file
+        join_columns: Columns to use as unique identifiers
+        ignore_columns: Columns to drop
+        name: File name for error messages
+        
+    Returns:
+        The frame without ignored columns, with a '_composite_key' column
+        
+    Raises:
+        ValueError: If a join column is missing
+    """
+    if ignore_columns:
+        df = df[[c for c in df.columns if c not in ignore_columns]]
+    missing = [col for col in join_columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"File '{name}' missing join columns: {missing}")
+    return df.assign(_composite_key=composite_key(df, join_columns))
+
+
+def load_keyed_frame(session_id: str, filename: str, join_columns: list[str],
+                     ignore_columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """Worker: load an uploaded file reduced by key_frame (the full frame stays in the worker)."""
+    return key_frame(FileHandler.load_dataframe(session_id, filename), join_columns, ignore_columns, filename)
+
+
+def _check_file_count(file_count: int):
+    if file_count < 2:
+        raise ValueError("At least 2 dataframes required for comparison")
+
+
+class _KeyRegistry:
+    """
+    Keys and per-record data of keyed frames, registered one file at a time
+    (in any order) so the work can overlap the loading of other files.
+    """
+    
+    def __init__(self, use_rust: bool, file_count: int):
+        self.key_to_files = defaultdict(set)
+        self.key_to_data = defaultdict(dict)
+        self.keys: dict[str, np.ndarray] = {}
+        # Native overlap counts are bitmasks as well
+        use_rust = use_rust and file_count <= MAX_OVERLAP_FILES
+        self.intersector = FastIntersector() if use_rust else None
+    
+    def add(self, name: str, keyed_df: pd.DataFrame):
+        with stage("keys", rows=len(keyed_df)):
+            keys = keyed_df['_composite_key']
+            if self.intersector is not None:
+                self.intersector.add_file(name, pd.unique(keys).tolist())
+            else:
+                self.keys[name] = keys.to_numpy()
+            
+            for _, row in keyed_df.iterrows():
+                key = row['_composite_key']
+                self.key_to_files[key].add(name)
+                self.key_to_data[key][name] = row.drop('_composite_key').to_dict()
+    
+    def finish(self, file_names: list[str]) -> dict:
+        """
+        Intersection results, with the key membership mask -> count table
+        (None beyond MAX_OVERLAP_FILES files, where masks do not fit).
+        """
+        with stage("intersections", rows=len(self.key_to_files)):
+            if len(file_names) > MAX_OVERLAP_FILES:
+                mask_counts = None
+                stats = membership_statistics([self.keys[name] for name in file_names], file_names)
+            else:
+                if self.intersector is not None:
+                    mask_counts = dict(self.intersector.overlap_counts(file_names))
+                else:
+                    _, masks = membership_masks([self.keys[name] for name in file_names])
+                    mask_counts = count_masks(masks)
+                stats = overlap_statistics(mask_counts, file_names)
+        
+        return {
+            'all_keys': list(self.key_to_files),
+            'key_to_files': self.key_to_files,
+            'key_to_data': self.key_to_data,
+            'file_exclusive_counts': stats['file_exclusive_counts'],
+            'overlap_count': stats['keys_in_all_files'],
+            'mask_counts': mask_counts,
+        }
+
 
 class MultiFileComparator:
     """
@@ -42,223 +147,202 @@ class MultiFileComparator:
         Args:
             dataframes: Dict mapping filename -> DataFrame
         """
-        if len(dataframes) < 2:
-            raise ValueError("At least 2 dataframes required for comparison")
+        _check_file_count(len(dataframes))
         
         self.dataframes = dataframes
         self.file_names = list(dataframes.keys())
         self._results: Optional[dict] = None
-        self._use_rust = RUST_AVAILABLE
+        self._keyed_dfs: Optional[dict[str, pd.DataFrame]] = None
+        self._join_columns: list[str] = []
+        self._use_rust = NATIVE_OVERLAP
+    
+    @classmethod
+    def compare_stream(cls, file_names: list[str],
+                       frames: Iterable[tuple[str, pd.DataFrame]],
+                       join_columns: list[str],
+                       ignore_columns: Optional[list[str]] = None,
+                       fuzzy_keys: Optional[dict] = None,
+                       on_file: Optional[Callable[[str, int], None]] = None) -> tuple["MultiFileComparator", dict]:
+        """
+        Compare files as they arrive rather than after all are loaded.
+        
+        Each frame is reduced with key_frame (unless a worker already did, see
+        load_keyed_frame) and its keys and records are registered before the
+        next frame is awaited, overlapping that work with the remaining loads.
+        Only the reduced frames are kept. With fuzzy_keys, keys are registered
+        once every file is in, since they are reconciled across files first.
+        
+        Args:
+            file_names: Files in comparison order (frames may arrive in any order)
+            frames: (filename, frame) pairs, e.g. ParallelProcessor.iter_session_files
+            join_columns, ignore_columns, fuzzy_keys: As for compare()
+            on_file: Optional callback(filename, rows) as each file is registered
+            
+        Returns:
+            (comparator, comparison results)
+        """
+        _check_file_count(len(file_names))
+        registry = _KeyRegistry(NATIVE_OVERLAP, len(file_names)) if fuzzy_keys is None else None
+        
+        keyed_dfs = {}
+        for name, df in frames:
+            if '_composite_key' not in df.columns:
+                df = key_frame(df, join_columns, ignore_columns, name)
+            keyed_dfs[name] = df
+            if registry is not None:
+                registry.add(name, df)
+            if on_file:
+                on_file(name, len(df))
+        
+        comparator = cls({name: keyed_dfs[name] for name in file_names})
+        result = comparator._compare_keyed(dict(comparator.dataframes), join_columns, fuzzy_keys, registry)
+        return comparator, result
     
     def compare(self, join_columns: list[str],
-                ignore_columns: Optional[list[str]] = None) -> dict:
+                ignore_columns: Optional[list[str]] = None,
+                fuzzy_keys: Optional[dict] = None) -> dict:
         """
         Perform multi-file comparison.
 
         Args:
             join_columns: Columns to use as unique identifiers
             ignore_columns: Columns to exclude from comparison
+            fuzzy_keys: Optional FuzzyKeyMatcher options. When given, keys that
+                        differ only by formatting are reconciled onto the keys
+                        of earlier files before set operations.
 
         Returns:
             Comprehensive comparison results
         """
-        # Prepare dataframes - use views where possible to reduce memory
-        dfs = {}
-        for name, df in self.dataframes.items():
-            if ignore_columns:
-                cols_to_keep = [c for c in df.columns if c not in ignore_columns]
-                dfs[name] = df[cols_to_keep]
-            else:
-                dfs[name] = df
-
-        # Create composite key for each dataframe
-        keyed_dfs = {}
-        for name, df in dfs.items():
-            if not all(col in df.columns for col in join_columns):
-                missing = [col for col in join_columns if col not in df.columns]
-                raise ValueError(f"File '{name}' missing join columns: {missing}")
-
-            # Create composite key - add column without full copy
-            df_keyed = df.assign(
-                _composite_key=df[join_columns].astype(str).agg('|'.join, axis=1)
-            )
-            keyed_dfs[name] = df_keyed
-        
-        # Use Rust-accelerated path if available
-        if self._use_rust:
-            intersection_result = self._compute_intersections_rust(keyed_dfs)
-        else:
-            intersection_result = self._compute_intersections_python(keyed_dfs)
-        
-        # Extract results from intersection computation
-        all_keys = intersection_result['all_keys']
-        key_to_files = intersection_result['key_to_files']
-        key_to_data = intersection_result['key_to_data']
-        file_exclusive_counts = intersection_result['file_exclusive_counts']
-        overlap_count = intersection_result['overlap_count']
-        
-        # Categorize records (still need Python for data extraction)
-        records_in_all = []
-        records_in_some = []
-        records_in_one = []
-        file_exclusive_records = {name: [] for name in self.file_names}
-        
-        n_files = len(self.file_names)
-        
-        for key in all_keys:
-            files_with_key = key_to_files[key]
-            record_info = {
-                'key': key,
-                'files': list(files_with_key),
-                'file_count': len(files_with_key),
-                'data': key_to_data.get(key, {}),
-            }
+        keyed_dfs = {
+            name: key_frame(df, join_columns, ignore_columns, name)
+            for name, df in self.dataframes.items()
+        }
+        return self._compare_keyed(keyed_dfs, join_columns, fuzzy_keys)
+    
+    def _compare_keyed(self, keyed_dfs: dict[str, pd.DataFrame], join_columns: list[str],
+                       fuzzy_keys: Optional[dict] = None,
+                       registry: Optional[_KeyRegistry] = None) -> dict:
+        """Compare frames reduced by key_frame, registering their keys unless done already."""
+        fuzzy_report = None
+        if fuzzy_keys is not None:
+            with stage("keys", rows=sum(len(df) for df in keyed_dfs.values())):
+                fuzzy_report = self._reconcile_fuzzy_keys(keyed_dfs, fuzzy_keys)
+        
+        self._keyed_dfs = keyed_dfs
+        self._join_columns = list(join_columns)
+        
+        if registry is None:
+            registry = _KeyRegistry(self._use_rust, len(self.file_names))
+            for name in self.file_names:
+                registry.add(name, keyed_dfs[name])
+        intersection_result = registry.finish(self.file_names)
+        
+        with stage("report", rows=len(intersection_result['all_keys'])):
+            # Extract results from intersection computation
+            all_keys = intersection_result['all_keys']
+            key_to_files = intersection_result['key_to_files']
+            key_to_data = intersection_result['key_to_data']
+            file_exclusive_counts = intersection_result['file_exclusive_counts']
+            overlap_count = intersection_result['overlap_count']
+            mask_counts = intersection_result['mask_counts']
+        
+            # Categorize records (still need Python for data extraction)
+            records_in_all = []
+            records_in_some = []
+            records_in_one = []
+            file_exclusive_records = {name: [] for name in self.file_names}
+        
+            n_files = len(self.file_names)
+        
+            for key in all_keys:
+                files_with_key = key_to_files[key]
+                record_info = {
+                    'key': key,
+                    'files': list(files_with_key),
+                    'file_count': len(files_with_key),
+                    'data': key_to_data.get(key, {}),
+                }
             
-            if len(files_with_key) == n_files:
-                records_in_all.append(record_info)
-            elif len(files_with_key) == 1:
-                records_in_one.append(record_info)
-                file_exclusive_records[list(files_with_key)[0]].append(record_info)
-            else:
-                records_in_some.append(record_info)
-        
-        # Build presence matrix
-        presence_matrix = self._build_presence_matrix(all_keys, key_to_files)
-        
-        # Analyze value differences for records in multiple files
-        value_differences = self._analyze_value_differences(
-            records_in_all + records_in_some, 
-            join_columns
-        )
-        
-        # Column analysis across files
-        column_analysis = self._analyze_columns(dfs)
+                if len(files_with_key) == n_files:
+                    records_in_all.append(record_info)
+                elif len(files_with_key) == 1:
+                    records_in_one.append(record_info)
+                    file_exclusive_records[list(files_with_key)[0]].append(record_info)
+                else:
+                    records_in_some.append(record_info)
+        
+            # Build presence matrix
+            presence_matrix = self._build_presence_matrix(all_keys, key_to_files)
+        
+            # Analyze value differences for records in multiple files
+            value_differences = self._analyze_value_differences(
+                records_in_all + records_in_some, 
+                join_columns
+            )
         
-        # Generate summary statistics
-        summary = self._generate_summary(
-            all_keys, records_in_all, records_in_some, 
-            records_in_one, file_exclusive_records
-        )
+            # Column analysis across files
+            column_analysis = self._analyze_columns(keyed_dfs)
         
-        # Add performance info to summary
-        summary["rust_accelerated"] = self._use_rust
+            # Generate summary statistics
+            summary = self._generate_summary(
+                all_keys, records_in_all, records_in_some, 
+                records_in_one, file_exclusive_records
+            )
         
-        self._results = {
-            "summary": summary,
-            "records_in_all_files": {
-                "count": len(records_in_all),
-                "samples": records_in_all[:20],  # Limit samples
-            },
-            "records_in_some_files": {
-                "count": len(records_in_some),
-                "by_file_count": self._group_by_file_count(records_in_some),
-                "samples": records_in_some[:20],
-            },
-            "records_in_one_file": {
-                "count": len(records_in_one),
-                "by_file": {name: len(recs) for name, recs in file_exclusive_records.items()},
-                "samples": records_in_one[:20],
-            },
-            "presence_matrix": presence_matrix,
-            "value_differences": value_differences,
-            "column_analysis": column_analysis,
-            "venn_data": self._generate_venn_data(key_to_files),
-        }
+            # Add performance info to summary
+            summary["rust_accelerated"] = registry.intersector is not None
+        
+            self._results = {
+                "summary": summary,
+                "records_in_all_files": {
+                    "count": len(records_in_all),
+                    "samples": records_in_all[:20],  # Limit samples
+                },
+                "records_in_some_files": {
+                    "count": len(records_in_some),
+                    "by_file_count": self._group_by_file_count(records_in_some),
+                    "samples": records_in_some[:20],
+                },
+                "records_in_one_file": {
+                    "count": len(records_in_one),
+                    "by_file": {name: len(recs) for name, recs in file_exclusive_records.items()},
+                    "samples": records_in_one[:20],
+                },
+                "presence_matrix": presence_matrix,
+                "value_differences": value_differences,
+                "column_analysis": column_analysis,
+                "venn_data": self._generate_venn_data(mask_counts),
+            }
+            if fuzzy_report is not None:
+                self._results["fuzzy_matching"] = fuzzy_report
         
         return self._results
     
-    def _compute_intersections_rust(self, keyed_dfs: dict[str, pd.DataFrame]) -> dict:
+    def _reconcile_fuzzy_keys(self, keyed_dfs: dict[str, pd.DataFrame],
+                              options: dict) -> dict:
         """
-        Use Rust FastIntersector for high-performance set operations.
+        Rewrite each file's composite keys onto matching keys of the files
+        before it (the first file is the reference), in place.
         
-        This is 10x-50x faster than the Python path for large datasets
-        due to parallel processing and efficient hash set operations.
-        """
-        logger.debug("Using Rust-accelerated intersection computation")
-        
-        # Initialize Rust intersector
-        intersector = FastIntersector()
-        
-        # Add each file's keys to the intersector
-        for name, df in keyed_dfs.items():
-            keys = df['_composite_key'].tolist()
-            intersector.add_file(name, keys)
-        
-        # Compute intersection using Rust (parallelized)
-        rust_result = intersector.compute()
-        
-        # Convert Rust result back to Python structures
-        # The Rust result provides: presence_matrix, keys, file_exclusive_counts, overlap_count, total_unique_keys
-        all_keys = set(rust_result.keys)
-        file_exclusive_counts = dict(rust_result.file_exclusive_counts)
-        overlap_count = rust_result.overlap_count
-        
-        # Rebuild key_to_files from presence matrix for compatibility
-        # presence_matrix[row_idx] = [bool for each file], keys[row_idx] = key
-        key_to_files = defaultdict(set)
-        file_names = intersector.get_filenames()
-        
-        for key_idx, key in enumerate(rust_result.keys):
-            if key_idx < len(rust_result.presence_matrix):
-                row = rust_result.presence_matrix[key_idx]
-                for file_idx, present in enumerate(row):
-                    if present and file_idx < len(file_names):
-                        key_to_files[key].add(file_names[file_idx])
-        
-        # Build key_to_data (still need Python for actual row data)
-        key_to_data = defaultdict(dict)
-        for name, df in keyed_dfs.items():
-            for _, row in df.iterrows():
-                key = row['_composite_key']
-                if key in all_keys:
-                    key_to_data[key][name] = row.drop('_composite_key').to_dict()
-        
-        return {
-            'all_keys': all_keys,
-            'key_to_files': key_to_files,
-            'key_to_data': key_to_data,
-            'file_exclusive_counts': file_exclusive_counts,
-            'overlap_count': overlap_count,
-        }
-    
-    def _compute_intersections_python(self, keyed_dfs: dict[str, pd.DataFrame]) -> dict:
-        """
-        Pure Python fallback for intersection computation.
-        
-        Used when Rust extension is not available.
+        Returns:
+            Per-file match summaries
         """
-        logger.debug("Using Python fallback for intersection computation")
-        
-        all_keys = set()
-        key_to_files = defaultdict(set)
-        key_to_data = defaultdict(dict)
-        
-        for name, df in keyed_dfs.items():
-            for _, row in df.iterrows():
-                key = row['_composite_key']
-                all_keys.add(key)
-                key_to_files[key].add(name)
-                key_to_data[key][name] = row.drop('_composite_key').to_dict()
-        
-        # Calculate file exclusive counts and overlap
-        file_exclusive_counts = {name: 0 for name in self.file_names}
-        overlap_count = 0
-        n_files = len(self.file_names)
-        
-        for key, files in key_to_files.items():
-            if len(files) == n_files:
-                overlap_count += 1
-            elif len(files) == 1:
-                file_name = list(files)[0]
-                file_exclusive_counts[file_name] += 1
+        matcher = FuzzyKeyMatcher(**options)
+        reference = pd.Index(keyed_dfs[self.file_names[0]]['_composite_key'].unique())
+        by_file = {}
+        
+        for name in self.file_names[1:]:
+            keys = keyed_dfs[name]['_composite_key']
+            matches = matcher.match(reference.to_series(), keys)
+            mapping = pd.Series(matches['left_key'].to_numpy(), index=matches['right_key'].to_numpy())
+            remapped = keys.map(mapping).fillna(keys)
+            
+            keyed_dfs[name] = keyed_dfs[name].assign(_composite_key=remapped)
+            reference = reference.union(pd.Index(remapped.unique()), sort=False)
+            by_file[name] = summarize_matches(matches)
         
-        return {
-            'all_keys': all_keys,
-            'key_to_files': key_to_files,
-            'key_to_data': key_to_data,
-            'file_exclusive_counts': file_exclusive_counts,
-            'overlap_count': overlap_count,
-        }
+        return {"reference_file": self.file_names[0], "by_file": by_file}
     
     def _build_presence_matrix(self, all_keys: set, 
                                key_to_files: dict) -> dict:
@@ -325,6 +409,8 @@ class MultiFileComparator:
         
         for name, df in dfs.items():
             for col in df.columns:
+                if col == '_composite_key':
+                    continue
                 all_columns.add(col)
                 column_presence[col].add(name)
                 column_types[col][name] = str(df[col].dtype)
@@ -397,31 +483,14 @@ class MultiFileComparator:
             for count, recs in sorted(groups.items())
         }
     
-    def _generate_venn_data(self, key_to_files: dict) -> dict:
-        """Generate data for Venn diagram visualization."""
-        if len(self.file_names) > 5:
-            return {"error": "Venn diagram not supported for more than 5 files"}
-        
-        # Count records in each combination
-        combination_counts = defaultdict(int)
-        
-        for key, files in key_to_files.items():
-            # Create a sorted tuple of file names for this record
-            combo = tuple(sorted(files))
-            combination_counts[combo] += 1
-        
-        # Format for visualization
-        venn_sets = []
-        for combo, count in combination_counts.items():
-            venn_sets.append({
-                "sets": list(combo),
-                "size": count,
-            })
-        
-        return {
-            "file_names": self.file_names,
-            "sets": venn_sets,
-        }
+    def _generate_venn_data(self, mask_counts: Optional[dict[int, int]]) -> dict:
+        """
+        Generate Venn / UpSet data: the largest exclusive intersections
+        (every one for up to 5 files), from the key membership mask counts.
+        """
+        if mask_counts is None:
+            return {"error": f"Venn diagram not supported for more than {MAX_OVERLAP_FILES} files"}
+        return upset_data(mask_counts, self.file_names)
     
     def get_reconciliation_report(self) -> dict:
         """Generate a detailed reconciliation report."""
@@ -462,29 +531,84 @@ class MultiFileComparator:
         
         return report
     
-    def export_differences(self, format: str = "records") -> pd.DataFrame:
-        """Export differences as a DataFrame for further analysis."""
-        if not self._results:
+    def get_presence_frame(self) -> pd.DataFrame:
+        """
+        Build the full key presence table without per-record Python work.
+        
+        Returns:
+            DataFrame with 'key', 'presence_mask' (bit i set when the key is in
+            file_names[i]), 'file_count' and one boolean column per file.
+        """
+        if self._keyed_dfs is None:
             raise ValueError("Run compare() first")
         
-        records = []
+        keys, masks = membership_masks(
+            [self._keyed_dfs[name]['_composite_key'] for name in self.file_names], sort=True
+        )
+        return presence_frame(keys, masks, self.file_names)
+    
+    def iter_value_mismatch_frames(self, batch_rows: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Yield every key/column whose values differ across the files holding it.
         
-        # Add records in single file
-        for record in self._results["records_in_one_file"]["samples"]:
-            records.append({
-                "key": record["key"],
-                "status": "single_file",
-                "files": ", ".join(record["files"]),
-                "file_count": 1,
-            })
+        Frames are in long format: 'key', 'column' and one string column per
+        file (null where the file lacks the key or column). Values are compared
+        by their string form, matching the value_differences summary.
+        """
+        if self._keyed_dfs is None:
+            raise ValueError("Run compare() first")
         
-        # Add records in some files
-        for record in self._results["records_in_some_files"]["samples"]:
-            records.append({
-                "key": record["key"],
-                "status": "partial_overlap",
-                "files": ", ".join(record["files"]),
-                "file_count": record["file_count"],
-            })
+        # Last occurrence wins for duplicate keys, as in key_to_data
+        by_key = {
+            name: df.drop_duplicates('_composite_key', keep='last').set_index('_composite_key')
+            for name, df in self._keyed_dfs.items()
+        }
+        
+        compare_cols = []
+        for df in by_key.values():
+            for col in df.columns:
+                if col not in self._join_columns and col not in compare_cols:
+                    compare_cols.append(col)
+        
+        for col in compare_cols:
+            values = {
+                name: df[col].astype(str)
+                for name, df in by_key.items() if col in df.columns
+            }
+            if len(values) < 2:
+                continue
+            
+            wide = pd.concat(values, axis=1)
+            reference = wide.bfill(axis=1).iloc[:, 0]
+            differs = (wide.notna() & wide.ne(reference, axis=0)).any(axis=1)
+            mismatched = wide[differs.to_numpy()]
+            
+            for start in range(0, len(mismatched), batch_rows):
+                batch = mismatched.iloc[start:start + batch_rows]
+                frame = pd.DataFrame({
+                    'key': batch.index.to_numpy(dtype=object),
+                    'column': col,
+                })
+                for name in self.file_names:
+                    frame[name] = (
+                        batch[name].astype("string").to_numpy() if name in batch.columns
+                        else pd.array([pd.NA] * len(batch), dtype="string")
+                    )
+                yield frame
+    
+    def export_differences(self, format: str = "records") -> pd.DataFrame:
+        """Export every key missing from at least one file as a DataFrame."""
+        if not self._results:
+            raise ValueError("Run compare() first")
         
-        return pd.DataFrame(records)
+        presence = self.get_presence_frame()
+        partial = presence[presence['file_count'] < len(self.file_names)]
+        membership = partial[self.file_names].to_numpy()
+        names = np.array(self.file_names, dtype=object)
+        
+        return pd.DataFrame({
+            "key": partial['key'].to_numpy(),
+            "status": np.where(partial['file_count'] == 1, "single_file", "partial_overlap"),
+            "files": [", ".join(names[row]) for row in membership],
+            "file_count": partial['file_count'].to_numpy(),
+        })
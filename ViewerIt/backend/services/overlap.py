@@ -0,0 +1,200 @@
+"""
+Overlap - Key membership bitmasks and UpSet-style intersection counts.
+Each unique key gets a uint64 mask with bit i set when it appears in file i,
+so up to 64 files are described by one integer per key. Aggregating the masks
+into a mask -> count table gives every exclusive intersection (the regions of
+a Venn diagram) in one vectorized pass; the table has at most one row per
+distinct combination that actually occurs, however many files there are.
+
+viewerit_core's FastIntersector.overlap_counts builds the same table
+natively from the keys it already holds, without materializing a presence
+matrix; the NumPy path below is the fallback and the reference.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import OVERLAP_TOP_K
+
+MAX_OVERLAP_FILES = 64
+
+
+def _check_file_count(file_count: int):
+    if file_count > MAX_OVERLAP_FILES:
+        raise ValueError(f"Overlap bitmasks support at most {MAX_OVERLAP_FILES} files, got {file_count}")
+
+
+def membership_masks(key_arrays: Sequence, sort: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Membership bitmask of every key across files.
+
+    Args:
+        key_arrays: One array-like of keys per file; bit i is file i.
+                    Keys may repeat within a file.
+        sort: Return keys in sorted order (default: first-seen order)
+
+    Returns:
+        Tuple of (unique keys as an object array, uint64 masks aligned with them)
+    """
+    _check_file_count(len(key_arrays))
+    arrays = [np.asarray(keys, dtype=object) for keys in key_arrays]
+    if not arrays:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.uint64)
+
+    codes, keys = pd.factorize(np.concatenate(arrays), sort=sort)
+    masks = np.zeros(len(keys), dtype=np.uint64)
+    start = 0
+    for idx, array in enumerate(arrays):
+        # Fancy-index OR: repeated keys within a file set the same bit
+        masks[codes[start:start + len(array)]] |= np.uint64(1) << np.uint64(idx)
+        start += len(array)
+    return np.asarray(keys, dtype=object), masks
+
+
+def count_masks(masks: np.ndarray) -> dict[int, int]:
+    """
+    Aggregate key masks into a mask -> key count table.
+
+    Args:
+        masks: uint64 membership masks, one per key
+
+    Returns:
+        Dict mapping each occurring mask to the number of keys with it
+    """
+    values, counts = np.unique(np.asarray(masks, dtype=np.uint64), return_counts=True)
+    return dict(zip(values.tolist(), counts.tolist()))
+
+
+def membership_statistics(key_arrays: Sequence, file_names: Sequence[str]) -> dict:
+    """
+    The totals of overlap_statistics computed from the keys themselves, for
+    any number of files (masks only fit MAX_OVERLAP_FILES).
+
+    Args:
+        key_arrays: One array-like of keys per file, in file_names order
+        file_names: File names
+    """
+    uniques = [pd.unique(np.asarray(keys, dtype=object)) for keys in key_arrays]
+    if uniques:
+        codes, keys = pd.factorize(np.concatenate(uniques))
+    else:
+        codes, keys = np.empty(0, dtype=np.intp), []
+    files = np.repeat(np.arange(len(uniques)), [len(unique) for unique in uniques])
+    degrees = np.bincount(codes, minlength=len(keys))
+    by_file_count = np.bincount(degrees, minlength=len(file_names) + 1)
+    exclusive = np.bincount(files[degrees[codes] == 1], minlength=len(file_names))
+
+    return {
+        "total_unique_keys": len(keys),
+        "keys_in_all_files": int(by_file_count[len(file_names)]),
+        "file_exclusive_counts": {name: int(exclusive[idx]) for idx, name in enumerate(file_names)},
+        "file_key_counts": {name: len(uniques[idx]) for idx, name in enumerate(file_names)},
+        "by_file_count": {
+            degree: int(count) for degree, count in enumerate(by_file_count) if count
+        },
+    }
+
+
+def mask_files(mask: int, file_names: Sequence[str]) -> list[str]:
+    """Names of the files whose bits are set in mask."""
+    return [name for idx, name in enumerate(file_names) if mask >> idx & 1]
+
+
+def presence_frame(keys: Sequence, masks: np.ndarray, file_names: Sequence[str]) -> pd.DataFrame:
+    """
+    Keys with their membership spelled out.
+
+    Returns:
+        DataFrame with 'key', 'presence_mask' (bit i set when the key is in
+        file_names[i]), 'file_count' and one boolean column per file.
+    """
+    masks = np.asarray(masks, dtype=np.uint64)
+    presence = pd.DataFrame({'key': keys, 'presence_mask': masks})
+    file_count = np.zeros(len(masks), dtype=np.int64)
+    for idx, name in enumerate(file_names):
+        in_file = (masks >> np.uint64(idx)) & np.uint64(1)
+        presence[name] = in_file.astype(bool)
+        file_count += in_file.astype(np.int64)
+    presence.insert(2, 'file_count', file_count)
+    return presence
+
+
+def _table_arrays(mask_counts: dict[int, int], file_count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The table as (masks, counts, degrees) arrays; degree = files holding the keys."""
+    _check_file_count(file_count)
+    masks = np.fromiter(mask_counts.keys(), dtype=np.uint64, count=len(mask_counts))
+    counts = np.fromiter(mask_counts.values(), dtype=np.int64, count=len(mask_counts))
+    degrees = np.zeros(len(masks), dtype=np.int64)
+    for idx in range(file_count):
+        degrees += ((masks >> np.uint64(idx)) & np.uint64(1)).astype(np.int64)
+    return masks, counts, degrees
+
+
+def overlap_statistics(mask_counts: dict[int, int], file_names: Sequence[str]) -> dict:
+    """
+    Totals derived from a mask -> count table.
+
+    Returns:
+        Dict with 'total_unique_keys', 'keys_in_all_files',
+        'file_exclusive_counts', 'file_key_counts' and 'by_file_count'
+        (keys grouped by how many files hold them)
+    """
+    masks, counts, degrees = _table_arrays(mask_counts, len(file_names))
+    full = (1 << len(file_names)) - 1
+    by_file_count = np.bincount(degrees, weights=counts, minlength=len(file_names) + 1)
+
+    return {
+        "total_unique_keys": int(counts.sum()),
+        "keys_in_all_files": mask_counts.get(full, 0),
+        "file_exclusive_counts": {
+            name: mask_counts.get(1 << idx, 0) for idx, name in enumerate(file_names)
+        },
+        "file_key_counts": {
+            name: int(counts[(masks >> np.uint64(idx)) & np.uint64(1) == 1].sum())
+            for idx, name in enumerate(file_names)
+        },
+        "by_file_count": {
+            degree: int(count) for degree, count in enumerate(by_file_count) if count
+        },
+    }
+
+
+def upset_data(mask_counts: dict[int, int], file_names: Sequence[str],
+               top_k: Optional[int] = None) -> dict:
+    """
+    Largest exclusive intersections for an UpSet plot (or a Venn diagram).
+
+    Args:
+        mask_counts: Mask -> count table (count_masks or overlap_counts)
+        file_names: File names in bit order
+        top_k: Intersections to keep, largest first (default: OVERLAP_TOP_K)
+
+    Returns:
+        Dict with 'file_names', 'set_sizes' (keys per file), 'sets' (each
+        with 'sets', 'mask', 'degree' and 'size'), 'intersection_count'
+        (distinct combinations that occur) and 'truncated'. Masks are decimal
+        strings, since JSON clients may read numbers as doubles (exact only
+        up to 2**53).
+    """
+    top_k = OVERLAP_TOP_K if top_k is None else top_k
+    stats = overlap_statistics(mask_counts, file_names)
+    masks, counts, degrees = _table_arrays(mask_counts, len(file_names))
+    # Largest first; ties broken by mask for a stable order
+    top = np.lexsort((masks, -counts))[:top_k]
+
+    return {
+        "file_names": list(file_names),
+        "set_sizes": stats["file_key_counts"],
+        "sets": [
+            {
+                "sets": mask_files(mask, file_names),
+                "mask": str(mask),
+                "degree": degree,
+                "size": count,
+            }
+            for mask, degree, count in zip(masks[top].tolist(), degrees[top].tolist(), counts[top].tolist())
+        ],
+        "intersection_count": len(mask_counts),
+        "truncated": len(mask_counts) > top_k,
+    }
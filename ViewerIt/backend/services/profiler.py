@@ -0,0 +1,392 @@
+"""
+Column Profiler Service - Single-pass per-column statistics shared by services.
+Schema analysis, quality checks, comparison statistics and chunked statistics
+all need nulls, distinct counts, top values and numeric summaries. Each column
+is profiled with one value_counts pass; everything else is derived from the
+(much smaller) table of distinct values and their counts.
+
+Profiles are cached against the file's content hash (set by
+FileHandler.load_dataframe in df.attrs), so one upload -> schema -> quality ->
+compare flow profiles each column once.
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import PROFILE_CACHE_MAX_FILES, PROFILE_TOP_VALUES, PROFILE_MAX_TRACKED_VALUES
+from .sketches import HyperLogLog, KLLSketch, MisraGries
+
+logger = logging.getLogger(__name__)
+
+# Key in DataFrame.attrs identifying the file a frame was loaded from
+CONTENT_HASH_ATTR = "content_hash"
+
+
+def _value_counts(series: pd.Series) -> pd.Series:
+    """Distinct non-null values and their counts, most frequent first."""
+    try:
+        counts = series.value_counts(dropna=True)
+        if counts.index.inferred_type != "mixed" or all(
+            pd.api.types.is_hashable(value) for value in counts.index
+        ):
+            return counts
+    except TypeError:
+        pass
+    # Unhashable values (e.g. lists from nested JSON)
+    return series.dropna().astype(str).value_counts()
+
+
+def _weighted_quantile(values: np.ndarray, cumulative: np.ndarray, q: float) -> float:
+    """Linear-interpolated quantile (pandas default) over sorted distinct values."""
+    n = cumulative[-1]
+    h = (n - 1) * q
+    lo, hi = int(np.floor(h)), int(np.ceil(h))
+    v_lo = values[np.searchsorted(cumulative, lo, side="right")]
+    v_hi = values[np.searchsorted(cumulative, hi, side="right")]
+    return float(v_lo + (h - lo) * (v_hi - v_lo))
+
+
+def _numeric_summary(values: np.ndarray, counts: np.ndarray) -> dict:
+    """Numeric statistics from distinct values and their counts."""
+    order = np.argsort(values, kind="stable")
+    values, counts = values[order], counts[order]
+    cumulative = np.cumsum(counts)
+    n = int(cumulative[-1])
+
+    mean = float(np.dot(values, counts) / n)
+    std = float(np.sqrt(np.dot((values - mean) ** 2, counts) / (n - 1))) if n > 1 else float("nan")
+
+    return {
+        "min": float(values[0]),
+        "max": float(values[-1]),
+        "mean": mean,
+        "std": std,
+        "q1": _weighted_quantile(values, cumulative, 0.25),
+        "median": _weighted_quantile(values, cumulative, 0.5),
+        "q3": _weighted_quantile(values, cumulative, 0.75),
+        "negative_count": int(counts[values < 0].sum()),
+    }
+
+
+def _string_summary(values: pd.Index, counts: np.ndarray) -> dict:
+    """String length statistics from distinct values and their counts."""
+    lengths = values.astype(str).str.len().to_numpy()
+    n = int(counts.sum())
+    return {
+        "avg_length": round(float(np.dot(lengths, counts) / n), 2),
+        "min_length": int(lengths.min()),
+        "max_length": int(lengths.max()),
+    }
+
+
+def profile_from_counts(dtype, row_count: int, value_counts: pd.Series,
+                        sample_values: list, count: Optional[int] = None) -> dict:
+    """
+    Build a column profile from its value counts.
+
+    Args:
+        dtype: Column dtype
+        row_count: Total rows, including nulls
+        value_counts: Distinct non-null values -> counts
+        sample_values: First few non-null values, in row order
+        count: Non-null count, when value_counts is truncated (chunked mode)
+    """
+    value_counts = value_counts.sort_values(ascending=False, kind="stable")
+    exact = count is None
+    count = int(value_counts.sum()) if exact else int(count)
+    unique_count = int(len(value_counts))
+    null_count = row_count - count
+
+    profile = {
+        "dtype": str(dtype),
+        "row_count": row_count,
+        "count": count,
+        "null_count": null_count,
+        "null_percentage": round(null_count / row_count * 100, 2) if row_count > 0 else 0,
+        "unique_count": unique_count,
+        "unique_percentage": round(unique_count / row_count * 100, 2) if row_count > 0 else 0,
+        "unique_count_exact": exact,
+        "top_values": value_counts.head(PROFILE_TOP_VALUES).to_dict(),
+        "sample_values": sample_values,
+    }
+
+    if count == 0 or not exact:
+        return profile
+
+    counts = value_counts.to_numpy(dtype=np.int64)
+    if pd.api.types.is_numeric_dtype(dtype):
+        profile.update(_numeric_summary(value_counts.index.to_numpy(dtype=np.float64), counts))
+    elif pd.api.types.is_string_dtype(dtype) or dtype == object:
+        profile.update(_string_summary(value_counts.index, counts))
+
+    return profile
+
+
+def profile_column(series: pd.Series) -> dict:
+    """Profile one column in a single value_counts pass."""
+    value_counts = _value_counts(series)
+    head = series.head(1000).dropna()
+    if len(head) < 5:
+        head = series.dropna()
+    return profile_from_counts(series.dtype, len(series), value_counts, head.head(5).tolist())
+
+
+class ProfileCache:
+    """Thread-safe LRU of per-file column profiles, keyed by content hash."""
+
+    def __init__(self, max_files: int = PROFILE_CACHE_MAX_FILES):
+        self.max_files = max_files
+        self._entries: OrderedDict[tuple, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_columns(self, key: tuple) -> dict:
+        """Get the cached column profiles for a file (empty if none)."""
+        with self._lock:
+            columns = self._entries.get(key)
+            if columns is None:
+                return {}
+            self._entries.move_to_end(key)
+            return dict(columns)
+
+    def update_columns(self, key: tuple, profiles: dict):
+        """Add column profiles for a file, evicting the least recent files."""
+        with self._lock:
+            columns = self._entries.setdefault(key, {})
+            columns.update(profiles)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_files:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached profiles."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global shared instance
+profile_cache = ProfileCache()
+
+
+def get_profiles(df: pd.DataFrame, columns: Optional[list] = None) -> dict:
+    """
+    Get profiles for a dataframe's columns, computing only missing ones.
+
+    Profiles are cached when the frame carries a content hash in df.attrs
+    and is the full loaded file (same row count); otherwise they are computed.
+
+    Args:
+        df: DataFrame to profile
+        columns: Columns to profile (default: all)
+
+    Returns:
+        Dict mapping column -> profile
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    content_hash = df.attrs.get(CONTENT_HASH_ATTR)
+    key = (content_hash, len(df)) if content_hash else None
+
+    cached = profile_cache.get_columns(key) if key else {}
+    profiles = {}
+    computed = {}
+    for col in columns:
+        profile = cached.get(col)
+        if profile is None or profile["dtype"] != str(df[col].dtype):
+            profile = computed[col] = profile_column(df[col])
+        profiles[col] = profile
+
+    if key and computed:
+        profile_cache.update_columns(key, computed)
+    return profiles
+
+
+class _ColumnSketch:
+    """Mergeable sketches standing in for a column's value counts."""
+
+    def __init__(self):
+        self.distinct = HyperLogLog()
+        self.quantiles = KLLSketch()
+        self.heavy = MisraGries()
+        self.lengths = [np.inf, -np.inf, 0]  # min, max, total
+
+    @classmethod
+    def from_counts(cls, counts: pd.Series) -> "_ColumnSketch":
+        sketch = cls()
+        sketch.update(counts)
+        return sketch
+
+    def update(self, counts: pd.Series):
+        """Add distinct values and their counts."""
+        self.distinct.update(counts.index)
+        self.heavy.update(counts)
+        if pd.api.types.is_numeric_dtype(counts.index.dtype):
+            self.quantiles.update(counts.index.to_numpy(dtype=np.float64), counts.to_numpy())
+        # Lengths of every chunk, so a column that widens to text later
+        # still averages over all of its values
+        if len(counts):
+            lengths = counts.index.astype(str).str.len().to_numpy()
+            self.lengths[0] = min(self.lengths[0], int(lengths.min()))
+            self.lengths[1] = max(self.lengths[1], int(lengths.max()))
+            self.lengths[2] += int(np.dot(lengths, counts.to_numpy()))
+
+    def merge(self, other: "_ColumnSketch"):
+        self.distinct.merge(other.distinct)
+        self.quantiles.merge(other.quantiles)
+        self.heavy.merge(other.heavy)
+        self.lengths = [min(self.lengths[0], other.lengths[0]),
+                        max(self.lengths[1], other.lengths[1]),
+                        self.lengths[2] + other.lengths[2]]
+
+    def profile(self, dtype, count: int, row_count: int) -> dict:
+        """Approximate distinct count, quantiles and top values, with their errors."""
+        unique_count = min(int(round(self.distinct.estimate())), count)
+        profile = {
+            "unique_count": unique_count,
+            "unique_percentage": round(unique_count / row_count * 100, 2) if row_count > 0 else 0,
+            "unique_count_error": round(self.distinct.relative_error, 4),
+            "top_values": self.heavy.top(PROFILE_TOP_VALUES).to_dict(),
+            "top_values_max_error": self.heavy.error,
+        }
+        if pd.api.types.is_numeric_dtype(dtype) and self.quantiles.count:
+            q1, median, q3 = self.quantiles.quantiles([0.25, 0.5, 0.75])
+            profile.update({"q1": q1, "median": median, "q3": q3,
+                            "quantile_rank_error": round(self.quantiles.rank_error, 4)})
+        elif self.lengths[1] >= 0:
+            profile.update({
+                "avg_length": round(self.lengths[2] / count, 2) if count else 0.0,
+                "min_length": int(self.lengths[0]),
+                "max_length": int(self.lengths[1]),
+            })
+        return profile
+
+
+class ChunkedProfiler:
+    """
+    Accumulates column profiles over chunks of a file.
+
+    Value counts are merged across chunks, so profiles are exact while a
+    column has at most PROFILE_MAX_TRACKED_VALUES distinct values. Beyond
+    that the column switches to mergeable sketches (unique_count_exact=False):
+    a HyperLogLog distinct count, KLL quantiles and Misra-Gries top values,
+    each reported with its error bound, while min/max/mean/std stay exact
+    running moments. Memory per sketched column is fixed, so one pass
+    profiles files of any size. Profilers of disjoint parts of a file merge.
+    """
+
+    def __init__(self, max_tracked_values: int = PROFILE_MAX_TRACKED_VALUES):
+        self.max_tracked_values = max_tracked_values
+        self.row_count = 0
+        self.chunk_count = 0
+        self._dtypes: dict = {}
+        self._counts: dict[str, pd.Series] = {}
+        self._sketches: dict[str, _ColumnSketch] = {}
+        self._non_null: dict[str, int] = {}
+        self._moments: dict[str, list] = {}
+        self._samples: dict[str, list] = {}
+
+    def update(self, chunk: pd.DataFrame):
+        """Add one chunk to the running profiles."""
+        self.row_count += len(chunk)
+        self.chunk_count += 1
+
+        for col in chunk.columns:
+            series = chunk[col]
+            self._merge_dtype(col, series.dtype)
+
+            counts = _value_counts(series)
+            self._non_null[col] = self._non_null.get(col, 0) + int(counts.sum())
+            if pd.api.types.is_numeric_dtype(series.dtype) and len(counts):
+                self._update_moments(col, counts)
+            self._merge_counts(col, counts)
+
+            samples = self._samples.setdefault(col, [])
+            if len(samples) < 5:
+                samples.extend(series.dropna().head(5 - len(samples)).tolist())
+
+    def merge(self, other: "ChunkedProfiler"):
+        """Fold in the profiler of a later part of the same file."""
+        self.row_count += other.row_count
+        self.chunk_count += other.chunk_count
+        for col, dtype in other._dtypes.items():
+            self._merge_dtype(col, dtype)
+            self._non_null[col] = self._non_null.get(col, 0) + other._non_null[col]
+            if col in other._moments:
+                self._merge_moments(col, other._moments[col])
+
+            if col in other._sketches:
+                sketch = self._sketches.get(col)
+                if sketch is None:
+                    sketch = self._sketches[col] = _ColumnSketch.from_counts(
+                        self._counts.pop(col, pd.Series(dtype=np.int64)))
+                sketch.merge(other._sketches[col])
+            else:
+                self._merge_counts(col, other._counts[col])
+
+            samples = self._samples.setdefault(col, [])
+            samples.extend(other._samples[col][:5 - len(samples)])
+
+    def _merge_counts(self, col: str, counts: pd.Series):
+        """Merge value counts exactly, switching to sketches past the cap."""
+        if col in self._sketches:
+            self._sketches[col].update(counts)
+            return
+        if col in self._counts:
+            counts = self._counts[col].add(counts, fill_value=0).astype(np.int64)
+        if len(counts) > self.max_tracked_values:
+            self._sketches[col] = _ColumnSketch.from_counts(counts)
+            self._counts.pop(col, None)
+        else:
+            self._counts[col] = counts
+
+    def _merge_dtype(self, col: str, dtype):
+        """Widen a column's dtype when chunks infer different types."""
+        current = self._dtypes.get(col)
+        if current is None or current == dtype:
+            self._dtypes[col] = dtype
+        elif pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(dtype):
+            self._dtypes[col] = np.dtype("float64")
+        else:
+            self._dtypes[col] = np.dtype("object")
+
+    def _update_moments(self, col: str, counts: pd.Series):
+        """Track min, max, count, sum, sum of squares and negatives for a numeric column."""
+        values = counts.index.to_numpy(dtype=np.float64)
+        weights = counts.to_numpy(dtype=np.float64)
+        self._merge_moments(col, [values.min(), values.max(), weights.sum(), np.dot(values, weights),
+                                  np.dot(values ** 2, weights), weights[values < 0].sum()])
+
+    def _merge_moments(self, col: str, other: list):
+        moments = self._moments.setdefault(col, [np.inf, -np.inf, 0.0, 0.0, 0.0, 0.0])
+        moments[0] = min(moments[0], other[0])
+        moments[1] = max(moments[1], other[1])
+        for i in range(2, 6):
+            moments[i] += other[i]
+
+    def result(self) -> dict:
+        """Get the merged column profiles."""
+        profiles = {}
+        for col, dtype in self._dtypes.items():
+            sketch = self._sketches.get(col)
+            if sketch is None:
+                profiles[col] = profile_from_counts(dtype, self.row_count, self._counts[col], self._samples[col])
+                continue
+
+            count = self._non_null[col]
+            profile = profile_from_counts(dtype, self.row_count, sketch.heavy.counters,
+                                          self._samples[col], count=count)
+            profile.update(sketch.profile(dtype, count, self.row_count))
+            moments = self._moments.get(col)
+            if moments and pd.api.types.is_numeric_dtype(dtype):
+                lo, hi, n, total, total_sq, negatives = moments
+                mean = total / n
+                var = (total_sq - n * mean ** 2) / (n - 1) if n > 1 else float("nan")
+                profile.update({
+                    "min": float(lo), "max": float(hi), "mean": float(mean),
+                    "std": float(np.sqrt(max(var, 0.0))) if n > 1 else float("nan"),
+                    "negative_count": int(negatives),
+                })
+            profiles[col] = profile
+        return profiles
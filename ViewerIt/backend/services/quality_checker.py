@@ -4,13 +4,25 @@ Validates data integrity, consistency, and completeness.
 """
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Callable, Optional
 from collections import defaultdict
 import re
+import math
 from datetime import datetime
+from pathlib import Path
+from statistics import NormalDist
 
 # Import centralized config
-from config import QUALITY_FORMAT_PATTERNS
+from config import (
+    QUALITY_FORMAT_PATTERNS, QUALITY_SAMPLE_ROWS, QUALITY_SAMPLE_CONFIDENCE,
+    QUALITY_CORRELATION_MAX_COLUMNS,
+)
+from .profiler import get_profiles
+from .chunked_processor import ChunkedProcessor
+from .string_profiler import profile_strings
+from .consistency import DateParser, pairwise_correlation, correlated_pairs
+from .worker_pool import PoolJob, WorkerPool, worker_pool
+from .metrics import stage
 
 
 class QualityChecker:
@@ -38,6 +50,26 @@ class QualityChecker:
         self.df = df
         self.name = name
         self._results: Optional[dict] = None
+        self._profiles: Optional[dict] = None
+        self._date_parser = DateParser()
+        self._parsed_dates: Optional[dict] = None
+    
+    @property
+    def profiles(self) -> dict:
+        """Shared single-pass column profiles (computed on first use)."""
+        if self._profiles is None:
+            self._profiles = get_profiles(self.df)
+        return self._profiles
+    
+    @property
+    def row_count(self) -> int:
+        """Number of rows checked."""
+        return len(self.df)
+    
+    @property
+    def columns(self) -> list:
+        """Columns checked, in file order."""
+        return list(self.df.columns)
     
     def check_all(self) -> dict:
         """
@@ -46,11 +78,12 @@ class QualityChecker:
         Returns:
             Complete quality analysis report
         """
-        completeness = self._check_completeness()
-        uniqueness = self._check_uniqueness()
-        validity = self._check_validity()
-        consistency = self._check_consistency()
-        outliers = self._detect_outliers()
+        with stage("quality_checks", rows=self.row_count):
+            completeness = self._check_completeness()
+            uniqueness = self._check_uniqueness()
+            validity = self._check_validity()
+            consistency = self._check_consistency()
+            outliers = self._detect_outliers()
         
         # Calculate overall quality score
         quality_score = self._calculate_quality_score(
@@ -59,8 +92,8 @@ class QualityChecker:
         
         self._results = {
             "dataset_name": self.name,
-            "row_count": len(self.df),
-            "column_count": len(self.df.columns),
+            "row_count": self.row_count,
+            "column_count": len(self.columns),
             "quality_score": quality_score,
             "completeness": completeness,
             "uniqueness": uniqueness,
@@ -79,16 +112,17 @@ class QualityChecker:
     
     def _check_completeness(self) -> dict:
         """Check for missing/null values."""
-        total_cells = len(self.df) * len(self.df.columns)
-        total_nulls = int(self.df.isnull().sum().sum())
+        row_count = self.row_count
+        total_cells = row_count * len(self.columns)
+        total_nulls = sum(profile["null_count"] for profile in self.profiles.values())
         
         column_completeness = {}
-        for col in self.df.columns:
-            null_count = int(self.df[col].isnull().sum())
+        for col in self.columns:
+            null_count = self.profiles[col]["null_count"]
             column_completeness[col] = {
                 "null_count": null_count,
-                "null_percentage": round(null_count / len(self.df) * 100, 2) if len(self.df) > 0 else 0,
-                "complete_count": len(self.df) - null_count,
+                "null_percentage": round(null_count / row_count * 100, 2) if row_count > 0 else 0,
+                "complete_count": row_count - null_count,
                 "is_complete": null_count == 0,
             }
         
@@ -113,21 +147,22 @@ class QualityChecker:
     
     def _check_uniqueness(self) -> dict:
         """Check for duplicate values and rows."""
+        row_count = self.row_count
+        
         # Full row duplicates
-        duplicate_rows = int(self.df.duplicated().sum())
-        duplicate_indices = self.df[self.df.duplicated(keep=False)].index.tolist()[:20]
+        duplicate_rows, duplicate_indices = self._duplicate_rows()
         
         # Column-level uniqueness
         column_uniqueness = {}
-        for col in self.df.columns:
-            unique_count = int(self.df[col].nunique())
+        for col in self.columns:
+            unique_count = self.profiles[col]["unique_count"]
             column_uniqueness[col] = {
                 "unique_count": unique_count,
-                "unique_percentage": round(unique_count / len(self.df) * 100, 2) if len(self.df) > 0 else 0,
-                "duplicate_count": len(self.df) - unique_count,
-                "is_unique": unique_count == len(self.df),
-                "cardinality": "high" if unique_count > len(self.df) * 0.9 else 
-                              "medium" if unique_count > len(self.df) * 0.5 else "low",
+                "unique_percentage": round(unique_count / row_count * 100, 2) if row_count > 0 else 0,
+                "duplicate_count": row_count - unique_count,
+                "is_unique": unique_count == row_count,
+                "cardinality": "high" if unique_count > row_count * 0.9 else 
+                              "medium" if unique_count > row_count * 0.5 else "low",
             }
         
         # Find potential ID columns (high uniqueness)
@@ -140,64 +175,75 @@ class QualityChecker:
         
         return {
             "duplicate_row_count": duplicate_rows,
-            "duplicate_row_percentage": round(duplicate_rows / len(self.df) * 100, 2) if len(self.df) > 0 else 0,
+            "duplicate_row_percentage": round(duplicate_rows / row_count * 100, 2) if row_count > 0 else 0,
             "duplicate_row_indices_sample": duplicate_indices,
             "column_uniqueness": column_uniqueness,
             "potential_id_columns": potential_id_columns,
             "categorical_columns": categorical_columns,
         }
     
+    def _duplicate_rows(self) -> tuple[int, list]:
+        """Duplicate row count and the first 20 row indices involved in duplicates."""
+        duplicate_rows = int(self.df.duplicated().sum())
+        duplicate_indices = self.df[self.df.duplicated(keep=False)].index.tolist()[:20]
+        return duplicate_rows, duplicate_indices
+    
+    def _column_dtype(self, col):
+        """Dtype of a column."""
+        return self.df[col].dtype
+    
+    def _string_profile(self, col) -> dict:
+        """Single-pass string profile of a text column (see profile_strings)."""
+        return profile_strings(
+            self.df[col], self.FORMAT_PATTERNS,
+            distinct_count=self.profiles[col]["unique_count"],
+        )
+    
     def _check_validity(self) -> dict:
         """Check data format validity and consistency."""
         validity_results = {}
         
-        for col in self.df.columns:
+        for col in self.columns:
+            dtype = self._column_dtype(col)
             col_validity = {
-                "dtype": str(self.df[col].dtype),
+                "dtype": str(dtype),
                 "format_checks": {},
                 "issues": [],
             }
             
             # Skip if column is all null
-            if self.df[col].isnull().all():
+            if self.profiles[col]["count"] == 0:
                 validity_results[col] = col_validity
                 continue
             
-            sample = self.df[col].dropna()
-            
-            # For string columns, check format patterns
-            if self.df[col].dtype == 'object':
-                sample_str = sample.astype(str)
+            # For string columns, classify each value once (case, whitespace, formats)
+            if dtype == 'object':
+                strings = self._string_profile(col)
+                total = strings["count"]
                 
-                # Auto-detect likely format based on column name
-                detected_format = self._detect_likely_format(col)
-                
-                # Check against common patterns
-                for pattern_name, pattern in self.FORMAT_PATTERNS.items():
-                    matches = sample_str.str.match(pattern, na=False)
-                    match_count = int(matches.sum())
-                    
-                    if match_count > len(sample) * 0.5:  # More than 50% match
-                        col_validity["format_checks"][pattern_name] = {
-                            "match_count": match_count,
-                            "match_percentage": round(match_count / len(sample) * 100, 2),
-                            "non_matching_samples": sample_str[~matches].head(5).tolist(),
-                        }
+                # Report common patterns matched by more than 50% of values
+                for pattern_name, pattern_info in strings["patterns"].items():
+                    match_count = pattern_info["match_count"]
+                    col_validity["format_checks"][pattern_name] = {
+                        "match_count": match_count,
+                        "match_percentage": round(match_count / total * 100, 2),
+                        "non_matching_samples": pattern_info["non_matching_samples"],
+                    }
                 
                 # Check for mixed case consistency
-                case_analysis = self._analyze_case_consistency(sample_str)
+                case_analysis = self._analyze_case_consistency(strings)
                 col_validity["case_consistency"] = case_analysis
                 
                 # Check for whitespace issues
-                whitespace_issues = self._check_whitespace_issues(sample_str)
+                whitespace_issues = self._check_whitespace_issues(strings)
                 if whitespace_issues:
                     col_validity["issues"].append(whitespace_issues)
             
             # For numeric columns, check for string contamination
-            elif pd.api.types.is_numeric_dtype(self.df[col]):
+            elif pd.api.types.is_numeric_dtype(dtype):
                 # Check for negative values where unexpected
-                if (sample < 0).any():
-                    neg_count = int((sample < 0).sum())
+                neg_count = self.profiles[col].get("negative_count", 0)
+                if neg_count > 0:
                     col_validity["issues"].append({
                         "type": "negative_values",
                         "count": neg_count,
@@ -227,16 +273,15 @@ class QualityChecker:
         
         return None
     
-    def _analyze_case_consistency(self, series: pd.Series) -> dict:
-        """Analyze case consistency in string column."""
-        if len(series) == 0:
+    def _analyze_case_consistency(self, strings: dict) -> dict:
+        """Analyze case consistency from a column's string profile."""
+        total = strings["count"]
+        if total == 0:
             return {"consistent": True, "pattern": "empty"}
         
-        upper_count = sum(1 for s in series if str(s).isupper())
-        lower_count = sum(1 for s in series if str(s).islower())
-        title_count = sum(1 for s in series if str(s).istitle())
-        
-        total = len(series)
+        upper_count = strings["case"]["upper"]
+        lower_count = strings["case"]["lower"]
+        title_count = strings["case"]["title"]
         
         if upper_count > total * 0.9:
             return {"consistent": True, "pattern": "UPPER"}
@@ -255,54 +300,86 @@ class QualityChecker:
                 },
             }
     
-    def _check_whitespace_issues(self, series: pd.Series) -> Optional[dict]:
-        """Check for whitespace issues in string column."""
-        leading_ws = series.str.match(r'^\s+', na=False).sum()
-        trailing_ws = series.str.match(r'\s+$', na=False).sum()
-        multiple_ws = series.str.contains(r'\s{2,}', na=False).sum()
+    def _check_whitespace_issues(self, strings: dict) -> Optional[dict]:
+        """Check for whitespace issues from a column's string profile."""
+        leading_ws = strings["whitespace"]["leading"]
+        trailing_ws = strings["whitespace"]["trailing"]
+        multiple_ws = strings["whitespace"]["multiple"]
         
         if leading_ws > 0 or trailing_ws > 0 or multiple_ws > 0:
             return {
                 "type": "whitespace_issues",
-                "leading_whitespace": int(leading_ws),
-                "trailing_whitespace": int(trailing_ws),
-                "multiple_spaces": int(multiple_ws),
+                "leading_whitespace": leading_ws,
+                "trailing_whitespace": trailing_ws,
+                "multiple_spaces": multiple_ws,
                 "message": "Whitespace inconsistencies detected",
             }
         
         return None
     
+    def _numeric_columns(self) -> list:
+        """Numeric (non-boolean) columns, in file order."""
+        return list(self.df.select_dtypes(include=['number']).columns)
+    
+    def _correlation_matrix(self, columns: list) -> np.ndarray:
+        """Pearson correlation of every pair of the given numeric columns (pairwise-complete)."""
+        return pairwise_correlation(self.df[columns])
+    
+    def _date_columns(self) -> list:
+        """Columns named like dates whose values all parse as dates (each parsed once)."""
+        if self._parsed_dates is None:
+            self._parsed_dates = {}
+            for col in self.df.columns:
+                if 'date' in col.lower() or 'time' in col.lower():
+                    try:
+                        self._parsed_dates[col] = self._date_parser.parse(
+                            col, self.df[col], self.profiles[col]["unique_count"])
+                    except (ValueError, TypeError, pd.errors.ParserError):
+                        # Column is not a valid date format
+                        pass
+        return list(self._parsed_dates)
+    
+    def _date_order_violations(self, col1: str, col2: str) -> int:
+        """Rows where col1 is later than col2 (0 if the dates cannot be compared)."""
+        try:
+            return int((self._parsed_dates[col1] > self._parsed_dates[col2]).sum())
+        except (ValueError, TypeError, pd.errors.ParserError):
+            # Date comparison failed, skip this pair
+            return 0
+    
+    def _correlation_candidates(self) -> list:
+        """
+        Numeric columns worth correlating, in file order, capped.
+        
+        Columns with fewer than two values or a single distinct value have no
+        defined correlation, so profiles rule them out without computing it.
+        """
+        candidates = [
+            col for col in self._numeric_columns()
+            if self.profiles[col]["count"] >= 2 and self.profiles[col]["unique_count"] >= 2
+        ]
+        return candidates[:QUALITY_CORRELATION_MAX_COLUMNS]
+    
     def _check_consistency(self) -> dict:
         """Check for data consistency and relationships."""
         consistency_checks = []
         
         # Check for columns that might be related
-        numeric_cols = self.df.select_dtypes(include=['number']).columns
+        numeric_cols = self._correlation_candidates()
         
         # Check if any column sums to another (e.g., subtotal + tax = total)
         if len(numeric_cols) >= 2:
-            for i, col1 in enumerate(numeric_cols):
-                for col2 in numeric_cols[i+1:]:
-                    # Check correlation
-                    correlation = self.df[col1].corr(self.df[col2])
-                    if abs(correlation) > 0.95:
-                        consistency_checks.append({
-                            "type": "high_correlation",
-                            "columns": [col1, col2],
-                            "correlation": round(correlation, 3),
-                            "message": f"High correlation ({correlation:.2f}) between {col1} and {col2}",
-                        })
+            matrix = self._correlation_matrix(numeric_cols)
+            for col1, col2, correlation in correlated_pairs(numeric_cols, matrix, 0.95):
+                consistency_checks.append({
+                    "type": "high_correlation",
+                    "columns": [col1, col2],
+                    "correlation": round(correlation, 3),
+                    "message": f"High correlation ({correlation:.2f}) between {col1} and {col2}",
+                })
         
         # Check for date columns that should be ordered
-        date_cols = []
-        for col in self.df.columns:
-            if 'date' in col.lower() or 'time' in col.lower():
-                try:
-                    pd.to_datetime(self.df[col], errors='raise')
-                    date_cols.append(col)
-                except (ValueError, TypeError, pd.errors.ParserError):
-                    # Column is not a valid date format
-                    pass
+        date_cols = self._date_columns()
         
         if len(date_cols) >= 2:
             # Check if start < end pattern exists
@@ -311,23 +388,18 @@ class QualityChecker:
                     if ('start' in col1.lower() and 'end' in col2.lower()) or \
                        ('begin' in col1.lower() and 'end' in col2.lower()) or \
                        ('from' in col1.lower() and 'to' in col2.lower()):
-                        try:
-                            dates1 = pd.to_datetime(self.df[col1])
-                            dates2 = pd.to_datetime(self.df[col2])
-                            invalid = (dates1 > dates2).sum()
-                            if invalid > 0:
-                                consistency_checks.append({
-                                    "type": "date_order_violation",
-                                    "columns": [col1, col2],
-                                    "violation_count": int(invalid),
-                                    "message": f"{invalid} rows where {col1} > {col2}",
-                                })
-                        except (ValueError, TypeError, pd.errors.ParserError):
-                            # Date comparison failed, skip this pair
-                            pass
+                        invalid = self._date_order_violations(col1, col2)
+                        if invalid > 0:
+                            consistency_checks.append({
+                                "type": "date_order_violation",
+                                "columns": [col1, col2],
+                                "violation_count": invalid,
+                                "message": f"{invalid} rows where {col1} > {col2}",
+                            })
         
         return {
             "checks_performed": len(consistency_checks),
+            "correlation_columns_checked": len(numeric_cols),
             "issues": consistency_checks,
         }
     
@@ -335,39 +407,37 @@ class QualityChecker:
         """Detect statistical outliers in numeric columns."""
         outlier_results = {}
         
-        numeric_cols = self.df.select_dtypes(include=['number']).columns
+        numeric_cols = self._numeric_columns()
         
         for col in numeric_cols:
-            clean_data = self.df[col].dropna()
+            profile = self.profiles[col]
             
-            if len(clean_data) < 4:  # Need minimum data points
+            if profile["count"] < 4:  # Need minimum data points
                 continue
             
             # IQR method
-            Q1 = clean_data.quantile(0.25)
-            Q3 = clean_data.quantile(0.75)
+            Q1 = profile["q1"]
+            Q3 = profile["q3"]
             IQR = Q3 - Q1
             
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
             
-            outliers_mask = (clean_data < lower_bound) | (clean_data > upper_bound)
-            outlier_count = int(outliers_mask.sum())
+            outlier_count, outlier_values = self._outlier_values(col, lower_bound, upper_bound)
             
             if outlier_count > 0:
-                outlier_values = clean_data[outliers_mask]
                 outlier_results[col] = {
                     "method": "IQR",
                     "outlier_count": outlier_count,
-                    "outlier_percentage": round(outlier_count / len(clean_data) * 100, 2),
+                    "outlier_percentage": round(outlier_count / profile["count"] * 100, 2),
                     "lower_bound": float(lower_bound),
                     "upper_bound": float(upper_bound),
-                    "outlier_values_sample": outlier_values.head(10).tolist(),
+                    "outlier_values_sample": outlier_values,
                     "statistics": {
-                        "mean": float(clean_data.mean()),
-                        "std": float(clean_data.std()),
-                        "min": float(clean_data.min()),
-                        "max": float(clean_data.max()),
+                        "mean": profile["mean"],
+                        "std": profile["std"],
+                        "min": profile["min"],
+                        "max": profile["max"],
                         "Q1": float(Q1),
                         "Q3": float(Q3),
                     },
@@ -379,6 +449,12 @@ class QualityChecker:
             "column_outliers": outlier_results,
         }
     
+    def _outlier_values(self, col, lower: float, upper: float) -> tuple[int, list]:
+        """Count of non-null values outside [lower, upper] and the first ten, in row order."""
+        clean_data = self.df[col].dropna()
+        outliers_mask = (clean_data < lower) | (clean_data > upper)
+        return int(outliers_mask.sum()), clean_data[outliers_mask].head(10).tolist()
+    
     def _calculate_quality_score(self, completeness: dict, uniqueness: dict,
                                  validity: dict, consistency: dict, 
                                  outliers: dict) -> dict:
@@ -433,8 +509,8 @@ class QualityChecker:
                          outliers: dict) -> dict:
         """Generate human-readable summary."""
         return {
-            "total_rows": len(self.df),
-            "total_columns": len(self.df.columns),
+            "total_rows": self.row_count,
+            "total_columns": len(self.columns),
             "completeness": f"{completeness.get('overall_completeness', 0)}% complete",
             "duplicates": f"{uniqueness.get('duplicate_row_count', 0)} duplicate rows",
             "empty_columns": len(completeness.get("empty_columns", [])),
@@ -499,27 +575,243 @@ class QualityChecker:
         return recommendations
 
 
+def wilson_interval(successes: int, n: int, confidence: float = QUALITY_SAMPLE_CONFIDENCE,
+                    population: Optional[int] = None) -> tuple[float, float]:
+    """
+    Wilson score interval for a proportion, as fractions in [0, 1].
+    
+    Args:
+        successes: Sampled rows with the property
+        n: Sample size
+        confidence: Confidence level
+        population: Population size; applies the finite population
+                    correction (a full census has zero width)
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    if population:
+        # Finite population correction as a larger effective sample size
+        fpc = max(population - n, 0) / max(population - 1, 1)
+        if fpc == 0:
+            return p, p
+        n = n / fpc
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+class SampledQualityChecker:
+    """
+    Quality checks on a uniform row sample of a (large) file.
+    
+    Runs the same checks as QualityChecker on the sample and reports
+    population estimates with confidence intervals: row-level completeness,
+    per-column null, format-match and outlier percentages, duplicate rows and
+    the resulting quality score range. Counts in the embedded report
+    (duplicates, unique values, outliers) are sample counts.
+    """
+    
+    def __init__(self, sample: pd.DataFrame, population_rows: int,
+                 name: str = "Dataset",
+                 confidence: float = QUALITY_SAMPLE_CONFIDENCE,
+                 method: str = "reservoir"):
+        """
+        Args:
+            sample: Uniform random sample of the file's rows
+            population_rows: Total rows in the file
+            name: Name identifier for the dataset
+            confidence: Confidence level for the intervals
+            method: How the sample was drawn (reported back)
+        """
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+        self.df = sample
+        self.population_rows = population_rows
+        self.name = name
+        self.confidence = confidence
+        self.method = method
+        self._checker = QualityChecker(sample, name)
+    
+    @classmethod
+    def from_csv(cls, file_path: Path, name: str,
+                 sample_size: int = QUALITY_SAMPLE_ROWS,
+                 processor: Optional[ChunkedProcessor] = None,
+                 seed: Optional[int] = None, **kwargs) -> "SampledQualityChecker":
+        """Sample a CSV file in chunks without loading it."""
+        processor = processor or ChunkedProcessor()
+        sample, total_rows = processor.reservoir_sample(file_path, sample_size, seed=seed)
+        return cls(sample, total_rows, name, **kwargs)
+    
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, name: str,
+                       sample_size: int = QUALITY_SAMPLE_ROWS,
+                       seed: Optional[int] = None, **kwargs) -> "SampledQualityChecker":
+        """Sample an already loaded dataframe."""
+        sample = df.sample(n=sample_size, random_state=seed).sort_index() if len(df) > sample_size else df
+        return cls(sample, len(df), name, method="random", **kwargs)
+    
+    def check_all(self) -> dict:
+        """
+        Run all quality checks on the sample.
+        
+        Returns:
+            QualityChecker report plus mode, sampling details and
+            confidence_intervals (percentages with lower/upper bounds)
+        """
+        result = self._checker.check_all()
+        n = len(self.df)
+        
+        result["row_count"] = self.population_rows
+        result["summary"]["total_rows"] = self.population_rows
+        result["mode"] = "sampled"
+        result["sampling"] = {
+            "method": self.method,
+            "sample_size": n,
+            "population_rows": self.population_rows,
+            "sampling_fraction": round(n / self.population_rows, 6) if self.population_rows else 1.0,
+            "confidence": self.confidence,
+        }
+        result["confidence_intervals"] = self._confidence_intervals(result)
+        return result
+    
+    def _interval(self, successes: int, n: int) -> dict:
+        """Proportion estimate and Wilson bounds, as percentages."""
+        lower, upper = wilson_interval(successes, n, self.confidence, self.population_rows)
+        return {
+            "estimate": round(successes / n * 100, 2) if n else 0.0,
+            "lower": round(lower * 100, 2),
+            "upper": round(upper * 100, 2),
+        }
+    
+    def _completeness_interval(self) -> dict:
+        """Mean row completeness with a normal interval (rows are the sampling unit)."""
+        n = len(self.df)
+        if n == 0 or len(self.df.columns) == 0:
+            return {"estimate": 100.0, "lower": 100.0, "upper": 100.0}
+        
+        row_completeness = self.df.notna().mean(axis=1).to_numpy()
+        mean = float(row_completeness.mean())
+        half_width = 0.0
+        if n > 1:
+            z = NormalDist().inv_cdf((1 + self.confidence) / 2)
+            fpc = math.sqrt(max(self.population_rows - n, 0) / max(self.population_rows - 1, 1))
+            half_width = z * float(row_completeness.std(ddof=1)) / math.sqrt(n) * fpc
+        return {
+            "estimate": round(mean * 100, 2),
+            "lower": round(max(0.0, mean - half_width) * 100, 2),
+            "upper": round(min(1.0, mean + half_width) * 100, 2),
+        }
+    
+    def _confidence_intervals(self, result: dict) -> dict:
+        """Population estimates for the sampled metrics."""
+        n = len(self.df)
+        profiles = self._checker.profiles
+        
+        completeness = self._completeness_interval()
+        duplicates = self._interval(result["uniqueness"]["duplicate_row_count"], n)
+        
+        format_match = {}
+        for col, info in result["validity"].items():
+            count = profiles[col]["count"]
+            checks = {
+                pattern: self._interval(check["match_count"], count)
+                for pattern, check in info["format_checks"].items()
+            }
+            if checks:
+                format_match[col] = checks
+        
+        outliers = {
+            col: self._interval(info["outlier_count"], profiles[col]["count"])
+            for col, info in result["outliers"]["column_outliers"].items()
+        }
+        
+        # Score range: completeness and duplicates at their worst and best bounds
+        score_bounds = []
+        for completeness_pct, duplicate_pct in (
+            (completeness["lower"], duplicates["upper"]),
+            (completeness["upper"], duplicates["lower"]),
+        ):
+            score = self._checker._calculate_quality_score(
+                {**result["completeness"], "overall_completeness": completeness_pct},
+                {**result["uniqueness"], "duplicate_row_percentage": duplicate_pct},
+                result["validity"], result["consistency"], result["outliers"],
+            )
+            score_bounds.append(score["total"])
+        
+        return {
+            "overall_completeness": completeness,
+            "column_null_percentage": {
+                col: self._interval(profile["null_count"], n)
+                for col, profile in profiles.items()
+            },
+            "duplicate_row_percentage": {
+                **duplicates,
+                # A duplicate pair is only seen if both rows are sampled
+                "note": "Duplicates within the sample; a lower bound for the full file",
+            },
+            "column_format_match_percentage": format_match,
+            "column_outlier_percentage": outliers,
+            "quality_score": {
+                "estimate": result["quality_score"]["total"],
+                "lower": score_bounds[0],
+                "upper": score_bounds[1],
+            },
+        }
+
+
 class MultiDatasetQualityChecker:
     """Compare quality metrics across multiple datasets."""
     
-    def __init__(self, dataframes: dict[str, pd.DataFrame]):
+    def __init__(self, dataframes: Optional[dict[str, pd.DataFrame]] = None,
+                 checkers: Optional[dict] = None,
+                 jobs: Optional[dict[str, PoolJob]] = None,
+                 pool: Optional[WorkerPool] = None):
         """
         Initialize with multiple dataframes.
         
         Args:
             dataframes: Dict mapping name -> DataFrame
+            checkers: Dict mapping name -> prepared checker (e.g.
+                      SampledQualityChecker), instead of dataframes
+            jobs: Dict mapping name -> worker-pool job returning that
+                  dataset's report, instead of dataframes or checkers;
+                  datasets are then loaded and checked concurrently
+            pool: Worker pool for jobs (default: the shared pool)
         """
-        self.dataframes = dataframes
-        self.checkers = {
-            name: QualityChecker(df, name)
-            for name, df in dataframes.items()
-        }
+        if checkers is None:
+            checkers = {
+                name: QualityChecker(df, name)
+                for name, df in (dataframes or {}).items()
+            }
+        self.checkers = checkers
+        self.dataframes = {name: checker.df for name, checker in checkers.items()}
+        self.jobs = jobs or {}
+        self.pool = pool or worker_pool
     
-    def check_all(self) -> dict:
-        """Run quality checks on all datasets and compare."""
-        individual_results = {}
-        for name, checker in self.checkers.items():
-            individual_results[name] = checker.check_all()
+    def check_all(self, on_result: Optional[Callable[[str, dict], None]] = None) -> dict:
+        """
+        Run quality checks on all datasets and compare.
+        
+        Args:
+            on_result: Optional callback(name, result) as each dataset's
+                       report completes (completion order for jobs)
+        """
+        if self.jobs:
+            completed = {}
+            for name, result in self.pool.run(self.jobs):
+                completed[name] = result
+                if on_result:
+                    on_result(name, result)
+            individual_results = {name: completed[name] for name in self.jobs}
+        else:
+            individual_results = {}
+            for name, checker in self.checkers.items():
+                individual_results[name] = checker.check_all()
+                if on_result:
+                    on_result(name, individual_results[name])
         
         # Compare quality scores
         comparison = self._compare_quality(individual_results)
@@ -0,0 +1,186 @@
+"""
+Quality Jobs - Build and run the quality check for one uploaded file.
+Used in-process for single-file checks and as the worker-pool job for
+multi-dataset checks, where each file is loaded and checked in its own
+worker process. Also runs duplicate detection across a session's files.
+"""
+from typing import Callable, Optional
+
+import pandas as pd
+
+from config import (
+    QUALITY_SAMPLE_ROWS,
+    QUALITY_STREAMING_MEMORY_MB,
+    NEAR_DUPLICATE_METHOD,
+    NEAR_DUPLICATE_THRESHOLD,
+    NEAR_DUPLICATE_MAX_HAMMING,
+    WORKER_BASE_MEMORY_MB,
+    WORKER_FRAME_EXPANSION,
+)
+from .file_handler import FileHandler, UPLOADS_DIR
+from .chunked_processor import ChunkedProcessor
+from .quality_checker import QualityChecker, SampledQualityChecker
+from .streaming_quality import StreamingQualityChecker
+from .worker_pool import PoolJob
+from .row_fingerprints import DuplicateFinder
+
+# Same per-row heuristic as ChunkedProcessor.is_large_file
+_ESTIMATED_ROW_BYTES = 100
+
+
+def build_quality_checker(session_id: str, filename: str, mode: str = "exact",
+                          sample_size: int = QUALITY_SAMPLE_ROWS,
+                          processor: Optional[ChunkedProcessor] = None,
+                          on_chunk: Optional[Callable[[int], None]] = None):
+    """
+    Create the checker for one file: exact (in memory or streamed) or sampled.
+
+    Args:
+        session_id: Session ID
+        filename: Uploaded file to check
+        mode: "exact" or "sampled"
+        sample_size: Rows sampled in sampled mode
+        processor: Chunk reader for CSV files (default: ChunkedProcessor())
+        on_chunk: Optional callback(rows_read) while a large file streams
+    """
+    processor = processor or ChunkedProcessor()
+    file_path = UPLOADS_DIR / session_id / filename
+    is_csv = file_path.suffix.lower() == ".csv"
+    if mode == "sampled":
+        if is_csv:
+            # Reservoir sample in chunks; the file is never fully loaded
+            return SampledQualityChecker.from_csv(file_path, filename, sample_size, processor)
+        df = FileHandler.load_dataframe(session_id, filename)
+        return SampledQualityChecker.from_dataframe(df, filename, sample_size)
+
+    if is_csv and processor.is_large_file(file_path):
+        # Exact checks on merged chunk state; memory stays bounded
+        return StreamingQualityChecker(
+            file_path, filename, processor,
+            read_options={"encoding": FileHandler.detect_encoding(file_path)},
+            on_chunk=on_chunk,
+        )
+
+    df = FileHandler.load_dataframe(session_id, filename)
+    return QualityChecker(df, filename)
+
+
+def check_file_quality(session_id: str, filename: str, mode: str = "exact",
+                       sample_size: int = QUALITY_SAMPLE_ROWS) -> dict:
+    """Load (or stream, or sample) one file and return its quality report."""
+    return build_quality_checker(session_id, filename, mode, sample_size).check_all()
+
+
+def estimate_quality_memory(session_id: str, filename: str, mode: str = "exact",
+                            sample_size: int = QUALITY_SAMPLE_ROWS,
+                            processor: Optional[ChunkedProcessor] = None) -> int:
+    """
+    Rough peak memory, in bytes, of check_file_quality in a worker.
+
+    In-memory checks hold the frame plus working copies (a multiple of the
+    file size); streamed checks hold one chunk plus their spill budget;
+    sampled CSV checks hold the sample.
+    """
+    processor = processor or ChunkedProcessor()
+    file_path = UPLOADS_DIR / session_id / filename
+    if not file_path.exists():
+        raise FileNotFoundError(f"File not found: {filename}")
+    size = file_path.stat().st_size
+    is_csv = file_path.suffix.lower() == ".csv"
+
+    if is_csv and mode == "sampled":
+        working = min(size, sample_size * _ESTIMATED_ROW_BYTES) * WORKER_FRAME_EXPANSION
+    elif is_csv and mode == "exact" and processor.is_large_file(file_path):
+        working = QUALITY_STREAMING_MEMORY_MB * 1024 * 1024
+    else:
+        working = size * WORKER_FRAME_EXPANSION
+    return WORKER_BASE_MEMORY_MB * 1024 * 1024 + int(working)
+
+
+def quality_job(session_id: str, filename: str, mode: str = "exact",
+                sample_size: int = QUALITY_SAMPLE_ROWS) -> PoolJob:
+    """Worker-pool job checking one file."""
+    return PoolJob(
+        check_file_quality,
+        (session_id, filename, mode, sample_size),
+        memory_bytes=estimate_quality_memory(session_id, filename, mode, sample_size),
+    )
+
+
+def find_file_duplicates(session_id: str, files: list[str],
+                         columns: Optional[list] = None,
+                         normalize: bool = False,
+                         near_method: Optional[str] = NEAR_DUPLICATE_METHOD,
+                         threshold: float = NEAR_DUPLICATE_THRESHOLD,
+                         max_hamming: int = NEAR_DUPLICATE_MAX_HAMMING,
+                         processor: Optional[ChunkedProcessor] = None,
+                         on_chunk: Optional[Callable[[str, int], None]] = None) -> dict:
+    """
+    Exact and near-duplicate rows within and across uploaded files.
+
+    CSV files are read in chunks as text, so files larger than memory
+    work; other formats are loaded and added in chunk-sized slices.
+
+    Args:
+        session_id: Session ID
+        files: Uploaded files to check together
+        columns: Columns compared (default: the columns common to all
+                 files, in the first file's order)
+        normalize: Compare text ignoring case and whitespace differences
+        near_method: "minhash", "simhash" or None (exact duplicates only)
+        threshold: MinHash similarity threshold
+        max_hamming: SimHash maximum differing bits
+        processor: Chunk reader for CSV files (default: ChunkedProcessor())
+        on_chunk: Optional callback(filename, rows_read) after each chunk
+
+    Raises:
+        FileNotFoundError: A file is not in the session
+        ValueError: No common columns, or a file lacks a requested column
+    """
+    processor = processor or ChunkedProcessor()
+    paths = {filename: UPLOADS_DIR / session_id / filename for filename in files}
+    for filename, path in paths.items():
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {filename}")
+
+    def is_csv(filename: str) -> bool:
+        return paths[filename].suffix.lower() == ".csv"
+
+    def file_columns(filename: str) -> list:
+        if is_csv(filename):
+            path = paths[filename]
+            return list(pd.read_csv(path, nrows=0, encoding=FileHandler.detect_encoding(path)).columns)
+        return list(FileHandler.load_dataframe(session_id, filename).columns)
+
+    if columns is None:
+        columns = file_columns(files[0])
+        for filename in files[1:]:
+            present = set(file_columns(filename))
+            columns = [col for col in columns if col in present]
+        if not columns:
+            raise ValueError("The files have no columns in common")
+
+    def chunks(filename: str):
+        if is_csv(filename):
+            # As text: a column hashes the same in every chunk, whatever types a chunk would infer
+            yield from processor.read_csv_chunked(
+                paths[filename], encoding=FileHandler.detect_encoding(paths[filename]),
+                usecols=lambda col: col in columns, dtype=str,
+            )
+            return
+        df = FileHandler.load_dataframe(session_id, filename)
+        for start in range(0, len(df), processor.chunk_size):
+            yield df.iloc[start:start + processor.chunk_size]
+
+    with DuplicateFinder(columns=columns, normalize=normalize, near_method=near_method,
+                         threshold=threshold, max_hamming=max_hamming) as finder:
+        for filename in files:
+            rows = 0
+            for chunk in chunks(filename):
+                finder.add(filename, chunk)
+                rows += len(chunk)
+                if on_chunk:
+                    on_chunk(filename, rows)
+            if not rows:
+                finder.add(filename, pd.DataFrame(columns=columns))
+        return finder.result()
@@ -0,0 +1,157 @@
+"""
+Result Cache - In-memory LRU cache for completed comparisons.
+Lets drill-down endpoints (column diffs, row diffs, exports) reuse a
+comparison instead of reloading both files and recomputing it.
+100% local - no external cache services required.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+import logging
+
+import pandas as pd
+
+from config import COMPARISON_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_nbytes(obj: Any) -> int:
+    """
+    Estimate the memory held by a cached value.
+    Sums the DataFrames reachable from the object's attributes, including
+    the datacompy Compare held by a DataComparator.
+    """
+    seen: set[int] = set()
+
+    def _walk(value: Any, depth: int) -> int:
+        if id(value) in seen or depth > 3:
+            return 0
+        seen.add(id(value))
+
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(deep=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(deep=True))
+        if isinstance(value, dict):
+            return sum(_walk(v, depth + 1) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(_walk(v, depth + 1) for v in value)
+        if hasattr(value, "__dict__"):
+            return sum(_walk(v, depth + 1) for v in vars(value).values())
+        return 0
+
+    return _walk(obj, 0)
+
+
+class ComparisonCache:
+    """
+    Thread-safe LRU cache bounded by an approximate byte budget.
+
+    Keys should identify the inputs by content (see make_key), so a cached
+    comparison is reused only when files and parameters are identical.
+    """
+
+    def __init__(self, max_bytes: int = COMPARISON_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(engine: str,
+                 content_hashes: list[str],
+                 join_columns: list[str],
+                 ignore_columns: Optional[list[str]] = None,
+                 abs_tol: float = 0.0,
+                 rel_tol: float = 0.0,
+                 **options) -> tuple:
+        """
+        Build a cache key from input content and comparison parameters.
+
+        Args:
+            engine: Comparison engine name (e.g. 'pairwise', 'multi')
+            content_hashes: Content hash of each input file, in order
+            join_columns: Join columns (order matters for composite keys)
+            ignore_columns: Ignored columns (order does not matter)
+            abs_tol: Absolute numeric tolerance
+            rel_tol: Relative numeric tolerance
+            **options: Any further engine options affecting the result
+        """
+        return (
+            engine,
+            tuple(content_hashes),
+            tuple(join_columns),
+            tuple(sorted(ignore_columns or [])),
+            float(abs_tol),
+            float(rel_tol),
+            tuple(sorted(options.items())),
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, marking it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: Optional[int] = None):
+        """
+        Store a value, evicting least recently used entries over budget.
+        Values larger than the whole budget are not cached.
+        """
+        if nbytes is None:
+            nbytes = estimate_nbytes(value)
+
+        if nbytes > self.max_bytes:
+            logger.info(f"Result of {nbytes} bytes exceeds cache budget; not cached")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (value, nbytes)
+            self._total_bytes += nbytes
+
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_bytes
+                self._evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and caching it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        """Get cache usage statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+# Global shared instance
+comparison_cache = ComparisonCache()
@@ -0,0 +1,698 @@
+"""
+Row Fingerprints - Exact and near-duplicate rows by hashing, in chunks.
+Every row gets a 64-bit fingerprint combined from vectorized per-column value
+hashes (optionally over a column subset, with text case and whitespace
+normalized). Equal fingerprints are exact duplicates; grouping them needs
+8 bytes per row instead of the rows themselves.
+
+Near-duplicates are rows whose values share most of their words. Each row
+becomes a set of (column, word) tokens, summarized one of two ways:
+
+- MinHash: one-permutation MinHash with optimal densification;
+  signature agreement estimates the Jaccard similarity
+- SimHash: a 64-bit sketch where similar rows differ in few bits
+
+Candidate pairs come from LSH buckets (MinHash bands, or SimHash bit-block
+tables by the pigeonhole principle) and are verified on their sketches, so pairs
+scale with the number of similar rows rather than all row pairs.
+
+DuplicateFinder keeps fingerprints, bucket keys and sketches in spill stores,
+so files far larger than memory can be checked chunk by chunk, and across
+files. Peak memory is bounded by one chunk plus the budget.
+"""
+import itertools
+import math
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from config import (
+    NEAR_DUPLICATE_METHOD,
+    NEAR_DUPLICATE_THRESHOLD,
+    NEAR_DUPLICATE_MAX_HAMMING,
+    NEAR_DUPLICATE_NUM_PERM,
+    NEAR_DUPLICATE_MAX_BUCKET,
+    DUPLICATE_MEMORY_MB,
+    DUPLICATE_SAMPLE_GROUPS,
+)
+from .spill import HashSpill, RecordSpill
+
+logger = logging.getLogger(__name__)
+
+# Shared hash for every null value
+NULL_HASH = np.uint64(0x6A09E667F3BCC908)
+# FNV-1a 64-bit prime; combines column hashes in column order
+_ROW_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+_EMPTY_BIN = np.uint64(np.iinfo(np.uint64).max)
+# Separates densification probe sequences from the token permutation
+_PROBE_SALT = np.uint64(0x9E3779B97F4A7C15)
+# SimHash LSH tables per row, at most (more tables allow longer bucket keys)
+_MAX_SIMHASH_TABLES = 32
+# Rows listed per sample group or cluster
+_SAMPLE_ROWS = 10
+# Candidate pairs verified per batch
+_VERIFY_BATCH = 100_000
+
+# Separate the hashes of non-integral floats and of uint64 values beyond
+# int64 from integer hashes of the same bits
+_FLOAT_SALT = np.uint64(0xBB67AE8584CAA73B)
+_UINT64_SALT = np.uint64(0x3C6EF372FE94F82B)
+
+NEAR_DUPLICATE_METHODS = ("minhash", "simhash")
+
+
+def mix64(values: np.ndarray, seed: np.uint64) -> np.ndarray:
+    """SplitMix64 finalizer: a fixed random permutation of uint64 hashes."""
+    with np.errstate(over="ignore"):
+        z = values ^ seed
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    """Set bits per uint64 value."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    bits = np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1)
+    return bits.sum(axis=1)
+
+
+def _text_array(series: pd.Series) -> pa.Array:
+    """A column as an Arrow string array (nulls kept), numbers in their shortest form."""
+    try:
+        array = pa.array(series, from_pandas=True)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # Mixed object columns: their string forms
+        return pa.array(series.astype(str).where(series.notna()), from_pandas=True, type=pa.string())
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        return array
+    try:
+        return pc.cast(array, pa.string())
+    except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+        return pa.array(series.astype(str).where(series.notna()), from_pandas=True, type=pa.string())
+
+
+def normalize_strings(array: pa.Array) -> pa.Array:
+    """Lowercase, trim and collapse runs of whitespace to one space."""
+    array = pc.replace_substring_regex(pc.utf8_lower(array), r"\s+", " ")
+    return pc.utf8_trim_whitespace(array)
+
+
+def _hash_strings(array: pa.Array) -> np.ndarray:
+    """64-bit hash per (non-null) string, hashing each distinct string once."""
+    encoded = array.dictionary_encode()
+    hashes = pd.util.hash_array(encoded.dictionary.to_numpy(zero_copy_only=False), categorize=False)
+    return hashes[encoded.indices.to_numpy(zero_copy_only=False)]
+
+
+def _number_hashes(series: pd.Series) -> np.ndarray:
+    """64-bit hash per value of a numeric or boolean column (nulls: NULL_HASH)."""
+    nulls = series.isna().to_numpy()
+    dtype = series.dtype
+    if pd.api.types.is_unsigned_integer_dtype(dtype):
+        values = series.to_numpy(dtype=np.uint64, na_value=0)
+        hashes = pd.util.hash_array(values)
+        # Beyond int64 the bits would alias negative integers
+        large = values > np.uint64(np.iinfo(np.int64).max)
+        hashes[large] = mix64(hashes[large], _UINT64_SALT)
+    elif pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        hashes = pd.util.hash_array(series.to_numpy(dtype=np.int64, na_value=0))
+    else:
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        integral = np.isfinite(values) & (np.trunc(values) == values) & (np.abs(values) < 2.0 ** 63)
+        # -0.0 becomes integer 0 here, so it matches 0.0
+        hashes = pd.util.hash_array(np.where(integral, values, 0).astype(np.int64))
+        fractional = ~integral
+        hashes[fractional] = mix64(pd.util.hash_array(values[fractional]), _FLOAT_SALT)
+    hashes[nulls] = NULL_HASH
+    return hashes
+
+
+def value_hashes(series: pd.Series, normalize: bool = False) -> np.ndarray:
+    """
+    64-bit hash per value of a column.
+
+    Integers (and booleans) hash as int64, so IDs beyond 2**53 stay
+    distinct, and integral floats hash as the same integer so 5 and 5.0
+    agree across chunks; all nulls share one hash. With normalize, text is
+    compared ignoring case and surrounding or repeated whitespace.
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        hashes = _number_hashes(series)
+    elif normalize:
+        array = normalize_strings(_text_array(series))
+        hashes = np.full(len(array), NULL_HASH, dtype=np.uint64)
+        valid = array.is_valid().to_numpy(zero_copy_only=False)
+        hashes[valid] = _hash_strings(array.drop_null())
+    else:
+        values = series.to_numpy(dtype=object)
+        hashes = pd.util.hash_array(values, categorize=False)
+        hashes[pd.isna(values)] = NULL_HASH
+    return hashes
+
+
+def row_fingerprints(column_hashes: list[np.ndarray], rows: int) -> np.ndarray:
+    """Combine per-column value hashes into one 64-bit fingerprint per row."""
+    fingerprints = np.zeros(rows, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for hashes in column_hashes:
+            fingerprints = (fingerprints * _ROW_HASH_MULTIPLIER) ^ hashes
+    return fingerprints
+
+
+def fingerprint_rows(df: pd.DataFrame, columns: Optional[list] = None,
+                     normalize: bool = False) -> np.ndarray:
+    """
+    64-bit fingerprint per row; equal rows get equal fingerprints.
+
+    Args:
+        df: Rows to fingerprint
+        columns: Columns to compare (default: all, in order)
+        normalize: Ignore text case and whitespace differences
+    """
+    frame = df if columns is None else df[list(columns)]
+    hashes = [value_hashes(frame.iloc[:, i], normalize) for i in range(frame.shape[1])]
+    return row_fingerprints(hashes, len(frame))
+
+
+def row_tokens(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (row position, token) pairs: the lowercased words of each value,
+    salted with the column name so equal words in different columns differ.
+    """
+    rows, tokens = [], []
+    for i, col in enumerate(df.columns):
+        words = pc.utf8_split_whitespace(pc.utf8_lower(_text_array(df.iloc[:, i])))
+        flat = pc.list_flatten(words)
+        if not len(flat):
+            continue
+        salt = pd.util.hash_array(np.array([str(col)], dtype=object))[0]
+        rows.append(pc.list_parent_indices(words).to_numpy().astype(np.int64))
+        tokens.append(mix64(_hash_strings(flat), salt))
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64)
+    return np.concatenate(rows), np.concatenate(tokens)
+
+
+def minhash_signatures(token_rows: np.ndarray, tokens: np.ndarray, rows: int,
+                       num_perm: int, seed: np.uint64) -> tuple[np.ndarray, np.ndarray]:
+    """
+    One-permutation MinHash signature per row, kept as the top 32 bits.
+
+    Returns:
+        (rows x num_perm uint32 signatures, mask of rows with any token)
+    """
+    shift = np.uint64(64 - (num_perm.bit_length() - 1))
+    mixed = mix64(tokens, seed)
+    bins = (mixed >> shift).astype(np.int64)
+    flat = np.full(rows * num_perm, _EMPTY_BIN, dtype=np.uint64)
+    np.minimum.at(flat, token_rows * num_perm + bins, mixed)
+    signatures = flat.reshape(rows, num_perm)
+
+    # Fill each empty bin from an occupied bin of its row, probed in a fixed
+    # random order per bin (optimal densification); borrowing from the next
+    # bin would repeat one value across whole bands of sparse rows
+    occupied = signatures != _EMPTY_BIN
+    has_tokens = occupied.any(axis=1)
+    # Bin each entry is taken from (-1: not yet found); small ints keep the passes cheap
+    source = np.where(occupied | ~has_tokens[:, None], np.arange(num_perm, dtype=np.int16), np.int16(-1))
+    probe_seed = seed ^ _PROBE_SALT
+
+    def probes(bins: np.ndarray, attempt: int) -> np.ndarray:
+        keys = (bins.astype(np.uint64) << np.uint64(32)) | np.uint64(attempt)
+        return (mix64(keys, probe_seed) >> shift).astype(np.int16)
+
+    # Whole-matrix passes while many bins are still empty, then only the rest
+    attempt, pending = 0, int((source < 0).sum())
+    while pending > source.size // 8:
+        attempt += 1
+        probe = probes(np.arange(num_perm), attempt)
+        fill = (source < 0) & occupied[:, probe]
+        source = np.where(fill, probe, source)
+        pending -= int(fill.sum())
+    pending_rows, pending_bins = np.nonzero(source < 0)
+    while len(pending_rows):
+        attempt += 1
+        probe = probes(pending_bins, attempt)
+        found = occupied[pending_rows, probe.astype(np.intp)]
+        source[pending_rows[found], pending_bins[found]] = probe[found]
+        pending_rows, pending_bins = pending_rows[~found], pending_bins[~found]
+
+    dense = np.take_along_axis(signatures, source, axis=1)
+    return (dense >> np.uint64(32)).astype(np.uint32), has_tokens
+
+
+def simhashes(token_rows: np.ndarray, tokens: np.ndarray, rows: int,
+              seed: np.uint64) -> tuple[np.ndarray, np.ndarray]:
+    """
+    64-bit SimHash per row: bit b is set when most of the row's tokens
+    have bit b set.
+
+    Returns:
+        (uint64 SimHash per row, mask of rows with any token)
+    """
+    mixed = mix64(tokens, seed)
+    counts = np.bincount(token_rows, minlength=rows)
+    sketches = np.zeros(rows, dtype=np.uint64)
+    for bit in range(64):
+        ones = np.bincount(token_rows, weights=(mixed >> np.uint64(bit)) & np.uint64(1), minlength=rows)
+        sketches |= (2 * ones > counts).astype(np.uint64) << np.uint64(bit)
+    return sketches, counts > 0
+
+
+def lsh_bands(num_perm: int, threshold: float, false_negative_weight: float = 0.8) -> int:
+    """
+    MinHash LSH bands for a Jaccard threshold: the divisor of num_perm that
+    minimizes the weighted false positive and false negative probability
+    mass. Candidates are verified, so missed pairs weigh more by default.
+    """
+    similarity = np.linspace(0.0, 1.0, 1001)
+    best, best_error = num_perm, np.inf
+    for bands in range(1, num_perm + 1):
+        if num_perm % bands:
+            continue
+        rows = num_perm // bands
+        candidate = 1 - (1 - similarity ** rows) ** bands
+        below = similarity < threshold
+        error = ((1 - false_negative_weight) * candidate[below].sum()
+                 + false_negative_weight * (1 - candidate[~below]).sum())
+        if error < best_error:
+            best, best_error = bands, error
+    return best
+
+
+def simhash_tables(max_hamming: int,
+                   max_tables: int = _MAX_SIMHASH_TABLES) -> tuple[np.ndarray, list[tuple[int, ...]]]:
+    """
+    Bit blocks and LSH tables catching SimHash pairs within max_hamming bits.
+
+    The 64 bits are split into max_hamming + r blocks. Pairs differing in at
+    most max_hamming bits agree on at least r whole blocks, so one table per
+    choice of r blocks catches all of them. r is the largest with at most
+    max_tables tables: longer keys, fewer chance collisions.
+
+    Returns:
+        (block bit edges, tables as tuples of block indices)
+    """
+    r = 1
+    while max_hamming + r < 64 and math.comb(max_hamming + r + 1, r + 1) <= max_tables:
+        r += 1
+    edges = np.linspace(0, 64, max_hamming + r + 1).astype(int)
+    return edges, list(itertools.combinations(range(max_hamming + r), r))
+
+
+def _band_keys(columns: list[np.ndarray], rows: int, band: int, seed: np.uint64) -> np.ndarray:
+    """Bucket key of one LSH band; the band number is hashed in, so bands never share buckets."""
+    return mix64(row_fingerprints([np.full(rows, band + 1, dtype=np.uint64), *columns], rows), seed)
+
+
+def _runs(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start and end of each run of equal values in a sorted array."""
+    if not len(keys):
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return starts, np.r_[starts[1:], len(keys)]
+
+
+def _bucket_pairs(members: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                  max_bucket_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Candidate pairs from buckets (runs of members): every pair in buckets
+    up to max_bucket_size, and each member with the first one in larger
+    buckets, which still links them into one cluster.
+    """
+    sizes = ends - starts
+    first, second = [], []
+
+    small = sizes <= max_bucket_size
+    in_small = np.repeat(small, sizes)
+    active = np.flatnonzero(in_small)
+    run_end = np.repeat(ends, sizes)[in_small]
+    # Pair each member with the one d places later in its bucket
+    d = 1
+    active, run_end = active[active + 1 < run_end], run_end[active + 1 < run_end]
+    while len(active):
+        first.append(members[active])
+        second.append(members[active + d])
+        d += 1
+        keep = active + d < run_end
+        active, run_end = active[keep], run_end[keep]
+
+    for start, end in zip(starts[~small], ends[~small]):
+        first.append(np.full(end - start - 1, members[start]))
+        second.append(members[start + 1:end])
+
+    if not first:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    first, second = np.concatenate(first), np.concatenate(second)
+    return np.minimum(first, second), np.maximum(first, second)
+
+
+def connected_components(first: np.ndarray, second: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Connected components of an edge list.
+
+    Returns:
+        (sorted node ids, component label per node: its smallest node index)
+    """
+    nodes = np.unique(np.concatenate([first, second]))
+    a, b = np.searchsorted(nodes, first), np.searchsorted(nodes, second)
+    labels = np.arange(len(nodes))
+    while True:
+        # Hook both ends onto the smaller label, then jump pointers to the root
+        low = np.minimum(labels[a], labels[b])
+        previous = labels.copy()
+        np.minimum.at(labels, a, low)
+        np.minimum.at(labels, b, low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, previous):
+            return nodes, labels
+
+
+class DuplicateFinder:
+    """
+    Exact and near-duplicate rows across chunks of one or more sources.
+
+    Usage:
+        with DuplicateFinder(columns=["Subject", "From"], normalize=True) as finder:
+            for chunk in processor.read_csv_chunked(path):
+                finder.add("volume1.csv", chunk)
+            result = finder.result()
+    """
+
+    def __init__(self,
+                 columns: Optional[list] = None,
+                 normalize: bool = False,
+                 near_method: Optional[str] = NEAR_DUPLICATE_METHOD,
+                 threshold: float = NEAR_DUPLICATE_THRESHOLD,
+                 max_hamming: int = NEAR_DUPLICATE_MAX_HAMMING,
+                 num_perm: int = NEAR_DUPLICATE_NUM_PERM,
+                 max_bucket_size: int = NEAR_DUPLICATE_MAX_BUCKET,
+                 sample_groups: int = DUPLICATE_SAMPLE_GROUPS,
+                 memory_budget_mb: float = DUPLICATE_MEMORY_MB,
+                 spill_dir: Optional[Path] = None,
+                 seed: int = 1):
+        """
+        Args:
+            columns: Columns compared (default: those of the first chunk)
+            normalize: Compare text ignoring case and whitespace differences
+            near_method: "minhash", "simhash" or None (exact duplicates only)
+            threshold: MinHash - minimum estimated Jaccard similarity of the
+                       rows' (column, word) token sets
+            max_hamming: SimHash - maximum differing bits of 64
+            num_perm: MinHash signature length (power of two)
+            max_bucket_size: LSH buckets with more distinct rows than this
+                             are paired star-wise (each row with the first)
+            sample_groups: Groups and clusters listed in the result
+            memory_budget_mb: Memory for fingerprints, bucket keys and
+                              sketches before they spill to temp files
+            spill_dir: Directory for spill files (default: system temp)
+        """
+        if near_method not in (None, *NEAR_DUPLICATE_METHODS):
+            raise ValueError(f"near_method must be one of {NEAR_DUPLICATE_METHODS} or None")
+        if num_perm <= 0 or num_perm & (num_perm - 1):
+            raise ValueError("num_perm must be a power of two")
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if not 0 <= max_hamming < 64:
+            raise ValueError("max_hamming must be between 0 and 63")
+
+        self.columns = list(columns) if columns is not None else None
+        self.normalize = normalize
+        self.near_method = near_method
+        self.threshold = threshold
+        self.max_hamming = max_hamming
+        self.num_perm = num_perm
+        self.max_bucket_size = max_bucket_size
+        self.sample_groups = sample_groups
+        if near_method == "simhash":
+            self._block_edges, self._tables = simhash_tables(max_hamming)
+            self.bands = len(self._tables)
+        else:
+            self.bands = lsh_bands(num_perm, threshold)
+
+        self._seed = np.uint64(seed)
+        self._rows = 0
+        self._sources: list[str] = []
+        self._source_rows: dict[str, int] = {}
+        # (first global row, source index, first row within the source) per run of chunks
+        self._segments: list[tuple[int, int, int]] = []
+
+        budget = int(memory_budget_mb * 1024 * 1024)
+        self._directory = Path(tempfile.mkdtemp(prefix="duplicates-", dir=spill_dir))
+        self._exact = HashSpill(self._directory, "rows", budget // 4)
+        self._buckets = self._fingerprints = self._sketches = None
+        if near_method:
+            self._buckets = HashSpill(self._directory, "buckets", budget // 4)
+            self._fingerprints = RecordSpill(self._directory, "fingerprints", np.uint64, 1, budget // 8)
+            if near_method == "minhash":
+                self._sketches = RecordSpill(self._directory, "signatures", np.uint32, num_perm, budget * 3 // 8)
+            else:
+                self._sketches = RecordSpill(self._directory, "simhashes", np.uint64, 1, budget * 3 // 8)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Remove the spill files."""
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    @property
+    def row_count(self) -> int:
+        return self._rows
+
+    def add(self, source: str, chunk: pd.DataFrame):
+        """
+        Fingerprint (and sketch) the next rows of a source.
+
+        Raises:
+            ValueError: The chunk lacks some of the compared columns
+        """
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        missing = [col for col in self.columns if col not in chunk.columns]
+        if missing:
+            raise ValueError(f"{source} is missing columns: {missing}")
+
+        if source not in self._source_rows:
+            self._sources.append(source)
+            self._source_rows[source] = 0
+        source_index = self._sources.index(source)
+        if not self._segments or self._segments[-1][1] != source_index:
+            self._segments.append((self._rows, source_index, self._source_rows[source]))
+
+        frame = chunk[self.columns]
+        rows = len(frame)
+        ids = np.arange(self._rows, self._rows + rows, dtype=np.int64)
+        fingerprints = fingerprint_rows(frame, normalize=self.normalize)
+        self._exact.add(fingerprints, ids)
+        if self.near_method:
+            self._sketch(frame, ids, fingerprints)
+
+        self._rows += rows
+        self._source_rows[source] += rows
+
+    def _sketch(self, frame: pd.DataFrame, ids: np.ndarray, fingerprints: np.ndarray):
+        """Store each row's sketch and file it under its LSH bucket keys."""
+        rows = len(frame)
+        token_rows, tokens = row_tokens(frame)
+        if self.near_method == "minhash":
+            signatures, has_tokens = minhash_signatures(token_rows, tokens, rows, self.num_perm, self._seed)
+            width = self.num_perm // self.bands
+            columns = [signatures[:, j].astype(np.uint64) for j in range(self.num_perm)]
+            keys = [_band_keys(columns[band * width:(band + 1) * width], rows, band, self._seed)
+                    for band in range(self.bands)]
+        else:
+            signatures, has_tokens = simhashes(token_rows, tokens, rows, self._seed)
+            edges = self._block_edges
+            blocks = [(signatures >> np.uint64(low)) & np.uint64((1 << int(high - low)) - 1)
+                      for low, high in zip(edges[:-1], edges[1:])]
+            keys = [_band_keys([blocks[i] for i in table], rows, band, self._seed)
+                    for band, table in enumerate(self._tables)]
+
+        self._fingerprints.add(fingerprints)
+        self._sketches.add(signatures)
+        # Rows without any words have nothing to be similar on
+        for band_keys in keys:
+            self._buckets.add(band_keys[has_tokens], ids[has_tokens])
+
+    def _locate(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Source index and row number within the source of global row ids."""
+        starts = np.array([segment[0] for segment in self._segments], dtype=np.int64)
+        segment = np.searchsorted(starts, rows, side="right") - 1
+        sources = np.array([s[1] for s in self._segments])[segment]
+        offsets = np.array([s[2] for s in self._segments], dtype=np.int64)[segment]
+        return sources, rows - starts[segment] + offsets
+
+    def _describe(self, rows: np.ndarray) -> list[dict]:
+        sources, local = self._locate(rows[:_SAMPLE_ROWS])
+        return [{"source": self._sources[s], "row": int(r)} for s, r in zip(sources, local)]
+
+    def result(self) -> dict:
+        """
+        Duplicate groups and near-duplicate clusters over everything added.
+
+        Returns:
+            rows and sources compared, "exact" duplicate groups and, with a
+            near_method, "near" clusters of similar (not identical) rows
+        """
+        result = {
+            "rows": self._rows,
+            "columns": self.columns or [],
+            "normalized": self.normalize,
+            "sources": dict(self._source_rows),
+            "exact": self._exact_groups(),
+            "near": self._near_clusters() if self.near_method else None,
+        }
+        result["spilled"] = self._exact.spilled or bool(self._buckets and self._buckets.spilled) \
+            or bool(self._sketches and self._sketches.spilled)
+        return result
+
+    def _exact_groups(self) -> dict:
+        duplicates = groups = cross_source = 0
+        samples = []
+        for pairs in self._exact.groups():
+            order = np.argsort(pairs["key"], kind="stable")
+            rows = pairs["tag"][order]
+            starts, ends = _runs(pairs["key"][order])
+            grouped = ends - starts > 1
+            starts, ends = starts[grouped], ends[grouped]
+            if not len(starts):
+                continue
+            duplicates += int((ends - starts - 1).sum())
+            groups += len(starts)
+
+            sources, _ = self._locate(rows)
+            cross_source += int((np.minimum.reduceat(sources, starts)
+                                 != np.maximum.reduceat(sources, starts)).sum())
+            # Rows are in order within a group; keep the groups whose first row comes first
+            for i in np.argsort(rows[starts])[:self.sample_groups]:
+                group = rows[starts[i]:ends[i]]
+                samples.append((int(group[0]), len(group), group[:_SAMPLE_ROWS].copy()))
+            samples = sorted(samples, key=lambda sample: sample[0])[:self.sample_groups]
+
+        return {
+            "duplicate_rows": duplicates,
+            "duplicate_groups": groups,
+            "cross_source_groups": cross_source,
+            "sample_groups": [{"count": count, "rows": self._describe(rows)} for _, count, rows in samples],
+        }
+
+    def _near_clusters(self) -> dict:
+        fingerprints = self._fingerprints.records()[:, 0]
+        sketches = self._sketches.records()
+        first, second, similarity = [], [], []
+        candidates = 0
+        for pairs in self._buckets.groups():
+            order = np.argsort(pairs["key"], kind="stable")
+            keys, rows = pairs["key"][order], pairs["tag"][order]
+            starts, ends = _runs(keys)
+            shared = np.repeat(ends - starts > 1, ends - starts)
+            keys, rows = keys[shared], rows[shared]
+            if not len(rows):
+                continue
+
+            # Identical rows are exact duplicates: keep one row per fingerprint in a bucket
+            row_fingerprints_ = fingerprints[rows]
+            order = np.lexsort((rows, row_fingerprints_, keys))
+            keys, rows, row_fingerprints_ = keys[order], rows[order], row_fingerprints_[order]
+            distinct = np.r_[True, (keys[1:] != keys[:-1]) | (row_fingerprints_[1:] != row_fingerprints_[:-1])]
+            keys, rows = keys[distinct], rows[distinct]
+
+            starts, ends = _runs(keys)
+            a, b = _bucket_pairs(rows, starts, ends, self.max_bucket_size)
+            pair_keys = np.unique(a * self._rows + b)
+            a, b = pair_keys // self._rows, pair_keys % self._rows
+            candidates += len(a)
+            for start in range(0, len(a), _VERIFY_BATCH):
+                batch_a, batch_b = a[start:start + _VERIFY_BATCH], b[start:start + _VERIFY_BATCH]
+                scores = self._similarity(sketches, batch_a, batch_b)
+                similar = self._is_similar(scores)
+                first.append(batch_a[similar])
+                second.append(batch_b[similar])
+                similarity.append(scores[similar])
+
+        near = {"method": self.near_method}
+        if self.near_method == "minhash":
+            near.update({"threshold": self.threshold, "num_perm": self.num_perm})
+        else:
+            near["max_hamming"] = self.max_hamming
+        near["bands"] = self.bands
+
+        first = np.concatenate(first) if first else np.empty(0, dtype=np.int64)
+        second = np.concatenate(second) if second else np.empty(0, dtype=np.int64)
+        similarity = np.concatenate(similarity) if similarity else np.empty(0)
+        # Pairs found in several bands (or partitions) count once
+        _, unique = np.unique(first * self._rows + second, return_index=True)
+        first, second, similarity = first[unique], second[unique], similarity[unique]
+        near.update({"candidate_pairs": candidates, "similar_pairs": len(first)})
+        if not len(first):
+            near.update({"clusters": 0, "rows_in_clusters": 0, "cross_source_clusters": 0,
+                         "sample_clusters": []})
+            return near
+
+        nodes, labels = connected_components(first, second)
+        roots, cluster_of, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+        minimum = np.ones(len(roots))
+        np.minimum.at(minimum, cluster_of[np.searchsorted(nodes, first)], similarity)
+
+        sources, _ = self._locate(nodes)
+        order = np.argsort(cluster_of, kind="stable")
+        starts = np.searchsorted(cluster_of[order], np.arange(len(roots)))
+        cross_source = np.minimum.reduceat(sources[order], starts) != np.maximum.reduceat(sources[order], starts)
+
+        # Roots are the smallest node of each cluster, so clusters come in row order
+        near.update({
+            "clusters": len(roots),
+            "rows_in_clusters": len(nodes),
+            "cross_source_clusters": int(cross_source.sum()),
+            "sample_clusters": [
+                {
+                    "size": int(sizes[c]),
+                    "min_similarity": round(float(minimum[c]), 4),
+                    "rows": self._describe(nodes[order[starts[c]:starts[c] + sizes[c]]]),
+                }
+                for c in range(min(len(roots), self.sample_groups))
+            ],
+        })
+        return near
+
+    def _similarity(self, sketches: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Estimated Jaccard (MinHash) or 1 - differing bits / 64 (SimHash) of row pairs."""
+        if self.near_method == "minhash":
+            return (sketches[a] == sketches[b]).mean(axis=1)
+        return 1 - _popcount64(sketches[a, 0] ^ sketches[b, 0]) / 64
+
+    def _is_similar(self, scores: np.ndarray) -> np.ndarray:
+        if self.near_method == "minhash":
+            return scores >= self.threshold
+        return scores >= 1 - self.max_hamming / 64
+
+
+def find_duplicates(frames: dict[str, pd.DataFrame], **options) -> dict:
+    """
+    Exact and near-duplicate rows across in-memory frames.
+
+    Args:
+        frames: Dict of source name to dataframe
+        **options: DuplicateFinder options
+    """
+    with DuplicateFinder(**options) as finder:
+        for name, df in frames.items():
+            finder.add(name, df)
+        return finder.result()
@@ -5,10 +5,13 @@ Detects column mismatches, type compatibility, and suggests mappings.
 import pandas as pd
 import numpy as np
 from typing import Optional
-from difflib import SequenceMatcher
 from collections import defaultdict
 import re
 
+from .profiler import get_profiles
+from .column_mapper import ColumnMapper
+from .fuzzy_keys import similarity as string_similarity
+
 
 class SchemaAnalyzer:
     """
@@ -53,6 +56,7 @@ class SchemaAnalyzer:
         self.dataframes = dataframes
         self.file_names = list(dataframes.keys())
         self._analysis: Optional[dict] = None
+        self._pattern_cache: dict[str, Optional[str]] = {}
     
     def analyze(self) -> dict:
         """
@@ -61,7 +65,7 @@ class SchemaAnalyzer:
         Returns:
             Complete schema analysis results
         """
-        # Get all column info
+        # Extract each file's schema exactly once; every analysis below reuses it
         schemas = {}
         for name, df in self.dataframes.items():
             schemas[name] = self._extract_schema(df)
@@ -79,7 +83,7 @@ class SchemaAnalyzer:
         issues = self._identify_issues(schemas, type_analysis)
         
         # Generate format analysis for common columns
-        format_analysis = self._analyze_formats()
+        format_analysis = self._analyze_formats(schemas)
         
         self._analysis = {
             "schemas": schemas,
@@ -102,27 +106,28 @@ class SchemaAnalyzer:
             "memory_usage": df.memory_usage(deep=True).sum(),
         }
         
+        profiles = get_profiles(df)
         for col in df.columns:
+            profile = profiles[col]
             col_info = {
-                "dtype": str(df[col].dtype),
-                "nullable": bool(df[col].isnull().any()),
-                "null_count": int(df[col].isnull().sum()),
-                "null_percentage": round(df[col].isnull().sum() / len(df) * 100, 2) if len(df) > 0 else 0,
-                "unique_count": int(df[col].nunique()),
-                "unique_percentage": round(df[col].nunique() / len(df) * 100, 2) if len(df) > 0 else 0,
+                "dtype": profile["dtype"],
+                "nullable": profile["null_count"] > 0,
+                "null_count": profile["null_count"],
+                "null_percentage": profile["null_percentage"],
+                "unique_count": profile["unique_count"],
+                "unique_percentage": profile["unique_percentage"],
             }
             
             # Add type-specific info
             if pd.api.types.is_numeric_dtype(df[col]):
-                col_info["min"] = float(df[col].min()) if not df[col].isnull().all() else None
-                col_info["max"] = float(df[col].max()) if not df[col].isnull().all() else None
-                col_info["mean"] = float(df[col].mean()) if not df[col].isnull().all() else None
+                col_info["min"] = profile.get("min")
+                col_info["max"] = profile.get("max")
+                col_info["mean"] = profile.get("mean")
             elif pd.api.types.is_string_dtype(df[col]) or df[col].dtype == 'object':
-                sample = df[col].dropna()
-                if len(sample) > 0:
-                    col_info["avg_length"] = round(sample.astype(str).str.len().mean(), 2)
-                    col_info["max_length"] = int(sample.astype(str).str.len().max())
-                    col_info["sample_values"] = sample.head(5).tolist()
+                if profile["count"] > 0:
+                    col_info["avg_length"] = profile["avg_length"]
+                    col_info["max_length"] = profile["max_length"]
+                    col_info["sample_values"] = profile["sample_values"]
             
             schema["columns"][col] = col_info
         
@@ -256,41 +261,43 @@ class SchemaAnalyzer:
         """Suggest column mappings for misaligned columns."""
         suggestions = []
         
-        # Get columns unique to each file
         all_columns_by_file = {
             name: set(schema["columns"].keys())
             for name, schema in schemas.items()
         }
         
-        # For each pair of files, find potential mappings
-        for i, file1 in enumerate(self.file_names):
-            for file2 in self.file_names[i+1:]:
-                cols1 = all_columns_by_file[file1]
-                cols2 = all_columns_by_file[file2]
-                
-                # Find columns unique to each file
-                unique_to_1 = cols1 - cols2
-                unique_to_2 = cols2 - cols1
-                
-                # Try to match unique columns
-                for col1 in unique_to_1:
-                    for col2 in unique_to_2:
-                        similarity = self._calculate_column_similarity(
-                            col1, col2, schemas[file1], schemas[file2]
-                        )
-                        
-                        if similarity["score"] >= 0.6:
-                            suggestions.append({
-                                "file1": file1,
-                                "column1": col1,
-                                "file2": file2,
-                                "column2": col2,
-                                "similarity_score": similarity["score"],
-                                "match_reasons": similarity["reasons"],
-                            })
-        
-        # Sort by similarity score
-        suggestions.sort(key=lambda x: x["similarity_score"], reverse=True)
+        # Only columns missing from at least one other file need a mapping
+        common = set.intersection(*all_columns_by_file.values()) if all_columns_by_file else set()
+        mapper = ColumnMapper()
+        for name in self.file_names:
+            unmatched = [col for col in self.dataframes[name].columns if col not in common]
+            mapper.add_file(name, self.dataframes[name], unmatched)
+        
+        # Score candidate pairs (similar names or values) instead of all pairs
+        for pair in mapper.candidate_pairs():
+            file1, col1 = pair["file1"], pair["column1"]
+            file2, col2 = pair["file2"], pair["column2"]
+            similarity = self._calculate_column_similarity(
+                col1, col2, schemas[file1], schemas[file2], pair["value_similarity"]
+            )
+            
+            if similarity["score"] >= 0.6:
+                suggestions.append({
+                    "file1": file1,
+                    "column1": col1,
+                    "file2": file2,
+                    "column2": col2,
+                    "similarity_score": similarity["score"],
+                    "name_similarity": similarity["name_similarity"],
+                    "value_similarity": similarity["value_similarity"],
+                    "match_reasons": similarity["reasons"],
+                })
+        
+        # Sort by similarity score, then by combined name and value similarity
+        suggestions.sort(
+            key=lambda x: (x["similarity_score"], x["name_similarity"] + (x["value_similarity"] or 0)),
+            reverse=True,
+        )
         
         return {
             "suggestions": suggestions[:20],  # Top 20 suggestions
@@ -298,13 +305,14 @@ class SchemaAnalyzer:
         }
     
     def _calculate_column_similarity(self, col1: str, col2: str,
-                                    schema1: dict, schema2: dict) -> dict:
+                                    schema1: dict, schema2: dict,
+                                    value_similarity: Optional[float] = None) -> dict:
         """Calculate similarity score between two columns."""
         score = 0.0
         reasons = []
         
         # Name similarity (fuzzy match)
-        name_ratio = SequenceMatcher(None, col1.lower(), col2.lower()).ratio()
+        name_ratio = string_similarity(col1.lower(), col2.lower())
         if name_ratio >= 0.8:
             score += 0.4
             reasons.append(f"Name similarity: {name_ratio:.2f}")
@@ -312,6 +320,15 @@ class SchemaAnalyzer:
             score += 0.2
             reasons.append(f"Name similarity: {name_ratio:.2f}")
         
+        # Value overlap (estimated Jaccard of sampled values)
+        if value_similarity is not None:
+            if value_similarity >= 0.7:
+                score += 0.4
+                reasons.append(f"Value overlap: {value_similarity:.2f}")
+            elif value_similarity >= 0.3:
+                score += 0.2
+                reasons.append(f"Value overlap: {value_similarity:.2f}")
+        
         # Check if same pattern type (e.g., both look like IDs)
         pattern1 = self._detect_column_pattern(col1)
         pattern2 = self._detect_column_pattern(col2)
@@ -338,18 +355,27 @@ class SchemaAnalyzer:
                 score += 0.1
                 reasons.append("Similar uniqueness distribution")
         
-        return {"score": min(score, 1.0), "reasons": reasons}
+        return {
+            "score": min(score, 1.0),
+            "name_similarity": round(name_ratio, 4),
+            "value_similarity": round(value_similarity, 4) if value_similarity is not None else None,
+            "reasons": reasons,
+        }
     
     def _detect_column_pattern(self, column_name: str) -> Optional[str]:
         """Detect what type of data a column likely contains based on name."""
-        col_lower = column_name.lower()
+        if column_name in self._pattern_cache:
+            return self._pattern_cache[column_name]
         
+        col_lower = column_name.lower()
+        detected = None
         for pattern_type, patterns in self.COMMON_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, col_lower):
-                    return pattern_type
+            if any(re.search(pattern, col_lower) for pattern in patterns):
+                detected = pattern_type
+                break
         
-        return None
+        self._pattern_cache[column_name] = detected
+        return detected
     
     def _identify_issues(self, schemas: dict, type_analysis: dict) -> list:
         """Identify potential schema issues."""
@@ -401,19 +427,13 @@ class SchemaAnalyzer:
         
         return issues
     
-    def _analyze_formats(self) -> dict:
+    def _analyze_formats(self, schemas: dict) -> dict:
         """Analyze data formats for potential standardization."""
         format_analysis = {}
         
-        # Find common string columns
-        common_columns = set()
-        for schema in self._extract_schema(list(self.dataframes.values())[0])["columns"]:
-            is_common = all(
-                schema in self._extract_schema(df)["columns"]
-                for df in self.dataframes.values()
-            )
-            if is_common:
-                common_columns.add(schema)
+        # Find columns common to all files from the already-extracted schemas
+        column_sets = [set(schema["columns"]) for schema in schemas.values()]
+        common_columns = set.intersection(*column_sets) if column_sets else set()
         
         for col in common_columns:
             col_formats = {}
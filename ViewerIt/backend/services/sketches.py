@@ -0,0 +1,256 @@
+"""
+Mergeable Sketches - Bounded-memory column statistics for streamed files.
+Exact distinct counts, quantiles and top values need every distinct value,
+which does not fit for multi-GB files. Each sketch here has a fixed size,
+absorbs one chunk at a time, and merges with another sketch of the same
+kind (e.g. from another chunk range), with a documented error:
+
+- HyperLogLog: distinct count, relative standard error 1.04 / sqrt(2^precision)
+- KLLSketch: quantiles, normalized rank error ~2.3 / k^0.97 (99% confidence)
+- MisraGries: most frequent values, each count low by at most `error`
+
+All three take per-chunk value counts (distinct values and their counts),
+which ChunkedProfiler already computes, so a chunk costs one pass over its
+distinct values.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from config import PROFILE_HLL_PRECISION, PROFILE_KLL_K, PROFILE_HEAVY_HITTERS
+from .row_fingerprints import mix64, value_hashes
+
+# Seed re-mixing value hashes so register index and rank bits are independent
+_HLL_SEED = np.uint64(0x3C6EF372FE94F82B)
+
+
+def _leading_zeros64(values: np.ndarray) -> np.ndarray:
+    """Leading zero bits per uint64 value (64 for zero)."""
+    values = values.copy()
+    zeros = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = (values >> np.uint64(64 - shift)) == 0
+        zeros[empty] += shift
+        values[empty] <<= np.uint64(shift)
+    zeros[(values >> np.uint64(63)) == 0] += 1
+    return zeros
+
+
+def _hll_sigma(x: float) -> float:
+    if x == 1.0:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _hll_tau(x: float) -> float:
+    if x in (0.0, 1.0):
+        return 0.0
+    y, z = 1.0, 1.0 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class HyperLogLog:
+    """
+    Distinct-count sketch of 2^precision one-byte registers.
+
+    Merging takes the register-wise maximum, so the union of two sketches is
+    exactly the sketch of the union. Estimates use Ertl's improved estimator,
+    which needs no bias tables or small-range switch.
+    """
+
+    def __init__(self, precision: int = PROFILE_HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"HyperLogLog precision must be 4-18, got {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of the estimate."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add_hashes(self, hashes: np.ndarray):
+        """Add values by their 64-bit hashes."""
+        if not len(hashes):
+            return
+        hashes = mix64(np.asarray(hashes, dtype=np.uint64), _HLL_SEED)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rank = np.minimum(_leading_zeros64(hashes << np.uint64(self.precision)) + 1,
+                          64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def update(self, values: pd.Index):
+        """Add distinct values (e.g. the index of a chunk's value counts)."""
+        self.add_hashes(value_hashes(pd.Series(values)))
+
+    def merge(self, other: "HyperLogLog"):
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> float:
+        """Estimated number of distinct values added."""
+        m = len(self.registers)
+        q = 64 - self.precision
+        histogram = np.bincount(self.registers, minlength=q + 2)
+        z = m * _hll_tau(1 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _hll_sigma(histogram[0] / m)
+        return m * m / (2 * math.log(2) * z)
+
+
+class KLLSketch:
+    """
+    Quantile sketch of compactor levels (Karnin, Lang & Liberty).
+
+    An item at level h stands for 2^h inputs. When a level outgrows its
+    capacity it is sorted and every other item (random offset) moves up a
+    level, so about 3k items are kept however many values are added.
+    Weighted input (distinct values and their counts) goes straight to the
+    levels of the count's set bits. Sketches merge level by level.
+    """
+
+    def __init__(self, k: int = PROFILE_KLL_K, seed: int = 0):
+        if k < 8:
+            raise ValueError(f"KLL k must be at least 8, got {k}")
+        self.k = k
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def rank_error(self) -> float:
+        """Normalized rank error of a quantile (99% confidence)."""
+        return 2.296 / self.k ** 0.9723
+
+    def update(self, values: np.ndarray, counts: np.ndarray = None):
+        """Add values, each repeated by its count when counts are given."""
+        values = np.asarray(values, dtype=np.float64)
+        if counts is None:
+            counts = np.ones(len(values), dtype=np.int64)
+        keep = ~np.isnan(values)
+        values, counts = values[keep], np.asarray(counts, dtype=np.int64)[keep]
+        if not len(values):
+            return
+        self.count += int(counts.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        for level in range(int(counts.max()).bit_length()):
+            self._append(level, values[(counts >> level) & 1 == 1])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        """Fold another sketch into this one."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for level, items in enumerate(other.levels):
+            self._append(level, items)
+        self._compress()
+
+    def _append(self, level: int, items: np.ndarray):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        if len(items):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _compress(self):
+        """Compact the lowest over-full level until every level fits."""
+        while True:
+            full = [level for level, items in enumerate(self.levels)
+                    if len(items) > self._capacity(level)]
+            if not full:
+                return
+            level = full[0]
+            items = np.sort(self.levels[level])
+            odd = len(items) % 2
+            self._append(level + 1, items[self._rng.integers(2):len(items) - odd:2])
+            self.levels[level] = items[len(items) - odd:]
+
+    def quantiles(self, qs) -> list[float]:
+        """Approximate quantiles, each within rank_error of its true rank."""
+        if not self.count:
+            return [float("nan")] * len(qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 1 << level, dtype=np.int64)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        result = []
+        for q in qs:
+            if q <= 0:
+                result.append(self.min)
+            elif q >= 1:
+                result.append(self.max)
+            else:
+                index = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+                result.append(float(items[min(index, len(items) - 1)]))
+        return result
+
+
+class MisraGries:
+    """
+    Frequent-values summary of at most k counters.
+
+    When more than k values are counted, the (k+1)-th largest count is
+    subtracted from every counter and those reaching zero are dropped, so a
+    value's true count lies in [counter, counter + error] and any value more
+    frequent than n / (k + 1) is kept. Summaries merge by adding counters
+    and reducing again (Agarwal et al., mergeable summaries).
+    """
+
+    def __init__(self, k: int = PROFILE_HEAVY_HITTERS):
+        if k < 1:
+            raise ValueError(f"Misra-Gries k must be positive, got {k}")
+        self.k = k
+        self.total = 0
+        self.error = 0
+        self.counters = pd.Series(dtype=np.int64)
+
+    def update(self, counts: pd.Series):
+        """Add values by their counts (e.g. a chunk's value counts)."""
+        self.total += int(counts.sum())
+        self._reduce(self.counters.add(counts, fill_value=0) if len(self.counters) else counts)
+
+    def merge(self, other: "MisraGries"):
+        """Fold another summary into this one."""
+        self.total += other.total
+        self.error += other.error
+        self._reduce(self.counters.add(other.counters, fill_value=0)
+                     if len(self.counters) else other.counters)
+
+    def _reduce(self, counters: pd.Series):
+        counters = counters.astype(np.int64)
+        if len(counters) > self.k:
+            cut = int(counters.nlargest(self.k + 1).iloc[-1])
+            counters = counters[counters > cut] - cut
+            self.error += cut
+        self.counters = counters
+
+    def top(self, n: int) -> pd.Series:
+        """The n largest counters (lower bounds of the true counts)."""
+        return self.counters.nlargest(n)
@@ -0,0 +1,272 @@
+"""
+Spill Stores - Memory-bounded buffers that overflow to temp files.
+Used by checks that need every row or value of files too large to load:
+
+- HashSpill: (64-bit key, tag) pairs, grouped by key one hash partition at
+  a time (duplicate rows, distinct values, LSH buckets)
+- ValueSpill: float64 values per column in row order, with exact rank
+  selection (quantiles)
+- RecordSpill: fixed-width records per row (signatures), read back by
+  row number
+
+Data stays in memory up to a byte budget and is written to files in the
+given directory beyond it; the caller owns (and removes) the directory.
+"""
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from config import QUALITY_SPILL_PARTITIONS
+
+SPILL_DTYPE = np.dtype([("key", "<u8"), ("tag", "<i8")])
+# Partition files larger than the budget are split again on the next key bits
+_MAX_SPLIT_LEVELS = 3
+_HISTOGRAM_BINS = 1024
+
+
+class HashSpill:
+    """
+    (key, tag) pairs buffered in memory and spilled to partitioned files.
+
+    Keys are 64-bit hashes; tags carry a row number or column index. Pairs
+    are partitioned by the top bits of their key, so equal keys always share
+    a partition and each partition can be grouped on its own.
+    """
+
+    def __init__(self, directory: Path, name: str, budget_bytes: int,
+                 partitions: int = QUALITY_SPILL_PARTITIONS):
+        if partitions <= 1 or partitions & (partitions - 1):
+            raise ValueError("partitions must be a power of two")
+        self.directory = Path(directory)
+        self.name = name
+        self.budget_bytes = budget_bytes
+        self.partitions = partitions
+        self.count = 0
+        self.spilled = False
+        self._bits = partitions.bit_length() - 1
+        self._buffer: list[np.ndarray] = []
+        self._buffered = 0
+
+    def add(self, keys: np.ndarray, tags):
+        """Add pairs; tags may be an array or one tag for all keys."""
+        if not len(keys):
+            return
+        pairs = np.empty(len(keys), dtype=SPILL_DTYPE)
+        pairs["key"] = keys
+        pairs["tag"] = tags
+        self._buffer.append(pairs)
+        self._buffered += pairs.nbytes
+        self.count += len(pairs)
+        if self._buffered > self.budget_bytes:
+            self._flush()
+
+    def _path(self, prefix: str, partition: int) -> Path:
+        return self.directory / f"{self.name}{prefix}-{partition}.bin"
+
+    def _write(self, pairs: np.ndarray, prefix: str, level: int):
+        """Append pairs to the partition files of one split level."""
+        with np.errstate(over="ignore"):
+            shifted = pairs["key"] << np.uint64(self._bits * level) if level else pairs["key"]
+        partition_ids = (shifted >> np.uint64(64 - self._bits)).astype(np.intp)
+        order = np.argsort(partition_ids, kind="stable")
+        bounds = np.searchsorted(partition_ids[order], np.arange(self.partitions + 1))
+        for partition in range(self.partitions):
+            start, end = bounds[partition], bounds[partition + 1]
+            if start < end:
+                with open(self._path(prefix, partition), "ab") as f:
+                    pairs[order[start:end]].tofile(f)
+
+    def _flush(self):
+        if self._buffer:
+            self._write(np.concatenate(self._buffer), "", 0)
+            self._buffer, self._buffered = [], 0
+            self.spilled = True
+
+    def groups(self) -> Iterator[np.ndarray]:
+        """
+        Yield all pairs, one partition at a time; pairs with equal keys are
+        always yielded together. Spill files are removed as they are read.
+        """
+        if not self.spilled:
+            if self._buffer:
+                yield np.concatenate(self._buffer)
+            self._buffer, self._buffered = [], 0
+            return
+
+        self._flush()
+        for partition in range(self.partitions):
+            yield from self._read(self._path("", partition), 1)
+
+    def _read(self, path: Path, level: int) -> Iterator[np.ndarray]:
+        if not path.exists():
+            return
+        if path.stat().st_size <= self.budget_bytes or level >= _MAX_SPLIT_LEVELS:
+            pairs = np.fromfile(path, dtype=SPILL_DTYPE)
+            path.unlink()
+            yield pairs
+            return
+
+        # Too large for the budget: split it on the next key bits
+        prefix = path.stem[len(self.name):]
+        block_rows = max(self.budget_bytes // SPILL_DTYPE.itemsize, 1)
+        with open(path, "rb") as f:
+            while True:
+                block = np.fromfile(f, dtype=SPILL_DTYPE, count=block_rows)
+                if not len(block):
+                    break
+                self._write(block, prefix, level)
+        path.unlink()
+        for partition in range(self.partitions):
+            yield from self._read(self._path(prefix, partition), level + 1)
+
+
+class ValueSpill:
+    """Non-null float64 values per column, in row order, spilled to files beyond a budget."""
+
+    def __init__(self, directory: Path, budget_bytes: int):
+        self.directory = Path(directory)
+        self.budget_bytes = budget_bytes
+        self.spilled = False
+        self._buffers: dict[int, list[np.ndarray]] = {}
+        self._buffered = 0
+
+    def add(self, column: int, values: np.ndarray):
+        if not len(values):
+            return
+        self._buffers.setdefault(column, []).append(values)
+        self._buffered += values.nbytes
+        if self._buffered > self.budget_bytes:
+            for col, arrays in self._buffers.items():
+                with open(self._path(col), "ab") as f:
+                    for array in arrays:
+                        array.tofile(f)
+            self._buffers, self._buffered = {}, 0
+            self.spilled = True
+
+    def _path(self, column: int) -> Path:
+        return self.directory / f"values-{column}.bin"
+
+    def blocks(self, column: int) -> Iterator[np.ndarray]:
+        """Yield a column's values in row order, in blocks within the budget."""
+        path = self._path(column)
+        if path.exists():
+            block_rows = max(self.budget_bytes // 8, 1)
+            with open(path, "rb") as f:
+                while True:
+                    block = np.fromfile(f, dtype=np.float64, count=block_rows)
+                    if not len(block):
+                        break
+                    yield block
+        yield from self._buffers.get(column, [])
+
+    def select(self, column: int, ranks: list[int], low: float, high: float) -> dict[int, float]:
+        """
+        Exact values at the given ranks of a column's sorted values.
+
+        Loads the values when they fit the budget; otherwise narrows each
+        rank down with histogram passes until its bin fits. Infinite values
+        are left out of the passes (their bin edges would be NaN): ranks in
+        the -inf prefix or +inf suffix are resolved from their counts, and
+        the rest are narrowed over the finite minimum and maximum.
+
+        Args:
+            column: Column index
+            ranks: 0-based ranks in sorted order
+            low: Column minimum
+            high: Column maximum
+        """
+        negative = positive = 0
+        total = None
+        if not (np.isfinite(low) and np.isfinite(high)):
+            total, low, high = 0, np.inf, -np.inf
+            for block in self.blocks(column):
+                total += len(block)
+                negative += int(np.count_nonzero(block == -np.inf))
+                positive += int(np.count_nonzero(block == np.inf))
+                finite = block[np.isfinite(block)]
+                if len(finite):
+                    low, high = min(low, float(finite.min())), max(high, float(finite.max()))
+
+        max_values = max(self.budget_bytes // 8, 1)
+        found = {}
+        for rank in sorted(set(ranks)):
+            if rank < negative:
+                found[rank] = float("-inf")
+                continue
+            if total is not None and rank >= total - positive:
+                found[rank] = float("inf")
+                continue
+            lo, hi, below = low, high, negative
+            while rank not in found:
+                if lo == hi:
+                    found[rank] = float(lo)
+                    break
+                edges = np.linspace(lo, hi, _HISTOGRAM_BINS + 1)
+                histogram = np.zeros(_HISTOGRAM_BINS, dtype=np.int64)
+                collected, inside = [], 0
+                for block in self.blocks(column):
+                    values = block[(block >= lo) & (block <= hi)]
+                    inside += len(values)
+                    if inside <= max_values:
+                        collected.append(values)
+                    bins = np.searchsorted(edges, values, side="right") - 1
+                    histogram += np.bincount(np.clip(bins, 0, _HISTOGRAM_BINS - 1),
+                                             minlength=_HISTOGRAM_BINS)
+                if inside <= max_values:
+                    values = np.sort(np.concatenate(collected))
+                    # The loaded range resolves every remaining rank inside it
+                    for other in ranks:
+                        if other not in found and below <= other < below + inside:
+                            found[other] = float(values[other - below])
+                    break
+                # Bin b holds edges[b] <= v < edges[b + 1] (the last bin includes hi)
+                cumulative = np.cumsum(histogram)
+                b = int(np.searchsorted(cumulative, rank - below, side="right"))
+                below += int(cumulative[b - 1]) if b else 0
+                lo = edges[b]
+                hi = edges[b + 1] if b == _HISTOGRAM_BINS - 1 else np.nextafter(edges[b + 1], -np.inf)
+        return found
+
+
+class RecordSpill:
+    """
+    Fixed-width per-row records (e.g. row signatures) appended in row order,
+    spilled to one file beyond a budget and read back by row number.
+    """
+
+    def __init__(self, directory: Path, name: str, dtype, width: int, budget_bytes: int):
+        self.path = Path(directory) / f"{name}.bin"
+        self.dtype = np.dtype(dtype)
+        self.width = width
+        self.budget_bytes = budget_bytes
+        self.count = 0
+        self.spilled = False
+        self._buffer: list[np.ndarray] = []
+        self._buffered = 0
+
+    def add(self, records: np.ndarray):
+        """Append rows x width records (the next row numbers in order)."""
+        records = np.ascontiguousarray(records, dtype=self.dtype).reshape(-1, self.width)
+        self._buffer.append(records)
+        self._buffered += records.nbytes
+        self.count += len(records)
+        if self._buffered > self.budget_bytes:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            with open(self.path, "ab") as f:
+                for records in self._buffer:
+                    records.tofile(f)
+            self._buffer, self._buffered = [], 0
+            self.spilled = True
+
+    def records(self) -> np.ndarray:
+        """All records as a rows x width array (memory-mapped once spilled)."""
+        if not self.spilled:
+            if not self._buffer:
+                return np.empty((0, self.width), dtype=self.dtype)
+            return np.concatenate(self._buffer)
+        self._flush()
+        return np.memmap(self.path, dtype=self.dtype, mode="r", shape=(self.count, self.width))
@@ -0,0 +1,529 @@
+"""
+Streaming Quality Checker - Exact quality checks without loading the file.
+Large CSV files are read in ChunkedProcessor chunks. Each chunk is reduced to
+a partial state - null counts, numeric moments, string-profile counts,
+pairwise correlation sums and date-order violations - which is merged into
+the running state and the chunk is dropped.
+
+Checks that need every value go to spill stores instead:
+
+- Duplicate rows: a 64-bit fingerprint per row, tagged with its row number
+- Distinct values: 64-bit value hashes per column, deduplicated per chunk
+- Outlier quantiles and samples: numeric values, in row order
+
+Spill stores keep data in memory up to a byte budget and write it to
+hash-partitioned temp files beyond it, so duplicates are found one partition
+at a time. Peak memory is bounded by the chunk size plus the budget.
+
+Chunks may infer different dtypes for one column. Numbers hash the same
+whether a chunk reads them as int or float; a column read as text in some
+chunks and as numbers or booleans in others is read again as text in a
+second pass, the way a full in-memory load sees it.
+"""
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config import QUALITY_STREAMING_MEMORY_MB
+from .chunked_processor import ChunkedProcessor
+from .spill import HashSpill, ValueSpill
+from .row_fingerprints import value_hashes, row_fingerprints, NULL_HASH
+from .quality_checker import QualityChecker
+from .string_profiler import profile_strings, DEDUPLICATE_MAX_RATIO
+from .consistency import DateParser, correlation_sums, correlation_matrix
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE_LIMIT = 5
+
+
+def _column_kind(series: pd.Series, non_null: int) -> str:
+    """How a chunk read a column: empty, bool, numeric or object."""
+    if non_null == 0:
+        return "empty"
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return "numeric"
+    return "object"
+
+
+def summarize_chunk(chunk: pd.DataFrame, offset: int, patterns: dict,
+                    shifts: np.ndarray, date_columns: list,
+                    date_pairs: list[tuple[str, str]],
+                    failed_dates: set,
+                    date_parser: Optional[DateParser] = None) -> dict:
+    """
+    Reduce one chunk to mergeable partial state.
+
+    Args:
+        chunk: Rows of the file
+        offset: Row number of the chunk's first row
+        patterns: Format patterns for text columns
+        shifts: Per-column shift for correlation sums (NaN: not set yet,
+                the chunk mean is used and returned)
+        date_columns: Date-named columns still parsing as dates
+        date_pairs: (start, end) column pairs to check for order violations
+        failed_dates: Date columns that already failed to parse
+        date_parser: Parser carrying each date column's inferred format
+                     across chunks (default: a fresh one)
+
+    Returns:
+        Dict of per-column counts and moments, string profiles, correlation
+        sums, date violations, plus row fingerprints, distinct value hashes
+        and numeric values for the spill stores
+    """
+    rows = len(chunk)
+    non_null = chunk.notna().sum().to_numpy(dtype=np.int64)
+    kinds = [_column_kind(chunk[col], int(non_null[i])) for i, col in enumerate(chunk.columns)]
+
+    column_hashes, distinct, numeric, strings = [], {}, {}, {}
+    for i, col in enumerate(chunk.columns):
+        series = chunk[col]
+        hashes = value_hashes(series)
+        column_hashes.append(hashes)
+        if kinds[i] == "empty":
+            continue
+        distinct[i] = np.unique(hashes[hashes != NULL_HASH])
+
+        if kinds[i] == "numeric":
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            mean = float(values.mean())
+            numeric[i] = {
+                "n": len(values),
+                "mean": mean,
+                "m2": float(np.dot(values - mean, values - mean)),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "negative_count": int((values < 0).sum()),
+                "values": values,
+            }
+        elif kinds[i] == "object":
+            # Row mode plus distinct samples: the full column decides which applies
+            strings[i] = profile_strings(series, patterns, distinct_count=len(distinct[i]),
+                                         min_match_ratio=None, sample_limit=2 * _SAMPLE_LIMIT,
+                                         distinct_samples=True)
+
+    # Pairwise-complete Pearson sums over the chunk's numeric columns
+    correlation = None
+    positions = np.array(list(numeric), dtype=np.intp)
+    if len(positions) >= 2:
+        shifts = shifts.copy()
+        unset = positions[np.isnan(shifts[positions])]
+        shifts[unset] = [numeric[i]["mean"] for i in unset]
+        values = chunk.iloc[:, positions].to_numpy(dtype=np.float64, na_value=np.nan)
+        correlation = correlation_sums(values, shifts[positions])
+        correlation.update({"positions": positions, "shifts": shifts})
+
+    date_parser = date_parser or DateParser()
+    parsed, newly_failed = {}, set()
+    for col in date_columns:
+        if col in failed_dates:
+            continue
+        try:
+            i = chunk.columns.get_loc(col)
+            parsed[col] = date_parser.parse(col, chunk[col], len(distinct.get(i, ())))
+        except (ValueError, TypeError, pd.errors.ParserError):
+            newly_failed.add(col)
+
+    violations, failed_pairs = {}, set()
+    for col1, col2 in date_pairs:
+        if col1 in parsed and col2 in parsed:
+            try:
+                violations[(col1, col2)] = int((parsed[col1] > parsed[col2]).sum())
+            except (ValueError, TypeError, pd.errors.ParserError):
+                failed_pairs.add((col1, col2))
+
+    return {
+        "rows": rows,
+        "offset": offset,
+        "non_null": non_null,
+        "kinds": kinds,
+        "dtypes": list(chunk.dtypes),
+        "fingerprints": row_fingerprints(column_hashes, rows),
+        "distinct": distinct,
+        "numeric": numeric,
+        "strings": strings,
+        "correlation": correlation,
+        "failed_dates": newly_failed,
+        "date_violations": violations,
+        "failed_date_pairs": failed_pairs,
+    }
+
+
+def _merge_samples(current: list, new: list, distinct: bool = False) -> list:
+    """Extend a sample list in order, up to the sample limit."""
+    for value in new:
+        if len(current) >= _SAMPLE_LIMIT:
+            break
+        if not distinct or value not in current:
+            current.append(value)
+    return current
+
+
+class StreamingQualityChecker(QualityChecker):
+    """
+    Exact quality checks on a CSV file, streamed in chunks.
+
+    Produces the same report as QualityChecker on the loaded file, while
+    holding one chunk plus bounded spill buffers in memory.
+
+    Usage:
+        checker = StreamingQualityChecker(Path("big.csv"), "big.csv")
+        report = checker.check_all()
+    """
+
+    def __init__(self, file_path: Path, name: str = "Dataset",
+                 processor: Optional[ChunkedProcessor] = None,
+                 memory_budget_mb: float = QUALITY_STREAMING_MEMORY_MB,
+                 read_options: Optional[dict] = None,
+                 spill_dir: Optional[Path] = None,
+                 on_chunk: Optional[Callable[[int], None]] = None):
+        """
+        Args:
+            file_path: CSV file to check
+            name: Name identifier for the dataset
+            processor: Chunk reader (default: ChunkedProcessor())
+            memory_budget_mb: Memory for spill buffers, shared by row
+                              fingerprints, value hashes and numeric values
+            read_options: Extra pd.read_csv arguments (e.g. encoding)
+            spill_dir: Parent directory for spill files (default: system temp)
+            on_chunk: Optional callback(rows_read) after each chunk
+        """
+        self.df = None  # The file is never loaded
+        self.name = name
+        self.file_path = Path(file_path)
+        self.processor = processor or ChunkedProcessor()
+        self.budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.read_options = read_options or {}
+        self.spill_dir = spill_dir
+        self.on_chunk = on_chunk
+        self._results: Optional[dict] = None
+        self._profiles: Optional[dict] = None
+        self._reset()
+
+    def _reset(self):
+        """Clear the running state before a pass over the file."""
+        self._columns: list = []
+        self._index: dict = {}
+        self._rows = 0
+        self._chunks = 0
+        self._kinds: list[set] = []
+        self._dtypes: list[set] = []
+        self._non_null = np.zeros(0, dtype=np.int64)
+        self._moments: dict[int, dict] = {}
+        self._strings: dict[int, dict] = {}
+        self._shifts = np.zeros(0)
+        self._correlation: Optional[dict] = None
+        self._date_names: list = []
+        self._date_parser = DateParser()
+        self._date_pairs: list[tuple[str, str]] = []
+        self._failed_dates: set = set()
+        self._date_violations: dict[tuple[str, str], int] = {}
+        self._failed_date_pairs: set = set()
+
+    @property
+    def row_count(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> list:
+        return self._columns
+
+    def check_all(self) -> dict:
+        """
+        Stream the file and run all quality checks.
+
+        Returns:
+            QualityChecker report plus mode="streaming" and streaming
+            details (chunks, passes, whether spill files were used)
+        """
+        with tempfile.TemporaryDirectory(prefix="quality-", dir=self.spill_dir) as directory:
+            directory = Path(directory)
+            budget = self.budget_bytes // 3
+            passes, text_columns = 1, set()
+            self._scan(directory, budget, text_columns)
+            mixed = self._mixed_columns()
+            if mixed:
+                # Read those columns as text, as a full load would see them
+                logger.info(f"Re-reading {self.file_path.name} with {len(mixed)} mixed-type column(s) as text")
+                passes, text_columns = 2, mixed
+                self._scan(directory, budget, text_columns)
+
+            self._profiles = self._build_profiles()
+            result = super().check_all()
+            result["mode"] = "streaming"
+            result["streaming"] = {
+                "chunk_size": self.processor.chunk_size,
+                "chunks": self._chunks,
+                "passes": passes,
+                "text_columns": sorted(text_columns, key=self._index.get),
+                "spilled": self._row_spill.spilled or self._value_spill.spilled or self._number_spill.spilled,
+            }
+            self._row_spill = self._value_spill = self._number_spill = None
+        return result
+
+    def _scan(self, directory: Path, budget: int, text_columns: set):
+        """One pass over the file, merging each chunk's partial state."""
+        self._reset()
+        for path in directory.iterdir():
+            path.unlink()
+        self._row_spill = HashSpill(directory, "rows", budget)
+        self._value_spill = HashSpill(directory, "distinct", budget)
+        self._number_spill = ValueSpill(directory, budget)
+
+        options = dict(self.read_options)
+        if text_columns:
+            options["dtype"] = {col: str for col in text_columns}
+
+        mixed = False
+        for chunk in self.processor.read_csv_chunked(self.file_path, **options):
+            if not self._chunks:
+                self._start(list(chunk.columns))
+            if mixed:
+                # A second pass follows; only column types matter now
+                self._merge_kinds(chunk.notna().sum().to_numpy(dtype=np.int64),
+                                  [_column_kind(chunk[col], 1) for col in chunk.columns], list(chunk.dtypes))
+            else:
+                self._merge(summarize_chunk(
+                    chunk, self._rows, self.FORMAT_PATTERNS, self._shifts,
+                    self._date_names, self._date_pairs, self._failed_dates,
+                    self._date_parser,
+                ))
+                mixed = not text_columns and bool(self._mixed_columns())
+            self._rows += len(chunk)
+            self._chunks += 1
+            if self.on_chunk:
+                self.on_chunk(self._rows)
+
+        if not self._chunks:
+            # Header only: no chunks, but the columns still count
+            header = pd.read_csv(self.file_path, nrows=0, **options)
+            self._start(list(header.columns))
+
+    def _start(self, columns: list):
+        """Set up per-column state once the columns are known."""
+        self._columns = columns
+        self._index = {col: i for i, col in enumerate(columns)}
+        k = len(columns)
+        self._kinds = [set() for _ in range(k)]
+        self._dtypes = [set() for _ in range(k)]
+        self._non_null = np.zeros(k, dtype=np.int64)
+        self._shifts = np.full(k, np.nan)
+        self._correlation = {key: np.zeros((k, k)) for key in ("n", "sx", "sxx", "sxy")}
+
+        self._date_names = [col for col in columns if 'date' in col.lower() or 'time' in col.lower()]
+        self._date_pairs = [
+            (col1, col2)
+            for i, col1 in enumerate(self._date_names)
+            for col2 in self._date_names[i+1:]
+            if ('start' in col1.lower() and 'end' in col2.lower()) or
+               ('begin' in col1.lower() and 'end' in col2.lower()) or
+               ('from' in col1.lower() and 'to' in col2.lower())
+        ]
+
+    def _merge_kinds(self, non_null: np.ndarray, kinds: list, dtypes: list):
+        self._non_null += non_null
+        for i, kind in enumerate(kinds):
+            if non_null[i]:
+                self._kinds[i].add(kind)
+                self._dtypes[i].add(dtypes[i])
+
+    def _merge(self, partial: dict):
+        """Fold one chunk's partial state into the running state."""
+        self._merge_kinds(partial["non_null"], partial["kinds"], partial["dtypes"])
+
+        rows = partial["rows"]
+        self._row_spill.add(partial["fingerprints"],
+                            np.arange(partial["offset"], partial["offset"] + rows, dtype=np.int64))
+        for i, hashes in partial["distinct"].items():
+            self._value_spill.add(hashes, i)
+
+        for i, chunk_moments in partial["numeric"].items():
+            self._number_spill.add(i, chunk_moments.pop("values"))
+            moments = self._moments.get(i)
+            if moments is None:
+                self._moments[i] = chunk_moments
+                continue
+            # Chan et al. parallel update of mean and sum of squared deviations
+            n = moments["n"] + chunk_moments["n"]
+            delta = chunk_moments["mean"] - moments["mean"]
+            moments["m2"] += chunk_moments["m2"] + delta * delta * moments["n"] * chunk_moments["n"] / n
+            moments["mean"] += delta * chunk_moments["n"] / n
+            moments["n"] = n
+            moments["min"] = min(moments["min"], chunk_moments["min"])
+            moments["max"] = max(moments["max"], chunk_moments["max"])
+            moments["negative_count"] += chunk_moments["negative_count"]
+
+        for i, profile in partial["strings"].items():
+            self._merge_strings(i, profile)
+
+        correlation = partial["correlation"]
+        if correlation is not None:
+            self._shifts = correlation["shifts"]
+            block = np.ix_(correlation["positions"], correlation["positions"])
+            for key in ("n", "sx", "sxx", "sxy"):
+                self._correlation[key][block] += correlation[key]
+
+        self._failed_dates |= partial["failed_dates"]
+        self._failed_date_pairs |= partial["failed_date_pairs"]
+        for pair, count in partial["date_violations"].items():
+            self._date_violations[pair] = self._date_violations.get(pair, 0) + count
+
+    def _merge_strings(self, i: int, profile: dict):
+        state = self._strings.setdefault(i, {
+            "count": 0,
+            "case": {"upper": 0, "lower": 0, "title": 0},
+            "whitespace": {"leading": 0, "trailing": 0, "multiple": 0},
+            "patterns": {},
+        })
+        state["count"] += profile["count"]
+        for group in ("case", "whitespace"):
+            for key, count in profile[group].items():
+                state[group][key] += count
+        for name, pattern in profile["patterns"].items():
+            merged = state["patterns"].setdefault(name, {"match_count": 0, "row": [], "distinct": []})
+            merged["match_count"] += pattern["match_count"]
+            _merge_samples(merged["row"], pattern["non_matching_samples"])
+            _merge_samples(merged["distinct"], pattern["distinct_non_matching_samples"], distinct=True)
+
+    def _mixed_columns(self) -> set:
+        """Columns read as text in some chunks and as numbers or booleans in others."""
+        return {col for col, kinds in zip(self._columns, self._kinds) if len(kinds) > 1}
+
+    def _final_dtype(self, i: int):
+        """The dtype a full load infers, from the dtypes chunks inferred."""
+        kinds, has_nulls = self._kinds[i], self._non_null[i] < self._rows
+        if "object" in kinds or (kinds == {"bool"} and has_nulls):
+            return np.dtype("object")
+        if kinds == {"bool"}:
+            return np.dtype("bool")
+        if kinds == {"numeric"}:
+            dtype = np.result_type(*self._dtypes[i])
+            return np.dtype("float64") if has_nulls and dtype.kind in "iu" else dtype
+        # Only nulls
+        return np.dtype("float64") if self._rows else np.dtype("object")
+
+    def _build_profiles(self) -> dict:
+        """Column profiles (the fields the checks use) from the merged state."""
+        unique_counts = np.zeros(len(self._columns), dtype=np.int64)
+        for pairs in self._value_spill.groups():
+            order = np.lexsort((pairs["key"], pairs["tag"]))
+            keys, tags = pairs["key"][order], pairs["tag"][order]
+            first = np.ones(len(keys), dtype=bool)
+            first[1:] = (keys[1:] != keys[:-1]) | (tags[1:] != tags[:-1])
+            unique_counts += np.bincount(tags[first], minlength=len(self._columns))
+
+        self._final_dtypes = [self._final_dtype(i) for i in range(len(self._columns))]
+        profiles = {}
+        for i, col in enumerate(self._columns):
+            count = int(self._non_null[i])
+            profile = {
+                "dtype": str(self._final_dtypes[i]),
+                "count": count,
+                "null_count": self._rows - count,
+                "unique_count": int(unique_counts[i]),
+            }
+            if self._final_dtypes[i] == bool:
+                profile["negative_count"] = 0
+            moments = self._moments.get(i)
+            if moments and self._final_dtypes[i].kind in "iuf":
+                n = moments["n"]
+                profile.update({
+                    "min": moments["min"],
+                    "max": moments["max"],
+                    "mean": moments["mean"],
+                    "std": float(np.sqrt(moments["m2"] / (n - 1))) if n > 1 else float("nan"),
+                    "negative_count": moments["negative_count"],
+                })
+                profile.update(self._quartiles(i, n, moments["min"], moments["max"]))
+            profiles[col] = profile
+        return profiles
+
+    def _quartiles(self, i: int, n: int, low: float, high: float) -> dict:
+        """Exact linear-interpolated quartiles (pandas default) from the spilled values."""
+        positions = {name: (n - 1) * q for name, q in (("q1", 0.25), ("q3", 0.75))}
+        ranks = [r for h in positions.values() for r in (int(np.floor(h)), int(np.ceil(h)))]
+        values = self._number_spill.select(i, ranks, low, high)
+        quartiles = {}
+        for name, h in positions.items():
+            lo, hi = int(np.floor(h)), int(np.ceil(h))
+            quartiles[name] = float(values[lo] + (h - lo) * (values[hi] - values[lo]))
+        return quartiles
+
+    def _duplicate_rows(self) -> tuple[int, list]:
+        duplicates = 0
+        sample = np.empty(0, dtype=np.int64)
+        for pairs in self._row_spill.groups():
+            order = np.argsort(pairs["key"], kind="stable")
+            keys = pairs["key"][order]
+            first = np.ones(len(keys), dtype=bool)
+            first[1:] = keys[1:] != keys[:-1]
+            duplicates += len(keys) - int(first.sum())
+
+            # Rows in groups of two or more, as duplicated(keep=False) marks them
+            group = np.cumsum(first) - 1
+            rows = pairs["tag"][order][np.bincount(group)[group] > 1]
+            if len(rows) > 20:
+                rows = np.partition(rows, 19)[:20]
+            sample = np.sort(np.concatenate([sample, rows]))[:20]
+        return duplicates, sample.tolist()
+
+    def _column_dtype(self, col):
+        return self._final_dtypes[self._index[col]]
+
+    def _string_profile(self, col) -> dict:
+        state = self._strings.get(self._index[col])
+        if state is None:
+            return {"count": 0, "case": {"upper": 0, "lower": 0, "title": 0},
+                    "whitespace": {"leading": 0, "trailing": 0, "multiple": 0}, "patterns": {}}
+
+        # A full-column profile samples distinct values when the column deduplicates
+        total = state["count"]
+        distinct = self.profiles[col]["unique_count"] <= total * DEDUPLICATE_MAX_RATIO
+        return {
+            "count": total,
+            "case": state["case"],
+            "whitespace": state["whitespace"],
+            "patterns": {
+                name: {
+                    "match_count": pattern["match_count"],
+                    "non_matching_samples": pattern["distinct" if distinct else "row"],
+                }
+                for name, pattern in state["patterns"].items()
+                if pattern["match_count"] > total * 0.5
+            },
+        }
+
+    def _numeric_columns(self) -> list:
+        return [col for col, dtype in zip(self._columns, self._final_dtypes) if dtype.kind in "iuf"]
+
+    def _correlation_matrix(self, columns: list) -> np.ndarray:
+        positions = [self._index[col] for col in columns]
+        block = np.ix_(positions, positions)
+        return correlation_matrix({key: sums[block] for key, sums in self._correlation.items()})
+
+    def _date_columns(self) -> list:
+        return [col for col in self._date_names if col not in self._failed_dates]
+
+    def _date_order_violations(self, col1: str, col2: str) -> int:
+        if (col1, col2) in self._failed_date_pairs:
+            return 0
+        return self._date_violations.get((col1, col2), 0)
+
+    def _outlier_values(self, col, lower: float, upper: float) -> tuple[int, list]:
+        i = self._index[col]
+        count, sample = 0, []
+        for block in self._number_spill.blocks(i):
+            outliers = block[(block < lower) | (block > upper)]
+            count += len(outliers)
+            if len(sample) < 10:
+                sample.extend(outliers[:10 - len(sample)].tolist())
+        if self._final_dtypes[i].kind in "iu":
+            sample = [int(value) for value in sample]
+        return count, sample
@@ -0,0 +1,212 @@
+"""
+String Profiler Service - Vectorized single-pass analysis of text columns.
+Quality checks need case classes, whitespace problems and format-pattern
+matches for every text column. Each value is classified once with Arrow
+compute kernels (C++, no Python loop per value) and all counts come back
+together.
+
+Low-cardinality columns are deduplicated first (Arrow value_counts), so each
+distinct value is classified once and weighted by its count. Format patterns
+are screened with one combined regex: a pattern can only pass the majority
+test if the combined pattern does, so most free-text columns need a single
+regex pass instead of one per pattern.
+"""
+from typing import Optional
+import logging
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from config import QUALITY_FORMAT_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+# Columns with at most this share of distinct values are classified per distinct value
+DEDUPLICATE_MAX_RATIO = 0.5
+
+# Python's \s on str (str.isspace), as an RE2 class body; RE2's \s is ASCII only
+_PY_SPACE = r"\t-\r\x{1c}-\x{20}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}"
+
+
+def _python_re(pattern: str) -> str:
+    """
+    Rewrite a Python `re` pattern for Arrow's RE2 engine with Python semantics.
+
+    RE2 treats \\d and \\s as ASCII and $ as the very end of the string, while
+    Python matches Unicode digits and whitespace and lets $ match before a
+    trailing newline.
+    """
+    out, in_class, i = [], False, 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            escape = pattern[i + 1]
+            if escape == "d":
+                out.append(r"\p{Nd}")
+            elif escape == "D" and not in_class:
+                out.append(r"\P{Nd}")
+            elif escape == "s":
+                out.append(_PY_SPACE if in_class else f"[{_PY_SPACE}]")
+            elif escape == "S" and not in_class:
+                out.append(f"[^{_PY_SPACE}]")
+            else:
+                out.append(char + escape)
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A ] right after [ or [^ is a literal member of the class
+            out.append(char)
+            i += 1
+            if pattern[i:i + 1] == "^":
+                out.append("^")
+                i += 1
+            if pattern[i:i + 1] == "]":
+                out.append("]")
+                i += 1
+            continue
+        elif char == "$":
+            char = r"(?:\n?\z)"
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def _anchored(pattern: str) -> str:
+    """Anchor a pattern at the start, as re.match / Series.str.match do."""
+    return _python_re(pattern if pattern.startswith("^") else f"^(?:{pattern})")
+
+
+def _to_arrow_strings(series: pd.Series) -> pa.Array:
+    """Non-null values of a column as an Arrow string array."""
+    try:
+        array = pa.array(series, from_pandas=True)
+        if not pa.types.is_string(array.type) and not pa.types.is_large_string(array.type):
+            raise pa.ArrowTypeError("not a string column")
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # Mixed object columns: compare their string forms
+        array = pa.array(series.dropna().astype(str))
+    return array.drop_null() if array.null_count else array
+
+
+def _first_distinct(values: pa.Array, limit: int) -> list:
+    """First `limit` distinct values in order of first appearance."""
+    window = limit * 8
+    while True:
+        distinct = pc.unique(values.slice(0, window))
+        if len(distinct) >= limit or window >= len(values):
+            return distinct.slice(0, limit).to_pylist()
+        window *= 4
+
+
+def _first_rows_in(values: pa.Array, subset: pa.Array, limit: int) -> list:
+    """First `limit` values (in row order, with repeats) that are in subset."""
+    window = limit * 8
+    while True:
+        rows = pc.filter(values.slice(0, window), pc.is_in(values.slice(0, window), value_set=subset))
+        if len(rows) >= limit or window >= len(values):
+            return rows.slice(0, limit).to_pylist()
+        window *= 4
+
+
+def profile_strings(series: pd.Series,
+                    patterns: Optional[dict[str, str]] = None,
+                    distinct_count: Optional[int] = None,
+                    min_match_ratio: Optional[float] = 0.5,
+                    sample_limit: int = 5,
+                    distinct_samples: bool = False) -> dict:
+    """
+    Classify every value of a text column once.
+
+    Args:
+        series: Column to analyze (nulls are ignored)
+        patterns: Named regex patterns (default: QUALITY_FORMAT_PATTERNS)
+        distinct_count: Known distinct count (e.g. from the column profile);
+                        decides whether to classify distinct values only
+        min_match_ratio: Patterns matched by at most this share of values
+                         are not reported (None reports every pattern, e.g.
+                         to merge counts across chunks)
+        sample_limit: Non-matching samples kept per reported pattern
+        distinct_samples: Report both sample kinds, e.g. to merge samples
+                          across chunks: non_matching_samples in row order
+                          (with repeats) and distinct_non_matching_samples
+                          (distinct values in order of first appearance)
+
+    Returns:
+        Dict with count (non-null values), case (upper/lower/title counts),
+        whitespace (leading/trailing/multiple counts) and patterns
+        ({name: {match_count, non_matching_samples}} for patterns matched by
+        more than min_match_ratio of values)
+    """
+    patterns = QUALITY_FORMAT_PATTERNS if patterns is None else patterns
+    values = _to_arrow_strings(series)
+    total = len(values)
+
+    counts = None
+    rows = values
+    if total and distinct_count is not None and distinct_count <= total * DEDUPLICATE_MAX_RATIO:
+        value_counts = pc.value_counts(values)
+        values = value_counts.field("values")
+        counts = value_counts.field("counts").to_numpy()
+
+    def count(mask: pa.Array) -> int:
+        flags = mask.to_numpy(zero_copy_only=False)
+        return int(flags.sum() if counts is None else counts[flags].sum())
+
+    result = {
+        "count": total,
+        "case": {"upper": 0, "lower": 0, "title": 0},
+        "whitespace": {"leading": 0, "trailing": 0, "multiple": 0},
+        "patterns": {},
+    }
+    if total == 0:
+        return result
+
+    result["case"] = {
+        "upper": count(pc.utf8_is_upper(values)),
+        "lower": count(pc.utf8_is_lower(values)),
+        "title": count(pc.utf8_is_title(values)),
+    }
+    # Most ID and code columns have no whitespace at all: one scan decides
+    if pc.any(pc.match_substring_regex(values, _python_re(r"\s"))).as_py():
+        result["whitespace"] = {
+            "leading": count(pc.match_substring_regex(values, _python_re(r"^\s"))),
+            "trailing": count(pc.match_substring_regex(values, _python_re(r"\s$"))),
+            "multiple": count(pc.match_substring_regex(values, _python_re(r"\s{2,}"))),
+        }
+
+    if not patterns:
+        return result
+
+    # Screen all patterns at once; only values matching some pattern can count
+    combined = "|".join(f"(?:{_anchored(p)})" for p in patterns.values())
+    any_match = pc.match_substring_regex(values, combined)
+    any_count = count(any_match)
+    if min_match_ratio is not None and any_count <= total * min_match_ratio:
+        return result
+
+    for name, pattern in patterns.items():
+        # Nothing matched the combined pattern: no pattern needs its own scan
+        matches = pc.match_substring_regex(values, _anchored(pattern)) if any_count else any_match
+        match_count = count(matches)
+        if min_match_ratio is None or match_count > total * min_match_ratio:
+            non_matching = pc.filter(values, pc.invert(matches))
+            result["patterns"][name] = {
+                "match_count": match_count,
+                "non_matching_samples": non_matching.slice(0, sample_limit).to_pylist(),
+            }
+            if distinct_samples and counts is not None:
+                # Deduplicated values are distinct, in first-appearance order
+                result["patterns"][name].update({
+                    "non_matching_samples": _first_rows_in(rows, non_matching, sample_limit),
+                    "distinct_non_matching_samples": non_matching.slice(0, sample_limit).to_pylist(),
+                })
+            elif distinct_samples:
+                result["patterns"][name]["distinct_non_matching_samples"] = (
+                    _first_distinct(non_matching, sample_limit)
+                )
+
+    return result
@@ -13,6 +13,7 @@ from typing import Any, Optional, Dict
 import logging
 
 from config import TASK_RESULT_TTL, TASK_CLEANUP_INTERVAL
+from . import metrics as stage_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,8 @@ class Task:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
+    partial_results: Dict[str, Any] = field(default_factory=dict)  # Per-item results so far
+    metrics: Optional[dict] = None  # Stage timings and memory of the run (services.metrics)
     
     def to_dict(self) -> dict:
         """Convert task to dictionary for API response."""
@@ -52,6 +55,8 @@ class Task:
             "updated_at": self.updated_at.isoformat(),
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "has_result": self.result is not None,
+            "partial_results": dict(self.partial_results),
+            "metrics": self.metrics,
         }
 
 
@@ -129,18 +134,28 @@ class TaskStore:
         with self._task_lock:
             return self._tasks.get(task_id)
     
-    def update_progress(self, task_id: str, progress: int, message: str = ""):
-        """Update task progress (0-100)."""
+    def update_progress(self, task_id: str, progress: int, message: str = "",
+                        partial: Optional[Dict[str, Any]] = None):
+        """
+        Update task progress (0-100).
+        
+        Args:
+            partial: Optional per-item results to merge into partial_results
+                     (e.g. one file's summary as soon as it is checked)
+        """
         with self._task_lock:
             task = self._tasks.get(task_id)
             if task:
                 task.status = TaskStatus.IN_PROGRESS
                 task.progress = min(100, max(0, progress))
                 task.message = message
+                if partial:
+                    task.partial_results.update(partial)
                 task.updated_at = datetime.now()
     
     def complete_task(self, task_id: str, result: Any):
-        """Mark task as completed with result."""
+        """Mark task as completed with result (and the run's metrics, when recorded)."""
+        metrics = stage_metrics.snapshot()
         with self._task_lock:
             task = self._tasks.get(task_id)
             if task:
@@ -148,17 +163,23 @@ class TaskStore:
                 task.progress = 100
                 task.message = "Completed"
                 task.result = result
+                task.metrics = metrics
                 task.updated_at = datetime.now()
                 task.completed_at = datetime.now()
                 logger.info(f"Task {task_id} completed successfully")
     
     def fail_task(self, task_id: str, error: str):
-        """Mark task as failed with error message."""
+        """Mark task as failed with error message (and the run's metrics, when recorded)."""
+        recorder = stage_metrics.current()
+        if recorder is not None:
+            recorder.fail()
+        metrics = stage_metrics.snapshot()
         with self._task_lock:
             task = self._tasks.get(task_id)
             if task:
                 task.status = TaskStatus.FAILED
                 task.error = error
+                task.metrics = metrics
                 task.message = f"Failed: {error}"
                 task.updated_at = datetime.now()
                 task.completed_at = datetime.now()
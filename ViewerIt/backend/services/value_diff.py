@@ -0,0 +1,129 @@
+"""
+Value Diff - Mismatching rows of key-aligned column pairs.
+Compares many columns of two row-aligned frames (e.g. datacompy's
+intersect_rows) with datacompy's rules: two nulls match, a null and a value
+do not, numbers match within abs_tol + rel_tol * |right| (np.isclose), and
+text matches after optional whitespace stripping and upper-casing.
+
+Numeric and text pairs go to viewerit_core's diff kernel as Arrow arrays
+when the built extension has it (columns compared in parallel, without the
+GIL), otherwise to the vectorized NumPy/pandas fallback below. Other pairs
+(dates, categoricals, mixed types) use datacompy's columns_equal directly.
+"""
+from typing import Optional
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from datacompy.core import columns_equal
+
+logger = logging.getLogger(__name__)
+
+# Try to import the Rust diff kernel
+try:
+    from viewerit_core import diff_columns as _native_diff_columns
+    NATIVE_DIFF_AVAILABLE = True
+except ImportError:
+    NATIVE_DIFF_AVAILABLE = False
+
+NUMERIC = "numeric"
+TEXT = "text"
+
+
+def column_kind(col_1: pd.Series, col_2: pd.Series) -> Optional[str]:
+    """
+    How a column pair is compared: NUMERIC, TEXT, or None when only
+    datacompy's columns_equal reproduces its rules.
+    """
+    if col_1.dtype.kind in "biuf" and col_2.dtype.kind in "biuf":
+        return NUMERIC
+    if all(
+        (col.dtype == object or isinstance(col.dtype, pd.StringDtype))
+        and pd.api.types.infer_dtype(col) == "string"
+        for col in (col_1, col_2)
+    ):
+        return TEXT
+    return None
+
+
+def _numeric_mismatches(col_1: pd.Series, col_2: pd.Series,
+                        abs_tol: float, rel_tol: float) -> np.ndarray:
+    values1 = col_1.to_numpy(dtype=np.float64)
+    values2 = col_2.to_numpy(dtype=np.float64)
+    return np.flatnonzero(~np.isclose(values1, values2, rtol=rel_tol, atol=abs_tol, equal_nan=True))
+
+
+def _normalize_text(col: pd.Series, ignore_spaces: bool, ignore_case: bool) -> pd.Series:
+    col = col.str.strip() if ignore_spaces else col
+    return col.str.upper() if ignore_case else col
+
+
+def _text_mismatches(col_1: pd.Series, col_2: pd.Series,
+                     ignore_spaces: bool, ignore_case: bool) -> np.ndarray:
+    values1 = _normalize_text(col_1, ignore_spaces, ignore_case)
+    values2 = _normalize_text(col_2, ignore_spaces, ignore_case)
+    nulls1, nulls2 = values1.isna().to_numpy(), values2.isna().to_numpy()
+    equal = (values1.to_numpy(dtype=object, na_value="") == values2.to_numpy(dtype=object, na_value="")) \
+        & ~nulls1 & ~nulls2
+    return np.flatnonzero(~(equal | (nulls1 & nulls2)))
+
+
+def _to_arrow(col: pd.Series, kind: str) -> pa.Array:
+    if kind == NUMERIC:
+        return pa.array(col.to_numpy(dtype=np.float64), type=pa.float64())
+    return pa.array(col.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True)
+
+
+def diff_columns(pairs: list[tuple[pd.Series, pd.Series]],
+                 abs_tol: float = 0.0,
+                 rel_tol: float = 0.0,
+                 ignore_spaces: bool = False,
+                 ignore_case: bool = False,
+                 native: Optional[bool] = None) -> list[np.ndarray]:
+    """
+    Find the rows where each column pair differs.
+
+    Args:
+        pairs: (left, right) columns of equal length, aligned row by row
+        abs_tol: Absolute tolerance for numeric comparisons
+        rel_tol: Relative tolerance for numeric comparisons
+        ignore_spaces: Strip leading/trailing whitespace from text first
+        ignore_case: Compare text case-insensitively
+        native: Use viewerit_core's kernel (default: when available)
+
+    Returns:
+        Positions (int64) of the mismatching rows of each pair, in order; a
+        pair's mismatch count is the length of its array
+    """
+    for col_1, col_2 in pairs:
+        if len(col_1) != len(col_2):
+            raise ValueError(f"Column lengths differ: {len(col_1)} and {len(col_2)}")
+    use_native = NATIVE_DIFF_AVAILABLE if native is None else native and NATIVE_DIFF_AVAILABLE
+
+    kinds = [column_kind(col_1, col_2) for col_1, col_2 in pairs]
+    results: list[Optional[np.ndarray]] = [None] * len(pairs)
+
+    kernel = [i for i, kind in enumerate(kinds) if kind is not None]
+    if use_native and kernel:
+        logger.debug(f"Diffing {len(kernel)} columns in viewerit_core")
+        positions = _native_diff_columns(
+            [_to_arrow(pairs[i][0], kinds[i]) for i in kernel],
+            [_to_arrow(pairs[i][1], kinds[i]) for i in kernel],
+            abs_tol=abs_tol, rel_tol=rel_tol,
+            ignore_spaces=ignore_spaces, ignore_case=ignore_case,
+        )
+        for i, array in zip(kernel, positions):
+            results[i] = array.to_numpy().astype(np.int64)
+
+    for i, ((col_1, col_2), kind) in enumerate(zip(pairs, kinds)):
+        if results[i] is not None:
+            continue
+        if kind == NUMERIC:
+            results[i] = _numeric_mismatches(col_1, col_2, abs_tol, rel_tol)
+        elif kind == TEXT:
+            results[i] = _text_mismatches(col_1, col_2, ignore_spaces, ignore_case)
+        else:
+            match = columns_equal(col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case)
+            results[i] = np.flatnonzero(~match.to_numpy(dtype=bool))
+    return results
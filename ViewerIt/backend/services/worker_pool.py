@@ -0,0 +1,161 @@
+"""
+Worker Pool - Shared local process pool with a memory budget.
+Runs independent per-file jobs (load + check, etc.) in separate processes,
+so CPU-bound pandas work uses every core and each job's peak memory is
+returned to the OS when it finishes.
+
+Each job carries an estimate of the memory it needs. Jobs are started,
+largest first, while the estimates of everything running (across all
+callers sharing the pool) fit the budget; a single job larger than the
+budget still runs, alone. Results are yielded as jobs complete.
+
+100% local - worker processes are started on this machine only.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from config import WORKER_POOL_MAX_WORKERS, WORKER_POOL_MEMORY_MB
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolJob:
+    """A picklable unit of work: fn(*args) in a worker, needing about memory_bytes."""
+    fn: Callable
+    args: tuple = ()
+    memory_bytes: int = 0
+    kwargs: dict = field(default_factory=dict)
+
+
+class WorkerPool:
+    """
+    Process pool shared by the services, bounded by workers and memory.
+
+    Usage:
+        jobs = {"a.csv": PoolJob(check_file, ("a.csv",), memory_bytes=500 << 20)}
+        for name, result in worker_pool.run(jobs):
+            ...
+    """
+
+    def __init__(self, max_workers: int = WORKER_POOL_MAX_WORKERS,
+                 memory_budget_mb: float = WORKER_POOL_MEMORY_MB):
+        """
+        Args:
+            max_workers: Worker processes
+            memory_budget_mb: Combined memory estimate of running jobs
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._reserved = 0
+        self._running = 0
+        self._condition = threading.Condition()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: workers never inherit the server's threads or locks
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Drop a broken executor (e.g. a worker was killed) so the next run starts fresh."""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _try_reserve(self, memory_bytes: int) -> bool:
+        """Claim a worker and memory for a job if both are free (or nothing runs)."""
+        with self._condition:
+            if self._running == 0 or (
+                self._running < self.max_workers and self._reserved + memory_bytes <= self.budget_bytes
+            ):
+                self._reserved += memory_bytes
+                self._running += 1
+                return True
+            return False
+
+    def _release(self, memory_bytes: int):
+        with self._condition:
+            self._reserved -= memory_bytes
+            self._running -= 1
+            self._condition.notify_all()
+
+    def run(self, jobs: dict[str, PoolJob]) -> Iterator[tuple[str, object]]:
+        """
+        Run jobs in the pool, yielding (name, result) as each completes.
+
+        When the caller is measured (services.metrics), each job is measured
+        in its worker and merged into the caller's stages.
+
+        Raises:
+            Exception: The first job exception (remaining jobs are cancelled)
+        """
+        recorder = metrics.current()
+        executor = self._get_executor()
+        pending = sorted(jobs.items(), key=lambda item: item[1].memory_bytes, reverse=True)
+        running = {}
+
+        try:
+            while pending or running:
+                # Start every pending job that fits, largest first
+                for name, job in list(pending):
+                    if self._try_reserve(job.memory_bytes):
+                        pending.remove((name, job))
+                        try:
+                            if recorder is None:
+                                future = executor.submit(job.fn, *job.args, **job.kwargs)
+                            else:
+                                future = executor.submit(metrics.measured_job, job.fn, *job.args, **job.kwargs)
+                        except BaseException:
+                            self._release(job.memory_bytes)
+                            raise
+                        # Released when the job finishes, even if this caller stops waiting
+                        future.add_done_callback(lambda _, size=job.memory_bytes: self._release(size))
+                        running[future] = name
+
+                if not running:
+                    # Other callers hold the pool; wait for one of their jobs to finish
+                    with self._condition:
+                        self._condition.wait(timeout=1.0)
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if recorder is not None:
+                        result = recorder.merge_worker(result)
+                    yield running.pop(future), result
+        except BrokenProcessPool:
+            logger.error("Worker process died; restarting the worker pool")
+            self._discard_executor(executor)
+            raise
+        finally:
+            for future in running:
+                future.cancel()
+
+    def shutdown(self):
+        """Stop the worker processes (they restart on the next run)."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Shared instance (workers start on first use)
+worker_pool = WorkerPool()
@@ -0,0 +1,95 @@
+"""
+Tests for the MinHash/LSH column mapper.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.column_mapper import ColumnMapper, name_ngrams
+from services.schema_analyzer import SchemaAnalyzer
+
+
+@pytest.fixture
+def renamed_files():
+    """Two files where columns were renamed but kept their values."""
+    rng = np.random.default_rng(7)
+    doc_ids = [f"DOC{n:06d}" for n in rng.choice(10**6, 200, replace=False)]
+    amounts = rng.normal(100, 25, 200).round(2)
+    file1 = pd.DataFrame({
+        "doc_id": doc_ids,
+        "bates_begin": [f"ABC{n:07d}" for n in range(200)],
+        "amount": amounts,
+    })
+    file2 = pd.DataFrame({
+        "DocID": doc_ids,
+        "production_start": [f"ABC{n:07d}" for n in range(200)],
+        "amount": amounts,
+    })
+    return {"file1.csv": file1, "file2.csv": file2}
+
+
+class TestColumnMapper:
+    """Test suite for candidate column pairs."""
+
+    def test_name_ngrams_normalized(self):
+        """Test that case and separators do not change name n-grams."""
+        assert name_ngrams("Doc_ID") == name_ngrams("docid") == {"^do", "doc", "oci", "cid", "id$"}
+        assert name_ngrams("x") == {"^x$"}
+
+    def test_identical_values_give_equal_signatures(self):
+        """Test that row order and int/float typing do not change a signature."""
+        mapper = ColumnMapper()
+        values = pd.Series(np.arange(500))
+        sig1 = mapper.signature(mapper.value_hashes(values))
+        sig2 = mapper.signature(mapper.value_hashes(values.sample(frac=1, random_state=1).astype(float)))
+        assert np.array_equal(sig1, sig2)
+
+    def test_signature_estimates_jaccard(self):
+        """Test that signature agreement tracks the true value overlap."""
+        mapper = ColumnMapper(num_perm=256, bands=64, sample_rows=10000)
+        a = mapper.signature(mapper.value_hashes(pd.Series(np.arange(0, 3000))))
+        b = mapper.signature(mapper.value_hashes(pd.Series(np.arange(1000, 4000))))
+        # |A & B| / |A | B| = 2000 / 4000
+        assert np.mean(a == b) == pytest.approx(0.5, abs=0.1)
+
+    def test_low_cardinality_columns_unsigned(self):
+        """Test that flag-like columns get no value signature."""
+        mapper = ColumnMapper()
+        assert mapper.signature(mapper.value_hashes(pd.Series(["Y", "N"] * 50))) is None
+
+    def test_candidates_by_name_and_value(self, renamed_files):
+        """Test that renamed columns are found by name or by contents."""
+        mapper = ColumnMapper()
+        for name, df in renamed_files.items():
+            mapper.add_file(name, df)
+        pairs = {(p["column1"], p["column2"]): p for p in mapper.candidate_pairs()}
+
+        # Similar name (and identical values)
+        assert ("doc_id", "DocID") in pairs
+        assert pairs[("doc_id", "DocID")]["value_similarity"] == 1.0
+        # Unrelated names, identical values
+        assert ("bates_begin", "production_start") in pairs
+        # Columns present in both files are never mapped
+        assert not any("amount" in pair for pair in pairs)
+
+
+class TestSchemaAnalyzerMappings:
+    """Test mapping suggestions built on the column mapper."""
+
+    def test_value_only_rename_suggested(self, renamed_files):
+        """Test that a rename with no name similarity is suggested from its values."""
+        result = SchemaAnalyzer(renamed_files).analyze()
+        suggestions = {
+            (s["column1"], s["column2"]): s
+            for s in result["mapping_suggestions"]["suggestions"]
+        }
+
+        suggestion = suggestions[("bates_begin", "production_start")]
+        assert suggestion["value_similarity"] == 1.0
+        assert any(reason.startswith("Value overlap") for reason in suggestion["match_reasons"])
+        assert ("doc_id", "DocID") in suggestions
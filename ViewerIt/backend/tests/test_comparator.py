@@ -156,6 +156,65 @@ class TestDataComparator:
         # If there are differences, they should have the expected structure
         for diff in diffs:
             assert "row_index" in diff or "value_in_df1" in diff
+        
+        # Bob -> Bobby is the only name change among shared ids
+        assert len(diffs) == 1
+        assert diffs[0]["value_in_df1"] == "Bob"
+        assert diffs[0]["value_in_df2"] == "Bobby"
+        
+        # Unknown columns are reported, not silently ignored
+        with pytest.raises(ValueError):
+            comparator.get_detailed_diff("missing_column")
+    
+    def test_get_detailed_diffs_all_columns(self, sample_csv_data, sample_csv_data_modified):
+        """Test the batched, columnar drill-down with pagination."""
+        comparator = DataComparator(
+            sample_csv_data,
+            sample_csv_data_modified,
+            "Original",
+            "Modified"
+        )
+        comparator.compare(join_columns=["id"])
+        
+        result = comparator.get_detailed_diffs()
+        pages = result["columns"]
+        
+        assert result["join_columns"] == ["id"]
+        assert set(pages) == {"name", "amount", "date", "category"}
+        assert pages["name"]["total"] == 1
+        assert pages["name"]["keys"]["id"] == [2]
+        assert pages["amount"]["total"] == 1
+        assert pages["date"]["total"] == 0
+        assert pages["date"]["value_in_df1"] == []
+        
+        # Pagination applies per column
+        second_page = comparator.get_detailed_diffs(["name"], limit=1, offset=1)
+        assert second_page["columns"]["name"]["total"] == 1
+        assert second_page["columns"]["name"]["value_in_df1"] == []
+    
+    def test_get_row_diff(self, sample_csv_data, sample_csv_data_modified):
+        """Test getting both versions of a single row."""
+        comparator = DataComparator(
+            sample_csv_data,
+            sample_csv_data_modified,
+            "Original",
+            "Modified"
+        )
+        comparator.compare(join_columns=["id"])
+        
+        row_diff = comparator.get_row_diff({"id": "2"})
+        assert row_diff["in_df1"] and row_diff["in_df2"]
+        assert row_diff["df1_row"]["name"] == "Bob"
+        assert row_diff["df2_row"]["name"] == "Bobby"
+        changed = {d["column"] for d in row_diff["differences"]}
+        assert changed == {"name", "amount"}
+        
+        only_df1 = comparator.get_row_diff({"id": 4})
+        assert only_df1["in_df1"] and not only_df1["in_df2"]
+        assert only_df1["differences"] == []
+        
+        with pytest.raises(ValueError):
+            comparator.get_row_diff({"name": "Bob"})
     
     def test_comparison_report(self, sample_csv_data, sample_csv_data_modified):
         """Test that comparison generates a text report."""
@@ -185,3 +244,30 @@ class TestDataComparator:
         assert result["summary"]["df1_rows"] == 0
         assert result["summary"]["df2_rows"] == 0
 
+
+
+class TestColumnDiffEndpoint:
+    """Paging through /compare/column-diff."""
+
+    def test_offset_returns_next_page(self):
+        from fastapi.testclient import TestClient
+        from main import app
+        from services.file_handler import FileHandler
+
+        df1 = pd.DataFrame({"id": range(6), "amount": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0]})
+        df2 = df1.assign(amount=df1["amount"] + 1)
+        session_id = FileHandler.save_uploaded_file(df1.to_csv(index=False).encode(), "a.csv")
+        try:
+            FileHandler.save_uploaded_file(df2.to_csv(index=False).encode(), "b.csv", session_id)
+            client = TestClient(app)
+            params = {"session_id": session_id, "file1": "a.csv", "file2": "b.csv",
+                      "diff_column": "amount", "limit": 4}
+            pages = [client.post("/compare/column-diff", params={**params, "offset": offset}, json=["id"])
+                     for offset in (0, 4)]
+        finally:
+            FileHandler.cleanup_session(session_id)
+
+        first, second = (page.json() for page in pages)
+        assert [diff["value_in_df1"] for diff in first["differences"]] == ["10.0", "20.0", "30.0", "40.0"]
+        assert [diff["value_in_df1"] for diff in second["differences"]] == ["50.0", "60.0"]
+        assert second["count"] == 2
@@ -0,0 +1,112 @@
+"""
+Tests for composite key extraction from CSV files (native and Python fallback).
+"""
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.chunked_processor import ChunkedProcessor, NATIVE_CSV_KEYS
+from services.worker_pool import WorkerPool
+
+
+@pytest.fixture
+def processor():
+    """A processor using the Python fallback, reading serially."""
+    processor = ChunkedProcessor(chunk_size=2, pool=WorkerPool(max_workers=1))
+    processor._native_keys = False
+    return processor
+
+
+@pytest.fixture
+def key_files(tmp_path):
+    """Three load files sharing some control numbers."""
+    contents = {
+        "vol1.csv": "control,volume,note\n007,A,first\n008,A,\"comma, inside\"\n009,A,\n",
+        "vol2.csv": "control,volume,note\n007,A,x\n010,B,y\n",
+        "vol3.csv": "volume,control\nA,007\nA,008\nC,011\n",
+    }
+    paths = []
+    for name, text in contents.items():
+        path = tmp_path / name
+        path.write_text(text)
+        paths.append(path)
+    return paths
+
+
+class TestFindUniqueKeys:
+    """Keys are the key columns' CSV text joined with "|"."""
+
+    def test_keys_are_raw_text(self, processor, key_files):
+        keys = processor.find_unique_keys_chunked(key_files[0], ["control", "volume"])
+
+        assert keys == {"007|A", "008|A", "009|A"}
+
+    def test_quoted_and_empty_fields(self, processor, key_files):
+        keys = processor.find_unique_keys_chunked(key_files[0], ["note"])
+
+        assert keys == {"first", "comma, inside", ""}
+
+    def test_short_rows_key_as_empty(self, processor, tmp_path):
+        path = tmp_path / "short.csv"
+        path.write_text("a,b\n1,NA\n2\n")
+
+        assert processor.find_unique_keys_chunked(path, ["a", "b"]) == {"1|NA", "2|"}
+
+    def test_missing_key_column(self, processor, key_files):
+        assert processor.find_unique_keys_chunked(key_files[0], ["control", "missing"]) == set()
+
+    def test_latin1_file(self, processor, tmp_path):
+        path = tmp_path / "latin1.csv"
+        path.write_bytes("name,id\nJos\xe9,1\n".encode("latin-1"))
+
+        assert processor.find_unique_keys_chunked(path, ["name"]) == {"Jos\xe9"}
+
+    def test_column_order_follows_key_columns(self, processor, key_files):
+        keys = processor.find_unique_keys_chunked(key_files[2], ["control", "volume"])
+
+        assert keys == {"007|A", "008|A", "011|C"}
+
+
+class TestChunkedKeyComparison:
+    """Two- and multi-file comparisons over extracted keys."""
+
+    def test_compare_two_files(self, processor, key_files):
+        result = processor.compare_large_files_chunked(key_files[0], key_files[1], ["control"])
+
+        assert result["file1_keys"] == 3
+        assert result["common_keys"] == 1
+        assert result["only_in_file1"] == 2
+        assert sorted(result["only_in_file1_sample"]) == ["008", "009"]
+        assert result["only_in_file2_sample"] == ["010"]
+        assert result["overlap_percentage"] == 25.0
+
+    def test_compare_multiple_files(self, processor, key_files):
+        result = processor.compare_multiple_files_chunked(key_files, ["control", "volume"])
+
+        assert result["file_names"] == ["vol1.csv", "vol2.csv", "vol3.csv"]
+        assert result["total_unique_keys"] == 5
+        assert result["keys_in_all_files"] == 1
+        assert result["file_exclusive_counts"] == {"vol1.csv": 1, "vol2.csv": 1, "vol3.csv": 1}
+
+
+@pytest.mark.skipif(not NATIVE_CSV_KEYS, reason="viewerit_core without native CSV key extraction")
+class TestNativeKeys:
+    """viewerit_core's reader keys files exactly as the Python fallback does."""
+
+    def test_native_matches_fallback(self, processor, key_files, tmp_path):
+        native = ChunkedProcessor(pool=WorkerPool(max_workers=1))
+        quoted = tmp_path / "quoted.csv"
+        pd.DataFrame({"id": ["1", "2", "3"], "note": ["two\nlines", 'say "hi"', ""]}).to_csv(quoted, index=False)
+
+        for path, columns in [(key_files[0], ["control", "volume"]), (key_files[0], ["note"]),
+                              (key_files[2], ["control"]), (quoted, ["id", "note"]),
+                              (key_files[1], ["missing"])]:
+            assert native.find_unique_keys_chunked(path, columns) == \
+                processor.find_unique_keys_chunked(path, columns)
+
+        assert native.compare_multiple_files_chunked(key_files, ["control"]) == \
+            {**processor.compare_multiple_files_chunked(key_files, ["control"]), "rust_accelerated": True}
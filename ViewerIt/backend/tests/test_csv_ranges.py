@@ -0,0 +1,104 @@
+"""
+Tests for quote-aware CSV byte ranges and parallel chunked processing.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.csv_ranges import split_csv_ranges, read_csv_range
+from services.chunked_processor import ChunkedProcessor
+from services.worker_pool import WorkerPool
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """One pool for the module; spawning workers is the slow part."""
+    pool = WorkerPool(max_workers=2, memory_budget_mb=100_000)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def quoted_csv(tmp_path):
+    """A CSV with quoted newlines, escaped quotes and commas inside fields."""
+    rng = np.random.default_rng(4)
+    n = 400
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "note": rng.choice(['plain', 'two\nlines', 'say ""hi""\nthen, bye', '"quoted"', ''], n),
+        "amount": rng.normal(50, 10, n).round(2),
+    })
+    path = tmp_path / "quoted.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def read_ranges(path: Path, range_bytes: int) -> pd.DataFrame:
+    header_end, ranges = split_csv_ranges(path, range_bytes)
+    frames = [chunk for start, end in ranges for chunk in read_csv_range(path, header_end, start, end, 1000)]
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestSplitCsvRanges:
+    """Test suite for record-boundary byte ranges."""
+
+    @pytest.mark.parametrize("range_bytes", [1, 7, 64, 1000, 10 ** 9])
+    def test_ranges_parse_to_whole_file(self, quoted_csv, range_bytes):
+        header_end, ranges = split_csv_ranges(quoted_csv, range_bytes)
+
+        assert ranges[0][0] == header_end
+        assert ranges[-1][1] == quoted_csv.stat().st_size
+        assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+        pd.testing.assert_frame_equal(read_ranges(quoted_csv, range_bytes), pd.read_csv(quoted_csv))
+
+    def test_header_only(self, tmp_path):
+        path = tmp_path / "empty.csv"
+        path.write_text("a,b\n")
+
+        assert split_csv_ranges(path, 10) == (4, [])
+
+    def test_invalid_range_bytes(self, quoted_csv):
+        with pytest.raises(ValueError):
+            split_csv_ranges(quoted_csv, 0)
+
+
+class TestParallelChunkedProcessor:
+    """Byte ranges processed in the worker pool, reduced in file order."""
+
+    def test_statistics_and_keys_match_serial(self, quoted_csv, pool):
+        serial = ChunkedProcessor(chunk_size=50, pool=WorkerPool(max_workers=1))
+        parallel = ChunkedProcessor(chunk_size=50, range_bytes=2000, pool=pool)
+
+        ranges = parallel.map_ranges(quoted_csv, list)
+        assert len(ranges) > 2
+        pd.testing.assert_frame_equal(pd.concat([chunk for chunks in ranges for chunk in chunks], ignore_index=True),
+                                      pd.read_csv(quoted_csv))
+        assert parallel.get_chunked_statistics(quoted_csv) == serial.get_chunked_statistics(quoted_csv)
+        assert parallel.find_unique_keys_chunked(quoted_csv, ["id", "note"]) == \
+            serial.find_unique_keys_chunked(quoted_csv, ["id", "note"])
+        assert parallel.process_chunked(quoted_csv, len, sum) == 400
+
+    def test_unpicklable_processor_runs_serially(self, quoted_csv, pool):
+        processor = ChunkedProcessor(chunk_size=50, range_bytes=2000, pool=pool)
+
+        assert processor.map_ranges(quoted_csv, lambda chunks: 0) is None
+        assert processor.process_chunked(quoted_csv, lambda chunk: len(chunk), sum) == 400
+
+    def test_stray_quote_falls_back_to_serial(self, tmp_path, pool):
+        """Test that an unquoted inch mark (which the parser reads literally) cannot corrupt the result."""
+        # The odd quote flips the parity, so a boundary lands inside a quoted newline
+        rows = ['0,5" screen,x'] + [f'{i},"multi\nline",y' for i in range(1, 200)]
+        path = tmp_path / "stray.csv"
+        path.write_text("id,item,flag\n" + "\n".join(rows) + "\n")
+        processor = ChunkedProcessor(chunk_size=30, range_bytes=500, pool=pool)
+
+        with pytest.raises(pd.errors.ParserError):
+            read_ranges(path, 500)
+        keys = processor.find_unique_keys_chunked(path, ["id"])
+
+        assert keys == {str(i) for i in range(200)}
@@ -0,0 +1,115 @@
+"""
+Tests for the DiffExporter service.
+"""
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.diff_exporter as diff_exporter
+from services.diff_exporter import DiffExporter
+from services.comparator import DataComparator
+from services.multi_comparator import MultiFileComparator
+
+
+@pytest.fixture
+def exporter_uploads(tmp_path, monkeypatch):
+    """Point the exporter at a temporary uploads directory."""
+    monkeypatch.setattr(diff_exporter, "UPLOADS_DIR", tmp_path)
+    return tmp_path
+
+
+class TestDiffExporter:
+    """Test suite for DiffExporter class."""
+
+    def test_invalid_format(self):
+        """Test that unsupported formats are rejected."""
+        with pytest.raises(ValueError):
+            DiffExporter("session", format="xlsx")
+
+    @pytest.mark.parametrize("fmt", ["parquet", "csv"])
+    def test_export_pairwise_full_sets(self, exporter_uploads, fmt,
+                                       sample_csv_data, sample_csv_data_modified):
+        """Test that pairwise exports contain every difference, not samples."""
+        comparator = DataComparator(sample_csv_data, sample_csv_data_modified, "A", "B")
+        comparator.compare(join_columns=["id"])
+
+        manifest = DiffExporter("session", format=fmt, batch_rows=1).export_pairwise(comparator)
+        files = {f["kind"]: f for f in manifest["files"]}
+
+        assert files["only_in_df1"]["rows"] == 2  # IDs 4, 5
+        assert files["only_in_df2"]["rows"] == 2  # IDs 6, 7
+
+        path = exporter_uploads / "session" / "exports" / files["mismatches"]["filename"]
+        mismatches = pd.read_parquet(path) if fmt == "parquet" else pd.read_csv(path)
+
+        # id 2: name Bob -> Bobby and amount 200.75 -> 250.00
+        assert files["mismatches"]["rows"] == len(mismatches) == 2
+        assert set(mismatches["column"]) == {"name", "amount"}
+        name_row = mismatches[mismatches["column"] == "name"].iloc[0]
+        assert name_row["value_in_df1"] == "Bob"
+        assert name_row["value_in_df2"] == "Bobby"
+
+    def test_export_pairwise_identical(self, exporter_uploads, sample_csv_data):
+        """Test that empty difference sets still produce readable files."""
+        comparator = DataComparator(sample_csv_data, sample_csv_data.copy())
+        comparator.compare(join_columns=["id"])
+
+        manifest = DiffExporter("session").export_pairwise(comparator)
+
+        for entry in manifest["files"]:
+            assert entry["rows"] == 0
+            df = pd.read_parquet(exporter_uploads / "session" / "exports" / entry["filename"])
+            assert len(df) == 0
+
+    def test_export_multi_presence_bitmask(self, exporter_uploads, sample_csv_data,
+                                           sample_csv_data_modified, sample_csv_data_third):
+        """Test that multi-file exports carry every key with its bitmask."""
+        comparator = MultiFileComparator({
+            "file1.csv": sample_csv_data,
+            "file2.csv": sample_csv_data_modified,
+            "file3.csv": sample_csv_data_third,
+        })
+        comparator.compare(join_columns=["id"])
+
+        manifest = DiffExporter("session").export_multi(comparator)
+        files = {f["kind"]: f for f in manifest["files"]}
+        presence = pd.read_parquet(
+            exporter_uploads / "session" / "exports" / files["presence"]["filename"]
+        ).set_index("key")
+
+        assert len(presence) == 8  # IDs 1-8
+        assert presence.loc["1", "presence_mask"] == 0b111
+        assert presence.loc["4", "presence_mask"] == 0b001
+        assert presence.loc["6", "presence_mask"] == 0b110
+        assert presence.loc["6", "file_count"] == 2
+        assert bool(presence.loc["8", "file3.csv"]) is True
+
+        mismatches = pd.read_parquet(
+            exporter_uploads / "session" / "exports" / files["value_mismatches"]["filename"]
+        )
+        name_diff = mismatches[(mismatches["key"] == "2") & (mismatches["column"] == "name")]
+        assert name_diff.iloc[0]["file1.csv"] == "Bob"
+        assert name_diff.iloc[0]["file2.csv"] == "Bobby"
+        assert pd.isna(name_diff.iloc[0]["file3.csv"])
+
+    def test_get_export_path_rejects_traversal(self, exporter_uploads):
+        """Test that export lookups cannot escape the exports directory."""
+        (exporter_uploads / "session").mkdir()
+        (exporter_uploads / "session" / "secret.csv").write_text("x")
+
+        with pytest.raises(FileNotFoundError):
+            DiffExporter.get_export_path("session", "../secret.csv")
+
+    def test_list_exports(self, exporter_uploads, sample_csv_data, sample_csv_data_modified):
+        """Test listing exports for a session."""
+        assert DiffExporter.list_exports("session") == []
+
+        comparator = DataComparator(sample_csv_data, sample_csv_data_modified)
+        comparator.compare(join_columns=["id"])
+        DiffExporter("session", format="csv").export_pairwise(comparator)
+
+        assert len(DiffExporter.list_exports("session")) == 3
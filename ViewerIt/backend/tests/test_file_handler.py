@@ -6,10 +6,12 @@ import pandas as pd
 from pathlib import Path
 import sys
 import os
+from collections import OrderedDict
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import services.file_handler as file_handler
 from services.file_handler import FileHandler, UPLOADS_DIR, MAX_FILE_SIZE
 
 
@@ -120,6 +122,44 @@ class TestFileHandler:
             # Cleanup
             FileHandler.cleanup_session(session_id)
     
+    def test_get_content_hash(self, sample_csv_data):
+        """Test that content hashes follow file content, not names."""
+        csv_content = sample_csv_data.to_csv(index=False).encode('utf-8')
+        session_id = FileHandler.save_uploaded_file(csv_content, "test1.csv")
+        session_dir = UPLOADS_DIR / session_id
+        (session_dir / "test2.csv").write_bytes(csv_content)
+        (session_dir / "test3.csv").write_bytes(csv_content + b"6,Frank,1.0,2024-01-06,D\n")
+        
+        try:
+            hash1 = FileHandler.get_content_hash(session_id, "test1.csv")
+            
+            assert hash1 == FileHandler.get_content_hash(session_id, "test1.csv")
+            assert hash1 == FileHandler.get_content_hash(session_id, "test2.csv")
+            assert hash1 != FileHandler.get_content_hash(session_id, "test3.csv")
+            
+            with pytest.raises(FileNotFoundError):
+                FileHandler.get_content_hash(session_id, "missing.csv")
+        finally:
+            FileHandler.cleanup_session(session_id)
+    
+    def test_content_hash_cache_is_bounded(self, sample_csv_data, monkeypatch):
+        """Test cached digests are capped and dropped with their session."""
+        monkeypatch.setattr(file_handler, "CONTENT_HASH_CACHE_MAX_FILES", 2)
+        monkeypatch.setattr(FileHandler, "_content_hashes", OrderedDict())
+        csv_content = sample_csv_data.to_csv(index=False).encode('utf-8')
+        session_id = FileHandler.save_uploaded_file(csv_content, "test1.csv")
+        for name in ("test2.csv", "test3.csv"):
+            (UPLOADS_DIR / session_id / name).write_bytes(csv_content)
+        
+        try:
+            for name in ("test1.csv", "test2.csv", "test3.csv"):
+                FileHandler.get_content_hash(session_id, name)
+            assert [key[1] for key in FileHandler._content_hashes] == ["test2.csv", "test3.csv"]
+        finally:
+            FileHandler.cleanup_session(session_id)
+        
+        assert not FileHandler._content_hashes
+    
     def test_cleanup_session(self, sample_csv_data):
         """Test session cleanup."""
         # Save test file
@@ -0,0 +1,113 @@
+"""
+Tests for fuzzy key matching.
+"""
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.fuzzy_keys import FuzzyKeyMatcher, composite_key, MATCH_KEY_COLUMN
+from services.comparator import DataComparator
+from services.multi_comparator import MultiFileComparator
+
+
+@pytest.fixture
+def bates_left():
+    """Reference production with canonical Bates numbers."""
+    return pd.DataFrame({
+        "bates": ["ABC0000123", "ABC0000124", "ABC0000125", "ABC0000126", "XYZ0000001"],
+        "custodian": ["Smith", "Smith", "Jones", "Jones", "Lee"],
+    })
+
+
+@pytest.fixture
+def bates_right():
+    """Reproduction with reformatted and slightly mistyped Bates numbers."""
+    return pd.DataFrame({
+        "bates": ["ABC0000123", "abc-124", "PROD-ABC-125", "ABC00001226", "QRS0000999"],
+        "custodian": ["Smith", "Smith", "Jones", "Jones", "Kim"],
+    })
+
+
+class TestFuzzyKeyMatcher:
+    """Test suite for FuzzyKeyMatcher class."""
+
+    def test_normalize(self):
+        """Test each normalization rule."""
+        matcher = FuzzyKeyMatcher(strip_prefixes=["PROD"])
+        keys = pd.Series([" abc-0012 ", "PROD_ABC12", "ABC 00012"])
+        assert matcher.normalize(keys).tolist() == ["ABC12", "ABC12", "ABC12"]
+
+        strict = FuzzyKeyMatcher(case_insensitive=False, strip_leading_zeros=False)
+        assert strict.normalize(pd.Series(["abc-0012"])).tolist() == ["abc0012"]
+
+    def test_match_methods_and_confidence(self, bates_left, bates_right):
+        """Test that exact, normalized and fuzzy passes are reported."""
+        matcher = FuzzyKeyMatcher(strip_prefixes=["PROD"], threshold=0.8)
+        matches = matcher.match(bates_left["bates"], bates_right["bates"])
+        by_right = matches.set_index("right_key")
+
+        assert by_right.loc["ABC0000123", "method"] == "exact"
+        assert by_right.loc["abc-124", "left_key"] == "ABC0000124"
+        assert by_right.loc["abc-124", "method"] == "normalized"
+        assert by_right.loc["PROD-ABC-125", "left_key"] == "ABC0000125"
+        assert by_right.loc["ABC00001226", "left_key"] == "ABC0000126"
+        assert by_right.loc["ABC00001226", "method"] == "fuzzy"
+        assert 0.8 <= by_right.loc["ABC00001226", "confidence"] < 1.0
+        assert "QRS0000999" not in by_right.index
+
+    def test_one_to_one(self):
+        """Test that each key is matched at most once."""
+        matcher = FuzzyKeyMatcher(threshold=0.5)
+        matches = matcher.match(pd.Series(["DOC100"]), pd.Series(["DOC101", "DOC102"]))
+        assert len(matches) == 1
+
+    def test_invalid_threshold(self):
+        """Test that out-of-range thresholds are rejected."""
+        with pytest.raises(ValueError):
+            FuzzyKeyMatcher(threshold=0)
+
+    def test_composite_key(self):
+        """Test composite keys match the '|'-joined string form."""
+        df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+        assert composite_key(df, ["a", "b"]).tolist() == ["1|x", "2|y"]
+        assert composite_key(df, ["a"]).tolist() == ["1", "2"]
+
+
+class TestFuzzyComparisons:
+    """Test fuzzy key mode in the comparators."""
+
+    def test_pairwise_fuzzy_keys(self, bates_left, bates_right):
+        """Test that reformatted keys join instead of being reported as unique."""
+        exact = DataComparator(bates_left, bates_right).compare(join_columns=["bates"])
+        assert exact["rows"]["only_in_df1_count"] == 4
+
+        comparator = DataComparator(bates_left, bates_right)
+        result = comparator.compare(
+            join_columns=["bates"],
+            fuzzy_keys={"strip_prefixes": ["PROD"], "threshold": 0.8},
+        )
+
+        assert result["rows"]["only_in_df1_count"] == 1
+        assert result["rows"]["only_in_df2_count"] == 1
+        assert result["summary"]["common_rows"] == 4
+        assert result["fuzzy_matching"]["join_column"] == MATCH_KEY_COLUMN
+        assert result["fuzzy_matching"]["matched_by"] == {"exact": 1, "normalized": 2, "fuzzy": 1}
+        # Original key formatting differences surface as value mismatches
+        assert "bates" in result["columns"]["mismatched"]
+
+    def test_multi_fuzzy_keys(self, bates_left, bates_right):
+        """Test that later files are reconciled onto earlier keys."""
+        third = pd.DataFrame({"bates": ["ABC-123", "XYZ-1"], "custodian": ["Smith", "Lee"]})
+        comparator = MultiFileComparator({"a": bates_left, "b": bates_right, "c": third})
+        result = comparator.compare(
+            join_columns=["bates"],
+            fuzzy_keys={"strip_prefixes": ["PROD"], "threshold": 0.8},
+        )
+
+        assert result["records_in_all_files"]["count"] == 1
+        assert result["fuzzy_matching"]["reference_file"] == "a"
+        assert result["fuzzy_matching"]["by_file"]["c"]["matched_by"]["normalized"] == 2
@@ -0,0 +1,186 @@
+"""
+Tests for persistent key indexes (sorted keys + presence bitmasks on disk).
+"""
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.diff_exporter as diff_exporter
+import services.key_index as key_index
+from services.key_index import KeyIndex, make_index_id, get_key_index_path, write_key_index
+from services.chunked_processor import ChunkedProcessor, NATIVE_KEY_INDEX
+from services.diff_exporter import DiffExporter
+from services.overlap import membership_masks, count_masks
+
+
+FILE_KEYS = {
+    "a.csv": ["1", "2", "3", "5", "é"],
+    "b.csv": ["2", "3", "4"],
+    "c.csv": ["1", "3", "4", "5", "é"],
+}
+
+
+@pytest.fixture
+def index_files(tmp_path):
+    """Three overlapping CSV volumes keyed by 'id' (read as text)."""
+    paths = []
+    for name, keys in FILE_KEYS.items():
+        path = tmp_path / name
+        pd.DataFrame({"id": keys, "value": range(len(keys))}).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def python_processor():
+    processor = ChunkedProcessor()
+    processor._native_keys = processor._native_index = False
+    return processor
+
+
+@pytest.fixture
+def index(tmp_path, index_files, python_processor):
+    path = tmp_path / "index.arrow"
+    python_processor.build_key_index(index_files, ["id"], path)
+    return KeyIndex(path)
+
+
+class TestKeyIndexFile:
+    """Writing and reopening index files."""
+
+    def test_build_and_reopen(self, tmp_path, index):
+        assert len(index) == 6
+        assert index.file_names == list(FILE_KEYS)
+        assert index.key_columns == ["id"]
+        assert index.keys.to_pylist() == ["1", "2", "3", "4", "5", "é"]
+        assert index.masks.tolist() == [0b101, 0b011, 0b111, 0b110, 0b101, 0b101]
+        # Temporary files are moved into place
+        assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+    def test_masks_are_mapped(self, index):
+        assert not index.masks.flags.writeable
+
+    def test_summary_matches_overlap_counts(self, index):
+        _, masks = membership_masks(list(FILE_KEYS.values()))
+        summary = index.summary()
+
+        assert summary["total_unique_keys"] == 6
+        assert summary["keys_in_all_files"] == 1
+        assert {int(s["mask"]): s["size"] for s in summary["overlaps"]["sets"]} == count_masks(masks)
+
+    def test_empty_index(self, tmp_path):
+        path = tmp_path / "empty.arrow"
+        assert write_key_index(path, ["a", "b"], [[], []], ["id"]) == 0
+
+        index = KeyIndex(path)
+        assert len(index) == 0
+        assert index.query(["a"])["keys"] == []
+        assert index.lookup(["x"])[0]["found"] is False
+
+    def test_not_an_index(self, tmp_path):
+        path = tmp_path / "other.arrow"
+        table = pa.table({"key": ["a"]})
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        with pytest.raises(ValueError):
+            KeyIndex(path)
+
+    def test_missing_index(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            KeyIndex(tmp_path / "missing.arrow")
+
+
+class TestKeyIndexIds:
+    """Index ids are content-addressed and path-safe."""
+
+    def test_id_depends_on_contents_and_keys(self):
+        base = make_index_id(["h1", "h2"], ["a", "b"], ["id"])
+
+        assert base == make_index_id(["h1", "h2"], ["a", "b"], ["id"])
+        assert base != make_index_id(["h1", "h3"], ["a", "b"], ["id"])
+        assert base != make_index_id(["h1", "h2"], ["a", "b"], ["id", "name"])
+
+    def test_path_rejects_traversal(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(key_index, "UPLOADS_DIR", tmp_path)
+        index_id = make_index_id(["h"], ["a"], ["id"])
+
+        assert get_key_index_path("s", index_id).parent == tmp_path / "s" / "key_indexes"
+        with pytest.raises(ValueError):
+            get_key_index_path("s", "../../etc/passwd")
+
+
+class TestKeyIndexQueries:
+    """Set queries, lookups and exports on a reopened index."""
+
+    def test_include_exclude(self, index):
+        result = index.query(include=["a.csv", "c.csv"], exclude=["b.csv"])
+
+        assert result["keys"] == ["1", "5", "é"]
+        assert result["count"] == 3
+        assert result["has_more"] is False
+
+    def test_all_keys_and_paging(self, index):
+        first = index.query(limit=4)
+        second = index.query(limit=4, offset=4)
+
+        assert first["count"] == 6 and first["has_more"] is True
+        assert first["keys"] + second["keys"] == index.keys.to_pylist()
+        assert second["has_more"] is False
+
+    def test_matches_brute_force(self, tmp_path):
+        rng = np.random.default_rng(0)
+        universe = np.array([f"K{i:04d}" for i in range(2000)], dtype=object)
+        key_sets = [list(universe[rng.random(len(universe)) < 0.5]) for _ in range(5)]
+        names = [f"f{i}" for i in range(5)]
+        write_key_index(tmp_path / "i.arrow", names, key_sets, ["id"])
+        index = KeyIndex(tmp_path / "i.arrow")
+
+        expected = sorted(set(key_sets[0]) & set(key_sets[3]) - set(key_sets[1]) - set(key_sets[4]))
+        result = index.query(include=["f0", "f3"], exclude=["f1", "f4"], limit=len(universe))
+        assert result["keys"] == expected
+
+    def test_unknown_file(self, index):
+        with pytest.raises(ValueError):
+            index.query(include=["z.csv"])
+
+    def test_lookup(self, index):
+        results = {r["key"]: r for r in index.lookup(["3", "é", "0", "6", "\ud800"])}
+
+        assert results["3"]["files"] == ["a.csv", "b.csv", "c.csv"]
+        assert results["é"]["files"] == ["a.csv", "c.csv"]
+        assert results["é"]["presence_mask"] == 0b101
+        assert not results["0"]["found"] and not results["6"]["found"]
+        assert results["\ud800"]["files"] == []
+
+    def test_export(self, tmp_path, monkeypatch, index):
+        monkeypatch.setattr(diff_exporter, "UPLOADS_DIR", tmp_path)
+        manifest = DiffExporter("session", batch_rows=2).export_keys(index, ["c.csv"], ["b.csv"])
+
+        entry = manifest["files"][0]
+        exported = pd.read_parquet(tmp_path / "session" / "exports" / entry["filename"])
+        assert manifest["type"] == "keys"
+        assert entry["rows"] == 3
+        assert exported["key"].tolist() == ["1", "5", "é"]
+        assert exported["file_count"].tolist() == [2, 2, 2]
+        assert exported["c.csv"].all() and not exported["b.csv"].any()
+
+
+@pytest.mark.skipif(not NATIVE_KEY_INDEX, reason="viewerit_core without write_index")
+class TestNativeKeyIndex:
+    """FastIntersector.write_index writes the same index as the NumPy path."""
+
+    def test_native_matches_fallback(self, tmp_path, index_files, index):
+        processor = ChunkedProcessor()
+        processor.build_key_index(index_files, ["id"], tmp_path / "native.arrow")
+        native = KeyIndex(tmp_path / "native.arrow")
+
+        assert native.file_names == index.file_names
+        assert native.keys.to_pylist() == index.keys.to_pylist()
+        assert native.masks.tolist() == index.masks.tolist()
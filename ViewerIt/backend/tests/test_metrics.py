@@ -0,0 +1,201 @@
+"""
+Tests for per-stage timing and memory metrics.
+"""
+import operator
+import pytest
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.file_handler as file_handler
+import services.metrics as metrics
+from services.metrics import MetricsRegistry, Recorder, record, stage, snapshot, measured_job
+from services.file_handler import FileHandler
+from services.task_store import TaskStore
+from services.worker_pool import WorkerPool, PoolJob
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def parse_stage(rows: int) -> int:
+    with stage("parse", bytes=10) as parsed:
+        parsed.add(rows=rows)
+    return rows * 2
+
+
+class TestStages:
+    """Recording stages into an operation's recorder."""
+
+    def test_stages_aggregate_and_nest(self, registry):
+        with record("task:test", registry) as recorder:
+            for rows in (3, 4):
+                with stage("parse", bytes=100) as parsed:
+                    with stage("encoding_detection"):
+                        pass
+                    parsed.add(rows=rows)
+            with stage("report"):
+                pass
+
+        stages = {entry["stage"]: entry for entry in recorder.summary()["stages"]}
+        assert list(stages) == ["encoding_detection", "parse", "report"]
+        assert stages["parse"]["calls"] == 2
+        assert stages["parse"]["rows"] == 7
+        assert stages["parse"]["bytes"] == 200
+        assert stages["parse"]["parent"] is None
+        assert stages["encoding_detection"]["parent"] == "parse"
+        assert stages["parse"]["peak_rss_mb"] > 0
+
+    def test_summary_totals(self, registry):
+        with record("task:test", registry) as recorder:
+            with stage("parse"):
+                sum(range(100000))
+
+        summary = recorder.summary()
+        assert summary["operation"] == "task:test"
+        assert summary["status"] == "ok"
+        assert summary["wall_seconds"] >= summary["stages"][0]["wall_seconds"]
+        assert summary["cpu_seconds"] > 0
+        assert summary["peak_rss_mb"] > 0
+
+    def test_stage_outside_operation_is_noop(self):
+        with stage("parse") as parsed:
+            parsed.add(rows=1)
+        assert snapshot() is None
+
+    def test_exception_marks_failure(self, registry):
+        with pytest.raises(RuntimeError):
+            with record("task:test", registry) as recorder:
+                with stage("parse"):
+                    raise RuntimeError("boom")
+
+        assert recorder.status == "error"
+        assert recorder.stages()["parse"]["calls"] == 1
+
+    def test_disabled(self, registry, monkeypatch):
+        monkeypatch.setattr(metrics, "METRICS_ENABLED", False)
+        with record("task:test", registry) as recorder:
+            assert stage("parse") is metrics._NULL_STAGE
+            assert snapshot() is None
+
+        assert recorder.summary() is None
+        assert registry.render().count("viewerit_operations_total{") == 0
+
+    def test_instrumented_load(self, registry, sample_csv_data, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_handler, "UPLOADS_DIR", tmp_path)
+        (tmp_path / "session").mkdir()
+        path = tmp_path / "session" / "sample.csv"
+        sample_csv_data.to_csv(path, index=False)
+
+        with record("task:test", registry) as recorder:
+            df = FileHandler.load_dataframe("session", "sample.csv")
+
+        stages = recorder.stages()
+        assert stages["parse"]["rows"] == len(df)
+        assert stages["parse"]["bytes"] == path.stat().st_size
+        assert stages["encoding_detection"]["parent"] == "parse"
+
+
+class TestWorkerJobs:
+    """Worker measurements merged into the caller's recorder."""
+
+    def test_measured_job_merge(self):
+        payload = measured_job(parse_stage, 5)
+        recorder = Recorder("task:test")
+
+        assert recorder.merge_worker(payload) == 10
+        stages = recorder.stages()
+        assert stages["worker_job"]["calls"] == 1
+        assert stages["parse"]["parent"] == "worker_job"
+        assert stages["parse"]["rows"] == 5
+
+    def test_pool_jobs_are_measured(self, registry):
+        pool = WorkerPool(max_workers=1, memory_budget_mb=100)
+        try:
+            with record("task:test", registry) as recorder:
+                with stage("quality_checks"):
+                    results = dict(pool.run({"a": PoolJob(operator.mul, (2, 3), memory_bytes=1)}))
+            # Unmeasured callers get plain results too
+            assert dict(pool.run({"b": PoolJob(operator.mul, (4, 5), memory_bytes=1)})) == {"b": 20}
+        finally:
+            pool.shutdown()
+
+        assert results == {"a": 6}
+        assert recorder.stages()["worker_job"]["parent"] == "quality_checks"
+
+
+class TestTaskMetrics:
+    """Tasks carry the metrics of their run."""
+
+    def test_completed_task(self, registry):
+        store = TaskStore()
+        task = store.create_task("comparison")
+        with record("task:comparison", registry):
+            with stage("datacompy", rows=10):
+                pass
+            store.complete_task(task.id, {"ok": True})
+
+        result = store.get_task(task.id).to_dict()["metrics"]
+        assert result["operation"] == "task:comparison"
+        assert result["stages"][0]["stage"] == "datacompy"
+
+    def test_failed_task(self, registry):
+        store = TaskStore()
+        task = store.create_task("comparison")
+        with record("task:comparison", registry) as recorder:
+            store.fail_task(task.id, "boom")
+
+        assert recorder.status == "error"
+        assert store.get_task(task.id).metrics["status"] == "error"
+        assert "viewerit_operations_total{operation=\"task:comparison\",status=\"error\"} 1" in registry.render()
+
+    def test_unrecorded_task(self):
+        store = TaskStore()
+        task = store.create_task("comparison")
+        store.complete_task(task.id, {})
+        assert store.get_task(task.id).metrics is None
+
+
+class TestPrometheusRender:
+    """The /metrics text exposition."""
+
+    def test_render(self, registry):
+        with record("POST /compare/sync", registry):
+            with stage("parse", rows=4, bytes=64):
+                pass
+
+        text = registry.render(extra_gauges={"viewerit_tasks_active": ("Active tasks", 2)})
+        assert "# TYPE viewerit_operation_duration_seconds histogram" in text
+        assert 'viewerit_operation_duration_seconds_bucket{operation="POST /compare/sync",le="+Inf"} 1' in text
+        assert 'viewerit_stage_rows_total{operation="POST /compare/sync",stage="parse"} 4' in text
+        assert 'viewerit_stage_bytes_total{operation="POST /compare/sync",stage="parse"} 64' in text
+        assert "# TYPE viewerit_tasks_active gauge" in text
+        assert "viewerit_tasks_active 2" in text
+        assert text.endswith("\n")
+
+    def test_histogram_is_cumulative(self, registry):
+        for _ in range(3):
+            with record("task:test", registry):
+                pass
+
+        buckets = [line for line in registry.render().splitlines()
+                   if line.startswith("viewerit_operation_duration_seconds_bucket")]
+        counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+        assert counts == sorted(counts)
+        assert counts[-1] == 3
+
+    def test_label_escaping(self, registry):
+        with record('GET /a"b\\c\nd', registry):
+            pass
+
+        assert 'operation="GET /a\\"b\\\\c\\nd"' in registry.render()
+
+    def test_reset(self, registry):
+        with record("task:test", registry):
+            pass
+        registry.reset()
+        assert "task:test" not in registry.render()
@@ -10,7 +10,7 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.multi_comparator import MultiFileComparator
+from services.multi_comparator import MultiFileComparator, key_frame
 
 
 class TestMultiFileComparator:
@@ -289,3 +289,54 @@ class TestMultiFileComparator:
             assert summary["file_record_counts"][file_name] == len(df)
 
 
+class TestCompareStream:
+    """Files registered as they arrive give the same results as compare()."""
+
+    @staticmethod
+    def comparable(result: dict) -> dict:
+        def keys(section):
+            return sorted(record["key"] for record in result[section]["samples"])
+        return {
+            "summary": result["summary"],
+            "venn_data": result["venn_data"],
+            "column_analysis": {k: sorted(v) if isinstance(v, list) else v
+                                for k, v in result["column_analysis"].items()},
+            "value_differences": {col: diff["mismatch_count"] for col, diff in result["value_differences"].items()},
+            "samples": [keys(s) for s in ("records_in_all_files", "records_in_some_files", "records_in_one_file")],
+        }
+
+    @pytest.mark.parametrize("fuzzy_keys", [None, {"threshold": 0.9}])
+    def test_same_results_as_compare(self, sample_csv_data, sample_csv_data_modified,
+                                     sample_csv_data_third, fuzzy_keys):
+        dataframes = {
+            "file1.csv": sample_csv_data,
+            "file2.csv": sample_csv_data_modified,
+            "file3.csv": sample_csv_data_third,
+        }
+        reference = MultiFileComparator(dataframes)
+        expected = reference.compare(["id"], ["date"], fuzzy_keys)
+        registered = []
+
+        # Frames arrive out of order, one of them already reduced by a worker
+        frames = [
+            ("file3.csv", dataframes["file3.csv"]),
+            ("file1.csv", key_frame(dataframes["file1.csv"], ["id"], ["date"], "file1.csv")),
+            ("file2.csv", dataframes["file2.csv"]),
+        ]
+        comparator, result = MultiFileComparator.compare_stream(
+            list(dataframes), iter(frames), ["id"], ["date"], fuzzy_keys,
+            on_file=lambda name, rows: registered.append((name, rows)),
+        )
+
+        assert comparator.file_names == list(dataframes)
+        assert registered == [(name, len(df)) for name, df in frames]
+        assert self.comparable(result) == self.comparable(expected)
+        assert "date" not in result["column_analysis"]["all_columns"]
+        pd.testing.assert_frame_equal(comparator.get_presence_frame(), reference.get_presence_frame())
+
+    def test_missing_join_column(self, sample_csv_data, sample_csv_data_modified):
+        frames = [("a.csv", sample_csv_data), ("b.csv", sample_csv_data_modified.drop(columns="id"))]
+
+        with pytest.raises(ValueError, match="b.csv"):
+            MultiFileComparator.compare_stream(["a.csv", "b.csv"], frames, ["id"])
+
@@ -0,0 +1,198 @@
+"""
+Tests for key membership bitmasks and UpSet-style overlap counts.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from collections import Counter
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.overlap import (
+    membership_masks,
+    membership_statistics,
+    count_masks,
+    overlap_statistics,
+    upset_data,
+    MAX_OVERLAP_FILES,
+)
+from services.multi_comparator import MultiFileComparator
+from services.chunked_processor import ChunkedProcessor, NATIVE_OVERLAP
+
+
+def random_key_sets(file_count: int, seed: int = 0) -> list[list[str]]:
+    """Keys of overlapping volumes: each key is in a random subset of files."""
+    rng = np.random.default_rng(seed)
+    universe = np.array([f"DOC{i:05d}" for i in range(3000)], dtype=object)
+    return [list(universe[rng.random(len(universe)) < rng.uniform(0.3, 0.9)]) for _ in range(file_count)]
+
+
+def brute_force_counts(key_sets: list[list[str]]) -> dict[int, int]:
+    masks = Counter()
+    for idx, keys in enumerate(key_sets):
+        for key in set(keys):
+            masks[key] |= 1 << idx
+    return dict(Counter(masks.values()))
+
+
+class TestMembershipMasks:
+    """Masks and mask counts agree with a per-key loop."""
+
+    @pytest.mark.parametrize("file_count", [2, 5, 12, MAX_OVERLAP_FILES])
+    def test_counts_match_brute_force(self, file_count):
+        key_sets = random_key_sets(file_count)
+        _, masks = membership_masks(key_sets)
+
+        assert count_masks(masks) == brute_force_counts(key_sets)
+
+    def test_sorted_keys_and_duplicates(self):
+        keys, masks = membership_masks([["b", "a", "b"], ["c", "a"], ["a"]], sort=True)
+
+        assert keys.tolist() == ["a", "b", "c"]
+        assert masks.tolist() == [0b111, 0b001, 0b010]
+
+    def test_top_bit(self):
+        key_sets = [[] for _ in range(MAX_OVERLAP_FILES)]
+        key_sets[-1] = ["last"]
+        key_sets[0] = ["last"]
+
+        _, masks = membership_masks(key_sets)
+
+        assert masks.tolist() == [(1 << 63) | 1]
+
+    def test_too_many_files(self):
+        with pytest.raises(ValueError):
+            membership_masks([["a"]] * (MAX_OVERLAP_FILES + 1))
+
+
+class TestOverlapSummaries:
+    """Statistics and UpSet data derived from a mask count table."""
+
+    def test_statistics(self):
+        counts = {0b111: 5, 0b001: 2, 0b100: 1, 0b011: 3}
+        stats = overlap_statistics(counts, ["a", "b", "c"])
+
+        assert stats["total_unique_keys"] == 11
+        assert stats["keys_in_all_files"] == 5
+        assert stats["file_exclusive_counts"] == {"a": 2, "b": 0, "c": 1}
+        assert stats["file_key_counts"] == {"a": 10, "b": 8, "c": 6}
+        assert stats["by_file_count"] == {1: 3, 2: 3, 3: 5}
+
+    def test_statistics_from_keys(self):
+        """Test the mask-free totals match the mask table's."""
+        key_sets = random_key_sets(5, seed=4)
+        names = [f"f{i}" for i in range(5)]
+        _, masks = membership_masks(key_sets)
+
+        assert membership_statistics(key_sets, names) == overlap_statistics(count_masks(masks), names)
+
+    def test_statistics_beyond_mask_width(self):
+        key_sets = [["shared", f"own{i}"] for i in range(MAX_OVERLAP_FILES + 6)] + [["shared", "own0"]]
+        names = [f"f{i}" for i in range(len(key_sets))]
+
+        stats = membership_statistics(key_sets, names)
+
+        assert stats["total_unique_keys"] == MAX_OVERLAP_FILES + 7
+        assert stats["keys_in_all_files"] == 1
+        assert stats["file_exclusive_counts"]["f0"] == 0
+        assert stats["file_exclusive_counts"]["f1"] == 1
+        assert stats["by_file_count"] == {1: MAX_OVERLAP_FILES + 5, 2: 1, len(names): 1}
+
+    def test_upset_top_k(self):
+        counts = {0b111: 5, 0b001: 2, 0b100: 1, 0b011: 3}
+        upset = upset_data(counts, ["a", "b", "c"], top_k=2)
+
+        assert upset["sets"] == [
+            {"sets": ["a", "b", "c"], "mask": "7", "degree": 3, "size": 5},
+            {"sets": ["a", "b"], "mask": "3", "degree": 2, "size": 3},
+        ]
+        assert upset["intersection_count"] == 4
+        assert upset["truncated"] is True
+
+
+class TestManyFileComparisons:
+    """Comparisons of more than five files report their overlaps."""
+
+    def test_multi_comparator_venn_beyond_five_files(self):
+        key_sets = random_key_sets(8, seed=1)
+        dataframes = {f"vol{i}.csv": pd.DataFrame({"id": keys, "v": 1}) for i, keys in enumerate(key_sets)}
+
+        result = MultiFileComparator(dataframes).compare(join_columns=["id"])
+        venn = result["venn_data"]
+
+        expected = brute_force_counts(key_sets)
+        assert "error" not in venn
+        assert venn["intersection_count"] == len(expected)
+        assert {int(s["mask"]): s["size"] for s in venn["sets"]} == \
+            dict(sorted(expected.items(), key=lambda item: (-item[1], item[0]))[:len(venn["sets"])])
+        assert all(len(s["sets"]) == s["degree"] for s in venn["sets"])
+
+    def test_multi_comparator_beyond_mask_width(self):
+        """Test more files than mask bits still compare, without Venn data."""
+        dataframes = {f"f{i}": pd.DataFrame({"id": [0, i + 1]}) for i in range(MAX_OVERLAP_FILES + 1)}
+
+        result = MultiFileComparator(dataframes).compare(join_columns=["id"])
+
+        assert result["records_in_all_files"]["count"] == 1
+        assert result["records_in_one_file"]["count"] == MAX_OVERLAP_FILES + 1
+        assert "error" in result["venn_data"]
+
+    def test_top_bit_mask_is_exact(self):
+        """Test masks beyond 2**53 are sent as exact strings."""
+        upset = upset_data({(1 << 64) - 1: 2}, [f"f{i}" for i in range(MAX_OVERLAP_FILES)])
+        assert upset["sets"][0]["mask"] == str((1 << 64) - 1)
+
+    def test_chunked_multi_file_overlaps(self, tmp_path):
+        key_sets = random_key_sets(12, seed=2)
+        paths = []
+        for i, keys in enumerate(key_sets):
+            path = tmp_path / f"vol{i:02d}.csv"
+            pd.DataFrame({"id": keys}).to_csv(path, index=False)
+            paths.append(path)
+        processor = ChunkedProcessor()
+        processor._native_keys = processor._use_rust = False
+
+        result = processor.compare_multiple_files_chunked(paths, ["id"])
+
+        expected = brute_force_counts(key_sets)
+        full = (1 << 12) - 1
+        assert result["total_unique_keys"] == sum(expected.values())
+        assert result["keys_in_all_files"] == expected.get(full, 0)
+        assert result["file_exclusive_counts"]["vol03.csv"] == expected.get(1 << 3, 0)
+        assert result["overlaps"]["intersection_count"] == len(expected)
+
+    def test_chunked_beyond_mask_width(self, tmp_path):
+        paths = []
+        for i in range(MAX_OVERLAP_FILES + 1):
+            path = tmp_path / f"vol{i:02d}.csv"
+            pd.DataFrame({"id": ["shared", f"own{i}"]}).to_csv(path, index=False)
+            paths.append(path)
+        processor = ChunkedProcessor()
+        processor._native_keys = processor._use_rust = False
+
+        result = processor.compare_multiple_files_chunked(paths, ["id"])
+
+        assert result["total_unique_keys"] == MAX_OVERLAP_FILES + 2
+        assert result["keys_in_all_files"] == 1
+        assert result["file_exclusive_counts"]["vol64.csv"] == 1
+        assert result["overlaps"] is None
+
+
+@pytest.mark.skipif(not NATIVE_OVERLAP, reason="viewerit_core without overlap_counts")
+class TestNativeOverlap:
+    """FastIntersector.overlap_counts returns the NumPy mask counts."""
+
+    def test_native_matches_fallback(self):
+        from viewerit_core import FastIntersector
+
+        key_sets = random_key_sets(20, seed=3)
+        names = [f"vol{i}" for i in range(20)]
+        intersector = FastIntersector()
+        for name, keys in zip(names, key_sets):
+            intersector.add_file(name, keys)
+
+        _, masks = membership_masks(key_sets)
+        assert dict(intersector.overlap_counts(names)) == count_masks(masks)
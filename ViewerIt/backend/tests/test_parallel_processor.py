@@ -0,0 +1,133 @@
+"""
+Tests for process-based multi-file loading with Arrow IPC frame transfer.
+"""
+import os
+from io import StringIO
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.chunked_processor as chunked_processor
+from services.chunked_processor import ParallelProcessor
+from services.file_handler import FileHandler
+from services.frame_transfer import ArrowFrame, export_frame, import_frame
+from services.multi_comparator import MultiFileComparator, load_keyed_frame
+from services.profiler import CONTENT_HASH_ATTR
+from services.worker_pool import WorkerPool
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """One pool for the module; spawning workers is the slow part."""
+    pool = WorkerPool(max_workers=2, memory_budget_mb=100_000)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def transfer_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "transfer"
+    directory.mkdir()
+    monkeypatch.setattr(chunked_processor, "WORKER_TRANSFER_DIR", str(directory))
+    return directory
+
+
+class TestFrameTransfer:
+    """Test suite for Arrow IPC frame hand-off."""
+
+    def test_roundtrip(self, sample_csv_with_nulls, tmp_path):
+        """Test that a loaded frame comes back identical, NaN nulls and attrs included."""
+        df = pd.read_csv(StringIO(sample_csv_with_nulls.to_csv(index=False)))
+        df.attrs[CONTENT_HASH_ATTR] = "abc"
+
+        exported = export_frame(df, tmp_path)
+        assert isinstance(exported, ArrowFrame)
+        result = import_frame(exported)
+
+        pd.testing.assert_frame_equal(result, df)
+        assert result.attrs == {CONTENT_HASH_ATTR: "abc"}
+        assert not list(tmp_path.iterdir())
+
+    def test_mixed_object_column_is_pickled(self, tmp_path):
+        df = pd.DataFrame({"mixed": [1, "a", 2.5]})
+
+        exported = export_frame(df, tmp_path)
+
+        assert exported is df
+        assert import_frame(exported) is df
+        assert not list(tmp_path.iterdir())
+
+
+class TestParallelProcessor:
+    """Files loaded and processed in the worker pool."""
+
+    def test_load_session_files(self, sample_csv_data, sample_csv_with_nulls, pool, transfer_dir):
+        session_id = FileHandler.save_uploaded_file(sample_csv_data.to_csv(index=False).encode(), "a.csv")
+        try:
+            FileHandler.save_uploaded_file(sample_csv_with_nulls.to_csv(index=False).encode(), "b.csv", session_id)
+            loaded_order = []
+            frames = ParallelProcessor(pool).load_session_files(
+                session_id, ["b.csv", "a.csv", "b.csv"], on_load=loaded_order.append)
+            expected = {name: FileHandler.load_dataframe(session_id, name) for name in ("b.csv", "a.csv")}
+            with pytest.raises(FileNotFoundError):
+                ParallelProcessor(pool).load_session_files(session_id, ["a.csv", "missing.csv"])
+        finally:
+            FileHandler.cleanup_session(session_id)
+
+        assert list(frames) == ["b.csv", "a.csv"]
+        assert sorted(loaded_order) == ["a.csv", "b.csv"]
+        for name, df in frames.items():
+            pd.testing.assert_frame_equal(df, expected[name])
+            assert df.attrs[CONTENT_HASH_ATTR] == expected[name].attrs[CONTENT_HASH_ATTR]
+        assert not list(transfer_dir.iterdir())
+
+    def test_pipelined_multi_compare(self, sample_csv_data, sample_csv_data_modified,
+                                     sample_csv_data_third, pool, transfer_dir):
+        """Test that files reduced in workers compare as loading them whole does."""
+        names = ["a.csv", "b.csv", "c.csv"]
+        session_id = FileHandler.save_uploaded_file(sample_csv_data.to_csv(index=False).encode(), "a.csv")
+        try:
+            FileHandler.save_uploaded_file(sample_csv_data_modified.to_csv(index=False).encode(), "b.csv", session_id)
+            FileHandler.save_uploaded_file(sample_csv_data_third.to_csv(index=False).encode(), "c.csv", session_id)
+            frames = ParallelProcessor(pool).iter_session_files(
+                session_id, names, load_keyed_frame, ["id"], ["category"])
+            comparator, result = MultiFileComparator.compare_stream(names, frames, ["id"], ["category"])
+            expected = MultiFileComparator(
+                {name: FileHandler.load_dataframe(session_id, name) for name in names}
+            ).compare(["id"], ["category"])
+        finally:
+            FileHandler.cleanup_session(session_id)
+
+        assert list(comparator.dataframes["a.csv"].columns) == ["id", "name", "amount", "date", "_composite_key"]
+        assert result["summary"] == expected["summary"]
+        assert result["venn_data"] == expected["venn_data"]
+        assert result["value_differences"].keys() == expected["value_differences"].keys()
+        assert not list(transfer_dir.iterdir())
+
+    def test_files_with_errors(self, sample_csv_data, tmp_path, pool, transfer_dir):
+        paths = [tmp_path / "a.csv", tmp_path / "missing.csv"]
+        sample_csv_data.to_csv(paths[0], index=False)
+        processor = ParallelProcessor(pool)
+
+        sizes = processor.process_files_parallel(paths, os.path.getsize)
+        frames = processor.load_dataframes_parallel(paths, pd.read_csv)
+
+        assert sizes["a.csv"] == paths[0].stat().st_size
+        assert "error" in sizes["missing.csv"]
+        assert list(frames) == ["a.csv"]
+        pd.testing.assert_frame_equal(frames["a.csv"], sample_csv_data)
+        assert not list(transfer_dir.iterdir())
+
+    def test_single_worker_runs_inline(self, sample_csv_data, tmp_path):
+        path = tmp_path / "a.csv"
+        sample_csv_data.to_csv(path, index=False)
+        processor = ParallelProcessor(WorkerPool(max_workers=1))
+
+        frames = processor.load_dataframes_parallel([path, path], lambda p: pd.read_csv(p))
+
+        pd.testing.assert_frame_equal(frames["a.csv"], sample_csv_data)
+        assert processor.pool._executor is None
@@ -0,0 +1,146 @@
+"""
+Tests for the shared column profiler.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.profiler as profiler
+from services.profiler import (
+    profile_column,
+    get_profiles,
+    ChunkedProfiler,
+    CONTENT_HASH_ATTR,
+)
+from services.file_handler import FileHandler
+
+
+@pytest.fixture(autouse=True)
+def clear_profile_cache():
+    """Isolate tests from profiles cached by other tests."""
+    profiler.profile_cache.clear()
+    yield
+    profiler.profile_cache.clear()
+
+
+class TestProfileColumn:
+    """Test suite for single-column profiles."""
+
+    def test_numeric_matches_pandas(self):
+        """Test that derived numeric stats match pandas' own results."""
+        series = pd.Series([5.0, 1.0, 3.0, 3.0, np.nan, -2.0, 8.5, 3.0])
+        profile = profile_column(series)
+        clean = series.dropna()
+
+        assert profile["count"] == 7
+        assert profile["null_count"] == 1
+        assert profile["unique_count"] == clean.nunique()
+        assert profile["negative_count"] == 1
+        assert profile["min"] == clean.min()
+        assert profile["max"] == clean.max()
+        assert profile["mean"] == pytest.approx(clean.mean())
+        assert profile["std"] == pytest.approx(clean.std())
+        assert profile["q1"] == pytest.approx(clean.quantile(0.25))
+        assert profile["median"] == pytest.approx(clean.median())
+        assert profile["q3"] == pytest.approx(clean.quantile(0.75))
+        assert profile["top_values"] == {3.0: 3, 5.0: 1, 1.0: 1, -2.0: 1, 8.5: 1}
+
+    def test_string_profile(self, sample_csv_with_nulls):
+        """Test string length stats ignore nulls."""
+        profile = profile_column(sample_csv_with_nulls["name"])
+
+        assert profile["null_count"] == 2
+        assert profile["sample_values"] == ["Alice", "Charlie", "Diana"]
+        assert profile["avg_length"] == pytest.approx(np.mean([5, 7, 5]), abs=0.01)
+        assert profile["max_length"] == 7
+
+    def test_all_null_column(self):
+        """Test that all-null columns have no derived stats."""
+        profile = profile_column(pd.Series([None, None], dtype=object))
+        assert profile["count"] == 0
+        assert profile["null_percentage"] == 100.0
+        assert "avg_length" not in profile
+
+    def test_unhashable_values(self):
+        """Test that list values are profiled via their string form."""
+        profile = profile_column(pd.Series([[1, 2], [1, 2], None]))
+        assert profile["unique_count"] == 1
+        assert profile["null_count"] == 1
+
+
+class TestProfileCache:
+    """Test caching against content hashes."""
+
+    def test_cached_by_content_hash(self, sample_csv_data, monkeypatch):
+        """Test that a frame tagged with a content hash is profiled once."""
+        calls = []
+        original = profiler.profile_column
+        monkeypatch.setattr(profiler, "profile_column",
+                            lambda s: calls.append(s.name) or original(s))
+
+        df1 = sample_csv_data.copy()
+        df1.attrs[CONTENT_HASH_ATTR] = "abc"
+        df2 = sample_csv_data.copy()
+        df2.attrs[CONTENT_HASH_ATTR] = "abc"
+
+        get_profiles(df1)
+        get_profiles(df2)
+        assert len(calls) == len(sample_csv_data.columns)
+
+        # Row-filtered frames keep attrs but must not reuse the profiles
+        get_profiles(df1.head(2))
+        assert len(calls) == 2 * len(sample_csv_data.columns)
+
+    def test_untagged_frames_not_cached(self, sample_csv_data):
+        """Test that frames without a content hash are always recomputed."""
+        get_profiles(sample_csv_data)
+        assert profiler.profile_cache.get_columns((None, len(sample_csv_data))) == {}
+
+    def test_load_dataframe_sets_content_hash(self, sample_csv_data):
+        """Test that loaded frames carry their file's content hash."""
+        csv_content = sample_csv_data.to_csv(index=False).encode('utf-8')
+        session_id = FileHandler.save_uploaded_file(csv_content, "test.csv")
+        try:
+            df = FileHandler.load_dataframe(session_id, "test.csv")
+            expected = FileHandler.get_content_hash(session_id, "test.csv")
+            assert df.attrs[CONTENT_HASH_ATTR] == expected
+        finally:
+            FileHandler.cleanup_session(session_id)
+
+
+class TestChunkedProfiler:
+    """Test suite for chunk-merged profiles."""
+
+    def test_chunked_matches_full(self, sample_csv_with_nulls):
+        """Test that merging chunks gives the same profile as one pass."""
+        chunked = ChunkedProfiler()
+        for start in range(0, len(sample_csv_with_nulls), 2):
+            chunked.update(sample_csv_with_nulls.iloc[start:start + 2])
+        merged = chunked.result()
+
+        for col in sample_csv_with_nulls.columns:
+            full = profile_column(sample_csv_with_nulls[col])
+            for field in ("count", "null_count", "unique_count", "min", "max", "mean", "avg_length"):
+                assert merged[col].get(field) == pytest.approx(full.get(field)), (col, field)
+
+    def test_truncated_tracking(self):
+        """Test that capped columns keep exact counts and running moments."""
+        chunked = ChunkedProfiler(max_tracked_values=3)
+        chunked.update(pd.DataFrame({"x": [1.0, 2.0, 3.0, np.nan]}))
+        chunked.update(pd.DataFrame({"x": [4.0, 5.0, 6.0]}))
+        profile = chunked.result()["x"]
+
+        assert profile["unique_count_exact"] is False
+        assert profile["count"] == 6
+        assert profile["null_count"] == 1
+        assert profile["min"] == 1.0
+        assert profile["max"] == 6.0
+        assert profile["mean"] == pytest.approx(3.5)
+        assert profile["std"] == pytest.approx(pd.Series([1, 2, 3, 4, 5, 6]).std())
+        assert profile["unique_count"] == 6
+        assert profile["median"] in (3.0, 4.0)
@@ -11,7 +11,13 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.quality_checker import QualityChecker, MultiDatasetQualityChecker
+from services.quality_checker import (
+    QualityChecker,
+    SampledQualityChecker,
+    MultiDatasetQualityChecker,
+    wilson_interval,
+)
+from services.chunked_processor import ChunkedProcessor
 
 
 class TestQualityChecker:
@@ -173,7 +179,80 @@ class TestQualityChecker:
         # Should detect high correlation
         correlation_issues = [i for i in consistency["issues"] if i["type"] == "high_correlation"]
         assert len(correlation_issues) > 0
-    
+
+    def test_correlation_matrix_matches_pairwise_corr(self):
+        """Vectorized correlations match Series.corr, including pairwise nulls."""
+        rng = np.random.default_rng(3)
+        df = pd.DataFrame(rng.normal(size=(200, 6)), columns=list("abcdef"))
+        df["b"] = df["a"] * 2 + rng.normal(scale=0.01, size=200)
+        df["c"] = -df["a"] + rng.normal(scale=0.01, size=200)
+        df.loc[rng.choice(200, 40, replace=False), "a"] = np.nan
+        df.loc[rng.choice(200, 60, replace=False), "d"] = np.nan
+        df["e"] = df["e"].round().astype("Int64")
+
+        checker = QualityChecker(df, "corr_test")
+        columns = list(df.columns)
+        matrix = checker._correlation_matrix(columns)
+        for i, col1 in enumerate(columns):
+            for j, col2 in enumerate(columns):
+                if i != j:
+                    assert matrix[i, j] == pytest.approx(df[col1].corr(df[col2]), abs=1e-9)
+
+        issues = checker.check_all()["consistency"]["issues"]
+        pairs = [issue["columns"] for issue in issues if issue["type"] == "high_correlation"]
+        assert pairs == [["a", "b"], ["a", "c"], ["b", "c"]]
+
+    def test_correlation_column_cap(self, monkeypatch):
+        """Only the first capped columns are correlated; constant columns are skipped."""
+        monkeypatch.setattr("services.quality_checker.QUALITY_CORRELATION_MAX_COLUMNS", 3)
+        df = pd.DataFrame({
+            "constant": [7] * 5,
+            "a": [1, 2, 3, 4, 5],
+            "b": [5, 3, 4, 1, 2],
+            "c": [2, 9, 1, 7, 3],
+            "d": [2, 4, 6, 8, 10],  # Correlates with a, but beyond the cap
+        })
+
+        consistency = QualityChecker(df, "cap_test").check_all()["consistency"]
+
+        assert consistency["correlation_columns_checked"] == 3
+        assert not [i for i in consistency["issues"] if i["type"] == "high_correlation"]
+
+    def test_date_columns_parsed_once(self, monkeypatch):
+        """Each date column is parsed once and reused for order checks."""
+        import services.consistency as consistency
+
+        calls = []
+        to_datetime = pd.to_datetime
+
+        def counting_to_datetime(arg, *args, **kwargs):
+            calls.append(getattr(arg, "name", None))
+            return to_datetime(arg, *args, **kwargs)
+
+        monkeypatch.setattr(consistency.pd, "to_datetime", counting_to_datetime)
+        df = pd.DataFrame({
+            "start_date": ["2024-01-01", "2024-03-01", "2024-02-01"],
+            "end_date": ["2024-02-01", "2024-01-01", "2024-03-01"],
+            "update_time": ["not a date", "x", "y"],
+        })
+
+        checker = QualityChecker(df, "date_test")
+        issues = checker.check_all()["consistency"]["issues"]
+
+        assert sorted(calls) == ["end_date", "start_date", "update_time"]
+        assert checker._date_parser.formats["start_date"] == "%Y-%m-%d"
+        violations = [i for i in issues if i["type"] == "date_order_violation"]
+        assert violations[0]["violation_count"] == 1
+
+    def test_date_parser_distinct_values(self):
+        """Parsing distinct values and mapping back matches a full parse."""
+        from services.consistency import DateParser
+
+        series = pd.Series(["", None, "03/01/2024", "12/31/2023", "03/01/2024", None] * 10, name="sent_date")
+        parsed = DateParser().parse("sent_date", series, distinct_count=3)
+
+        pd.testing.assert_series_equal(parsed, pd.to_datetime(series))
+
     def test_outlier_detection(self):
         """Test outlier detection using IQR method."""
         # Create data with outliers
@@ -303,6 +382,9 @@ class TestQualityChecker:
         issues = name_validity.get("issues", [])
         whitespace_issues = [i for i in issues if i.get("type") == "whitespace_issues"]
         assert len(whitespace_issues) > 0
+        assert whitespace_issues[0]["leading_whitespace"] == 2
+        assert whitespace_issues[0]["trailing_whitespace"] == 2
+        assert whitespace_issues[0]["multiple_spaces"] == 1
     
     def test_case_consistency_detection(self):
         """Test detection of case consistency."""
@@ -413,3 +495,87 @@ class TestMultiDatasetQualityChecker:
         assert summary["total_rows"] == len(sample_csv_data) + len(sample_csv_data_modified)
 
 
+
+
+class TestSampledQualityChecker:
+    """Test suite for sampled quality checks with confidence intervals."""
+    
+    @pytest.fixture
+    def large_frame(self):
+        """Frame with a known null rate (10%) in one column."""
+        rng = np.random.default_rng(0)
+        n = 5000
+        amount = rng.normal(100, 10, n)
+        amount[np.arange(n) % 10 == 0] = np.nan
+        return pd.DataFrame({
+            "id": np.arange(n),
+            "amount": amount,
+            "email": [f"user{i}@example.com" for i in range(n)],
+        })
+    
+    def test_wilson_interval(self):
+        """Test Wilson bounds contain the estimate and collapse for a census."""
+        lower, upper = wilson_interval(50, 100)
+        assert lower < 0.5 < upper
+        assert wilson_interval(0, 100)[0] == 0.0
+        assert wilson_interval(50, 100, population=100) == pytest.approx((0.5, 0.5))
+    
+    def test_reservoir_sample(self, large_frame, tmp_path):
+        """Test the chunked reservoir sample is uniform-sized, indexed by row and reproducible."""
+        path = tmp_path / "large.csv"
+        large_frame.to_csv(path, index=False)
+        processor = ChunkedProcessor(chunk_size=700)
+        
+        sample, total_rows = processor.reservoir_sample(path, 500, seed=1)
+        again, _ = processor.reservoir_sample(path, 500, seed=1)
+        
+        assert total_rows == len(large_frame)
+        assert len(sample) == 500
+        assert sample.index.is_monotonic_increasing
+        assert (sample["id"].to_numpy() == sample.index.to_numpy()).all()
+        assert sample.index.equals(again.index)
+    
+    def test_sampled_report(self, large_frame, tmp_path):
+        """Test sampled mode reports population rows and intervals covering the truth."""
+        path = tmp_path / "large.csv"
+        large_frame.to_csv(path, index=False)
+        
+        checker = SampledQualityChecker.from_csv(
+            path, "large.csv", sample_size=1000, processor=ChunkedProcessor(chunk_size=700), seed=3
+        )
+        result = checker.check_all()
+        intervals = result["confidence_intervals"]
+        
+        assert result["mode"] == "sampled"
+        assert result["row_count"] == 5000
+        assert result["sampling"]["sample_size"] == 1000
+        
+        nulls = intervals["column_null_percentage"]["amount"]
+        assert nulls["lower"] <= 10.0 <= nulls["upper"]
+        completeness = intervals["overall_completeness"]
+        assert completeness["lower"] <= 100 - 10 / 3 <= completeness["upper"]
+        assert intervals["column_format_match_percentage"]["email"]["email"]["estimate"] == 100.0
+        score = intervals["quality_score"]
+        assert score["lower"] <= score["estimate"] <= score["upper"]
+    
+    def test_small_frame_is_a_census(self, sample_csv_data):
+        """Test that sampling a frame smaller than the sample gives exact, zero-width results."""
+        result = SampledQualityChecker.from_dataframe(sample_csv_data, "small", sample_size=1000).check_all()
+        exact = QualityChecker(sample_csv_data, "small").check_all()
+        
+        assert result["quality_score"]["total"] == exact["quality_score"]["total"]
+        completeness = result["confidence_intervals"]["overall_completeness"]
+        assert completeness["lower"] == completeness["upper"]
+        score = result["confidence_intervals"]["quality_score"]
+        assert score["lower"] == score["estimate"] == score["upper"]
+    
+    def test_multi_dataset_with_sampled_checkers(self, sample_csv_data, sample_csv_data_modified):
+        """Test multi-dataset comparison over prepared sampled checkers."""
+        checkers = {
+            "a": SampledQualityChecker.from_dataframe(sample_csv_data, "a"),
+            "b": SampledQualityChecker.from_dataframe(sample_csv_data_modified, "b"),
+        }
+        result = MultiDatasetQualityChecker(checkers=checkers).check_all()
+        
+        assert set(result["individual_results"]) == {"a", "b"}
+        assert result["individual_results"]["a"]["mode"] == "sampled"
@@ -0,0 +1,135 @@
+"""
+Tests for the fast JSON response layer and compression middleware.
+"""
+import gzip
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+import response_layer
+from response_layer import (
+    dumps,
+    choose_encoding,
+    CompressionMiddleware,
+    FastJSONResponse,
+    FastJSONRoute,
+)
+
+
+@pytest.fixture
+def client():
+    """Small app wired like main.py."""
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.router.route_class = FastJSONRoute
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/small")
+    async def small():
+        return {"value": np.int64(1)}
+
+    @app.get("/large")
+    async def large():
+        return {"values": np.arange(1000, dtype=np.float64), "nan": float("nan")}
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"x" * 500, b"y" * 500]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+class TestDumps:
+    """Test suite for the serializer."""
+
+    def test_numpy_and_pandas_values(self):
+        """Test that numpy/pandas values serialize without conversion."""
+        payload = {
+            "int": np.int64(3),
+            "float": np.float32(1.5),
+            "bool": np.bool_(True),
+            "array": np.array([1.0, np.nan]),
+            "object_array": np.array(["a", None], dtype=object),
+            "timestamp": pd.Timestamp("2024-01-02 03:04:05"),
+            "nat": pd.NaT,
+            "na": pd.NA,
+            "nan": float("nan"),
+            "set": {1},
+        }
+
+        decoded = json.loads(dumps(payload))
+
+        assert decoded["int"] == 3
+        assert decoded["float"] == 1.5
+        assert decoded["bool"] is True
+        assert decoded["array"] == [1.0, None]
+        assert decoded["object_array"] == ["a", None]
+        assert decoded["timestamp"].startswith("2024-01-02T03:04:05")
+        assert decoded["nat"] is None
+        assert decoded["na"] is None
+        assert decoded["nan"] is None
+        assert decoded["set"] == [1]
+
+    def test_non_string_keys(self):
+        """Test that numpy and int dict keys are written as strings."""
+        decoded = json.loads(dumps({np.int64(2): "a", 3: "b"}))
+        assert decoded == {"2": "a", "3": "b"}
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """Test that the stdlib path produces the same JSON."""
+        payload = {"a": np.float64("nan"), "b": [np.int32(1)], "c": pd.Timestamp("2024-01-01")}
+        fast = json.loads(dumps(payload))
+
+        monkeypatch.setattr(response_layer, "ORJSON_AVAILABLE", False)
+        assert json.loads(dumps(payload)) == fast
+
+
+class TestCompression:
+    """Test suite for encoding negotiation and the middleware."""
+
+    def test_choose_encoding(self):
+        """Test Accept-Encoding negotiation."""
+        assert choose_encoding("gzip") == "gzip"
+        assert choose_encoding("gzip;q=0") is None
+        assert choose_encoding("identity") is None
+        if response_layer.ZSTD_AVAILABLE:
+            assert choose_encoding("gzip, zstd") == "zstd"
+            assert choose_encoding("zstd;q=0.5, gzip") == "gzip"
+
+    def test_small_response_uncompressed(self, client):
+        """Test that bodies below the threshold are sent as-is."""
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"value": 1}
+
+    def test_large_response_gzip(self, client):
+        """Test that large bodies are gzip-compressed when requested."""
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        body = response.json()
+        assert len(body["values"]) == 1000
+        assert body["nan"] is None
+
+    def test_gzip_content_length_matches(self, client):
+        """Test that Content-Length describes the compressed body."""
+        with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+        assert int(response.headers["content-length"]) == len(raw)
+        assert json.loads(gzip.decompress(raw))["values"][1] == 1.0
+
+    def test_streaming_response_passthrough(self, client):
+        """Test that streaming responses are never buffered or compressed."""
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert len(response.content) == 1000
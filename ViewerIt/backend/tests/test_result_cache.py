@@ -0,0 +1,82 @@
+"""
+Tests for the comparison result cache.
+"""
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.result_cache import ComparisonCache, estimate_nbytes
+from services.comparator import DataComparator
+
+
+class TestComparisonCache:
+    """Test suite for ComparisonCache class."""
+
+    def test_key_depends_on_content_and_parameters(self):
+        """Test that keys differ when any input or parameter differs."""
+        base = ComparisonCache.make_key("pairwise", ["h1", "h2"], ["id"], ["a", "b"], 0.1, 0.0)
+
+        assert base == ComparisonCache.make_key("pairwise", ["h1", "h2"], ["id"], ["b", "a"], 0.1, 0.0)
+        assert base != ComparisonCache.make_key("pairwise", ["h1", "h3"], ["id"], ["a", "b"], 0.1, 0.0)
+        assert base != ComparisonCache.make_key("pairwise", ["h1", "h2"], ["key"], ["a", "b"], 0.1, 0.0)
+        assert base != ComparisonCache.make_key("pairwise", ["h1", "h2"], ["id"], ["a", "b"], 0.2, 0.0)
+        assert base != ComparisonCache.make_key("multi", ["h1", "h2"], ["id"], ["a", "b"], 0.1, 0.0)
+
+    def test_hit_and_miss(self):
+        """Test that stored values are returned and counted."""
+        cache = ComparisonCache(max_bytes=1000)
+        assert cache.get("k") is None
+
+        cache.put("k", "value", nbytes=10)
+        assert cache.get("k") == "value"
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bytes"] == 10
+
+    def test_lru_eviction_by_bytes(self):
+        """Test that the least recently used entries are evicted over budget."""
+        cache = ComparisonCache(max_bytes=100)
+        cache.put("a", 1, nbytes=40)
+        cache.put("b", 2, nbytes=40)
+        cache.get("a")  # 'b' is now least recently used
+        cache.put("c", 3, nbytes=40)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] == 80
+
+    def test_oversized_value_not_cached(self):
+        """Test that values larger than the budget are skipped."""
+        cache = ComparisonCache(max_bytes=10)
+        cache.put("big", "value", nbytes=11)
+        assert cache.get("big") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_get_or_compute(self):
+        """Test that compute runs only on a miss."""
+        cache = ComparisonCache(max_bytes=1000)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return "result"
+
+        assert cache.get_or_compute("k", compute) == "result"
+        assert cache.get_or_compute("k", compute) == "result"
+        assert len(calls) == 1
+
+    def test_estimate_nbytes_comparator(self, sample_csv_data, sample_csv_data_modified):
+        """Test that comparator size includes its dataframes."""
+        comparator = DataComparator(sample_csv_data, sample_csv_data_modified)
+        comparator.compare(join_columns=["id"])
+
+        frames_only = int(sample_csv_data.memory_usage(deep=True).sum())
+        assert estimate_nbytes(comparator) > frames_only
+        assert estimate_nbytes(pd.DataFrame()) >= 0
@@ -0,0 +1,189 @@
+"""
+Tests for row fingerprints and exact / near-duplicate detection.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.row_fingerprints import (
+    DuplicateFinder,
+    connected_components,
+    find_duplicates,
+    fingerprint_rows,
+    minhash_signatures,
+    row_tokens,
+)
+from services.chunked_processor import ChunkedProcessor
+from services.file_handler import FileHandler
+from services.quality_jobs import find_file_duplicates
+
+
+@pytest.fixture
+def documents():
+    """Email-like rows, the first 30 re-appearing with one word changed and the next 20 copied."""
+    rng = np.random.default_rng(11)
+    vocabulary = np.array([f"word{i}" for i in range(20000)])
+    n = 2000
+    df = pd.DataFrame({
+        "subject": [" ".join(rng.choice(vocabulary, 40)) for _ in range(n)],
+        "custodian": rng.choice(["Smith, J", "Jones, K", "Lee, M"], n),
+        "pages": rng.integers(1, 50, n),
+    })
+    edited = df.iloc[:30].copy()
+    edited["subject"] = edited["subject"].str.replace(r"^\w+", "edited", regex=True)
+    return pd.concat([df, edited, df.iloc[100:120]], ignore_index=True)
+
+
+class TestFingerprints:
+    """Test suite for row fingerprints."""
+
+    def test_duplicates_match_pandas(self, sample_csv_with_nulls):
+        """Test that equal fingerprints are exactly the rows pandas calls duplicates."""
+        df = pd.concat([sample_csv_with_nulls, sample_csv_with_nulls.iloc[[0, 2]]], ignore_index=True)
+        df["zero"] = [0.0, -0.0] * (len(df) // 2) + [0.0] * (len(df) % 2)
+
+        fingerprints = pd.Index(fingerprint_rows(df))
+
+        assert fingerprints.duplicated().tolist() == df.duplicated().tolist()
+
+    def test_numbers_hash_alike_across_dtypes(self):
+        """Test that 5 and 5.0 give the same fingerprint, as int and float chunks read them."""
+        ints = pd.DataFrame({"a": [5, 6], "b": ["x", "y"]})
+        floats = pd.DataFrame({"a": [5.0, 6.0], "b": ["x", "y"]})
+
+        assert (fingerprint_rows(ints) == fingerprint_rows(floats)).all()
+
+    def test_large_integers_stay_distinct(self):
+        """Test that rows differing only in an ID beyond 2**53 are not duplicates."""
+        df = pd.DataFrame({"control": 1234567890123456789 + np.arange(50), "custodian": "Smith, J"})
+
+        assert len(set(fingerprint_rows(df))) == 50
+        assert find_duplicates({"a.parquet": df}, near_method=None)["exact"]["duplicate_rows"] == 0
+
+    def test_normalize_ignores_case_and_whitespace(self):
+        df = pd.DataFrame({"name": ["John  Smith", " john smith", "JOHN SMITH", "Jon Smith", None]})
+
+        plain = fingerprint_rows(df)
+        normalized = fingerprint_rows(df, normalize=True)
+
+        assert len(set(plain[:3])) == 3
+        assert len(set(normalized[:3])) == 1
+        assert normalized[3] != normalized[0]
+        assert normalized[4] != normalized[0]
+
+    def test_column_subset(self, sample_csv_data):
+        df = sample_csv_data.copy()
+        df.loc[1, "category"] = "A"
+
+        fingerprints = fingerprint_rows(df, columns=["category"])
+
+        assert fingerprints[0] == fingerprints[1] == fingerprints[2]
+        assert fingerprints[0] != fingerprint_rows(df)[1]
+
+
+class TestDuplicateFinder:
+    """Test suite for exact and near-duplicate detection."""
+
+    def test_exact_groups_across_sources(self, sample_csv_data):
+        frames = {"a.csv": sample_csv_data, "b.csv": sample_csv_data.iloc[[1, 1, 4]]}
+
+        result = find_duplicates(frames, near_method=None)
+
+        assert result["rows"] == 8
+        assert result["sources"] == {"a.csv": 5, "b.csv": 3}
+        assert result["exact"]["duplicate_rows"] == 3
+        assert result["exact"]["duplicate_groups"] == 2
+        assert result["exact"]["cross_source_groups"] == 2
+        assert result["exact"]["sample_groups"][0] == {
+            "count": 3,
+            "rows": [{"source": "a.csv", "row": 1}, {"source": "b.csv", "row": 0}, {"source": "b.csv", "row": 1}],
+        }
+        assert result["near"] is None
+
+    @pytest.mark.parametrize("method, min_found", [("minhash", 30), ("simhash", 25)])
+    def test_near_duplicates_found(self, documents, method, min_found):
+        """Test that edited rows cluster with their originals, and copies stay exact duplicates."""
+        result = find_duplicates({"docs.csv": documents}, near_method=method, threshold=0.85, max_hamming=10)
+
+        near = result["near"]
+        assert result["exact"]["duplicate_rows"] == 20
+        # SimHash can miss a pair whose edit flipped more bits than max_hamming
+        assert min_found <= near["clusters"] <= 30
+        assert near["rows_in_clusters"] == 2 * near["clusters"]
+        for cluster in near["sample_clusters"]:
+            original, edited = (row["row"] for row in cluster["rows"])
+            assert edited == original + 2000
+            assert cluster["min_similarity"] >= 0.84
+
+    def test_spilled_state_matches(self, documents, tmp_path):
+        """Test that a tiny budget (spilling every store) finds the same duplicates."""
+        in_memory = find_duplicates({"docs.csv": documents})
+        finder = DuplicateFinder(memory_budget_mb=0.05, spill_dir=tmp_path)
+        for start in range(0, len(documents), 300):
+            finder.add("docs.csv", documents.iloc[start:start + 300])
+
+        result = finder.result()
+        finder.close()
+
+        assert result["spilled"]
+        assert result["exact"] == in_memory["exact"]
+        for key in ("clusters", "rows_in_clusters", "similar_pairs", "sample_clusters"):
+            assert result["near"][key] == in_memory["near"][key]
+        assert not list(tmp_path.iterdir())
+
+    def test_missing_columns(self, sample_csv_data):
+        finder = DuplicateFinder(columns=["id", "missing"])
+        with pytest.raises(ValueError):
+            finder.add("a.csv", sample_csv_data)
+        finder.close()
+
+    def test_invalid_method(self):
+        with pytest.raises(ValueError):
+            DuplicateFinder(near_method="cosine")
+
+    def test_minhash_estimates_jaccard(self):
+        """Test signature agreement tracks the Jaccard similarity of the token sets."""
+        words = [f"w{i}" for i in range(300)]
+        df = pd.DataFrame({"text": [" ".join(words[:200]), " ".join(words[100:300])]})
+
+        token_rows, tokens = row_tokens(df)
+        signatures, has_tokens = minhash_signatures(token_rows, tokens, 2, 256, np.uint64(1))
+
+        assert has_tokens.all()
+        assert abs((signatures[0] == signatures[1]).mean() - 1 / 3) < 0.1
+
+    def test_connected_components(self):
+        nodes, labels = connected_components(np.array([1, 2, 7, 9]), np.array([2, 3, 9, 8]))
+
+        assert nodes.tolist() == [1, 2, 3, 7, 8, 9]
+        assert labels.tolist() == [0, 0, 0, 3, 3, 3]
+
+
+class TestFileDuplicates:
+    """Duplicate detection over uploaded files, read in chunks."""
+
+    def test_common_columns_in_chunks(self, sample_csv_data):
+        other = sample_csv_data.iloc[[0, 3]].assign(extra="x")
+        session_id = FileHandler.save_uploaded_file(sample_csv_data.to_csv(index=False).encode(), "a.csv")
+        try:
+            FileHandler.save_uploaded_file(other.to_csv(index=False).encode(), "b.csv", session_id)
+            chunks = []
+            result = find_file_duplicates(
+                session_id, ["a.csv", "b.csv"], near_method=None,
+                processor=ChunkedProcessor(chunk_size=2),
+                on_chunk=lambda filename, rows: chunks.append(filename),
+            )
+            with pytest.raises(FileNotFoundError):
+                find_file_duplicates(session_id, ["missing.csv"])
+        finally:
+            FileHandler.cleanup_session(session_id)
+
+        assert result["columns"] == list(sample_csv_data.columns)
+        assert result["exact"]["duplicate_rows"] == 2
+        assert result["exact"]["cross_source_groups"] == 2
+        assert chunks == ["a.csv"] * 3 + ["b.csv"]
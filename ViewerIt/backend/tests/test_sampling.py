@@ -0,0 +1,154 @@
+"""
+Tests for seek-based tail sampling and skip-based reservoir sampling.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.csv_ranges import header_length, iter_record_blocks, tail_record_start, read_csv_spans
+from services.chunked_processor import ChunkedProcessor, _SkipReservoir
+
+
+@pytest.fixture
+def quoted_csv(tmp_path):
+    """A CSV with quoted newlines, escaped quotes, blank lines and CRLF records."""
+    rng = np.random.default_rng(5)
+    n = 1000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "note": rng.choice(['plain', 'two\nlines', 'say "hi"\r\nthen, bye', '"quoted"', ''], n),
+        "amount": rng.normal(50, 10, n).round(2),
+    })
+    text = df.to_csv(index=False)
+    lines = text.split("\n")
+    # Blank lines (skipped by pandas) between records
+    text = lines[0] + "\n\n" + "\n".join(lines[1:40]) + "\n\r\n" + "\n".join(lines[40:])
+    path = tmp_path / "quoted.csv"
+    path.write_bytes(text.encode())
+    return path
+
+
+@pytest.fixture
+def processor():
+    return ChunkedProcessor(chunk_size=97)
+
+
+class TestRecordSpans:
+    """Quote-aware record numbering and backwards record search."""
+
+    def test_spans_match_pandas_rows(self, quoted_csv):
+        header_end = header_length(quoted_csv)
+        blocks = list(iter_record_blocks(quoted_csv, header_end, block_bytes=1000))
+        spans = [(int(s), int(e)) for block in blocks for s, e in zip(*block.spans())]
+
+        assert len(blocks) > 10
+        assert len(spans) == 1000
+        pd.testing.assert_frame_equal(read_csv_spans(quoted_csv, header_end, spans[::7]),
+                                      pd.read_csv(quoted_csv).iloc[::7].reset_index(drop=True))
+
+    def test_last_record_without_newline(self, tmp_path):
+        path = tmp_path / "no_newline.csv"
+        path.write_text('a,b\n1,"x\ny"\n2,z')
+        header_end = header_length(path)
+
+        spans = [(int(s), int(e)) for block in iter_record_blocks(path, header_end)
+                 for s, e in zip(*block.spans())]
+
+        assert spans == [(4, 12), (12, 15)]
+        assert tail_record_start(path, header_end, 1) == 12
+
+    def test_unbalanced_quotes(self, tmp_path):
+        path = tmp_path / "stray.csv"
+        path.write_text('id,size\n1,5" screen\n2,7\n')
+
+        with pytest.raises(ValueError):
+            list(iter_record_blocks(path, header_length(path)))
+
+    @pytest.mark.parametrize("count", [1, 5, 333, 1000, 5000])
+    def test_tail_record_start(self, quoted_csv, count):
+        header_end = header_length(quoted_csv)
+        start = tail_record_start(quoted_csv, header_end, count, block_bytes=50)
+        tail = read_csv_spans(quoted_csv, header_end, [(start, quoted_csv.stat().st_size)])
+
+        pd.testing.assert_frame_equal(tail, pd.read_csv(quoted_csv).tail(count).reset_index(drop=True))
+
+
+class TestTailSample:
+    """Tail sampling reads from the end and re-attaches the header."""
+
+    def test_tail(self, processor, quoted_csv):
+        tail = processor.sample_large_file(quoted_csv, 250, method="tail")
+
+        pd.testing.assert_frame_equal(tail, pd.read_csv(quoted_csv).tail(250).reset_index(drop=True))
+
+    def test_short_file(self, processor, quoted_csv):
+        assert len(processor.tail_sample(quoted_csv, 5000)) == 1000
+
+    def test_stray_quote_falls_back(self, processor, tmp_path):
+        path = tmp_path / "stray.csv"
+        rows = [f'{i},"multi\nline"' for i in range(50)] + ['50,5" screen'] + [f"{i},x" for i in range(51, 60)]
+        path.write_text("id,item\n" + "\n".join(rows) + "\n")
+
+        tail = processor.tail_sample(path, 15)
+
+        assert tail["id"].tolist() == list(range(45, 60))
+
+    def test_invalid_size(self, processor, quoted_csv):
+        with pytest.raises(ValueError):
+            processor.tail_sample(quoted_csv, 0)
+
+
+class TestReservoirSample:
+    """Algorithm L sampling over record spans or parsed chunks."""
+
+    def test_skip_reservoir_is_uniform(self):
+        n, k, trials = 200, 20, 4000
+        counts = np.zeros(n)
+        rng = np.random.default_rng(0)
+        for _ in range(trials):
+            slots = np.full(k, -1)
+            reservoir = _SkipReservoir(k, rng)
+            for start in range(0, n, 37):
+                for item, slot in reservoir.accept(start, min(start + 37, n)):
+                    slots[slot] = item
+            counts[slots] += 1
+
+        # Each row is kept with probability k/n; allow 5 standard deviations
+        expected = trials * k / n
+        sd = np.sqrt(trials * k / n * (1 - k / n))
+        assert np.abs(counts - expected).max() < 5 * sd
+
+    def test_records_and_chunks_draw_the_same_sample(self, processor, quoted_csv):
+        records, total = processor._sample_records(quoted_csv, 100, np.random.default_rng(3))
+        chunks, chunk_total = processor._sample_chunks(quoted_csv, 100, np.random.default_rng(3))
+
+        assert total == chunk_total == 1000
+        pd.testing.assert_frame_equal(records, chunks, check_index_type=False)
+        assert (records["id"].to_numpy() == records.index.to_numpy()).all()
+
+    def test_random_sample(self, processor, quoted_csv):
+        sample = processor.sample_large_file(quoted_csv, 100, method="random")
+
+        assert len(sample) == 100
+        assert sample.index.is_monotonic_increasing
+        pd.testing.assert_frame_equal(sample, pd.read_csv(quoted_csv).loc[sample.index], check_index_type=False)
+
+    def test_small_file_returns_every_row(self, processor, quoted_csv):
+        sample, total = processor.reservoir_sample(quoted_csv, 5000, seed=1)
+
+        assert total == 1000
+        assert sample.index.tolist() == list(range(1000))
+
+    def test_stray_quote_falls_back(self, processor, tmp_path):
+        path = tmp_path / "stray.csv"
+        path.write_text("id,size\n" + "\n".join(f'{i},{i % 9}"' for i in range(301)) + "\n")
+
+        sample, total = processor.reservoir_sample(path, 50, seed=2)
+
+        assert total == 301
+        assert (sample["id"].to_numpy() == sample.index.to_numpy()).all()
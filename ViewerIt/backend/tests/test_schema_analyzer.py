@@ -306,3 +306,20 @@ class TestSchemaAnalyzer:
         assert isinstance(null_issues, list)
 
 
+    
+    def test_schema_extracted_once_per_file(self, sample_csv_data, sample_csv_data_modified, monkeypatch):
+        """Test that analysis reuses each file's schema instead of re-extracting it."""
+        calls = []
+        original = SchemaAnalyzer._extract_schema
+        monkeypatch.setattr(SchemaAnalyzer, "_extract_schema",
+                            lambda self, df: calls.append(1) or original(self, df))
+        
+        dataframes = {
+            "file1.csv": sample_csv_data,
+            "file2.csv": sample_csv_data_modified,
+            "file3.csv": sample_csv_data,
+        }
+        result = SchemaAnalyzer(dataframes).analyze()
+        
+        assert len(calls) == 3
+        assert set(result["format_analysis"]) <= set(sample_csv_data.columns)
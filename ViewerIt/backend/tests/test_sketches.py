@@ -0,0 +1,166 @@
+"""
+Tests for mergeable sketches and sketched chunked profiles.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.sketches import HyperLogLog, KLLSketch, MisraGries
+from services.profiler import ChunkedProfiler
+
+
+class TestHyperLogLog:
+    """Test suite for distinct-count sketches."""
+
+    @pytest.mark.parametrize("n", [10, 5000, 200_000])
+    def test_estimate_within_error(self, n):
+        sketch = HyperLogLog()
+        sketch.update(pd.Index(np.arange(n)))
+        sketch.update(pd.Index(np.arange(n // 2)))  # repeats do not count
+
+        assert abs(sketch.estimate() / n - 1) < 3 * sketch.relative_error
+
+    def test_merge_is_union(self):
+        words = pd.Index([f"value{i}" for i in range(20_000)])
+        whole, first, second = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        whole.update(words)
+        first.update(words[:12_000])
+        second.update(words[8_000:])
+
+        first.merge(second)
+
+        assert (first.registers == whole.registers).all()
+        with pytest.raises(ValueError):
+            first.merge(HyperLogLog(precision=10))
+
+    def test_invalid_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=30)
+
+
+class TestKLLSketch:
+    """Test suite for quantile sketches."""
+
+    def test_quantiles_within_rank_error(self):
+        values = np.random.default_rng(3).lognormal(size=300_000)
+        sketch = KLLSketch()
+        for start in range(0, len(values), 25_000):
+            sketch.update(values[start:start + 25_000])
+        ordered = np.sort(values)
+
+        qs = [0.05, 0.25, 0.5, 0.75, 0.95]
+        for q, estimate in zip(qs, sketch.quantiles(qs)):
+            assert abs(np.searchsorted(ordered, estimate) / len(values) - q) <= sketch.rank_error
+        assert sketch.quantiles([0, 1]) == [values.min(), values.max()]
+        assert sum(len(level) for level in sketch.levels) < 4 * sketch.k
+
+    def test_weighted_update_and_merge(self):
+        """Test that value counts and merged halves give the quantiles of the repeated values."""
+        first, second = KLLSketch(), KLLSketch(seed=1)
+        first.update(np.arange(1000.0), np.full(1000, 7))
+        second.update(np.arange(1000.0, 2000.0), np.full(1000, 7))
+
+        first.merge(second)
+
+        assert first.count == 14_000
+        assert abs(first.quantiles([0.5])[0] - 1000) <= 2000 * first.rank_error
+
+
+class TestMisraGries:
+    """Test suite for frequent-value summaries."""
+
+    def test_counts_within_error(self):
+        values = pd.Series(np.random.default_rng(5).zipf(1.6, 200_000))
+        first, second = MisraGries(50), MisraGries(50)
+        for start in range(0, 100_000, 10_000):
+            first.update(values[start:start + 10_000].value_counts())
+        second.update(values[100_000:].value_counts())
+
+        first.merge(second)
+        true = values.value_counts()
+
+        assert len(first.counters) <= 50
+        assert first.error <= len(values) / 51
+        assert first.top(3).index.tolist() == true.head(3).index.tolist()
+        for value, counter in first.counters.items():
+            assert counter <= true[value] <= counter + first.error
+
+
+class TestSketchedProfiles:
+    """Chunked profiles past the exact tracking cap."""
+
+    @pytest.fixture
+    def wide(self):
+        rng = np.random.default_rng(9)
+        n = 60_000
+        return pd.DataFrame({
+            "id": np.char.add("DOC", np.arange(n).astype(str)),
+            "amount": rng.normal(100, 20, n).round(2),
+            "custodian": rng.choice(["Smith, J", "Jones, K"], n),
+        })
+
+    def test_high_cardinality_columns(self, wide):
+        chunked = ChunkedProfiler(max_tracked_values=1000)
+        for start in range(0, len(wide), 10_000):
+            chunked.update(wide.iloc[start:start + 10_000])
+        profiles = chunked.result()
+
+        ids, amounts = profiles["id"], profiles["amount"]
+        assert ids["unique_count_exact"] is False
+        assert abs(ids["unique_count"] / 60_000 - 1) < 3 * ids["unique_count_error"]
+        assert ids["max_length"] == 8 and ids["min_length"] == 4
+        assert ids["avg_length"] == round(wide["id"].str.len().mean(), 2)
+        assert amounts["mean"] == pytest.approx(wide["amount"].mean())
+        assert amounts["negative_count"] == int((wide["amount"] < 0).sum())
+        for field, q in (("q1", 0.25), ("median", 0.5), ("q3", 0.75)):
+            rank = (wide["amount"] < amounts[field]).mean()
+            assert abs(rank - q) <= amounts["quantile_rank_error"] + 0.001
+        assert profiles["custodian"]["unique_count_exact"] is True
+        assert profiles["custodian"]["unique_count"] == 2
+
+    def test_merged_profilers(self, wide):
+        """Test that profilers of two halves merge into the single-pass profile."""
+        whole, first, second = (ChunkedProfiler(max_tracked_values=1000) for _ in range(3))
+        whole.update(wide)
+        first.update(wide.iloc[:500])
+        second.update(wide.iloc[500:])
+
+        first.merge(second)
+        merged, expected = first.result(), whole.result()
+
+        assert first.row_count == len(wide)
+        assert merged["custodian"] == expected["custodian"]
+        assert merged["id"]["unique_count"] == expected["id"]["unique_count"]
+        assert merged["amount"]["mean"] == pytest.approx(expected["amount"]["mean"])
+
+    def test_lengths_span_numeric_and_text_chunks(self):
+        """Test lengths cover a column's numeric chunks after it widens to text."""
+        numbers = pd.DataFrame({"code": np.arange(100_000, 106_000)})
+        text = pd.DataFrame({"code": [f"X{i}" for i in range(6000)]})
+        chunked = ChunkedProfiler(max_tracked_values=1000)
+        for chunk in (numbers.iloc[:3000], numbers.iloc[3000:], text.iloc[:3000], text.iloc[3000:]):
+            chunked.update(chunk)
+        profile = chunked.result()["code"]
+
+        lengths = pd.concat([numbers["code"].astype(str), text["code"]]).str.len()
+        assert profile["unique_count_exact"] is False
+        assert profile["avg_length"] == round(lengths.mean(), 2)
+        assert profile["min_length"] == lengths.min()
+        assert profile["max_length"] == lengths.max()
+
+
+    def test_large_integer_distinct_count(self):
+        """Test integers beyond 2**53 are counted apart, not rounded together."""
+        df = pd.DataFrame({"control": 10 ** 18 + np.arange(50_000)})
+        chunked = ChunkedProfiler(max_tracked_values=1000)
+        for start in range(0, len(df), 10_000):
+            chunked.update(df.iloc[start:start + 10_000])
+        profile = chunked.result()["control"]
+
+        assert profile["unique_count_exact"] is False
+        assert abs(profile["unique_count"] / 50_000 - 1) < 3 * profile["unique_count_error"]
@@ -0,0 +1,225 @@
+"""
+Tests for the streaming (out-of-core) quality checker.
+"""
+import math
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.quality_checker import QualityChecker
+from services.chunked_processor import ChunkedProcessor
+from services.streaming_quality import StreamingQualityChecker, HashSpill, ValueSpill
+
+
+@pytest.fixture
+def messy_frame():
+    """Frame exercising every check: nulls, duplicates, formats, dates, correlation, outliers."""
+    rng = np.random.default_rng(7)
+    n = 3000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "amount": rng.normal(100, 20, n).round(2),
+        "code": rng.choice(["A1", "B2", "c3", " d4", None], n),
+        "email": [f"user{i % 400}@example.com" if i % 11 else "n/a" for i in range(n)],
+        "start_date": pd.date_range("2020-01-01", periods=n, freq="h").astype(str),
+        "end_date": pd.date_range("2020-01-01 01:00", periods=n, freq="h").astype(str),
+        "empty": np.nan,
+    })
+    df.loc[rng.choice(n, 200), "amount"] = np.nan
+    df["total"] = df["amount"] * 1.1 + rng.normal(0, 0.5, n)
+    df["quantity"] = rng.integers(1, 10, n)
+    df.loc[[5, 2500], "quantity"] = [500, -80]
+    df.loc[2000:2049, "end_date"] = "2019-01-01 00:00:00"
+    # Exact duplicates spread across chunks
+    return pd.concat([df, df.iloc[100:120], df.iloc[2990:]], ignore_index=True)
+
+
+def write_csv(df: pd.DataFrame, tmp_path: Path, name: str = "data.csv") -> Path:
+    path = tmp_path / name
+    df.to_csv(path, index=False)
+    return path
+
+
+def assert_reports_match(expected, actual, path="report"):
+    """Recursive equality, with floats compared to 1e-9 relative."""
+    if isinstance(expected, dict):
+        assert set(expected) == set(actual), path
+        for key in expected:
+            assert_reports_match(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert len(expected) == len(actual), path
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            assert_reports_match(e, a, f"{path}[{i}]")
+    elif isinstance(expected, float) and math.isnan(expected):
+        assert math.isnan(actual), path
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-9), path
+    else:
+        assert expected == actual, path
+
+
+def streaming_report(path: Path, chunk_size: int, memory_budget_mb: float = 1) -> dict:
+    checker = StreamingQualityChecker(path, "data", ChunkedProcessor(chunk_size=chunk_size),
+                                      memory_budget_mb=memory_budget_mb)
+    return checker.check_all()
+
+
+class TestStreamingQualityChecker:
+    """Tests for StreamingQualityChecker."""
+    
+    def test_matches_in_memory_checker(self, messy_frame, tmp_path):
+        """Test the merged chunk state reproduces the in-memory report."""
+        path = write_csv(messy_frame, tmp_path)
+        expected = QualityChecker(pd.read_csv(path, low_memory=False), "data").check_all()
+        
+        result = streaming_report(path, chunk_size=400)
+        streaming = result.pop("streaming")
+        
+        assert result.pop("mode") == "streaming"
+        assert streaming["chunks"] == 8
+        assert streaming["passes"] == 1
+        assert_reports_match(expected, result)
+        # The fixture triggers every kind of finding
+        assert result["uniqueness"]["duplicate_row_count"] == 30
+        assert {issue["type"] for issue in result["consistency"]["issues"]} == {
+            "high_correlation", "date_order_violation"}
+        assert result["outliers"]["column_outliers"]["quantity"]["outlier_values_sample"] == [500, -80]
+    
+    def test_spilled_state_matches(self, messy_frame, tmp_path):
+        """Test results are unchanged when spill buffers overflow to disk."""
+        path = write_csv(messy_frame, tmp_path)
+        in_memory = streaming_report(path, chunk_size=400)
+        spilled = streaming_report(path, chunk_size=400, memory_budget_mb=0.03)
+        
+        assert spilled["streaming"]["spilled"] is True
+        assert in_memory["streaming"]["spilled"] is False
+        in_memory.pop("streaming"), spilled.pop("streaming")
+        assert_reports_match(in_memory, spilled)
+    
+    def test_spilled_quartiles_with_infinite_values(self, tmp_path):
+        """Test quartiles of a spilled column holding inf and -inf match a full load."""
+        rng = np.random.default_rng(3)
+        amount = rng.normal(100, 20, 6000)
+        amount[::97], amount[5::89] = np.inf, -np.inf
+        path = write_csv(pd.DataFrame({"amount": amount, "id": np.arange(6000)}), tmp_path)
+        expected = QualityChecker(pd.read_csv(path, low_memory=False), "data").check_all()
+        
+        result = streaming_report(path, chunk_size=500, memory_budget_mb=0.01)
+        
+        assert result["streaming"]["spilled"] is True
+        stats = result["outliers"]["column_outliers"]["amount"]["statistics"]
+        expected_stats = expected["outliers"]["column_outliers"]["amount"]["statistics"]
+        assert stats["Q1"] == pytest.approx(expected_stats["Q1"], rel=1e-12)
+        assert stats["Q3"] == pytest.approx(expected_stats["Q3"], rel=1e-12)
+    
+    def test_large_integer_ids_stay_distinct(self, tmp_path):
+        """Test integers beyond 2**53 are not merged by float rounding."""
+        df = pd.DataFrame({"control": 1234567890123456789 + np.arange(50), "pages": np.arange(50) % 3})
+        path = write_csv(df, tmp_path)
+        expected = QualityChecker(pd.read_csv(path, low_memory=False), "data").check_all()
+
+        result = streaming_report(path, chunk_size=20)
+        result.pop("streaming"), result.pop("mode")
+
+        assert result["uniqueness"]["duplicate_row_count"] == 0
+        assert result["uniqueness"]["column_uniqueness"]["control"]["unique_count"] == 50
+        assert_reports_match(expected, result)
+
+    def test_mixed_type_column_is_reread_as_text(self, tmp_path):
+        """Test a column that turns from numbers to text matches a full load."""
+        df = pd.DataFrame({
+            "zip": [str(10000 + i) for i in range(900)] + [f"{10000 + i}-1234" for i in range(100)],
+            "flag": [True, False] * 300 + [None] + [True] * 399,
+            "value": np.arange(1000) % 7,
+        })
+        path = write_csv(df, tmp_path)
+        expected = QualityChecker(pd.read_csv(path, low_memory=False), "data").check_all()
+        
+        result = streaming_report(path, chunk_size=300)
+        streaming = result.pop("streaming")
+        result.pop("mode")
+        
+        assert streaming["passes"] == 2
+        assert streaming["text_columns"] == ["zip", "flag"]
+        assert result["validity"]["zip"]["dtype"] == "object"
+        assert_reports_match(expected, result)
+    
+    @pytest.mark.parametrize("fixture", ["sample_csv_data", "sample_csv_with_nulls"])
+    def test_fixture_frames_match(self, fixture, request, tmp_path):
+        """Test small fixture files, two rows per chunk."""
+        path = write_csv(request.getfixturevalue(fixture), tmp_path)
+        expected = QualityChecker(pd.read_csv(path, low_memory=False), "data").check_all()
+        
+        result = streaming_report(path, chunk_size=2)
+        result.pop("streaming"), result.pop("mode")
+        
+        assert_reports_match(expected, result)
+    
+    def test_header_only_file(self, tmp_path):
+        """Test a file without rows still reports its columns."""
+        path = tmp_path / "empty.csv"
+        path.write_text("a,b\n")
+        
+        result = streaming_report(path, chunk_size=10)
+        
+        assert result["row_count"] == 0
+        assert result["column_count"] == 2
+
+
+class TestSpillStores:
+    """Tests for the hash and value spill stores."""
+    
+    def test_hash_spill_keeps_equal_keys_together(self, tmp_path):
+        """Test spilled, re-split partitions still group every key in one place."""
+        rng = np.random.default_rng(3)
+        keys = rng.integers(0, 2**63, 5000, dtype=np.int64).astype(np.uint64)
+        keys = np.concatenate([keys, keys[:1000]])
+        spill = HashSpill(tmp_path, "test", budget_bytes=4096, partitions=4)
+        for start in range(0, len(keys), 700):
+            spill.add(keys[start:start + 700], np.arange(start, min(start + 700, len(keys))))
+        
+        assert spill.spilled
+        seen, duplicates = set(), 0
+        for pairs in spill.groups():
+            group_keys = set(pairs["key"].tolist())
+            assert not group_keys & seen
+            seen |= group_keys
+            duplicates += len(pairs) - len(group_keys)
+        assert duplicates == 1000
+        assert not list(tmp_path.iterdir())
+    
+    def test_value_spill_selects_exact_ranks(self, tmp_path):
+        """Test histogram narrowing finds the same order statistics as a sort."""
+        rng = np.random.default_rng(5)
+        values = np.concatenate([rng.normal(0, 1, 20000), np.full(3000, 0.5)])
+        spill = ValueSpill(tmp_path, budget_bytes=8 * 1000)
+        for start in range(0, len(values), 2500):
+            spill.add(0, values[start:start + 2500])
+        
+        ranks = [0, 5749, 5750, 11500, 17249, len(values) - 1]
+        found = spill.select(0, ranks, values.min(), values.max())
+        
+        assert spill.spilled
+        expected = np.sort(values)
+        assert found == {rank: expected[rank] for rank in ranks}
+    
+    def test_value_spill_resolves_infinite_ranks(self, tmp_path):
+        """Test ranks among inf / -inf come from their counts and the rest stay exact."""
+        rng = np.random.default_rng(6)
+        values = np.concatenate([rng.normal(0, 1, 8000), np.full(1500, -np.inf), np.full(500, np.inf)])
+        rng.shuffle(values)
+        spill = ValueSpill(tmp_path, budget_bytes=8 * 1000)
+        for start in range(0, len(values), 2500):
+            spill.add(0, values[start:start + 2500])
+        
+        ranks = [0, 1499, 1500, 5000, 9499, 9500, len(values) - 1]
+        found = spill.select(0, ranks, -np.inf, np.inf)
+        
+        assert spill.spilled
+        expected = np.sort(values)
+        assert found == {rank: expected[rank] for rank in ranks}
@@ -0,0 +1,95 @@
+"""
+Tests for the vectorized string profiler.
+"""
+import re
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import QUALITY_FORMAT_PATTERNS
+from services.string_profiler import profile_strings
+
+
+@pytest.fixture
+def text_values():
+    """Text column mixing case classes, whitespace, formats and nulls."""
+    values = [
+        "alice@example.com", "BOB@EXAMPLE.COM", "Carol@Example.com", " dave@example.com",
+        "erin@example.com ", "not  an email", "12345", "2024-01-31", None, "Hello World",
+    ]
+    return pd.Series(values * 30 + ["frank@example.com"] * 200, dtype=object)
+
+
+def expected_counts(series: pd.Series) -> dict:
+    """Per-value Python reference for the profiler's counts."""
+    values = [str(v) for v in series.dropna()]
+    return {
+        "case": {
+            "upper": sum(v.isupper() for v in values),
+            "lower": sum(v.islower() for v in values),
+            "title": sum(v.istitle() for v in values),
+        },
+        "whitespace": {
+            "leading": sum(bool(re.match(r"\s", v)) for v in values),
+            "trailing": sum(bool(re.search(r"\s$", v)) for v in values),
+            "multiple": sum(bool(re.search(r"\s{2,}", v)) for v in values),
+        },
+        "patterns": {
+            name: sum(bool(re.match(pattern, v)) for v in values)
+            for name, pattern in QUALITY_FORMAT_PATTERNS.items()
+        },
+    }
+
+
+class TestProfileStrings:
+    """Test suite for single-pass string classification."""
+
+    @pytest.mark.parametrize("distinct_count", [None, 11])
+    def test_counts_match_per_value_reference(self, text_values, distinct_count):
+        """Test counts with and without per-distinct-value classification."""
+        result = profile_strings(text_values, distinct_count=distinct_count)
+        expected = expected_counts(text_values)
+
+        assert result["count"] == text_values.notna().sum()
+        assert result["case"] == expected["case"]
+        assert result["whitespace"] == expected["whitespace"]
+        assert set(result["patterns"]) == {"email"}
+        assert result["patterns"]["email"]["match_count"] == expected["patterns"]["email"]
+
+    def test_non_matching_samples_in_row_order(self, text_values):
+        """Test that non-matching samples are the first values that fail the pattern."""
+        result = profile_strings(text_values, distinct_count=11, sample_limit=3)
+        assert result["patterns"]["email"]["non_matching_samples"] == [
+            " dave@example.com", "erin@example.com ", "not  an email",
+        ]
+
+    def test_unicode_matches_python_re(self):
+        """Test non-ASCII whitespace and digits, and $ before a final newline, count as in re."""
+        series = pd.Series([
+            " lead", "trail ", "two　　spaces", "١٢٣٤٥", "१२३-४५-६७८९",
+            "12345\n", "https://example.com/a b", "plain",
+        ] * 3, dtype=object)
+        result = profile_strings(series, min_match_ratio=None)
+        expected = expected_counts(series)
+
+        assert result["whitespace"] == expected["whitespace"] == {"leading": 3, "trailing": 6, "multiple": 3}
+        assert {name: entry["match_count"] for name, entry in result["patterns"].items()} == expected["patterns"]
+        assert result["patterns"]["numeric_id"]["match_count"] == 6
+        assert result["patterns"]["ssn"]["match_count"] == 3
+
+    def test_mixed_types_use_string_form(self):
+        """Test that non-string objects are classified by their string form."""
+        result = profile_strings(pd.Series([1, "2", 3.0, None], dtype=object))
+        assert result["count"] == 3
+        assert result["patterns"]["numeric_id"]["match_count"] == 2
+
+    def test_no_values(self):
+        """Test an all-null column."""
+        result = profile_strings(pd.Series([None, np.nan], dtype=object))
+        assert result["count"] == 0
+        assert result["patterns"] == {}
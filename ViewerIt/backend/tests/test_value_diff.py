@@ -0,0 +1,139 @@
+"""
+Tests for the value-level diff kernel and its use in DataComparator.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from datacompy.core import Compare, columns_equal
+from services.comparator import DataComparator
+from services.value_diff import diff_columns, column_kind, NATIVE_DIFF_AVAILABLE, NUMERIC, TEXT
+
+
+def generated_frames(n: int = 2000, seed: int = 7) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Two versions of a load file with numeric drift, text edits, nulls and dates."""
+    rng = np.random.default_rng(seed)
+    words = np.array(["Alpha", "beta ", " Gamma", "DELTA", "epsilon"])
+    df1 = pd.DataFrame({
+        "id": np.arange(n),
+        "amount": rng.normal(100, 30, n).round(4),
+        "pages": rng.integers(1, 500, n),
+        "custodian": rng.choice(words, n).astype(object),
+        "reviewed": rng.random(n) < 0.5,
+        "sent": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D"),
+        "mixed": rng.choice(np.array([1, "one", None], dtype=object), n),
+    })
+    df2 = df1.copy()
+    drift = rng.random(n)
+    df2.loc[drift < 0.1, "amount"] += 0.00005
+    df2.loc[drift > 0.95, "amount"] += 1.5
+    df2.loc[rng.random(n) < 0.05, "pages"] += 1
+    df2.loc[rng.random(n) < 0.05, "amount"] = np.nan
+    df1.loc[rng.random(n) < 0.05, "amount"] = np.nan
+    edits = rng.random(n)
+    df2.loc[edits < 0.1, "custodian"] = df2.loc[edits < 0.1, "custodian"].str.upper()
+    df2.loc[(edits >= 0.1) & (edits < 0.2), "custodian"] = df2.loc[(edits >= 0.1) & (edits < 0.2), "custodian"] + "  "
+    df2.loc[(edits >= 0.2) & (edits < 0.25), "custodian"] = "zeta"
+    df1.loc[rng.random(n) < 0.03, "custodian"] = None
+    df2.loc[rng.random(n) < 0.03, "reviewed"] = ~df2["reviewed"]
+    df2.loc[rng.random(n) < 0.03, "sent"] += pd.Timedelta(days=1)
+    # Rows unique to each side
+    return df1.iloc[:-20], df2.iloc[20:]
+
+
+class TestDiffColumns:
+    """diff_columns agrees with datacompy's columns_equal."""
+
+    @pytest.mark.parametrize("abs_tol,rel_tol", [(0, 0), (0.0001, 0), (0, 0.01)])
+    @pytest.mark.parametrize("ignore_spaces,ignore_case", [(False, False), (True, False), (True, True)])
+    def test_matches_columns_equal(self, abs_tol, rel_tol, ignore_spaces, ignore_case):
+        df1, df2 = generated_frames()
+        df1, df2 = df1.iloc[20:].reset_index(drop=True), df2.iloc[:-20].reset_index(drop=True)
+        columns = ["amount", "pages", "custodian", "reviewed", "sent", "mixed"]
+
+        results = diff_columns([(df1[c], df2[c]) for c in columns], abs_tol, rel_tol, ignore_spaces, ignore_case)
+
+        for column, positions in zip(columns, results):
+            expected = columns_equal(df1[column], df2[column], rel_tol, abs_tol, ignore_spaces, ignore_case)
+            np.testing.assert_array_equal(positions, np.flatnonzero(~expected.to_numpy(dtype=bool)),
+                                          err_msg=column)
+
+    def test_column_kinds(self):
+        df1, df2 = generated_frames(100)
+
+        assert column_kind(df1["amount"], df2["pages"]) == NUMERIC
+        assert column_kind(df1["reviewed"], df2["reviewed"]) == NUMERIC
+        assert column_kind(df1["custodian"], df2["custodian"].astype("string")) == TEXT
+        assert column_kind(df1["sent"], df2["sent"]) is None
+        assert column_kind(df1["mixed"], df2["mixed"]) is None
+        assert column_kind(df1["custodian"], df2["pages"]) is None
+
+    def test_string_dtype_nulls(self):
+        left = pd.Series(["a", pd.NA, "b", pd.NA], dtype="string")
+        right = pd.Series(["a", pd.NA, pd.NA, "c"], dtype="string")
+
+        np.testing.assert_array_equal(diff_columns([(left, right)])[0], [2, 3])
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            diff_columns([(pd.Series([1.0]), pd.Series([1.0, 2.0]))])
+
+
+class TestComparatorEquivalence:
+    """DataComparator results equal plain datacompy's on generated data."""
+
+    @pytest.mark.parametrize("abs_tol,rel_tol,ignore_spaces,ignore_case", [
+        (0.0001, 0.0, False, False),
+        (0.0, 0.01, True, True),
+    ])
+    def test_same_results_as_datacompy(self, abs_tol, rel_tol, ignore_spaces, ignore_case):
+        df1, df2 = generated_frames()
+        comparator = DataComparator(df1, df2, "left", "right")
+        result = comparator.compare(["id"], abs_tol=abs_tol, rel_tol=rel_tol,
+                                    ignore_spaces=ignore_spaces, ignore_case=ignore_case)
+        reference = Compare(df1, df2, join_columns=["id"], df1_name="left", df2_name="right",
+                            abs_tol=abs_tol, rel_tol=rel_tol,
+                            ignore_spaces=ignore_spaces, ignore_case=ignore_case)
+        comp = comparator._comparison
+
+        pd.testing.assert_frame_equal(comp.intersect_rows, reference.intersect_rows[comp.intersect_rows.columns])
+        assert comp.column_stats == reference.column_stats
+        # Sample rows in the report are drawn at random
+        section = "Sample Rows with Unequal Values"
+        assert result["text_report"].split(section)[0] == reference.report().split(section)[0]
+        assert result["matches"] == reference.matches()
+        mismatched = {stat["column"]: stat["unequal_cnt"] for stat in reference.column_stats}
+        assert {stat["column"]: stat["mismatch_count"] for stat in result["column_stats"]} == \
+            {column: count for column, count in mismatched.items() if column != "id"}
+
+
+    def test_join_columns_only(self):
+        """Test column_stats when nothing but the join column is compared."""
+        df1 = pd.DataFrame({"id": [1, 2, 3, 4]})
+        df2 = pd.DataFrame({"id": [2, 3, 5]})
+        comparator = DataComparator(df1, df2, "left", "right")
+        comparator.compare(["id"])
+        reference = Compare(df1, df2, join_columns=["id"], df1_name="left", df2_name="right", abs_tol=0.0001)
+
+        assert comparator._comparison.column_stats == reference.column_stats
+
+@pytest.mark.skipif(not NATIVE_DIFF_AVAILABLE, reason="viewerit_core without the diff kernel")
+class TestNativeDiff:
+    """viewerit_core's diff kernel returns the fallback's mismatches."""
+
+    @pytest.mark.parametrize("ignore_spaces,ignore_case", [(False, False), (True, True)])
+    def test_native_matches_fallback(self, ignore_spaces, ignore_case):
+        df1, df2 = generated_frames()
+        df1, df2 = df1.iloc[20:].reset_index(drop=True), df2.iloc[:-20].reset_index(drop=True)
+        pairs = [(df1[c], df2[c]) for c in ["amount", "pages", "custodian", "reviewed"]]
+
+        native = diff_columns(pairs, 0.0001, 0.01, ignore_spaces, ignore_case, native=True)
+        fallback = diff_columns(pairs, 0.0001, 0.01, ignore_spaces, ignore_case, native=False)
+
+        for positions, expected in zip(native, fallback):
+            np.testing.assert_array_equal(positions, expected)
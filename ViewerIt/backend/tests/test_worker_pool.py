@@ -0,0 +1,117 @@
+"""
+Tests for the shared worker pool and parallel multi-dataset quality checks.
+"""
+import operator
+from io import StringIO
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.worker_pool import WorkerPool, PoolJob
+from services.file_handler import FileHandler
+from services.quality_checker import MultiDatasetQualityChecker
+from services.quality_jobs import quality_job, estimate_quality_memory
+
+MB = 1024 * 1024
+
+
+def csv_roundtrip(df: pd.DataFrame) -> pd.DataFrame:
+    """The frame as it reads back from CSV (dtypes as a loaded upload sees them)."""
+    return pd.read_csv(StringIO(df.to_csv(index=False)))
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """One pool for the module; spawning workers is the slow part."""
+    pool = WorkerPool(max_workers=2, memory_budget_mb=100)
+    yield pool
+    pool.shutdown()
+
+
+class TestWorkerPool:
+    """Test suite for WorkerPool."""
+
+    def test_run_yields_every_result(self, pool):
+        jobs = {f"job{i}": PoolJob(operator.mul, (i, 10), memory_bytes=10 * MB) for i in range(5)}
+
+        results = dict(pool.run(jobs))
+
+        assert results == {f"job{i}": i * 10 for i in range(5)}
+
+    def test_job_error_propagates(self, pool):
+        jobs = {"ok": PoolJob(operator.add, (1, 2)), "bad": PoolJob(int, ("not a number",))}
+
+        with pytest.raises(ValueError):
+            dict(pool.run(jobs))
+
+        # The pool is still usable afterwards
+        assert dict(pool.run({"again": PoolJob(operator.add, (2, 2))})) == {"again": 4}
+
+    def test_memory_budget_admission(self):
+        pool = WorkerPool(max_workers=3, memory_budget_mb=100)
+
+        assert pool._try_reserve(60 * MB)
+        assert not pool._try_reserve(60 * MB)  # Would exceed the budget
+        assert pool._try_reserve(30 * MB)
+        pool._release(60 * MB)
+        pool._release(30 * MB)
+
+        # A job larger than the budget still runs, but only alone
+        assert pool._try_reserve(500 * MB)
+        assert not pool._try_reserve(1 * MB)
+        pool._release(500 * MB)
+
+    def test_worker_limit_admission(self):
+        pool = WorkerPool(max_workers=1, memory_budget_mb=100)
+
+        assert pool._try_reserve(1 * MB)
+        assert not pool._try_reserve(1 * MB)
+
+    def test_invalid_worker_count(self):
+        with pytest.raises(ValueError):
+            WorkerPool(max_workers=0)
+
+
+class TestParallelQualityChecks:
+    """Multi-dataset quality checks run through the pool."""
+
+    def test_jobs_match_in_process_checks(self, pool, sample_csv_data, sample_csv_with_nulls):
+        frames = {"clean.csv": sample_csv_data, "nulls.csv": sample_csv_with_nulls}
+        session_id = FileHandler.save_uploaded_file(sample_csv_data.to_csv(index=False).encode(), "clean.csv")
+        try:
+            FileHandler.save_uploaded_file(
+                sample_csv_with_nulls.to_csv(index=False).encode(), "nulls.csv", session_id
+            )
+            jobs = {name: quality_job(session_id, name) for name in frames}
+            seen = []
+
+            result = MultiDatasetQualityChecker(jobs=jobs, pool=pool).check_all(
+                on_result=lambda name, report: seen.append(name)
+            )
+        finally:
+            FileHandler.cleanup_session(session_id)
+
+        expected = MultiDatasetQualityChecker(
+            dataframes={name: csv_roundtrip(df) for name, df in frames.items()}
+        ).check_all()
+        assert sorted(seen) == sorted(frames)
+        assert list(result["individual_results"]) == list(frames)
+        assert result["comparison"] == expected["comparison"]
+        for name in frames:
+            assert result["individual_results"][name]["quality_score"] == \
+                expected["individual_results"][name]["quality_score"]
+
+    def test_memory_estimate(self, sample_csv_data):
+        session_id = FileHandler.save_uploaded_file(sample_csv_data.to_csv(index=False).encode(), "data.csv")
+        try:
+            exact = estimate_quality_memory(session_id, "data.csv")
+            with pytest.raises(FileNotFoundError):
+                estimate_quality_memory(session_id, "missing.csv")
+        finally:
+            FileHandler.cleanup_session(session_id)
+
+        assert exact > 0
@@ -112,8 +112,12 @@ export interface MultiFileComparisonResult {
   };
   venn_data: {
     file_names: string[];
-    sets: Array<{ sets: string[]; size: number }>;
-  };
+    set_sizes: Record<string, number>;
+    // mask: decimal string of a 64-bit bitmask (too wide for a JS number)
+    sets: Array<{ sets: string[]; mask: string; degree: number; size: number }>;
+    intersection_count: number;
+    truncated: boolean;
+  } | { error: string };
   reconciliation_report?: {
     summary: Record<string, unknown>;
     recommendations: Array<{ type: string; message: string; action?: string }>;